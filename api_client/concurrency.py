@@ -0,0 +1,264 @@
+"""
+Adaptívne riadenie počtu súbežných volaní DataForSEO API (AIMD).
+
+Namiesto pevného limitu súbežných requestov drží proces okno, ktoré sa podľa odoziev API
+mení: kým volania prechádzajú bez dočasných chýb a latencia je blízko priemeru, okno rastie
+aditívne (o ConcurrencySettings.INCREASE za každé okno úspešných volaní). Pri dočasnej chybe
+(50301, 429, 5xx, výpadok spojenia) alebo skoku latencie sa okno multiplikatívne zmenší
+(ConcurrencySettings.DECREASE). Na jednu epizódu preťaženia sa okno zmenší len raz: signály
+z volaní odoslaných ešte pred posledným zmenšením sa ignorujú.
+
+Stav je v jednej inštancii na proces spoločnej pre všetky session (get_concurrency_limiter),
+nastavenia v config.py sa nemenia. Aktuálne okno vracia snapshot() pre monitorovanie.
+Limiter nezávisí od konkrétneho event loopu, takže ho môžu zdieľať aj korutíny z viacerých loopov.
+"""
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+from collections import deque
+from contextlib import asynccontextmanager
+import asyncio
+import logging
+import threading
+import time
+
+from config import ConcurrencySettings
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+# Počet vzoriek latencie, po ktorom sa začnú rozpoznávať jej skoky
+_MIN_LATENCY_SAMPLES = 5
+
+class ConcurrencySlot:
+    """Jedno miesto v okne súbežných volaní; volajúci doň zaznamená výsledok volania."""
+
+    def __init__(self, window_epoch: int):
+        self.window_epoch = window_epoch
+        self.started_at: Optional[float] = None
+        self.congested: Optional[bool] = None
+
+    def start(self) -> None:
+        """Začiatok merania latencie (po získaní tokenu rate limiteru, tesne pred odoslaním)."""
+        self.started_at = time.monotonic()
+
+    def record(self, congested: bool) -> None:
+        """Zaznamená, či volanie skončilo dočasnou chybou (preťaženie API)."""
+        self.congested = congested
+
+class AimdConcurrencyLimiter:
+    """Okno súbežných volaní s aditívnym zväčšovaním a multiplikatívnym zmenšovaním."""
+
+    def __init__(
+        self,
+        initial_window: float,
+        min_window: int,
+        max_window: int,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_spike_factor: float = 2.0,
+        latency_smoothing: float = 0.2
+    ):
+        """
+        Args:
+            initial_window: Počiatočná veľkosť okna
+            min_window: Najmenšie okno (počet súbežných volaní)
+            max_window: Najväčšie okno
+            increase: Zväčšenie okna za každé okno úspešných volaní
+            decrease: Násobok okna pri preťažení (0 až 1)
+            latency_spike_factor: Latencia nad týmto násobkom priemeru sa berie ako preťaženie
+            latency_smoothing: Váha novej vzorky v kĺzavom priemere latencie
+        """
+        self._lock = threading.Lock()
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._in_flight = 0
+        self._epoch = 0
+        self._latency: Optional[float] = None
+        self._latency_samples = 0
+        self._decreases = 0
+        self.configure(min_window, max_window, increase, decrease, latency_spike_factor, latency_smoothing)
+        self._window = float(min(max(initial_window, self._min_window), self._max_window))
+
+    def configure(
+        self,
+        min_window: int,
+        max_window: int,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_spike_factor: float = 2.0,
+        latency_smoothing: float = 0.2
+    ) -> None:
+        """Zmení hranice a parametre okna bez straty jeho stavu."""
+        if not 0 < decrease < 1:
+            raise ValueError("decrease musí byť medzi 0 a 1.")
+        with self._lock:
+            self._min_window = max(1, int(min_window))
+            self._max_window = max(self._min_window, int(max_window))
+            self._increase = increase
+            self._decrease = decrease
+            self._latency_spike_factor = latency_spike_factor
+            self._latency_smoothing = latency_smoothing
+            if hasattr(self, "_window"):
+                self._window = min(max(self._window, self._min_window), self._max_window)
+        self._wake_waiters()
+
+    @property
+    def window(self) -> float:
+        with self._lock:
+            return self._window
+
+    @property
+    def limit(self) -> int:
+        """Počet volaní, ktoré môžu práve bežať súbežne."""
+        with self._lock:
+            return self._limit()
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return self._in_flight
+
+    def _parameters(self) -> Tuple[int, int, float, float, float, float]:
+        return (
+            self._min_window, self._max_window, self._increase,
+            self._decrease, self._latency_spike_factor, self._latency_smoothing
+        )
+
+    def _limit(self) -> int:
+        return max(self._min_window, int(self._window))
+
+    async def acquire(self) -> ConcurrencySlot:
+        """Počká na voľné miesto v okne bez blokovania event loopu."""
+        with self._lock:
+            if self._in_flight < self._limit() and not self._waiters:
+                self._in_flight += 1
+                return ConcurrencySlot(self._epoch)
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # Miesto už bolo pridelené; ak ho ešte neodovzdal _hand_over, uvoľní ho on
+            if not waiter.cancelled():
+                self._release_slot()
+            raise
+        with self._lock:
+            return ConcurrencySlot(self._epoch)
+
+    def try_acquire(self) -> Optional[ConcurrencySlot]:
+        """Vezme miesto v okne len vtedy, ak je voľné hneď a nikto naň nečaká.
+
+        Returns:
+            Optional[ConcurrencySlot]: Miesto alebo None, ak je okno plné
+        """
+        with self._lock:
+            if self._in_flight < self._limit() and not self._waiters:
+                self._in_flight += 1
+                return ConcurrencySlot(self._epoch)
+        return None
+
+    def release(self, slot: ConcurrencySlot) -> None:
+        """Uvoľní miesto a podľa výsledku volania upraví okno."""
+        latency = time.monotonic() - slot.started_at if slot.started_at is not None else None
+        with self._lock:
+            if slot.congested is not None:
+                self._observe(slot, latency)
+        self._release_slot()
+
+    def _observe(self, slot: ConcurrencySlot, latency: Optional[float]) -> None:
+        """Upraví okno podľa jedného dokončeného volania. Volať pod zámkom."""
+        latency_spike = (
+            latency is not None and self._latency is not None and self._latency_samples >= _MIN_LATENCY_SAMPLES
+            and latency > self._latency * self._latency_spike_factor
+        )
+        if latency is not None and not slot.congested:
+            self._latency = latency if self._latency is None else (
+                self._latency_smoothing * latency + (1 - self._latency_smoothing) * self._latency
+            )
+            self._latency_samples += 1
+
+        if slot.congested or latency_spike:
+            # Na preťaženie sa reaguje raz; volania odoslané pred zmenšením ho už nehlásia znova
+            if slot.window_epoch == self._epoch:
+                previous = self._window
+                self._window = max(float(self._min_window), self._window * self._decrease)
+                self._epoch += 1
+                self._decreases += 1
+                reason = "dočasná chyba API" if slot.congested else f"skok latencie ({latency:.2f} s)"
+                logger.warning(f"Okno súbežných volaní zmenšené z {previous:.1f} na {self._window:.1f}: {reason}")
+        else:
+            self._window = min(float(self._max_window), self._window + self._increase / max(self._window, 1.0))
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        """Pridelí uvoľnené miesta čakajúcim v poradí, v akom prišli."""
+        with self._lock:
+            while self._waiters and self._in_flight < self._limit():
+                waiter = self._waiters.popleft()
+                self._in_flight += 1
+                waiter.get_loop().call_soon_threadsafe(self._hand_over, waiter)
+
+    def _hand_over(self, waiter: asyncio.Future) -> None:
+        if waiter.done():
+            # Čakajúci bol medzitým zrušený
+            self._release_slot()
+        else:
+            waiter.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[ConcurrencySlot]:
+        """Miesto v okne na dobu jedného volania.
+
+        Volajúci zavolá slot.start() tesne pred odoslaním a slot.record() s výsledkom;
+        zrušené volanie (bez record) okno nemení.
+        """
+        acquired = await self.acquire()
+        try:
+            yield acquired
+        finally:
+            self.release(acquired)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Stav pre monitorovanie: okno, limit, bežiace a čakajúce volania, priemerná latencia."""
+        with self._lock:
+            return {
+                "window": round(self._window, 2),
+                "limit": self._limit(),
+                "min_window": self._min_window,
+                "max_window": self._max_window,
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiters),
+                "latency_seconds": round(self._latency, 3) if self._latency is not None else None,
+                "decreases": self._decreases,
+            }
+
+_concurrency_limiter: Optional[AimdConcurrencyLimiter] = None
+_concurrency_limiter_lock = threading.Lock()
+
+def get_concurrency_limiter() -> AimdConcurrencyLimiter:
+    """Vráti AIMD limiter súbežných volaní zdieľaný v procese.
+
+    Limiter sa vytvorí pri prvom použití podľa ConcurrencySettings. Zmena hraníc alebo
+    parametrov v nastaveniach sa prejaví pri ďalšom volaní, aktuálne okno sa zachová.
+
+    Returns:
+        AimdConcurrencyLimiter: Limiter zdieľaný všetkými session v procese
+    """
+    global _concurrency_limiter
+    parameters = (
+        ConcurrencySettings.MIN_WINDOW, ConcurrencySettings.MAX_WINDOW, ConcurrencySettings.INCREASE,
+        ConcurrencySettings.DECREASE, ConcurrencySettings.LATENCY_SPIKE_FACTOR, ConcurrencySettings.LATENCY_SMOOTHING
+    )
+    with _concurrency_limiter_lock:
+        if _concurrency_limiter is None:
+            _concurrency_limiter = AimdConcurrencyLimiter(ConcurrencySettings.INITIAL_WINDOW, *parameters)
+        elif _concurrency_limiter._parameters() != parameters:
+            logger.info(f"Mením hranice okna súbežných volaní na {parameters[0]}-{parameters[1]}")
+            _concurrency_limiter.configure(*parameters)
+        return _concurrency_limiter
@@ -3,17 +3,39 @@ API klient pre komunikáciu s DataForSEO REST API.
 Podporuje načítanie údajov o lokáciách, jazykoch a vyhľadávacích objemoch.
 """
 from typing import List, Dict, Tuple, Any, Optional
-import streamlit as st
 import requests
 import aiohttp
+import asyncio
 import base64
-import json
+import hashlib
+import time
 import pandas as pd
 from datetime import datetime
 import logging
 
 # Import konfigurácie
-from config import ApiEndpoints, CacheSettings, DataProcessingSettings
+from config import ApiEndpoints, CacheSettings, DataProcessingSettings, HedgeSettings
+from api_client.concurrency import get_concurrency_limiter
+from api_client.hedging import get_hedge_policy
+from api_client.http_session import get_http_session
+from api_client.json_codec import response_json, response_json_async
+from api_client.rate_limiter import get_rate_limiter
+from api_client.transport import wrap_client_session
+from api_client.search_volume_columns import SearchVolumeColumns, empty_search_volume_frame
+from api_client.streaming_parser import (
+    JSON_PARSE_ERRORS,
+    STREAM_CHUNK_SIZE,
+    is_streaming_parse_enabled,
+    parse_search_volume_stream,
+    parse_search_volume_stream_async
+)
+from api_client.retry import (
+    TaskRetryTracker,
+    is_retryable_http_status,
+    is_retryable_task_status,
+    parse_retry_after
+)
+from utils.swr_cache import stale_while_revalidate
 
 # Nastavenie loggera
 logger = logging.getLogger(__name__)
@@ -32,49 +54,52 @@ def _get_auth_headers(login: str, password: str) -> Dict[str, str]:
     encoded_credentials = base64.b64encode(credentials.encode()).decode()
     return {'Authorization': f'Basic {encoded_credentials}', 'Content-Type': 'application/json'}
 
-@st.cache_data(ttl=CacheSettings.LOCATIONS_TTL)
-def load_locations(login: str, password: str) -> Tuple[List[Tuple[str, int]], Optional[str]]:
-    """Načíta dostupné lokácie z DataForSEO API.
+def credentials_fingerprint(login: str, password: str) -> str:
+    """Odtlačok prihlasovacích údajov pre kľúče zdieľaných volaní a jobov (heslo sa neukladá).
     
     Args:
         login: API prihlasovacie meno
         password: API heslo
         
     Returns:
-        Tuple[List[Tuple[str, int]], Optional[str]]: Dvojica (zoznam lokácií, chybová správa alebo None)
+        str: SHA-256 odtlačok dvojice login a heslo
+    """
+    return hashlib.sha256(f"{login}:{password}".encode("utf-8")).hexdigest()
+
+def fetch_location_rows(login: str, password: str) -> Tuple[List[Tuple[int, str, Optional[str]]], Optional[str]]:
+    """Stiahne zoznam lokácií z DataForSEO API bez cachovania.
+    
+    Args:
+        login: API prihlasovacie meno
+        password: API heslo
+        
+    Returns:
+        Tuple[List[Tuple[int, str, Optional[str]]], Optional[str]]: Dvojica (zoznam (kód, názov, typ lokácie), chybová správa alebo None)
     """
     if not login or not password:
         return [], "Chýbajú API prihlasovacie údaje."
     
     headers = _get_auth_headers(login, password)
-    location_options = [] 
+    location_rows = []
     error_msg = None
     
     try:
-        response = requests.get(
+        response = get_http_session().get(
             ApiEndpoints.LOCATIONS, 
             headers=headers, 
             timeout=DataProcessingSettings.API_REQUEST_TIMEOUT
         )
         response.raise_for_status()
-        data = response.json()
+        data = response_json(response)
         
         if data.get("tasks") and data["tasks"][0].get("status_code") == 20000:
             results = data["tasks"][0].get("result")
             if results:
-                temp_locations = {}
                 for item in results:
                     code = item.get("location_code")
                     name = item.get("location_name")
-                    loc_type = item.get("location_type")
-                    display_name = f"{name}" + (f" ({loc_type})" if loc_type and loc_type != "Country" else "")
                     if code and name:
-                        temp_locations[code] = {'name': name, 'type': loc_type, 'display': display_name}
-                
-                location_options = sorted(
-                    [(data['display'], code) for code, data in temp_locations.items()], 
-                    key=lambda x: x[0]
-                )
+                        location_rows.append((code, name, item.get("location_type")))
             else:
                 error_msg = "API (lokácie): Žiadne výsledky."
         elif data.get("tasks") and data["tasks"][0].get("status_code") == 40101:
@@ -93,9 +118,41 @@ def load_locations(login: str, password: str) -> Tuple[List[Tuple[str, int]], Op
         error_msg = f"Neočekávaná chyba pri načítaní lokácií: {e}"
         logger.error(error_msg)
     
+    return location_rows, error_msg
+
+def location_display_name(name: str, location_type: Optional[str]) -> str:
+    """Zobrazovaný názov lokácie; pri inom type ako krajina sa pridá typ v zátvorke."""
+    return f"{name}" + (f" ({location_type})" if location_type and location_type != "Country" else "")
+
+@stale_while_revalidate(
+    "Lokácie", ttl=lambda: CacheSettings.LOCATIONS_TTL, max_stale=lambda: CacheSettings.LOCATIONS_MAX_STALE,
+    is_failure=lambda result: result[1] is not None
+)
+def load_locations(login: str, password: str) -> Tuple[List[Tuple[str, int]], Optional[str]]:
+    """Načíta dostupné lokácie z DataForSEO API.
+    
+    Celý zoznam obsahuje desaťtisíce lokácií; UI používa indexovaný katalóg
+    (data_processing/location_catalog.py) a táto funkcia ostáva pre skripty a testy.
+    
+    Args:
+        login: API prihlasovacie meno
+        password: API heslo
+        
+    Returns:
+        Tuple[List[Tuple[str, int]], Optional[str]]: Dvojica (zoznam lokácií, chybová správa alebo None)
+    """
+    location_rows, error_msg = fetch_location_rows(login, password)
+    temp_locations = {code: location_display_name(name, loc_type) for code, name, loc_type in location_rows}
+    location_options = sorted(
+        [(display, code) for code, display in temp_locations.items()], 
+        key=lambda x: x[0]
+    )
     return location_options, error_msg
 
-@st.cache_data(ttl=CacheSettings.LANGUAGES_TTL)
+@stale_while_revalidate(
+    "Jazyky", ttl=lambda: CacheSettings.LANGUAGES_TTL, max_stale=lambda: CacheSettings.LANGUAGES_MAX_STALE,
+    is_failure=lambda result: result[1] is not None
+)
 def load_languages(login: str, password: str) -> Tuple[List[Tuple[str, str]], Optional[str]]:
     """Načíta dostupné jazyky z DataForSEO API.
     
@@ -114,13 +171,13 @@ def load_languages(login: str, password: str) -> Tuple[List[Tuple[str, str]], Op
     error_msg = None
     
     try:
-        response = requests.get(
+        response = get_http_session().get(
             ApiEndpoints.LANGUAGES, 
             headers=headers, 
             timeout=DataProcessingSettings.API_REQUEST_TIMEOUT
         )
         response.raise_for_status()
-        data = response.json()
+        data = response_json(response)
         
         if data.get("tasks") and data["tasks"][0].get("status_code") == 20000:
             results = data["tasks"][0].get("result")
@@ -156,101 +213,415 @@ def load_languages(login: str, password: str) -> Tuple[List[Tuple[str, str]], Op
     
     return language_options, error_msg
 
-async def get_search_volume_async(
-    session: aiohttp.ClientSession,
-    login: str, 
-    password: str, 
-    keywords: List[str], 
-    location_code: int, 
-    language_code: str, 
-    date_from: datetime, 
-    date_to: datetime
-) -> Tuple[List[Dict[str, Any]], Optional[str], int]:
-    """Asynchrónne získa objem vyhľadávania pre jednu sadu parametrov.
+def verify_credentials(login: str, password: str) -> Optional[str]:
+    """Overí prihlasovacie údaje pred vrátením výsledku zostaveného len z cache.
+    
+    Cache buniek je spoločná pre všetky účty, preto výsledok bez API volania nesmie dostať
+    session s údajmi, ktoré API odmieta. Overenie použije cachovaný zoznam jazykov
+    (load_languages), takže platné údaje zvyčajne nestoja žiadne ďalšie volanie.
+    Dočasná chyba API výsledok z cache neblokuje.
     
     Args:
-        session: aiohttp ClientSession
         login: API prihlasovacie meno
         password: API heslo
+        
+    Returns:
+        Optional[str]: Chybová správa, ak API prihlasovacie údaje odmietlo, inak None
+    """
+    if not login or not password:
+        return "Chyba: Chýbajú API prihlasovacie údaje."
+    _, error_msg = load_languages(login, password)
+    if not error_msg:
+        return None
+    if "40101" in error_msg or "401 Client Error" in error_msg:
+        return f"Chyba: API odmietlo prihlasovacie údaje ({error_msg}). Skontrolujte API prihlasovacie údaje."
+    logger.warning(f"Prihlasovacie údaje sa nepodarilo overiť, použije sa výsledok z cache: {error_msg}")
+    return None
+
+
+# Tag, ktorým označujeme tasky odoslané z aplikácie (DataForSEO ho vracia v "data" každého tasku)
+SEARCH_VOLUME_TASK_TAG = "streamlit_app_request"
+
+def build_search_volume_task(
+    keywords: List[str],
+    location_code: int,
+    language_code: str,
+    date_from: datetime,
+    date_to: datetime,
+    tag: str = SEARCH_VOLUME_TASK_TAG
+) -> Dict[str, Any]:
+    """Vytvorí jeden task pre search_volume endpoint.
+    
+    Args:
         keywords: Zoznam kľúčových slov
         location_code: Kód lokácie
         language_code: Kód jazyka
         date_from: Počiatočný dátum
         date_to: Koncový dátum
+        tag: Tag tasku, ktorý API vráti v odpovedi
         
     Returns:
-        Tuple[List[Dict[str, Any]], Optional[str], int]: Trojica (výsledky, chybová správa alebo None, kód lokácie)
+        Dict[str, Any]: Task pripravený na odoslanie v tele POST requestu
     """
-    results_list = []
-    error_msg = None
-    
-    headers = _get_auth_headers(login, password)
-    post_data = [{
+    return {
         "keywords": keywords,
         "location_code": location_code,
         "language_code": language_code,
         "date_from": date_from.strftime("%Y-%m-%d"),
         "date_to": date_to.strftime("%Y-%m-%d"),
-        "tag": "streamlit_app_request"
-    }]
+        "tag": tag
+    }
+
+def _collect_monthly_columns(result_items: List[Dict[str, Any]]) -> SearchVolumeColumns:
+    """Zozbiera result[].monthly_searches[] plne načítanej odpovede do typových polí.
+    
+    Args:
+        result_items: Pole result[] jedného tasku
+        
+    Returns:
+        SearchVolumeColumns: Mesačné údaje tasku
+    """
+    columns = SearchVolumeColumns()
+    for item in result_items:
+        keyword = item.get("keyword")
+        monthly_searches = item.get("monthly_searches")
+        if not keyword or not monthly_searches:
+            continue
+        keyword_code = columns.add_keyword(keyword)
+        for ms_item in monthly_searches:
+            columns.append(keyword_code, ms_item.get("year"), ms_item.get("month"), ms_item.get("search_volume"))
+    return columns
+
+def _parse_search_volume_task(task: Dict[str, Any], location_code: int) -> Tuple[pd.DataFrame, Optional[str]]:
+    """Spracuje jeden task z poľa tasks[] odpovede search_volume endpointu.
+    
+    Task môže pochádzať z plne načítanej odpovede (pole 'result') alebo z prúdového
+    parsera (už zozbierané mesačné údaje v 'monthly_columns').
+    
+    Args:
+        task: Jeden prvok poľa tasks[] z odpovede API
+        location_code: Kód lokácie, ku ktorej task patrí
+        
+    Returns:
+        Tuple[pd.DataFrame, Optional[str]]: Dvojica (výsledky v stĺpcoch SEARCH_VOLUME_COLUMNS, chybová správa alebo None)
+    """
+    status_code = task.get("status_code")
+    
+    if status_code == 40101:
+        return empty_search_volume_frame(), f"API: Kód {task['status_code']} - {task.get('status_message')}. Skontrolujte API prihlasovacie údaje."
+    if status_code != 20000:
+        return empty_search_volume_frame(), f"API: Kód {task.get('status_code','N/A')} - {task.get('status_message','N/A')}"
+    
+    # Ak API vráti OK, ale žiadne výsledky (prázdny DataFrame), to nie je chyba API
+    # to sa spracuje vo vyššej vrstve
+    columns = task.get("monthly_columns")
+    if columns is None:
+        columns = _collect_monthly_columns(task.get("result") or [])
+    return columns.to_frame(location_code), None
+
+def _match_response_tasks(
+    response_tasks: List[Dict[str, Any]],
+    post_data: List[Dict[str, Any]]
+) -> List[Optional[Dict[str, Any]]]:
+    """Spáruje tasky z odpovede API s odoslanými taskami.
+    
+    Tasky sa párujú podľa tagu, ktorý API vracia v "data" každého tasku. Ak tag chýba
+    a počet taskov sedí, použije sa poradie taskov v odpovedi.
+    
+    Args:
+        response_tasks: Pole tasks[] z odpovede API
+        post_data: Zoznam odoslaných taskov (v poradí, v akom boli odoslané)
+        
+    Returns:
+        List[Optional[Dict[str, Any]]]: Task z odpovede pre každý odoslaný task, alebo None
+    """
+    tasks_by_tag = {
+        (task.get("data") or {}).get("tag"): task
+        for task in response_tasks
+        if isinstance(task, dict)
+    }
+    
+    matched = []
+    for index, sent_task in enumerate(post_data):
+        task = tasks_by_tag.get(sent_task.get("tag"))
+        if task is None and index < len(response_tasks) and len(response_tasks) == len(post_data):
+            task = response_tasks[index]
+        matched.append(task)
+    return matched
 
+def _split_search_volume_response(
+    response_data: Dict[str, Any],
+    post_data: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Rozdelí pole tasks[] z odpovede API späť na jednotlivé odoslané tasky.
+    
+    Tasky sa párujú podľa tagu, ktorý API vracia v "data" každého tasku. Ak tag chýba,
+    použije sa poradie taskov v odpovedi.
+    
+    Args:
+        response_data: Celá JSON odpoveď API
+        post_data: Zoznam odoslaných taskov (v poradí, v akom boli odoslané)
+        
+    Returns:
+        List[Dict[str, Any]]: Výsledok pre každý odoslaný task (v poradí post_data) s kľúčmi
+            'location_code', 'language_code', 'results' (DataFrame) a 'error'
+    """
+    response_tasks = response_data.get("tasks") or []
+    
+    outcomes = []
+    for sent_task, task in zip(post_data, _match_response_tasks(response_tasks, post_data)):
+        location_code = sent_task["location_code"]
+        if task is None:
+            if response_tasks:
+                error_msg = "API nevrátilo výsledok pre tento task."
+            else:
+                error_msg = "API vrátilo neočakávanú štruktúru odpovede."
+                logger.warning(f"Detail odpovede: {str(response_data)[:500]}")
+            results_list = empty_search_volume_frame()
+            retryable = False
+        else:
+            results_list, error_msg = _parse_search_volume_task(task, location_code)
+            retryable = is_retryable_task_status(task.get("status_code"))
+        
+        outcomes.append({
+            "location_code": location_code,
+            "language_code": sent_task["language_code"],
+            "results": results_list,
+            "error": error_msg,
+            "retryable": retryable,
+        })
+    return outcomes
+
+def _failed_outcomes(
+    post_data: List[Dict[str, Any]],
+    error_msg: str,
+    retryable: bool = False,
+    retry_after: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """Vytvorí výsledky pre všetky tasky POST requestu, ktorý zlyhal ako celok.
+    
+    Args:
+        post_data: Odoslané tasky
+        error_msg: Chybová správa
+        retryable: Či ide o dočasnú chybu, pri ktorej má zmysel task zopakovať
+        retry_after: Čakanie odporúčané serverom (Retry-After) v sekundách
+        
+    Returns:
+        List[Dict[str, Any]]: Výsledok pre každý task
+    """
+    return [
+        {
+            "location_code": task["location_code"],
+            "language_code": task["language_code"],
+            "results": empty_search_volume_frame(),
+            "error": error_msg,
+            "retryable": retryable,
+            "retry_after": retry_after,
+        }
+        for task in post_data
+    ]
+
+def _tag_search_volume_tasks(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Pridá každému tasku jedinečný tag, aby sme ho vedeli spárovať s odpoveďou."""
+    return [
+        {**task, "tag": f"{task.get('tag', SEARCH_VOLUME_TASK_TAG)}#{index}"}
+        for index, task in enumerate(tasks)
+    ]
+
+async def _post_search_volume_tasks_async(
+    session: aiohttp.ClientSession,
+    headers: Dict[str, str],
+    post_data: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Odošle tasky jedným POST requestom (jeden pokus, bez opakovania).
+    
+    Volanie čaká na miesto v adaptívnom okne súbežných volaní a na token zo zdieľaného
+    rate limiteru. Dočasná chyba API okno zmenší, úspešné volanie ho zväčší. Pri zapnutom
+    HedgeSettings.ENABLED sa pomalé volanie môže odoslať ešte raz (_send_search_volume_tasks_hedged).
+    
+    Args:
+        session: aiohttp ClientSession
+        headers: Autorizačné hlavičky
+        post_data: Označené tasky na odoslanie
+        
+    Returns:
+        List[Dict[str, Any]]: Výsledok pokusu pre každý task (vrátane kľúčov 'retryable' a 'retry_after')
+    """
+    async with get_concurrency_limiter().slot() as slot:
+        await get_rate_limiter().acquire_async()
+        slot.start()
+        outcomes = await _send_search_volume_tasks_hedged(session, headers, post_data)
+        slot.record(congested=_has_retryable_outcome(outcomes))
+        return outcomes
+
+def _has_retryable_outcome(outcomes: List[Dict[str, Any]]) -> bool:
+    return any(outcome.get("retryable") for outcome in outcomes)
+
+async def _send_search_volume_tasks_hedged(
+    session: aiohttp.ClientSession,
+    headers: Dict[str, str],
+    post_data: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Odošle tasky a pri pomalej odpovedi aj duplicitný request (api_client/hedging.py).
+    
+    Latencia každého volania sa zaznamená do zdieľanej politiky hedgingu podľa počtu taskov.
+    Ak volanie s najviac HedgeSettings.MAX_TASKS taskami neodpovie do percentilu latencie
+    nedávnych volaní rovnakej veľkosti a rozpočet taskov, rate limiter aj okno súbežných
+    volaní to hneď dovolia, rovnaký request sa odošle znova na vlastnom mieste v okne.
+    Použije sa prvá odpoveď bez dočasnej chyby, druhé volanie sa zruší.
+    """
+    policy = get_hedge_policy()
+    limiter = get_concurrency_limiter()
+    task_count = len(post_data)
+    policy.record_call(task_count)
+    hedgeable = HedgeSettings.ENABLED and task_count <= HedgeSettings.MAX_TASKS
+    delay = policy.hedge_delay(task_count) if hedgeable else None
+    started: Dict[asyncio.Future, float] = {}
+    hedge_slot = None
+    
+    def launch(coro) -> asyncio.Future:
+        attempt = asyncio.ensure_future(coro)
+        started[attempt] = time.monotonic()
+        return attempt
+    
+    def reserve_hedge() -> bool:
+        # Duplicitné volanie potrebuje voľné miesto v okne aj token rate limiteru, bez čakania
+        nonlocal hedge_slot
+        hedge_slot = limiter.try_acquire()
+        if hedge_slot is None:
+            return False
+        if get_rate_limiter().try_reserve():
+            return True
+        limiter.release(hedge_slot)
+        hedge_slot = None
+        return False
+    
+    async def send_hedge(slot) -> List[Dict[str, Any]]:
+        slot.start()
+        outcomes = await _send_search_volume_tasks_async(session, headers, post_data)
+        slot.record(congested=_has_retryable_outcome(outcomes))
+        return outcomes
+    
+    primary = launch(_send_search_volume_tasks_async(session, headers, post_data))
+    pending = {primary}
+    done = set()
+    winner = None
     try:
-        async with session.post(
+        if delay is not None:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done and policy.try_hedge(task_count, reserve_hedge):
+                logger.info(f"API neodpovedalo do {delay:.2f} s, odosielam duplicitné volanie ({task_count} taskov)")
+                hedge = launch(send_hedge(hedge_slot))
+                # Miesto sa uvoľní aj vtedy, keď sa volanie zruší ešte pred spustením
+                hedge.add_done_callback(lambda _, slot=hedge_slot: limiter.release(slot))
+                pending.add(hedge)
+        while winner is None:
+            if not done:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            finished_at = time.monotonic()
+            healthy = [attempt for attempt in done if not _has_retryable_outcome(attempt.result())]
+            for attempt in healthy:
+                policy.observe(finished_at - started[attempt], task_count)
+            if healthy or not pending:
+                winner = (healthy or list(done))[0]
+            done = set()
+        if winner is not primary:
+            policy.record_hedge_won()
+        return winner.result()
+    finally:
+        cancelled_at = time.monotonic()
+        for attempt in pending:
+            attempt.cancel()
+            if winner is not None:
+                # Pomalšie volanie trvalo aspoň doteraz; bez tejto vzorky by percentil klesal
+                policy.observe(cancelled_at - started[attempt], task_count)
+
+async def _send_search_volume_tasks_async(
+    session: aiohttp.ClientSession,
+    headers: Dict[str, str],
+    post_data: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Odošle tasky jedným POST requestom a rozdelí odpoveď na výsledky taskov."""
+    try:
+        async with wrap_client_session(session).post(
             ApiEndpoints.SEARCH_VOLUME_LIVE,
             headers=headers,
             json=post_data,
             timeout=DataProcessingSettings.API_REQUEST_TIMEOUT
         ) as response:
+            if is_retryable_http_status(response.status):
+                error_msg = f"Chyba HTTP {response.status} pri komunikácii s API."
+                logger.warning(error_msg)
+                return _failed_outcomes(post_data, error_msg, True, parse_retry_after(response.headers.get("Retry-After")))
             response.raise_for_status()
-            response_data = await response.json()
-
-            if response_data.get("tasks") and response_data["tasks"][0].get("status_code") == 20000:
-                task_result_items = response_data["tasks"][0].get("result")
-                if task_result_items:
-                    for item in task_result_items:
-                        keyword = item.get("keyword")
-                        monthly_searches = item.get("monthly_searches")
-                        if not keyword or not monthly_searches:
-                            continue
-                        
-                        for ms_item in monthly_searches:
-                            year = ms_item.get("year")
-                            month = ms_item.get("month")
-                            sv = ms_item.get("search_volume")
-                            
-                            if year and month and sv is not None:
-                                try:
-                                    month_date = pd.to_datetime(f'{year}-{month:02d}-01')
-                                    results_list.append({
-                                        "Keyword": keyword,
-                                        "Date": month_date,
-                                        "Search Volume": sv,
-                                        "Location Code": location_code,
-                                    })
-                                except ValueError:
-                                    # Ignorujeme neplatné dátumy
-                                    pass
-            elif response_data.get("tasks") and response_data["tasks"][0].get("status_code") == 40101:
-                error_msg = f"API: Kód {response_data['tasks'][0]['status_code']} - {response_data['tasks'][0]['status_message']}. Skontrolujte API prihlasovacie údaje."
-            elif response_data.get("tasks"):
-                error_msg = f"API: Kód {response_data['tasks'][0].get('status_code','N/A')} - {response_data['tasks'][0].get('status_message','N/A')}"
+            if is_streaming_parse_enabled():
+                # Mesačné údaje sa čítajú priebežne, bez načítania celej odpovede do pamäte
+                response_data = await parse_search_volume_stream_async(response.content)
             else:
-                error_msg = "API vrátilo neočakávanú štruktúru odpovede."
-                logger.warning(f"Detail odpovede: {str(response_data)[:500]}")
+                response_data = await response_json_async(response)
+            return _split_search_volume_response(response_data, post_data)
     except aiohttp.ClientResponseError as e:
         error_msg = f"Chyba HTTP pri komunikácii s API: {e}"
         logger.error(error_msg)
+        return _failed_outcomes(post_data, error_msg)
+    except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+        # Výpadok spojenia alebo timeout sú dočasné chyby
+        error_msg = f"Chyba pri komunikácii s API: {str(e) or 'vypršal časový limit'}"
+        logger.error(error_msg)
+        return _failed_outcomes(post_data, error_msg, True)
     except aiohttp.ClientError as e:
         error_msg = f"Chyba pri komunikácii s API: {e}"
         logger.error(error_msg)
+        return _failed_outcomes(post_data, error_msg)
+    except JSON_PARSE_ERRORS:
+        error_msg = "Chyba: Nepodarilo sa dekódovať JSON odpoveď."
+        logger.error(error_msg)
+        return _failed_outcomes(post_data, error_msg)
     except Exception as e:
         error_msg = f"Nastala neočakávaná chyba pri spracovaní API volania: {e}"
         logger.error(error_msg)
-    
-    return results_list, error_msg, location_code
+        return _failed_outcomes(post_data, error_msg)
 
+async def get_search_volume_multi_async(
+    session: aiohttp.ClientSession,
+    login: str,
+    password: str,
+    tasks: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Asynchrónne získa objem vyhľadávania pre viacero taskov jedným POST volaním.
+    
+    DataForSEO prijíma v tele jedného POST requestu pole taskov (najviac
+    DataProcessingSettings.MAX_TASKS_PER_POST). Odpoveď obsahuje pole tasks[],
+    ktoré sa rozdelí späť na jednotlivé tasky. Každé volanie čaká na token zo
+    zdieľaného rate limiteru. Tasky, ktoré zlyhali dočasnou chybou (50301, 429,
+    5xx, výpadok spojenia), sa opakujú s exponenciálnym backoffom podľa RetrySettings;
+    ostatné tasky sa znova neodosielajú.
+    
+    Args:
+        session: aiohttp ClientSession
+        login: API prihlasovacie meno
+        password: API heslo
+        tasks: Zoznam taskov vytvorených pomocou build_search_volume_task
+        
+    Returns:
+        List[Dict[str, Any]]: Výsledok pre každý task v poradí vstupu - slovník s kľúčmi
+            'location_code', 'language_code', 'results' (DataFrame), 'error' a 'attempts' (počet pokusov)
+    """
+    post_data = _tag_search_volume_tasks(tasks)
+    headers = _get_auth_headers(login, password)
+    tracker = TaskRetryTracker(len(post_data))
+    
+    while True:
+        attempt_outcomes = await _post_search_volume_tasks_async(
+            session, headers, [post_data[i] for i in tracker.pending]
+        )
+        delay = tracker.record(attempt_outcomes)
+        if delay is None:
+            return tracker.outcomes()
+        await asyncio.sleep(delay)
 
-def get_search_volume_for_task(
+async def get_search_volume_async(
+    session: aiohttp.ClientSession,
     login: str, 
     password: str, 
     keywords: List[str], 
@@ -258,10 +629,11 @@ def get_search_volume_for_task(
     language_code: str, 
     date_from: datetime, 
     date_to: datetime
-) -> Tuple[List[Dict[str, Any]], Optional[str]]:
-    """Získa objem vyhľadávania pre jednu sadu parametrov (jeden task).
+) -> Tuple[pd.DataFrame, Optional[str], int]:
+    """Asynchrónne získa objem vyhľadávania pre jednu sadu parametrov.
     
     Args:
+        session: aiohttp ClientSession
         login: API prihlasovacie meno
         password: API heslo
         keywords: Zoznam kľúčových slov
@@ -271,85 +643,125 @@ def get_search_volume_for_task(
         date_to: Koncový dátum
         
     Returns:
-        Tuple[List[Dict[str, Any]], Optional[str]]: Dvojica (výsledky, chybová správa alebo None)
+        Tuple[pd.DataFrame, Optional[str], int]: Trojica (výsledky, chybová správa alebo None, kód lokácie)
     """
-    results_list = []
-    error_msg = None
-    
-    headers = _get_auth_headers(login, password)
-    post_data = [{
-        "keywords": keywords,
-        "location_code": location_code,
-        "language_code": language_code,
-        "date_from": date_from.strftime("%Y-%m-%d"),
-        "date_to": date_to.strftime("%Y-%m-%d"),
-        "tag": "streamlit_app_request"
-    }]
+    task = build_search_volume_task(keywords, location_code, language_code, date_from, date_to)
+    outcome = (await get_search_volume_multi_async(session, login, password, [task]))[0]
+    return outcome["results"], outcome["error"], location_code
 
+
+def _post_search_volume_tasks_sync(
+    headers: Dict[str, str],
+    post_data: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Synchrónne odošle tasky jedným POST requestom (jeden pokus, bez opakovania).
+    
+    Args:
+        headers: Autorizačné hlavičky
+        post_data: Označené tasky na odoslanie
+        
+    Returns:
+        List[Dict[str, Any]]: Výsledok pokusu pre každý task (vrátane kľúčov 'retryable' a 'retry_after')
+    """
     try:
-        response = requests.post(
+        get_rate_limiter().acquire()
+        streaming = is_streaming_parse_enabled()
+        with get_http_session().post(
             ApiEndpoints.SEARCH_VOLUME_LIVE,
             headers=headers,
             json=post_data,
-            timeout=DataProcessingSettings.API_REQUEST_TIMEOUT
-        )
-        response.raise_for_status()
-        response_data = response.json()
-
-        if response_data.get("tasks") and response_data["tasks"][0].get("status_code") == 20000:
-            task_result_items = response_data["tasks"][0].get("result")
-            if task_result_items:
-                for item in task_result_items:
-                    keyword = item.get("keyword")
-                    monthly_searches = item.get("monthly_searches")
-                    if not keyword or not monthly_searches:
-                        continue
-                    
-                    for ms_item in monthly_searches:
-                        year = ms_item.get("year")
-                        month = ms_item.get("month")
-                        sv = ms_item.get("search_volume")
-                        
-                        if year and month and sv is not None:
-                            try:
-                                # API vracia dáta pre celý mesiac, aj keď je dopyt na kratšie obdobie v rámci mesiaca.
-                                # Filtrovanie na presné obdobie date_from/date_to sa deje až po načítaní.
-                                month_date = pd.to_datetime(f'{year}-{month:02d}-01')
-                                results_list.append({
-                                    "Keyword": keyword,
-                                    "Date": month_date,
-                                    "Search Volume": sv,
-                                    "Location Code": location_code,
-                                    # Názov krajiny sa doplní vo fetcher.py
-                                })
-                            except ValueError:
-                                # Ignorujeme neplatné dátumy
-                                pass
-            # Ak API vráti OK, ale žiadne výsledky (prázdny results_list), to nie je chyba API
-            # to sa spracuje vo vyššej vrstve
-            
-        elif response_data.get("tasks") and response_data["tasks"][0].get("status_code") == 40101:
-            error_msg = f"API: Kód {response_data['tasks'][0]['status_code']} - {response_data['tasks'][0]['status_message']}. Skontrolujte API prihlasovacie údaje."
-        elif response_data.get("tasks"):
-            error_msg = f"API: Kód {response_data['tasks'][0].get('status_code','N/A')} - {response_data['tasks'][0].get('status_message','N/A')}"
-        else:
-            error_msg = "API vrátilo neočakávanú štruktúru odpovede."
-            logger.warning(f"Detail odpovede: {str(response_data)[:500]}")
-            
+            timeout=DataProcessingSettings.API_REQUEST_TIMEOUT,
+            stream=streaming
+        ) as response:
+            if is_retryable_http_status(response.status_code):
+                error_msg = f"Chyba HTTP {response.status_code} pri komunikácii s API."
+                logger.warning(error_msg)
+                return _failed_outcomes(post_data, error_msg, True, parse_retry_after(response.headers.get("Retry-After")))
+            response.raise_for_status()
+            if streaming:
+                # Mesačné údaje sa čítajú priebežne, bez načítania celej odpovede do pamäte
+                response_data = parse_search_volume_stream(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+            else:
+                response_data = response_json(response)
+        return _split_search_volume_response(response_data, post_data)
     except requests.exceptions.Timeout:
         error_msg = "Chyba: Vypršal časový limit pri čakaní na odpoveď z API."
         logger.error(error_msg)
+        return _failed_outcomes(post_data, error_msg, True)
     except requests.exceptions.HTTPError as e:
         error_msg = f"Chyba HTTP pri komunikácii s API: {e}"
         logger.error(error_msg)
+        return _failed_outcomes(post_data, error_msg)
+    except requests.exceptions.ConnectionError as e:
+        error_msg = f"Chyba pri komunikácii s API: {e}"
+        logger.error(error_msg)
+        return _failed_outcomes(post_data, error_msg, True)
     except requests.exceptions.RequestException as e:
         error_msg = f"Chyba pri komunikácii s API: {e}"
         logger.error(error_msg)
-    except json.JSONDecodeError:
+        return _failed_outcomes(post_data, error_msg)
+    except JSON_PARSE_ERRORS:
         error_msg = f"Chyba: Nepodarilo sa dekódovať JSON odpoveď."
         logger.error(error_msg)
+        return _failed_outcomes(post_data, error_msg)
     except Exception as e:
         error_msg = f"Nastala neočakávaná chyba pri spracovaní API volania: {e}"
         logger.error(error_msg)
+        return _failed_outcomes(post_data, error_msg)
+
+def get_search_volume_tasks(
+    login: str,
+    password: str,
+    tasks: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Synchrónne získa objem vyhľadávania pre viacero taskov jedným POST volaním.
+    
+    Synchrónny náprotivok get_search_volume_multi_async s rovnakým opakovaním
+    taskov, ktoré zlyhali dočasnou chybou.
+    
+    Args:
+        login: API prihlasovacie meno
+        password: API heslo
+        tasks: Zoznam taskov vytvorených pomocou build_search_volume_task
+        
+    Returns:
+        List[Dict[str, Any]]: Výsledok pre každý task v poradí vstupu - slovník s kľúčmi
+            'location_code', 'language_code', 'results' (DataFrame), 'error' a 'attempts' (počet pokusov)
+    """
+    post_data = _tag_search_volume_tasks(tasks)
+    headers = _get_auth_headers(login, password)
+    tracker = TaskRetryTracker(len(post_data))
+    
+    while True:
+        attempt_outcomes = _post_search_volume_tasks_sync(headers, [post_data[i] for i in tracker.pending])
+        delay = tracker.record(attempt_outcomes)
+        if delay is None:
+            return tracker.outcomes()
+        time.sleep(delay)
+
+def get_search_volume_for_task(
+    login: str, 
+    password: str, 
+    keywords: List[str], 
+    location_code: int, 
+    language_code: str, 
+    date_from: datetime, 
+    date_to: datetime
+) -> Tuple[pd.DataFrame, Optional[str]]:
+    """Získa objem vyhľadávania pre jednu sadu parametrov (jeden task).
     
-    return results_list, error_msg
\ No newline at end of file
+    Args:
+        login: API prihlasovacie meno
+        password: API heslo
+        keywords: Zoznam kľúčových slov
+        location_code: Kód lokácie
+        language_code: Kód jazyka
+        date_from: Počiatočný dátum
+        date_to: Koncový dátum
+        
+    Returns:
+        Tuple[pd.DataFrame, Optional[str]]: Dvojica (výsledky, chybová správa alebo None)
+    """
+    task = build_search_volume_task(keywords, location_code, language_code, date_from, date_to)
+    outcome = get_search_volume_tasks(login, password, [task])[0]
+    return outcome["results"], outcome["error"]
@@ -0,0 +1,200 @@
+"""
+Duplicitné (hedged) volania search volume endpointu proti pomalým odpovediam.
+
+Multi-country beh čaká na najpomalšie volanie. Ak volanie neodpovie do zvoleného percentilu
+latencie nedávnych volaní rovnakej veľkosti (HedgeSettings.PERCENTILE), odošle sa rovnaký
+request ešte raz a použije sa odpoveď, ktorá príde prvá; druhé volanie sa zruší.
+
+Latencia sa sleduje zvlášť pre skupiny volaní podľa počtu taskov v POST requeste (1, 2-4,
+5-16, ...), pretože volanie so 100 taskami trvá inak ako volanie s jedným. DataForSEO účtuje
+každý task, preto sa rozpočet počíta v taskoch: každý odoslaný task pridá HedgeSettings.BUDGET_RATIO
+kreditu (najviac MAX_BUDGET) a duplicitné volanie minie toľko kreditu, koľko má taskov.
+Volania s viac ako HedgeSettings.MAX_TASKS taskami sa neduplikujú vôbec. Duplicitné volanie sa
+navyše pošle len vtedy, ak je v rate limiteri voľný token a v okne súbežných volaní voľné miesto
+hneď, takže nečaká na limity a nepredbieha bežné volania. Stav je v jednej inštancii na proces
+(get_hedge_policy), snapshot() vracia štatistiky pre monitorovanie.
+"""
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from collections import deque
+import logging
+import math
+import threading
+
+from config import HedgeSettings
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+# Horné hranice skupín volaní podľa počtu taskov v POST requeste; väčšie volania tvoria poslednú skupinu
+_SIZE_BUCKETS = (1, 4, 16, 64)
+
+def size_bucket(tasks: int) -> str:
+    """Skupina volania podľa počtu taskov (napr. '1', '2-4', '65+')."""
+    lower = 1
+    for upper in _SIZE_BUCKETS:
+        if tasks <= upper:
+            return str(upper) if lower == upper else f"{lower}-{upper}"
+        lower = upper + 1
+    return f"{lower}+"
+
+class HedgePolicy:
+    """Percentily latencie nedávnych volaní podľa veľkosti a rozpočet duplicitných taskov."""
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        latency_window: int = 200,
+        min_samples: int = 20,
+        min_delay: float = 0.5,
+        budget_ratio: float = 0.05,
+        max_budget: float = 10
+    ):
+        """
+        Args:
+            percentile: Percentil latencie, po ktorom sa pošle duplicitné volanie (0 až 100)
+            latency_window: Počet posledných vzoriek latencie v každej skupine veľkosti
+            min_samples: Najmenší počet vzoriek v skupine, kým sa začne hedgovať
+            min_delay: Najkratšie čakanie pred duplicitným volaním v sekundách
+            budget_ratio: Kredit pridaný za každý odoslaný task
+            max_budget: Najväčší naakumulovaný kredit (v taskoch)
+        """
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._budget = 0.0
+        self._calls = 0
+        self._hedges = 0
+        self._hedged_tasks = 0
+        self._hedges_won = 0
+        self._skipped = 0
+        self.configure(percentile, latency_window, min_samples, min_delay, budget_ratio, max_budget)
+
+    def configure(
+        self,
+        percentile: float = 95,
+        latency_window: int = 200,
+        min_samples: int = 20,
+        min_delay: float = 0.5,
+        budget_ratio: float = 0.05,
+        max_budget: float = 10
+    ) -> None:
+        """Zmení parametre bez straty nameraných latencií."""
+        if not 0 < percentile < 100:
+            raise ValueError("percentile musí byť medzi 0 a 100.")
+        with self._lock:
+            self._percentile = percentile
+            self._latency_window = max(1, int(latency_window))
+            self._min_samples = max(1, int(min_samples))
+            self._min_delay = min_delay
+            self._budget_ratio = budget_ratio
+            self._max_budget = max_budget
+            self._budget = min(self._budget, self._max_budget)
+            self._latencies = {
+                bucket: deque(latencies, maxlen=self._latency_window)
+                for bucket, latencies in self._latencies.items()
+            }
+
+    def _parameters(self) -> Tuple[float, int, int, float, float, float]:
+        return (
+            self._percentile, self._latency_window, self._min_samples,
+            self._min_delay, self._budget_ratio, self._max_budget
+        )
+
+    def observe(self, latency: float, tasks: int = 1) -> None:
+        """Zaznamená latenciu dokončeného volania (alebo dobu, po ktorú bežalo zrušené volanie)."""
+        with self._lock:
+            bucket = size_bucket(tasks)
+            if bucket not in self._latencies:
+                self._latencies[bucket] = deque(maxlen=self._latency_window)
+            self._latencies[bucket].append(latency)
+
+    def record_call(self, tasks: int = 1) -> None:
+        """Započíta jedno volanie a pridá kredit za jeho tasky do rozpočtu."""
+        with self._lock:
+            self._calls += 1
+            self._budget = min(self._max_budget, self._budget + self._budget_ratio * tasks)
+
+    def _percentile_latency(self, bucket: str) -> Optional[float]:
+        latencies = self._latencies.get(bucket)
+        if latencies is None or len(latencies) < self._min_samples:
+            return None
+        ordered = sorted(latencies)
+        index = max(0, math.ceil(self._percentile / 100 * len(ordered)) - 1)
+        return ordered[index]
+
+    def hedge_delay(self, tasks: int = 1) -> Optional[float]:
+        """Čas, po ktorom sa má poslať duplicitné volanie s daným počtom taskov.
+
+        Returns:
+            Optional[float]: Sekundy, alebo None, kým skupina volaní tejto veľkosti nemá dosť vzoriek
+        """
+        with self._lock:
+            latency = self._percentile_latency(size_bucket(tasks))
+            return None if latency is None else max(self._min_delay, latency)
+
+    def try_hedge(self, tasks: int, reserve: Callable[[], bool]) -> bool:
+        """Minie kredit na duplicitné volanie, ak kredit pokryje jeho tasky a reserve() uspeje.
+
+        Args:
+            tasks: Počet taskov duplicitného volania
+            reserve: Vezme bez čakania token rate limiteru a miesto v okne súbežných volaní
+
+        Returns:
+            bool: True, ak sa má duplicitné volanie odoslať
+        """
+        with self._lock:
+            if self._budget < tasks or not reserve():
+                self._skipped += 1
+                return False
+            self._budget -= tasks
+            self._hedges += 1
+            self._hedged_tasks += tasks
+            return True
+
+    def record_hedge_won(self) -> None:
+        """Započíta duplicitné volanie, ktorého odpoveď prišla skôr ako pôvodná."""
+        with self._lock:
+            self._hedges_won += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Stav pre monitorovanie: percentily latencie podľa veľkosti volaní, rozpočet a počty."""
+        with self._lock:
+            latencies = {}
+            for bucket in self._latencies:
+                latency = self._percentile_latency(bucket)
+                latencies[bucket] = round(latency, 3) if latency is not None else None
+            return {
+                "percentile": self._percentile,
+                "latency_seconds": latencies,
+                "samples": sum(len(values) for values in self._latencies.values()),
+                "budget": round(self._budget, 2),
+                "calls": self._calls,
+                "hedges": self._hedges,
+                "hedged_tasks": self._hedged_tasks,
+                "hedges_won": self._hedges_won,
+                "skipped": self._skipped,
+            }
+
+_hedge_policy: Optional[HedgePolicy] = None
+_hedge_policy_lock = threading.Lock()
+
+def get_hedge_policy() -> HedgePolicy:
+    """Vráti politiku duplicitných volaní zdieľanú v procese.
+
+    Politika sa vytvorí pri prvom použití podľa HedgeSettings. Zmena parametrov v nastaveniach
+    sa prejaví pri ďalšom volaní, namerané latencie sa zachovajú.
+
+    Returns:
+        HedgePolicy: Politika zdieľaná všetkými session v procese
+    """
+    global _hedge_policy
+    parameters = (
+        HedgeSettings.PERCENTILE, HedgeSettings.LATENCY_WINDOW, HedgeSettings.MIN_SAMPLES,
+        HedgeSettings.MIN_DELAY, HedgeSettings.BUDGET_RATIO, HedgeSettings.MAX_BUDGET
+    )
+    with _hedge_policy_lock:
+        if _hedge_policy is None:
+            _hedge_policy = HedgePolicy(*parameters)
+        elif _hedge_policy._parameters() != parameters:
+            logger.info(f"Mením hedging na {parameters[0]}. percentil, rozpočet {parameters[4]:.0%} taskov")
+            _hedge_policy.configure(*parameters)
+        return _hedge_policy
@@ -0,0 +1,153 @@
+"""
+Zdieľané HTTP spojenia pre DataForSEO API.
+Udržiava jednu dlhodobo žijúcu aiohttp ClientSession s obmedzeným connection poolom
+a keep-alive. Session žije na spoločnom event loope procesu (utils/event_loop.py), takže
+ju opakovane používajú všetky behy, rerun-y aj Streamlit session v procese. Pre synchrónne volania
+poskytuje requests.Session nad jedným zdieľaným connection poolom. Pri ukončení
+procesu sa spojenia korektne zatvoria. Komprimované odpovede zabezpečí predvolená hlavička
+Accept-Encoding oboch knižníc (gzip, deflate); telo sa rozbalí automaticky.
+"""
+from typing import Any, AsyncIterator, Coroutine, Optional
+from contextlib import asynccontextmanager
+import atexit
+import concurrent.futures
+import threading
+import logging
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import DataProcessingSettings, HttpPoolSettings
+from api_client.transport import wrap_http_adapter
+from utils.event_loop import get_background_loop, run_coroutine, submit_coroutine
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+def _create_client_session() -> aiohttp.ClientSession:
+    """Vytvorí aiohttp ClientSession s obmedzeným connection poolom a keep-alive.
+    
+    Returns:
+        aiohttp.ClientSession: Nová session (musí sa vytvoriť vnútri bežiaceho event loopu)
+    """
+    connector = aiohttp.TCPConnector(
+        limit=HttpPoolSettings.POOL_SIZE,
+        limit_per_host=HttpPoolSettings.POOL_SIZE_PER_HOST,
+        keepalive_timeout=HttpPoolSettings.KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=HttpPoolSettings.DNS_CACHE_TTL,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=DataProcessingSettings.API_REQUEST_TIMEOUT),
+    )
+
+class _SharedClientSession:
+    """Zdieľaná aiohttp ClientSession, ktorá žije na spoločnom event loope (utils/event_loop.py)."""
+    
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    def get(self) -> aiohttp.ClientSession:
+        """Vráti zdieľanú session. Volať len zo spoločného event loopu."""
+        if self._session is None or self._session.closed:
+            self._session = _create_client_session()
+            logger.info("Vytvorená zdieľaná aiohttp ClientSession pre DataForSEO API")
+        return self._session
+    
+    async def aclose(self) -> None:
+        """Zatvorí session (na spoločnom event loope)."""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+    
+    def close(self) -> None:
+        """Zatvorí session z ľubovoľného vlákna; event loop ostáva bežať pre ďalšie použitie."""
+        if self._session is None:
+            return
+        try:
+            run_coroutine(self.aclose(), timeout=5)
+        except Exception as e:
+            logger.warning(f"Nepodarilo sa korektne zatvoriť aiohttp ClientSession: {e}")
+
+_shared_client_session = _SharedClientSession()
+get_background_loop().add_shutdown_callback(_shared_client_session.aclose)
+
+def submit_http_coroutine(coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+    """Spustí korutínu na spoločnom event loope, kde shared_client_session vráti zdieľanú session.
+    
+    Args:
+        coro: Korutína na spustenie
+        
+    Returns:
+        concurrent.futures.Future: Future s výsledkom korutíny
+    """
+    return submit_coroutine(coro)
+
+@asynccontextmanager
+async def shared_client_session() -> AsyncIterator[aiohttp.ClientSession]:
+    """Poskytne aiohttp session pre API volania.
+    
+    Na spoločnom event loope vráti zdieľanú dlhodobo žijúcu session. Na inom event
+    loope (napr. pri priamom asyncio.run v testoch) vytvorí dočasnú session s rovnakým
+    nastavením poolu, ktorá sa po skončení zatvorí.
+    
+    Yields:
+        aiohttp.ClientSession: Session na použitie
+    """
+    if get_background_loop().is_current():
+        yield _shared_client_session.get()
+    else:
+        async with _create_client_session() as session:
+            yield session
+
+_http_adapter: Optional[HTTPAdapter] = None
+_http_adapter_lock = threading.Lock()
+_thread_local = threading.local()
+
+def _get_http_adapter() -> HTTPAdapter:
+    """Vráti zdieľaný HTTPAdapter, ktorý drží connection pool pre synchrónne volania."""
+    global _http_adapter
+    with _http_adapter_lock:
+        if _http_adapter is None:
+            # Opakovanie volaní nerieši adapter, ale vyššia vrstva klienta
+            _http_adapter = HTTPAdapter(
+                pool_connections=HttpPoolSettings.SYNC_POOL_CONNECTIONS,
+                pool_maxsize=HttpPoolSettings.POOL_SIZE_PER_HOST,
+                max_retries=0
+            )
+        return _http_adapter
+
+def get_http_session() -> requests.Session:
+    """Vráti requests.Session pre synchrónne volania DataForSEO API.
+    
+    Každé vlákno (Streamlit session) má vlastný objekt requests.Session, takže sa
+    nezdieľa jeho stav (napr. cookies). Všetky však používajú jeden HTTPAdapter,
+    ktorého urllib3 connection pool je bezpečný pre viac vlákien, a preto sa
+    otvorené keep-alive spojenia a TLS relácie opakovane využívajú naprieč
+    všetkými session. Timeout sa naďalej zadáva pri každom volaní
+    (DataProcessingSettings.API_REQUEST_TIMEOUT). V režime nahrávania alebo prehrávania
+    (TransportSettings.MODE) je adapter obalený kazetou (api_client/transport.py).
+    
+    Returns:
+        requests.Session: Session pre aktuálne vlákno
+    """
+    adapter = wrap_http_adapter(_get_http_adapter())
+    session = getattr(_thread_local, "session", None)
+    if session is None or session.get_adapter("https://") is not adapter:
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _thread_local.session = session
+    return session
+
+def close_http_sessions() -> None:
+    """Zatvorí zdieľané HTTP spojenia. Volá sa automaticky pri ukončení procesu."""
+    global _http_adapter
+    _shared_client_session.close()
+    with _http_adapter_lock:
+        adapter, _http_adapter = _http_adapter, None
+    if adapter is not None:
+        adapter.close()
+
+atexit.register(close_http_sessions)
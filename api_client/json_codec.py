@@ -0,0 +1,56 @@
+"""
+Dekódovanie JSON odpovedí DataForSEO API.
+Ak je nainštalovaný voliteľný balík orjson a DataProcessingSettings.FAST_JSON je zapnuté,
+telá odpovedí (lokácie, jazyky, frontové endpointy a search volume pri vypnutom prúdovom
+spracovaní) sa dekódujú cez orjson priamo z bajtov. Inak sa použije štandardný modul json.
+Synchrónny (requests) aj asynchrónny (aiohttp) klient používajú rovnaké funkcie.
+"""
+from typing import Any, Union
+import json
+import logging
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - závisí od prostredia
+    orjson = None
+
+from config import DataProcessingSettings
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+def is_fast_json_enabled() -> bool:
+    """Zistí, či sa odpovede dekódujú cez orjson."""
+    return orjson is not None and bool(DataProcessingSettings.get('FAST_JSON', True))
+
+def json_backend_name() -> str:
+    """Názov použitého JSON dekodéra (pre logy a benchmark)."""
+    return "orjson" if is_fast_json_enabled() else "json"
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Dekóduje JSON dokument.
+
+    Chyby oboch dekodérov sú podtriedy json.JSONDecodeError, takže ich zachytí
+    streaming_parser.JSON_PARSE_ERRORS.
+
+    Args:
+        data: Telo odpovede ako bajty alebo text
+
+    Returns:
+        Any: Dekódovaný dokument
+    """
+    if is_fast_json_enabled():
+        return orjson.loads(data)
+    return json.loads(data)
+
+def response_json(response: Any) -> Any:
+    """Dekóduje telo odpovede requests.Response."""
+    if is_fast_json_enabled():
+        return orjson.loads(response.content)
+    return response.json()
+
+async def response_json_async(response: Any) -> Any:
+    """Dekóduje telo odpovede aiohttp.ClientResponse (alebo odpovede z kazety)."""
+    if is_fast_json_enabled():
+        return orjson.loads(await response.read())
+    return await response.json()
@@ -0,0 +1,326 @@
+"""
+Štandardný (frontový) režim search_volume endpointu DataForSEO.
+Tasky sa odošlú hromadne cez task_post, ich dokončenie sa sleduje cez tasks_ready
+s adaptívnym intervalom a hotové výsledky sa súbežne stiahnu cez task_get.
+Každý request (task_post, tasks_ready aj task_get) čaká na token spoločného rate limiteru.
+Výsledky majú rovnaký tvar ako pri live režime (get_search_volume_multi_async).
+"""
+from typing import List, Dict, Tuple, Any, Optional, Callable, Set
+import asyncio
+import time
+import logging
+import aiohttp
+
+from config import ApiEndpoints, DataProcessingSettings, QueuedTaskSettings, RetrySettings
+from api_client.dataforseo_client import (
+    _failed_outcomes,
+    _get_auth_headers,
+    _match_response_tasks,
+    _split_search_volume_response,
+    _tag_search_volume_tasks
+)
+from api_client.rate_limiter import get_rate_limiter
+from api_client.json_codec import response_json_async
+from api_client.transport import wrap_client_session
+from api_client.retry import (
+    TaskRetryTracker,
+    compute_backoff_delay,
+    is_retryable_http_status,
+    is_retryable_task_status,
+    parse_retry_after
+)
+from api_client.search_volume_columns import empty_search_volume_frame
+from api_client.streaming_parser import JSON_PARSE_ERRORS, is_streaming_parse_enabled, parse_search_volume_stream_async
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+# Status tasku prijatého do fronty
+TASK_CREATED_STATUS_CODE = 20100
+
+async def _request_json_async(
+    session: aiohttp.ClientSession,
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    payload: Optional[List[Dict[str, Any]]] = None,
+    stream_search_volume: bool = False
+) -> Tuple[Optional[Dict[str, Any]], Optional[str], bool, Optional[float]]:
+    """Vykoná jeden HTTP request na API a načíta JSON odpoveď (jeden pokus, bez opakovania).
+
+    Args:
+        session: aiohttp ClientSession
+        method: HTTP metóda ('GET' alebo 'POST')
+        url: URL endpointu
+        headers: Autorizačné hlavičky
+        payload: Telo POST requestu
+        stream_search_volume: Odpoveď obsahuje výsledky search volume a môže sa spracovať prúdovo
+
+    Returns:
+        Tuple[Optional[Dict[str, Any]], Optional[str], bool, Optional[float]]: Štvorica
+            (odpoveď, chybová správa, či je chyba dočasná, Retry-After v sekundách)
+    """
+    try:
+        async with wrap_client_session(session).request(
+            method,
+            url,
+            headers=headers,
+            json=payload,
+            timeout=DataProcessingSettings.API_REQUEST_TIMEOUT
+        ) as response:
+            if is_retryable_http_status(response.status):
+                error_msg = f"Chyba HTTP {response.status} pri komunikácii s API."
+                logger.warning(error_msg)
+                return None, error_msg, True, parse_retry_after(response.headers.get("Retry-After"))
+            response.raise_for_status()
+            if stream_search_volume and is_streaming_parse_enabled():
+                return await parse_search_volume_stream_async(response.content), None, False, None
+            return await response_json_async(response), None, False, None
+    except aiohttp.ClientResponseError as e:
+        error_msg = f"Chyba HTTP pri komunikácii s API: {e}"
+        logger.error(error_msg)
+        return None, error_msg, False, None
+    except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+        # Výpadok spojenia alebo timeout sú dočasné chyby
+        error_msg = f"Chyba pri komunikácii s API: {str(e) or 'vypršal časový limit'}"
+        logger.error(error_msg)
+        return None, error_msg, True, None
+    except aiohttp.ClientError as e:
+        error_msg = f"Chyba pri komunikácii s API: {e}"
+        logger.error(error_msg)
+        return None, error_msg, False, None
+    except JSON_PARSE_ERRORS:
+        error_msg = "Chyba: Nepodarilo sa dekódovať JSON odpoveď."
+        logger.error(error_msg)
+        return None, error_msg, False, None
+    except Exception as e:
+        error_msg = f"Nastala neočakávaná chyba pri spracovaní API volania: {e}"
+        logger.error(error_msg)
+        return None, error_msg, False, None
+
+async def _post_queued_tasks_async(
+    session: aiohttp.ClientSession,
+    headers: Dict[str, str],
+    post_data: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Odošle tasky do fronty jedným task_post requestom (jeden pokus).
+
+    Args:
+        session: aiohttp ClientSession
+        headers: Autorizačné hlavičky
+        post_data: Označené tasky na odoslanie
+
+    Returns:
+        List[Dict[str, Any]]: Výsledok pre každý task; prijatý task má v 'task_id' ID tasku vo fronte
+    """
+    await get_rate_limiter().acquire_async()
+    response_data, error_msg, retryable, retry_after = await _request_json_async(
+        session, "POST", ApiEndpoints.SEARCH_VOLUME_TASK_POST, headers, post_data
+    )
+    if error_msg:
+        return _failed_outcomes(post_data, error_msg, retryable, retry_after)
+
+    response_tasks = response_data.get("tasks") or []
+    outcomes = []
+    for sent_task, task in zip(post_data, _match_response_tasks(response_tasks, post_data)):
+        outcome = {
+            "location_code": sent_task["location_code"],
+            "language_code": sent_task["language_code"],
+            "results": empty_search_volume_frame(),
+            "error": None,
+            "retryable": False,
+            "task_id": None,
+        }
+        if task is None:
+            outcome["error"] = "API nevrátilo výsledok pre tento task." if response_tasks else "API vrátilo neočakávanú štruktúru odpovede."
+        elif task.get("status_code") == TASK_CREATED_STATUS_CODE and task.get("id"):
+            outcome["task_id"] = task["id"]
+        elif task.get("status_code") == 40101:
+            outcome["error"] = f"API: Kód {task['status_code']} - {task.get('status_message')}. Skontrolujte API prihlasovacie údaje."
+        else:
+            outcome["error"] = f"API: Kód {task.get('status_code','N/A')} - {task.get('status_message','N/A')}"
+            outcome["retryable"] = is_retryable_task_status(task.get("status_code"))
+        outcomes.append(outcome)
+    return outcomes
+
+async def _fetch_ready_task_ids_async(
+    session: aiohttp.ClientSession,
+    headers: Dict[str, str]
+) -> Tuple[Set[str], Optional[str]]:
+    """Zistí ID hotových taskov, ktoré ešte neboli vyzdvihnuté (tasks_ready).
+
+    Args:
+        session: aiohttp ClientSession
+        headers: Autorizačné hlavičky
+
+    Returns:
+        Tuple[Set[str], Optional[str]]: Dvojica (ID hotových taskov, chybová správa alebo None)
+    """
+    await get_rate_limiter().acquire_async()
+    response_data, error_msg, _, _ = await _request_json_async(
+        session, "GET", ApiEndpoints.SEARCH_VOLUME_TASKS_READY, headers
+    )
+    if error_msg:
+        return set(), error_msg
+
+    ready_ids = set()
+    for task in response_data.get("tasks") or []:
+        if task.get("status_code") != 20000:
+            return ready_ids, f"API: Kód {task.get('status_code','N/A')} - {task.get('status_message','N/A')}"
+        ready_ids.update(item["id"] for item in task.get("result") or [] if item.get("id"))
+    return ready_ids, None
+
+async def _get_queued_task_result_async(
+    session: aiohttp.ClientSession,
+    headers: Dict[str, str],
+    task_id: str,
+    sent_task: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Stiahne výsledok jedného hotového tasku (task_get) s opakovaním pri dočasnej chybe.
+
+    Args:
+        session: aiohttp ClientSession
+        headers: Autorizačné hlavičky
+        task_id: ID tasku vo fronte
+        sent_task: Odoslaný task (s tagom)
+
+    Returns:
+        Dict[str, Any]: Výsledok tasku v tvare get_search_volume_multi_async
+    """
+    tracker = TaskRetryTracker(1)
+    while True:
+        await get_rate_limiter().acquire_async()
+        response_data, error_msg, retryable, retry_after = await _request_json_async(
+            session, "GET", ApiEndpoints.SEARCH_VOLUME_TASK_GET.format(task_id=task_id), headers,
+            stream_search_volume=True
+        )
+        if error_msg:
+            attempt_outcomes = _failed_outcomes([sent_task], error_msg, retryable, retry_after)
+        else:
+            attempt_outcomes = _split_search_volume_response(response_data, [sent_task])
+        delay = tracker.record(attempt_outcomes)
+        if delay is None:
+            return {**tracker.outcomes()[0], "task_id": task_id}
+        await asyncio.sleep(delay)
+
+async def get_search_volume_queued_async(
+    session: aiohttp.ClientSession,
+    login: str,
+    password: str,
+    tasks: List[Dict[str, Any]],
+    on_task_done: Optional[Callable[[int, int], None]] = None,
+    on_outcome: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None
+) -> List[Dict[str, Any]]:
+    """Získa objem vyhľadávania pre viacero taskov cez štandardnú frontu DataForSEO.
+
+    Tasky sa odošlú po DataProcessingSettings.MAX_TASKS_PER_POST v jednom task_post
+    requeste (každý request čaká na token zdieľaného rate limiteru, dočasné chyby sa
+    opakujú). Potom sa kontroluje tasks_ready: interval začína na
+    QueuedTaskSettings.POLL_INITIAL_INTERVAL, bez nových hotových taskov sa predlžuje
+    až po POLL_MAX_INTERVAL a pri nových hotových taskoch sa opäť skracuje. Hotové
+    tasky sa sťahujú súbežne (najviac DOWNLOAD_CONCURRENCY naraz) hneď, ako sa objavia.
+    Tasky, ktoré po QUEUE_TIMEOUT neboli hlásené ako hotové, sa skúsia stiahnuť priamo.
+
+    Args:
+        session: aiohttp ClientSession
+        login: API prihlasovacie meno
+        password: API heslo
+        tasks: Zoznam taskov vytvorených pomocou build_search_volume_task
+        on_task_done: Voliteľná funkcia volaná s (počet hotových taskov, počet taskov)
+        on_outcome: Voliteľná funkcia volaná s (task zo vstupu, jeho výsledok) hneď, ako je task hotový
+
+    Returns:
+        List[Dict[str, Any]]: Výsledok pre každý task v poradí vstupu - slovník s kľúčmi
+            'location_code', 'language_code', 'results' (DataFrame), 'error' a 'attempts'
+    """
+    post_data = _tag_search_volume_tasks(tasks)
+    headers = _get_auth_headers(login, password)
+    outcomes: List[Optional[Dict[str, Any]]] = [None] * len(post_data)
+    done_count = 0
+
+    def finish(index: int, outcome: Dict[str, Any]) -> None:
+        nonlocal done_count
+        outcomes[index] = outcome
+        done_count += 1
+        if on_task_done:
+            on_task_done(done_count, len(post_data))
+        if on_outcome:
+            on_outcome(tasks[index], outcome)
+
+    # 1. Odoslanie taskov do fronty
+    max_tasks_per_post = max(1, DataProcessingSettings.get('MAX_TASKS_PER_POST', 100))
+
+    async def post_chunk(start: int) -> List[Dict[str, Any]]:
+        chunk = post_data[start:start + max_tasks_per_post]
+        tracker = TaskRetryTracker(len(chunk))
+        while True:
+            attempt_outcomes = await _post_queued_tasks_async(session, headers, [chunk[i] for i in tracker.pending])
+            delay = tracker.record(attempt_outcomes)
+            if delay is None:
+                return tracker.outcomes()
+            await asyncio.sleep(delay)
+
+    chunk_starts = range(0, len(post_data), max_tasks_per_post)
+    posted = [outcome for chunk in await asyncio.gather(*(post_chunk(start) for start in chunk_starts)) for outcome in chunk]
+
+    waiting: Dict[str, int] = {}
+    for index, outcome in enumerate(posted):
+        if outcome.get("task_id"):
+            waiting[outcome["task_id"]] = index
+        else:
+            finish(index, outcome)
+    if not waiting:
+        return outcomes
+    logger.info(f"Do fronty odoslaných {len(waiting)} taskov, čakám na ich spracovanie")
+
+    # 2. Sledovanie tasks_ready a súbežné sťahovanie hotových taskov
+    semaphore = asyncio.Semaphore(max(1, QueuedTaskSettings.DOWNLOAD_CONCURRENCY))
+
+    async def download(task_id: str, index: int, timed_out: bool = False) -> None:
+        async with semaphore:
+            outcome = await _get_queued_task_result_async(session, headers, task_id, post_data[index])
+        outcome["attempts"] = max(outcome["attempts"], posted[index]["attempts"])
+        if timed_out and outcome["error"]:
+            outcome["error"] = f"Task {task_id} sa nespracoval do {QueuedTaskSettings.QUEUE_TIMEOUT} s: {outcome['error']}"
+        finish(index, outcome)
+
+    downloads = []
+    try:
+        initial_interval = max(0.0, QueuedTaskSettings.POLL_INITIAL_INTERVAL)
+        interval = initial_interval
+        deadline = time.monotonic() + QueuedTaskSettings.QUEUE_TIMEOUT
+        poll_failures = 0
+
+        while waiting and time.monotonic() < deadline:
+            await asyncio.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+            ready_ids, error_msg = await _fetch_ready_task_ids_async(session, headers)
+            if error_msg:
+                poll_failures += 1
+                logger.warning(f"Kontrola hotových taskov zlyhala: {error_msg}")
+                if "40101" in error_msg or poll_failures >= RetrySettings.MAX_ATTEMPTS:
+                    for task_id, index in waiting.items():
+                        finish(index, {**posted[index], "task_id": task_id, "error": f"Nepodarilo sa zistiť stav tasku: {error_msg}"})
+                    waiting.clear()
+                    break
+                interval = max(interval, compute_backoff_delay(poll_failures))
+                continue
+            poll_failures = 0
+
+            newly_ready = [task_id for task_id in ready_ids if task_id in waiting]
+            for task_id in newly_ready:
+                downloads.append(asyncio.create_task(download(task_id, waiting.pop(task_id))))
+            if newly_ready:
+                interval = max(initial_interval, interval / QueuedTaskSettings.POLL_BACKOFF_FACTOR)
+            else:
+                interval = min(QueuedTaskSettings.POLL_MAX_INTERVAL, interval * QueuedTaskSettings.POLL_BACKOFF_FACTOR)
+
+        # 3. Tasky, ktoré neboli hlásené ako hotové, skúsime stiahnuť priamo
+        for task_id, index in waiting.items():
+            downloads.append(asyncio.create_task(download(task_id, index, timed_out=True)))
+        if downloads:
+            await asyncio.gather(*downloads)
+    finally:
+        # Pri zrušení behu (napr. rerun stránky) sa zrušia aj rozbehnuté sťahovania
+        for pending_download in downloads:
+            pending_download.cancel()
+    return outcomes
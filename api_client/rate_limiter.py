@@ -0,0 +1,140 @@
+"""
+Zdieľaný token-bucket rate limiter pre volania DataForSEO API.
+Jedna inštancia na proces, cez ktorú prechádzajú všetky synchrónne aj asynchrónne
+volania search volume endpointu zo všetkých Streamlit session.
+"""
+from typing import Optional
+import asyncio
+import threading
+import time
+import logging
+
+from config import DataProcessingSettings
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+class TokenBucketRateLimiter:
+    """Token bucket s frontou čakajúcich volaní.
+    
+    Každé volanie si rezervuje jeden token. Ak žiadny nie je voľný, token sa
+    "požičia" z budúcnosti a volajúci počká, kým sa vygeneruje. Volania sa tak
+    odosielajú hneď, ako je token k dispozícii, v poradí, v akom prišli.
+    Rezervácia prebieha pod zámkom, preto je limiter bezpečný pre viac vlákien
+    aj viac event loopov naraz.
+    """
+    
+    def __init__(self, requests_per_minute: float, burst: int = 1):
+        """
+        Args:
+            requests_per_minute: Povolený priemerný počet volaní za minútu
+            burst: Maximálny počet volaní, ktoré možno odoslať naraz po nečinnosti
+        """
+        self._lock = threading.Lock()
+        self._rate_per_second = 0.0
+        self._capacity = 1.0
+        self._tokens = 0.0
+        self._updated_at = time.monotonic()
+        self.configure(requests_per_minute, burst)
+        self._tokens = self._capacity
+    
+    @property
+    def requests_per_minute(self) -> float:
+        return self._rate_per_second * 60
+    
+    @property
+    def burst(self) -> int:
+        return int(self._capacity)
+    
+    def configure(self, requests_per_minute: float, burst: int = 1) -> None:
+        """Zmení rýchlosť a kapacitu limiteru bez straty aktuálneho stavu.
+        
+        Args:
+            requests_per_minute: Povolený priemerný počet volaní za minútu
+            burst: Maximálny počet volaní, ktoré možno odoslať naraz po nečinnosti
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute musí byť kladné číslo.")
+        with self._lock:
+            self._refill()
+            self._rate_per_second = requests_per_minute / 60.0
+            self._capacity = float(max(1, burst))
+            self._tokens = min(self._tokens, self._capacity)
+    
+    def _refill(self) -> None:
+        """Doplní tokeny za čas od poslednej aktualizácie. Volať pod zámkom."""
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate_per_second)
+        self._updated_at = now
+    
+    def reserve(self) -> float:
+        """Rezervuje jeden token.
+        
+        Returns:
+            float: Počet sekúnd, ktoré musí volajúci počkať pred odoslaním volania
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate_per_second
+    
+    def try_reserve(self) -> bool:
+        """Vezme token len vtedy, ak je voľný hneď (bez požičania z budúcnosti).
+        
+        Returns:
+            bool: True, ak sa token podarilo vziať
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+    
+    def acquire(self) -> float:
+        """Počká na token (blokujúco).
+        
+        Returns:
+            float: Počet sekúnd strávených čakaním
+        """
+        wait_time = self.reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+    
+    async def acquire_async(self) -> float:
+        """Počká na token bez blokovania event loopu.
+        
+        Returns:
+            float: Počet sekúnd strávených čakaním
+        """
+        wait_time = self.reserve()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+        return wait_time
+
+_rate_limiter: Optional[TokenBucketRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> TokenBucketRateLimiter:
+    """Vráti zdieľaný limiter pre tento proces.
+    
+    Limiter sa vytvorí pri prvom použití podľa DataProcessingSettings.API_RATE_LIMIT_PER_MINUTE
+    a API_RATE_LIMIT_BURST. Zmena nastavení sa prejaví pri ďalšom volaní.
+    
+    Returns:
+        TokenBucketRateLimiter: Limiter zdieľaný všetkými session v procese
+    """
+    global _rate_limiter
+    requests_per_minute = DataProcessingSettings.get('API_RATE_LIMIT_PER_MINUTE', 12)
+    burst = DataProcessingSettings.get('API_RATE_LIMIT_BURST', 3)
+    
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = TokenBucketRateLimiter(requests_per_minute, burst)
+        elif _rate_limiter.requests_per_minute != requests_per_minute or _rate_limiter.burst != burst:
+            logger.info(f"Mením rate limit na {requests_per_minute} volaní/min (burst {burst})")
+            _rate_limiter.configure(requests_per_minute, burst)
+        return _rate_limiter
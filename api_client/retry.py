@@ -0,0 +1,132 @@
+"""
+Politika opakovania API volaní pri dočasných chybách.
+Exponenciálny backoff s jitterom, rešpektovanie hlavičky Retry-After a obmedzený
+počet pokusov. Opakujú sa len tasky, ktoré zlyhali dočasnou chybou.
+"""
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+import logging
+
+from config import RetrySettings
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+def is_retryable_http_status(status: Optional[int]) -> bool:
+    """Zistí, či HTTP status znamená dočasnú chybu (429 alebo 5xx)."""
+    return status in RetrySettings.RETRYABLE_HTTP_STATUSES
+
+def is_retryable_task_status(status_code: Optional[int]) -> bool:
+    """Zistí, či status_code tasku DataForSEO znamená dočasnú chybu (napr. 50301)."""
+    return status_code in RetrySettings.RETRYABLE_TASK_STATUS_CODES
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Prečíta hodnotu hlavičky Retry-After (počet sekúnd alebo HTTP dátum).
+    
+    Args:
+        value: Hodnota hlavičky alebo None
+        
+    Returns:
+        Optional[float]: Počet sekúnd čakania alebo None, ak hlavička chýba alebo je neplatná
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def compute_backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Vypočíta čakanie pred ďalším pokusom.
+    
+    Exponenciálny backoff s jitterom: náhodná hodnota z druhej polovice intervalu
+    BASE_DELAY * 2^(attempt-1), najviac MAX_DELAY. Ak server poslal Retry-After,
+    čaká sa aspoň toľko (tiež najviac MAX_DELAY).
+    
+    Args:
+        attempt: Poradie pokusu, ktorý práve zlyhal (od 1)
+        retry_after: Hodnota Retry-After v sekundách alebo None
+        
+    Returns:
+        float: Počet sekúnd čakania
+    """
+    exponential = min(RetrySettings.MAX_DELAY, RetrySettings.BASE_DELAY * (2 ** (attempt - 1)))
+    delay = random.uniform(exponential / 2, exponential)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, RetrySettings.MAX_DELAY))
+    return delay
+
+class TaskRetryTracker:
+    """Sleduje pokusy pre skupinu taskov odoslaných spolu.
+    
+    Po každom pokuse si zapamätá výsledky a rozhodne, ktoré tasky sa majú zopakovať.
+    Výsledok pokusu je slovník s kľúčmi 'location_code', 'language_code', 'results',
+    'error' a internými kľúčmi 'retryable' a 'retry_after'.
+    """
+    
+    def __init__(self, task_count: int, max_attempts: Optional[int] = None):
+        """
+        Args:
+            task_count: Počet taskov
+            max_attempts: Maximálny počet pokusov pre task (predvolene RetrySettings.MAX_ATTEMPTS)
+        """
+        self.max_attempts = max(1, max_attempts if max_attempts is not None else RetrySettings.MAX_ATTEMPTS)
+        self.attempt = 0
+        self.pending: List[int] = list(range(task_count))
+        self._outcomes: List[Optional[Dict[str, Any]]] = [None] * task_count
+    
+    def record(self, attempt_outcomes: List[Dict[str, Any]]) -> Optional[float]:
+        """Zaznamená výsledky pokusu pre tasky v self.pending (v rovnakom poradí).
+        
+        Args:
+            attempt_outcomes: Výsledky pokusu
+            
+        Returns:
+            Optional[float]: Počet sekúnd čakania pred ďalším pokusom, alebo None ak je hotovo
+        """
+        self.attempt += 1
+        still_pending = []
+        retry_after = None
+        for index, outcome in zip(self.pending, attempt_outcomes):
+            outcome = dict(outcome)
+            retryable = outcome.pop("retryable", False)
+            outcome_retry_after = outcome.pop("retry_after", None)
+            outcome["attempts"] = self.attempt
+            self._outcomes[index] = outcome
+            if retryable and self.attempt < self.max_attempts:
+                still_pending.append(index)
+                if outcome_retry_after is not None:
+                    retry_after = max(retry_after or 0.0, outcome_retry_after)
+        
+        self.pending = still_pending
+        if not still_pending:
+            return None
+        
+        delay = compute_backoff_delay(self.attempt, retry_after)
+        logger.warning(
+            f"Opakujem {len(still_pending)} z {len(self._outcomes)} taskov o {delay:.1f}s "
+            f"(pokus {self.attempt + 1}/{self.max_attempts})"
+        )
+        return delay
+    
+    def outcomes(self) -> List[Dict[str, Any]]:
+        """Vráti konečné výsledky taskov s počtom pokusov v kľúči 'attempts'.
+        
+        Returns:
+            List[Dict[str, Any]]: Výsledky v pôvodnom poradí taskov
+        """
+        final_outcomes = []
+        for outcome in self._outcomes:
+            if outcome["error"] and outcome["attempts"] > 1:
+                outcome = {**outcome, "error": f"{outcome['error']} (po {outcome['attempts']} pokusoch)"}
+            final_outcomes.append(outcome)
+        return final_outcomes
@@ -0,0 +1,94 @@
+"""
+Stĺpcové spracovanie mesačných údajov search_volume endpointu.
+Kľúčové slovo, rok, mesiac a objem sa zbierajú do typových polí a z nich sa
+jedným vektorovým krokom zostaví DataFrame výsledku vrátane stĺpca Date.
+"""
+from typing import List, Any
+from array import array
+import numpy as np
+import pandas as pd
+
+# Stĺpce DataFrame s výsledkami jedného tasku (názov krajiny sa doplní vo fetcheri)
+SEARCH_VOLUME_COLUMNS = ["Keyword", "Date", "Search Volume", "Location Code"]
+
+# Hodnota, ktorou sa v poliach označí chýbajúci alebo neplatný údaj
+_MISSING = -1
+
+def empty_search_volume_frame() -> pd.DataFrame:
+    """Vráti prázdny DataFrame výsledkov so stĺpcami a typmi SEARCH_VOLUME_COLUMNS."""
+    return pd.DataFrame({
+        "Keyword": pd.Series(dtype=object),
+        "Date": pd.Series(dtype="datetime64[ns]"),
+        "Search Volume": pd.Series(dtype=np.int64),
+        "Location Code": pd.Series(dtype=np.int64),
+    })
+
+def _as_int(value: Any) -> int:
+    """Prevedie číselný údaj z odpovede na int; chýbajúci alebo neplatný údaj na _MISSING."""
+    if value is None or isinstance(value, (bool, str)):
+        return _MISSING
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        return _MISSING
+
+class SearchVolumeColumns:
+    """Zberač mesačných údajov jedného tasku v typových poliach.
+
+    Každé kľúčové slovo sa uloží raz a riadky naň odkazujú indexom, takže pri
+    tisíckach riadkov nevznikajú slovníky ani objekty Timestamp pre každý riadok.
+    """
+
+    def __init__(self):
+        self._keywords: List[str] = []
+        self._keyword_codes = array("q")
+        self._years = array("q")
+        self._months = array("q")
+        self._volumes = array("q")
+
+    def __len__(self) -> int:
+        return len(self._keyword_codes)
+
+    def add_keyword(self, keyword: str) -> int:
+        """Zaregistruje kľúčové slovo a vráti jeho index pre append()."""
+        self._keywords.append(keyword)
+        return len(self._keywords) - 1
+
+    def append(self, keyword_code: int, year: Any, month: Any, search_volume: Any) -> None:
+        """Pridá jeden mesiac kľúčového slova s indexom keyword_code."""
+        self._keyword_codes.append(keyword_code)
+        self._years.append(_as_int(year))
+        self._months.append(_as_int(month))
+        self._volumes.append(_as_int(search_volume))
+
+    def to_frame(self, location_code: int) -> pd.DataFrame:
+        """Zostaví DataFrame výsledkov tasku.
+
+        Riadky bez roka, s neplatným mesiacom alebo bez objemu sa vynechajú.
+        API vracia dáta pre celý mesiac, preto Date je vždy prvý deň mesiaca;
+        filtrovanie na presné obdobie date_from/date_to sa deje až vo fetcheri.
+
+        Args:
+            location_code: Kód lokácie, ku ktorej task patrí
+
+        Returns:
+            pd.DataFrame: Stĺpce SEARCH_VOLUME_COLUMNS
+        """
+        if not len(self):
+            return empty_search_volume_frame()
+
+        years = np.frombuffer(self._years, dtype=np.int64)
+        months = np.frombuffer(self._months, dtype=np.int64)
+        volumes = np.frombuffer(self._volumes, dtype=np.int64)
+        valid = (years > 0) & (months >= 1) & (months <= 12) & (volumes >= 0)
+        years, months = years[valid], months[valid]
+
+        # Počet mesiacov od roku 1970 sa priamo prevedie na dátum prvého dňa mesiaca
+        dates = ((years - 1970) * 12 + (months - 1)).astype("datetime64[M]").astype("datetime64[ns]")
+        keyword_codes = np.frombuffer(self._keyword_codes, dtype=np.int64)[valid]
+        return pd.DataFrame({
+            "Keyword": np.asarray(self._keywords, dtype=object)[keyword_codes],
+            "Date": dates,
+            "Search Volume": volumes[valid],
+            "Location Code": np.full(len(dates), location_code, dtype=np.int64),
+        })
@@ -0,0 +1,200 @@
+"""
+Zlúčenie rovnakých súbežne prebiehajúcich search volume taskov v rámci procesu (single-flight).
+
+Keď dvaja používatelia (alebo dve Streamlit session) naraz pýtajú rovnaké dáta, stale-while-revalidate
+cache fetcherov (utils/swr_cache.py) zatiaľ nemá výsledok a obe volania by išli do API. Register
+preto drží rozpracované tasky podľa kanonického kľúča (odtlačok prihlasovacích údajov, kľúčové
+slová, lokácia, jazyk, rozsah dátumov). Prvý volajúci task odošle, ďalší s rovnakými údajmi
+počkajú na jeho výsledok a nezaťažia API ani rate limit; session s iným heslom sa k cudziemu
+tasku nepripojí. Po dokončení sa task z registra odstráni, výsledky ďalej drží cache buniek
+(data_processing/fetch_planner.py) a SWR cache fetcherov.
+
+Register používa concurrent.futures.Future, takže na výsledok môže čakať synchrónny fetcher
+vo vlákne aj asynchrónny fetcher na spoločnom event loope. Ak vlastník task zruší (napr.
+rerun jeho stránky), čakajúci dostanú FlightAbandoned a task načítajú sami.
+"""
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+import asyncio
+import concurrent.futures
+import logging
+import threading
+
+from api_client.dataforseo_client import credentials_fingerprint
+from config import DataProcessingSettings
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+class FlightAbandoned(Exception):
+    """Vlastník operáciu zrušil skôr, ako ju dokončil; čakajúci ju musia vykonať sami."""
+
+def _is_cancellation(error: BaseException) -> bool:
+    """Zrušenie behu (asyncio, rerun alebo zastavenie Streamlit skriptu), nie chyba operácie."""
+    return isinstance(error, (asyncio.CancelledError, concurrent.futures.CancelledError)) or not isinstance(error, Exception)
+
+class SingleFlight:
+    """Register rozpracovaných operácií podľa kľúča."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, concurrent.futures.Future] = {}
+
+    def join(self, key: Hashable) -> Tuple[concurrent.futures.Future, bool]:
+        """Pripojí sa k rozpracovanej operácii, alebo ju založí.
+
+        Returns:
+            Tuple[concurrent.futures.Future, bool]: Dvojica (future s výsledkom, či volajúci
+                operáciu vykoná sám a po dokončení zavolá complete)
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future, False
+            future = self._in_flight[key] = concurrent.futures.Future()
+            return future, True
+
+    def complete(self, key: Hashable, result: Any = None, error: BaseException = None) -> None:
+        """Odovzdá výsledok (alebo výnimku) čakajúcim a odstráni operáciu z registra."""
+        with self._lock:
+            future = self._in_flight.pop(key)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
+
+_search_volume_flights = SingleFlight()
+
+def get_search_volume_flights() -> SingleFlight:
+    """Vráti register rozpracovaných search volume taskov zdieľaný v procese."""
+    return _search_volume_flights
+
+def search_volume_task_key(login: str, password: str, task: Dict[str, Any]) -> Tuple:
+    """Kanonický kľúč tasku: rovnaké dáta pre rovnaké prihlasovacie údaje bez ohľadu na poradie kľúčových slov."""
+    return (
+        credentials_fingerprint(login, password),
+        tuple(sorted(task["keywords"])),
+        task["location_code"],
+        task["language_code"],
+        task["date_from"],
+        task["date_to"],
+    )
+
+def _shared_outcome(outcome: Dict[str, Any]) -> Dict[str, Any]:
+    """Kópia výsledku pre ďalšieho čakajúceho, aby si volajúci navzájom nemenili DataFrame."""
+    return {**outcome, "results": outcome["results"].copy()}
+
+def _claim_tasks(login: str, password: str, tasks: List[Dict[str, Any]]) -> Tuple[List[Tuple[Hashable, concurrent.futures.Future, bool]], List[int]]:
+    flights = get_search_volume_flights()
+    claims = []
+    for task in tasks:
+        key = search_volume_task_key(login, password, task)
+        claims.append((key, *flights.join(key)))
+    own = [i for i, (_, _, is_owner) in enumerate(claims) if is_owner]
+    if len(own) < len(tasks):
+        logger.info(f"{len(tasks) - len(own)} z {len(tasks)} taskov už načítava iný beh, čakám na jeho výsledok")
+    return claims, own
+
+def _complete_tasks(claims, own: List[int], outcomes: List[Dict[str, Any]] = None, error: BaseException = None) -> None:
+    flights = get_search_volume_flights()
+    for position, index in enumerate(own):
+        key = claims[index][0]
+        if error is not None:
+            flights.complete(key, error=FlightAbandoned() if _is_cancellation(error) else error)
+        else:
+            flights.complete(key, outcomes[position])
+
+def fetch_tasks_single_flight(
+    login: str,
+    password: str,
+    tasks: List[Dict[str, Any]],
+    fetch: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """Synchrónne získa výsledky taskov, rovnaké rozpracované tasky nenačítava znova.
+
+    Args:
+        login: API prihlasovacie meno (súčasť odtlačku v kľúči)
+        password: API heslo (súčasť odtlačku v kľúči)
+        tasks: Tasky vytvorené pomocou build_search_volume_task
+        fetch: Funkcia, ktorá pre zoznam taskov vráti výsledky v rovnakom poradí
+
+    Returns:
+        List[Dict[str, Any]]: Výsledok pre každý task v poradí vstupu
+    """
+    if not DataProcessingSettings.get('SINGLE_FLIGHT', True):
+        return fetch(tasks)
+
+    claims, own = _claim_tasks(login, password, tasks)
+    outcomes: List[Any] = [None] * len(tasks)
+    if own:
+        try:
+            own_outcomes = fetch([tasks[i] for i in own])
+        except BaseException as e:
+            _complete_tasks(claims, own, error=e)
+            raise
+        _complete_tasks(claims, own, own_outcomes)
+        for index, outcome in zip(own, own_outcomes):
+            outcomes[index] = outcome
+    for index, (_, future, is_owner) in enumerate(claims):
+        if not is_owner:
+            try:
+                outcomes[index] = _shared_outcome(future.result())
+            except FlightAbandoned:
+                outcomes[index] = fetch_tasks_single_flight(login, password, [tasks[index]], fetch)[0]
+    return outcomes
+
+async def fetch_tasks_single_flight_async(
+    login: str,
+    password: str,
+    tasks: List[Dict[str, Any]],
+    fetch: Callable[[List[Dict[str, Any]]], Awaitable[List[Dict[str, Any]]]],
+    on_shared_outcome: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None
+) -> List[Dict[str, Any]]:
+    """Asynchrónny náprotivok fetch_tasks_single_flight.
+
+    Na výsledky taskov, ktoré načítava iný volajúci, sa čaká súbežne s vlastným načítaním.
+
+    Args:
+        login: API prihlasovacie meno (súčasť odtlačku v kľúči)
+        password: API heslo (súčasť odtlačku v kľúči)
+        tasks: Tasky vytvorené pomocou build_search_volume_task
+        fetch: Korutínová funkcia, ktorá pre zoznam taskov vráti výsledky v rovnakom poradí
+        on_shared_outcome: Voliteľná funkcia volaná s (task, výsledok) hneď, ako je hotový
+            task načítavaný iným volajúcim
+
+    Returns:
+        List[Dict[str, Any]]: Výsledok pre každý task v poradí vstupu
+    """
+    if not DataProcessingSettings.get('SINGLE_FLIGHT', True):
+        return await fetch(tasks)
+
+    claims, own = _claim_tasks(login, password, tasks)
+    outcomes: List[Any] = [None] * len(tasks)
+
+    async def follow(index: int, future: concurrent.futures.Future) -> None:
+        try:
+            outcomes[index] = _shared_outcome(await asyncio.wrap_future(future))
+        except FlightAbandoned:
+            outcomes[index] = (await fetch_tasks_single_flight_async(login, password, [tasks[index]], fetch))[0]
+        if on_shared_outcome:
+            on_shared_outcome(tasks[index], outcomes[index])
+
+    followers = [asyncio.ensure_future(follow(index, future)) for index, (_, future, is_owner) in enumerate(claims) if not is_owner]
+    try:
+        if own:
+            try:
+                own_outcomes = await fetch([tasks[i] for i in own])
+            except BaseException as e:
+                _complete_tasks(claims, own, error=e)
+                raise
+            _complete_tasks(claims, own, own_outcomes)
+            for index, outcome in zip(own, own_outcomes):
+                outcomes[index] = outcome
+        await asyncio.gather(*followers)
+    finally:
+        for follower in followers:
+            follower.cancel()
+    return outcomes
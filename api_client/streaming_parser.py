@@ -0,0 +1,142 @@
+"""
+Prúdové (inkrementálne) spracovanie JSON odpovede search_volume endpointu.
+Položky result[].monthly_searches[] sa čítajú priebežne, ako prichádza telo odpovede,
+bez toho, aby sa celá odpoveď načítala do Python slovníkov. Vyžaduje voliteľný balík
+ijson; ak nie je nainštalovaný, klient použije bežné spracovanie cez json.
+"""
+from typing import List, Dict, Tuple, Any, Optional, Iterable
+import json
+import logging
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - závisí od prostredia
+    ijson = None
+
+from api_client.search_volume_columns import SearchVolumeColumns
+from config import DataProcessingSettings
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+# Chyby, ktoré znamenajú poškodenú alebo neúplnú JSON odpoveď
+JSON_PARSE_ERRORS: Tuple[type, ...] = (json.JSONDecodeError,) + ((ijson.JSONError,) if ijson else ())
+
+# Veľkosť bloku, po ktorom sa číta telo odpovede
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def is_streaming_parse_enabled() -> bool:
+    """Zistí, či sa má odpoveď search_volume endpointu spracovať prúdovo."""
+    return ijson is not None and bool(DataProcessingSettings.get('STREAMING_JSON_PARSE', True))
+
+class SearchVolumeStreamParser:
+    """Skladá tasky odpovede search_volume endpointu z prúdu udalostí ijson.
+
+    Z každého tasku si ponecháva len status, tag a mesačné údaje v typových poliach
+    (SearchVolumeColumns v kľúči 'monthly_columns'); ostatné polia odpovede sa
+    zahadzujú hneď pri čítaní.
+    Mesiace položky, ktorej keyword v odpovedi ešte neprišiel, sa podržia len do
+    konca tejto položky.
+    """
+
+    _TASK = "tasks.item"
+    _ITEM = "tasks.item.result.item"
+    _MONTH = "tasks.item.result.item.monthly_searches.item"
+    _MONTH_FIELDS = {"year": 0, "month": 1, "search_volume": 2}
+
+    def __init__(self):
+        self._response: Dict[str, Any] = {"status_code": None, "status_message": None}
+        self._tasks: Optional[List[Dict[str, Any]]] = None
+        self._task: Optional[Dict[str, Any]] = None
+        self._keyword_code: Optional[int] = None
+        self._pending_months: List[List[Any]] = []
+        self._month: Optional[List[Any]] = None
+
+    def feed(self, prefix: str, event: str, value: Any) -> None:
+        """Spracuje jednu udalosť (prefix, event, value) z ijson.parse."""
+        if prefix.startswith(self._MONTH):
+            if prefix == self._MONTH:
+                if event == "start_map":
+                    self._month = [None, None, None]
+                elif event == "end_map" and self._month is not None:
+                    if self._keyword_code is not None:
+                        self._task["monthly_columns"].append(self._keyword_code, *self._month)
+                    else:
+                        self._pending_months.append(self._month)
+                    self._month = None
+            elif self._month is not None:
+                field_index = self._MONTH_FIELDS.get(prefix[len(self._MONTH) + 1:])
+                if field_index is not None:
+                    self._month[field_index] = value
+        elif prefix == self._ITEM:
+            if event in ("start_map", "end_map"):
+                self._keyword_code = None
+                self._pending_months = []
+        elif prefix == self._ITEM + ".keyword":
+            if self._task is not None and isinstance(value, str) and value:
+                columns = self._task["monthly_columns"]
+                self._keyword_code = columns.add_keyword(value)
+                for month in self._pending_months:
+                    columns.append(self._keyword_code, *month)
+                self._pending_months = []
+        elif prefix == self._TASK:
+            if event == "start_map":
+                self._task = {"status_code": None, "status_message": None, "data": {}, "monthly_columns": SearchVolumeColumns()}
+            elif event == "end_map" and self._task is not None:
+                self._tasks.append(self._task)
+                self._task = None
+        elif prefix == self._TASK + ".status_code":
+            self._task["status_code"] = value
+        elif prefix == self._TASK + ".status_message":
+            self._task["status_message"] = value
+        elif prefix == self._TASK + ".data.tag":
+            self._task["data"]["tag"] = value
+        elif prefix == "tasks" and event == "start_array":
+            self._tasks = []
+        elif prefix in ("status_code", "status_message"):
+            self._response[prefix] = value
+
+    def response_data(self) -> Dict[str, Any]:
+        """Vráti zostavenú odpoveď v tvare, ktorý očakáva _split_search_volume_response."""
+        return {**self._response, "tasks": self._tasks}
+
+class _ChunkReader:
+    """Súborový objekt nad iterátorom blokov bajtov (pre ijson.parse)."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+
+    def read(self, size: int = -1) -> bytes:
+        # ijson volá read(0), aby zistil typ prúdu; vtedy nesmieme spotrebovať blok
+        if size == 0:
+            return b""
+        # Prázdny blok by ijson považoval za koniec prúdu
+        return next((chunk for chunk in self._chunks if chunk), b"")
+
+def parse_search_volume_stream(chunks: Iterable[bytes]) -> Dict[str, Any]:
+    """Prúdovo spracuje telo odpovede zadané ako iterátor blokov bajtov.
+
+    Args:
+        chunks: Bloky tela odpovede (napr. response.iter_content() z requests)
+
+    Returns:
+        Dict[str, Any]: Odpoveď so statusom a zoznamom taskov s kľúčom 'monthly_columns'
+    """
+    parser = SearchVolumeStreamParser()
+    for prefix, event, value in ijson.parse(_ChunkReader(chunks)):
+        parser.feed(prefix, event, value)
+    return parser.response_data()
+
+async def parse_search_volume_stream_async(stream: Any) -> Dict[str, Any]:
+    """Prúdovo spracuje telo odpovede z asynchrónneho prúdu.
+
+    Args:
+        stream: Objekt s metódou `async read(n)` (napr. response.content z aiohttp)
+
+    Returns:
+        Dict[str, Any]: Odpoveď so statusom a zoznamom taskov s kľúčom 'monthly_columns'
+    """
+    parser = SearchVolumeStreamParser()
+    async for prefix, event, value in ijson.parse_async(stream, buf_size=STREAM_CHUNK_SIZE):
+        parser.feed(prefix, event, value)
+    return parser.response_data()
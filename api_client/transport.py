@@ -0,0 +1,400 @@
+"""
+Transportná vrstva pre DataForSEO API s nahrávaním a prehrávaním odpovedí.
+
+V režime 'record' sa skutočné odpovede API (search volume, lokácie, jazyky aj frontové
+endpointy) ukladajú do komprimovanej kazety: gzip súbor s jedným JSON záznamom na riadok.
+V režime 'replay' sa odpovede čítajú z kazety bez akéhokoľvek sieťového spojenia,
+voliteľne s pôvodne nameranou latenciou. Celé spracovanie (parsovanie, DataFrame,
+add_period_column, grafy) sa tak dá opakovane profilovať offline na reálnych dátach.
+V predvolenom režime 'network' sa volania nemenia.
+
+Záznamy sa párujú podľa HTTP metódy, cesty URL a tela requestu (bez hostiteľa a hlavičiek),
+takže kazetu nahranú proti produkčnému API možno prehrať aj s inou základnou adresou.
+Autorizačné hlavičky sa do kazety neukladajú. Opakované rovnaké requesty (napr. kontroly
+tasks_ready) sa prehrajú v poradí nahrávania; po ich vyčerpaní sa opakuje posledná odpoveď.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import timedelta
+from http import HTTPStatus
+from urllib.parse import urlsplit
+import asyncio
+import base64
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+
+import aiohttp
+import requests
+from multidict import CIMultiDict, CIMultiDictProxy
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from yarl import URL
+
+from config import TransportSettings
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+TRANSPORT_MODES = ("network", "record", "replay")
+
+# Hlavičky odpovede, ktoré klient používa a preto sa ukladajú do kazety
+RECORDED_HEADERS = ("Content-Type", "Retry-After")
+
+class CassetteMissError(requests.exceptions.RequestException, aiohttp.ClientError):
+    """Kazeta neobsahuje odpoveď na požadovaný request."""
+
+def get_transport_mode() -> str:
+    """Vráti aktuálny režim transportu ('network', 'record' alebo 'replay')."""
+    mode = TransportSettings.MODE
+    if mode not in TRANSPORT_MODES:
+        logger.warning(f"Neznámy režim transportu '{mode}', používa sa 'network'.")
+        return "network"
+    return mode
+
+def _interaction_key(method: str, url: Any, payload: Any) -> Tuple[str, str]:
+    """Vytvorí kľúč záznamu z metódy, cesty URL a tela requestu.
+
+    Returns:
+        Tuple[str, str]: Dvojica (kľúč, cieľ requestu v tvare 'METÓDA /cesta?query')
+    """
+    parts = urlsplit(str(url))
+    target = f"{method.upper()} {parts.path}" + (f"?{parts.query}" if parts.query else "")
+    body = "" if payload is None else json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(f"{target}\n{body}".encode("utf-8")).hexdigest(), target
+
+def _encode_body(content: bytes) -> Dict[str, str]:
+    """Uloží telo odpovede ako text, alebo ako base64, ak nie je v UTF-8."""
+    try:
+        return {"body": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_base64": base64.b64encode(content).decode("ascii")}
+
+def _decode_body(interaction: Dict[str, Any]) -> bytes:
+    if "body_base64" in interaction:
+        return base64.b64decode(interaction["body_base64"])
+    return interaction.get("body", "").encode("utf-8")
+
+class Cassette:
+    """Kazeta s nahratými odpoveďami API uložená v komprimovanom súbore."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self._positions: Dict[str, int] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with gzip.open(self.path, "rt", encoding="utf-8") as cassette_file:
+            for line in cassette_file:
+                if line.strip():
+                    self._add(json.loads(line))
+        logger.info(f"Načítaná kazeta {self.path} ({len(self)} záznamov)")
+
+    def _add(self, interaction: Dict[str, Any]) -> None:
+        interaction["content"] = _decode_body(interaction)
+        self._interactions.setdefault(interaction["key"], []).append(interaction)
+
+    def __len__(self) -> int:
+        return sum(len(interactions) for interactions in self._interactions.values())
+
+    def record(
+        self,
+        method: str,
+        url: Any,
+        payload: Any,
+        status: int,
+        headers: Any,
+        content: bytes,
+        elapsed: float
+    ) -> Dict[str, Any]:
+        """Pridá odpoveď do kazety a hneď ju zapíše na disk.
+
+        Args:
+            method: HTTP metóda
+            url: URL requestu
+            payload: JSON telo requestu alebo None
+            status: HTTP status odpovede
+            headers: Hlavičky odpovede
+            content: Dekomprimované telo odpovede
+            elapsed: Latencia odpovede v sekundách (od odoslania po prečítanie tela)
+
+        Returns:
+            Dict[str, Any]: Uložený záznam
+        """
+        key, target = _interaction_key(method, url, payload)
+        interaction = {
+            "key": key,
+            "request": target,
+            "status": status,
+            "headers": {name: headers[name] for name in RECORDED_HEADERS if name in headers},
+            "elapsed": round(elapsed, 6),
+            **_encode_body(content),
+        }
+        line = json.dumps(interaction, ensure_ascii=False) + "\n"
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Každý zápis je samostatný gzip člen, súbor tak zostane čitateľný aj po prerušení
+            with gzip.open(self.path, "at", encoding="utf-8") as cassette_file:
+                cassette_file.write(line)
+            self._add(interaction)
+        return interaction
+
+    def play(self, method: str, url: Any, payload: Any) -> Optional[Dict[str, Any]]:
+        """Vráti ďalší nahratý záznam pre request alebo None, ak ho kazeta neobsahuje."""
+        key, _ = _interaction_key(method, url, payload)
+        with self._lock:
+            interactions = self._interactions.get(key)
+            if not interactions:
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return interactions[min(position, len(interactions) - 1)]
+
+    def interactions(self) -> List[Dict[str, Any]]:
+        """Všetky záznamy kazety (napr. pre meranie dekódovania nahratých odpovedí)."""
+        with self._lock:
+            return [interaction for interactions in self._interactions.values() for interaction in interactions]
+
+    def rewind(self) -> None:
+        """Prehrávanie začne opäť od prvého záznamu každého requestu."""
+        with self._lock:
+            self._positions.clear()
+
+_cassettes: Dict[str, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+def get_cassette(path: Optional[str] = None) -> Cassette:
+    """Vráti kazetu pre zadanú cestu (predvolene TransportSettings.CASSETTE_PATH), zdieľanú v procese."""
+    path = os.path.abspath(path or TransportSettings.CASSETTE_PATH)
+    with _cassettes_lock:
+        cassette = _cassettes.get(path)
+        if cassette is None:
+            cassette = _cassettes[path] = Cassette(path)
+        return cassette
+
+def reset_cassettes() -> None:
+    """Zabudne načítané kazety; pri ďalšom použití sa načítajú znova zo súboru."""
+    with _cassettes_lock:
+        _cassettes.clear()
+
+def _missing_interaction_error(cassette: Cassette, method: str, url: Any) -> CassetteMissError:
+    _, target = _interaction_key(method, url, None)
+    return CassetteMissError(f"Kazeta {cassette.path} neobsahuje odpoveď na {target}")
+
+def _reason(status: int) -> str:
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return ""
+
+class _RecordedStream:
+    """Telo nahratej odpovede s rozhraním read(n) ako aiohttp.StreamReader."""
+
+    def __init__(self, content: bytes):
+        self._buffer = io.BytesIO(content)
+
+    async def read(self, n: int = -1) -> bytes:
+        return self._buffer.read(n)
+
+class CassetteResponse:
+    """Odpoveď z kazety s rozhraním aiohttp.ClientResponse, ktoré používa klient."""
+
+    def __init__(self, method: str, url: Any, interaction: Dict[str, Any]):
+        self.method = method
+        self.url = URL(str(url))
+        self.status = interaction["status"]
+        self.reason = _reason(self.status)
+        self.headers = CIMultiDictProxy(CIMultiDict(interaction["headers"]))
+        self._body = interaction["content"]
+        self.content = _RecordedStream(self._body)
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: str = "utf-8") -> str:
+        return self._body.decode(encoding)
+
+    async def json(self, **kwargs) -> Any:
+        return json.loads(self._body)
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            request_info = aiohttp.RequestInfo(self.url, self.method, CIMultiDictProxy(CIMultiDict()), self.url)
+            raise aiohttp.ClientResponseError(
+                request_info, (), status=self.status, message=self.reason, headers=self.headers
+            )
+
+    async def __aenter__(self) -> "CassetteResponse":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+class _CassetteRequest:
+    """Umožní použiť request ako 'async with session.post(...) as response'."""
+
+    def __init__(self, coro):
+        self._coro = coro
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self) -> CassetteResponse:
+        return await self._coro
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+class CassetteClientSession:
+    """Náhrada aiohttp.ClientSession, ktorá odpovede nahráva alebo prehráva z kazety.
+
+    V režime 'record' deleguje requesty na skutočnú session a odpoveď pred vrátením
+    uloží do kazety. V režime 'replay' sieť nepoužíva vôbec.
+    """
+
+    def __init__(self, mode: str, cassette: Cassette, session: Optional[aiohttp.ClientSession] = None):
+        self.mode = mode
+        self.cassette = cassette
+        self.session = session
+
+    @property
+    def closed(self) -> bool:
+        return self.session.closed if self.session is not None else False
+
+    def request(self, method: str, url: Any, **kwargs) -> _CassetteRequest:
+        if self.mode == "replay":
+            return _CassetteRequest(self._replay(method, url, kwargs.get("json")))
+        return _CassetteRequest(self._record(method, url, **kwargs))
+
+    def get(self, url: Any, **kwargs) -> _CassetteRequest:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: Any, **kwargs) -> _CassetteRequest:
+        return self.request("POST", url, **kwargs)
+
+    async def _replay(self, method: str, url: Any, payload: Any) -> CassetteResponse:
+        interaction = self.cassette.play(method, url, payload)
+        if interaction is None:
+            raise _missing_interaction_error(self.cassette, method, url)
+        if TransportSettings.REPLAY_LATENCY:
+            await asyncio.sleep(interaction["elapsed"])
+        return CassetteResponse(method, url, interaction)
+
+    async def _record(self, method: str, url: Any, **kwargs) -> CassetteResponse:
+        started = time.perf_counter()
+        async with self.session.request(method, url, **kwargs) as response:
+            content = await response.read()
+            status, headers = response.status, response.headers
+        interaction = self.cassette.record(
+            method, url, kwargs.get("json"), status, headers, content, time.perf_counter() - started
+        )
+        return CassetteResponse(method, url, interaction)
+
+def wrap_client_session(session: aiohttp.ClientSession) -> Any:
+    """Obalí aiohttp session podľa režimu transportu.
+
+    Args:
+        session: Skutočná aiohttp ClientSession
+
+    Returns:
+        Any: Pôvodná session v režime 'network', inak CassetteClientSession
+    """
+    mode = get_transport_mode()
+    if mode == "network" or isinstance(session, CassetteClientSession):
+        return session
+    return CassetteClientSession(mode, get_cassette(), session if mode == "record" else None)
+
+def _request_payload(body: Any) -> Any:
+    """Získa JSON telo z pripraveného requests requestu."""
+    if body is None:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body.decode("utf-8", "replace") if isinstance(body, bytes) else body
+
+def _build_requests_response(request: requests.PreparedRequest, interaction: Dict[str, Any]) -> requests.Response:
+    """Zostaví requests.Response z nahratého záznamu."""
+    content = interaction["content"]
+    response = requests.Response()
+    response.status_code = interaction["status"]
+    response.reason = _reason(response.status_code)
+    response.headers = CaseInsensitiveDict(interaction["headers"])
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+    response.url = request.url
+    response.request = request
+    response.elapsed = timedelta(seconds=interaction["elapsed"])
+    response.raw = io.BytesIO(content)
+    # Telo je už celé načítané, iter_content ho vráti po častiach z pamäte
+    response._content = content
+    response._content_consumed = True
+    return response
+
+class CassetteAdapter(BaseAdapter):
+    """requests adapter, ktorý odpovede nahráva alebo prehráva z kazety.
+
+    V režime 'record' deleguje na zdieľaný HTTPAdapter s connection poolom.
+    """
+
+    def __init__(self, mode: str, cassette: Cassette, adapter: BaseAdapter):
+        super().__init__()
+        self.mode = mode
+        self.cassette = cassette
+        self.adapter = adapter
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        payload = _request_payload(request.body)
+        if self.mode == "replay":
+            interaction = self.cassette.play(request.method, request.url, payload)
+            if interaction is None:
+                raise _missing_interaction_error(self.cassette, request.method, request.url)
+            if TransportSettings.REPLAY_LATENCY:
+                time.sleep(interaction["elapsed"])
+            return _build_requests_response(request, interaction)
+
+        started = time.perf_counter()
+        response = self.adapter.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        content = response.content
+        self.cassette.record(
+            request.method, request.url, payload, response.status_code, response.headers,
+            content, time.perf_counter() - started
+        )
+        return response
+
+    def close(self) -> None:
+        # Zdieľaný adapter zatvára http_session.close_http_sessions
+        pass
+
+_adapters: Dict[Tuple[str, str, int], CassetteAdapter] = {}
+_adapters_lock = threading.Lock()
+
+def wrap_http_adapter(adapter: BaseAdapter) -> BaseAdapter:
+    """Obalí requests adapter podľa režimu transportu.
+
+    Args:
+        adapter: Zdieľaný HTTPAdapter
+
+    Returns:
+        BaseAdapter: Pôvodný adapter v režime 'network', inak CassetteAdapter (rovnaký objekt
+            pre rovnaký režim a kazetu, aby sa session nevytvárali znova)
+    """
+    mode = get_transport_mode()
+    if mode == "network":
+        return adapter
+    cassette = get_cassette()
+    key = (mode, cassette.path, id(adapter))
+    with _adapters_lock:
+        wrapped = _adapters.get(key)
+        if wrapped is None or wrapped.cassette is not cassette or wrapped.adapter is not adapter:
+            wrapped = _adapters[key] = CassetteAdapter(mode, cassette, adapter)
+        return wrapped
@@ -4,14 +4,24 @@ Obsahuje nastavenia, konštanty a pomocné funkcie pre celú aplikáciu.
 """
 from typing import Tuple, Optional, Dict, List, Any
 from datetime import date
+import os
 import streamlit as st
 
 # API Endpointy
 class ApiEndpoints:
-    """API endpointy pre DataForSEO."""
-    SEARCH_VOLUME_LIVE = "https://api.dataforseo.com/v3/keywords_data/google_ads/search_volume/live"
-    LOCATIONS = "https://api.dataforseo.com/v3/keywords_data/google_ads/locations"
-    LANGUAGES = "https://api.dataforseo.com/v3/keywords_data/google_ads/languages"
+    """API endpointy pre DataForSEO.
+    
+    Základnú adresu API možno prepísať premennou prostredia DATAFORSEO_API_BASE_URL,
+    napr. na lokálny simulátor (tools/dataforseo_simulator.py).
+    """
+    BASE_URL = os.environ.get("DATAFORSEO_API_BASE_URL", "https://api.dataforseo.com").rstrip("/")
+    SEARCH_VOLUME_LIVE = f"{BASE_URL}/v3/keywords_data/google_ads/search_volume/live"
+    LOCATIONS = f"{BASE_URL}/v3/keywords_data/google_ads/locations"
+    LANGUAGES = f"{BASE_URL}/v3/keywords_data/google_ads/languages"
+    # Štandardný (frontový) režim: tasky sa odošlú hromadne a výsledky sa vyzdvihnú, keď sú hotové
+    SEARCH_VOLUME_TASK_POST = f"{BASE_URL}/v3/keywords_data/google_ads/search_volume/task_post"
+    SEARCH_VOLUME_TASKS_READY = f"{BASE_URL}/v3/keywords_data/google_ads/search_volume/tasks_ready"
+    SEARCH_VOLUME_TASK_GET = f"{BASE_URL}/v3/keywords_data/google_ads/search_volume/task_get/{{task_id}}"
 
 # Prednastavené kľúčové slová
 DEFAULT_KEYWORDS = "isadore\ncastelli\nrapha\nmaap\npas normal studios\nvan rysel"
@@ -26,20 +36,106 @@ class CacheSettings:
     LOCATIONS_TTL = 3600  # 1 hodina
     LANGUAGES_TTL = 3600  # 1 hodina
     SEARCH_DATA_TTL = 3600  # 1 hodina
+    # Po uplynutí TTL sa záznam ešte takto dlho vráti okamžite a obnoví na pozadí (stale-while-revalidate)
+    LOCATIONS_MAX_STALE = 7 * 24 * 3600  # zoznam lokácií sa mení zriedka
+    LANGUAGES_MAX_STALE = 7 * 24 * 3600
+    SEARCH_DATA_MAX_STALE = 24 * 3600
+    SEARCH_DATA_MAX_ENTRIES = 200  # maximálny počet cachovaných výsledkov search volume fetcherov
+    SEARCH_CELLS_TTL = 3600  # 1 hodina, platnosť jednej bunky (kľúčové slovo, lokácia, jazyk, mesiac) v cache plánovača
+    SEARCH_CELLS_MAX = 2_000_000  # maximálny počet buniek v cache plánovača pre celý proces
+    PERSISTENT_CACHE_ENABLED = True  # bunky cache plánovača sa ukladajú aj na disk (SQLite) a prežijú reštart aplikácie
+    PERSISTENT_CACHE_DIR = os.environ.get("SOS_CACHE_DIR", ".cache")  # adresár perzistentnej cache, spoločný pre všetky worker procesy
+    PERSISTENT_CACHE_MAX_MB = 512  # maximálna veľkosť perzistentnej cache, nad ňou sa odstránia najstaršie bunky
 
 # Nastavenia spracovávania dát
 class DataProcessingSettings:
     """Nastavenia pre spracovanie dát."""
     API_REQUEST_TIMEOUT = 60  # sekundy pre timeout API requestov
-    API_RATE_LIMIT_SLEEP = 5.5  # sekundy prestávky medzi API volaniami
-    ASYNC_BATCH_SIZE = 5  # počet súbežných API volaní v jednej dávke
-    ASYNC_BATCH_PAUSE = 3  # pauza medzi dávkami API volaní v sekundách
+    API_RATE_LIMIT_PER_MINUTE = 12  # povolený počet search volume volaní za minútu pre celý proces
+    API_RATE_LIMIT_BURST = 3  # počet volaní, ktoré možno odoslať naraz po nečinnosti
+    ASYNC_PACK_TASKS = True  # zabalí všetky krajiny jedného behu do čo najmenšieho počtu POST requestov
+    MAX_TASKS_PER_POST = 100  # maximálny počet taskov v tele jedného POST requestu (limit DataForSEO)
+    MAX_KEYWORDS_PER_TASK = 1000  # maximálny počet kľúčových slov v jednom tasku (limit DataForSEO)
+    SHARD_MAX_WORKERS = 4  # počet súbežne načítavaných častí kľúčových slov v synchrónnom režime
+    SEARCH_VOLUME_FETCH_MODE = "live"  # "live" (okamžitá odpoveď) alebo "standard" (lacnejšie tasky cez frontu, pre veľké joby)
+    STREAMING_JSON_PARSE = True  # číta mesačné údaje z odpovede priebežne (vyžaduje balík ijson), bez načítania celej odpovede
+    FAST_JSON = True  # dekóduje JSON odpovede cez orjson, ak je nainštalovaný (inak štandardný json)
+    SINGLE_FLIGHT = True  # rovnaké súbežne prebiehajúce tasky (napr. z dvoch session) sa odošlú do API len raz
     
     @classmethod
     def get(cls, name, default=None):
         """Získa hodnotu nastavenia podľa názvu alebo vráti predvolenú hodnotu."""
         return getattr(cls, name, default)
 
+# Nastavenia adaptívneho počtu súbežných API volaní
+class ConcurrencySettings:
+    """Nastavenia AIMD okna súbežných search volume volaní (api_client/concurrency.py)."""
+    INITIAL_WINDOW = 4  # počet súbežných volaní po spustení procesu
+    MIN_WINDOW = 1  # najmenšie okno, pod ktoré sa pri preťažení nezmenší
+    MAX_WINDOW = 16  # najväčšie okno, nad ktoré nerastie ani pri rýchlych odpovediach
+    INCREASE = 1.0  # zväčšenie okna za každé okno úspešných volaní
+    DECREASE = 0.5  # násobok okna pri dočasnej chybe API (50301, 429, 5xx) alebo skoku latencie
+    LATENCY_SPIKE_FACTOR = 2.0  # latencia nad týmto násobkom kĺzavého priemeru sa berie ako preťaženie
+    LATENCY_SMOOTHING = 0.2  # váha novej vzorky v kĺzavom priemere latencie
+
+# Nastavenia duplicitných (hedged) API volaní
+class HedgeSettings:
+    """Nastavenia hedgingu pomalých search volume volaní (api_client/hedging.py)."""
+    ENABLED = False  # ak volanie neodpovie do percentilu latencie, pošle sa duplicitné a použije sa prvá odpoveď
+    PERCENTILE = 95  # percentil latencie nedávnych volaní rovnakej veľkosti, po ktorom sa pošle duplicitné volanie
+    LATENCY_WINDOW = 200  # počet posledných volaní v každej skupine veľkosti, z ktorých sa počíta percentil
+    MIN_SAMPLES = 20  # najmenší počet vzoriek latencie v skupine, kým sa začne hedgovať
+    MIN_DELAY = 0.5  # sekundy, duplicitné volanie sa nepošle skôr
+    MAX_TASKS = 10  # volania s viac taskami sa neduplikujú (DataForSEO účtuje každý task)
+    BUDGET_RATIO = 0.05  # podiel odoslaných taskov, ktoré možno zduplikovať (5 %)
+    MAX_BUDGET = 10  # najviac naakumulovaných duplicitných taskov po období bez hedgingu
+
+# Nastavenia opakovania API volaní
+class RetrySettings:
+    """Nastavenia opakovania taskov pri dočasných chybách API."""
+    MAX_ATTEMPTS = 4  # maximálny počet pokusov pre jeden task (vrátane prvého)
+    BASE_DELAY = 1.0  # sekundy, základ exponenciálneho backoffu
+    MAX_DELAY = 30.0  # sekundy, maximálne čakanie pred ďalším pokusom
+    RETRYABLE_HTTP_STATUSES = (429, 500, 502, 503, 504)
+    RETRYABLE_TASK_STATUS_CODES = (40202, 50000, 50301)  # rate limit, interná chyba, "Too many requests"
+
+# Nastavenia štandardného (frontového) režimu search volume endpointu
+class QueuedTaskSettings:
+    """Nastavenia odosielania taskov cez task_post a ich vyzdvihnutia cez tasks_ready / task_get."""
+    POLL_INITIAL_INTERVAL = 5.0  # sekundy do prvej kontroly tasks_ready a najkratší interval kontroly
+    POLL_MAX_INTERVAL = 60.0  # sekundy, najdlhší interval medzi kontrolami tasks_ready
+    POLL_BACKOFF_FACTOR = 1.5  # násobok intervalu, keď kontrola nenájde žiadny nový hotový task
+    QUEUE_TIMEOUT = 1800  # sekundy, ako dlho najviac čakáme na dokončenie taskov
+    DOWNLOAD_CONCURRENCY = 10  # počet súbežne sťahovaných výsledkov (task_get)
+
+# Nastavenia jobov načítania dát na pozadí
+class FetchJobSettings:
+    """Nastavenia jobov, ktoré načítavajú dáta mimo behu Streamlit skriptu (data_processing/fetch_jobs.py)."""
+    MAX_WORKERS = 4  # počet súbežne bežiacich jobov v procese
+    POLL_INTERVAL = 0.5  # sekundy medzi prekresleniami stránky, kým job beží
+    ABANDON_AFTER = 30  # sekundy bez kontroly stavu (zatvorená session), po ktorých sa job zruší
+    KEEP_FINISHED = 600  # sekundy, počas ktorých je dokončený job k dispozícii ďalším session
+
+# Nastavenia zdieľaných HTTP spojení
+class HttpPoolSettings:
+    """Nastavenia connection poolu a keep-alive pre spojenia s DataForSEO API."""
+    POOL_SIZE = 20  # maximálny počet otvorených spojení v poole
+    POOL_SIZE_PER_HOST = 10  # maximálny počet súbežných spojení na jeden host
+    SYNC_POOL_CONNECTIONS = 4  # počet hostov, pre ktoré synchrónny klient drží samostatný pool
+    KEEPALIVE_TIMEOUT = 60  # sekundy, po ktoré sa nečinné spojenie drží otvorené
+    DNS_CACHE_TTL = 300  # sekundy, po ktoré sa cachuje DNS záznam
+
+# Nastavenia nahrávania a prehrávania odpovedí API
+class TransportSettings:
+    """Nastavenia transportnej vrstvy pre nahrávanie a prehrávanie odpovedí DataForSEO API.
+
+    Režim a kazetu možno nastaviť premennými prostredia DATAFORSEO_TRANSPORT,
+    DATAFORSEO_CASSETTE a DATAFORSEO_REPLAY_LATENCY.
+    """
+    MODE = os.environ.get("DATAFORSEO_TRANSPORT", "network")  # "network" (bez zmeny), "record" alebo "replay"
+    CASSETTE_PATH = os.environ.get("DATAFORSEO_CASSETTE", "cassettes/dataforseo.jsonl.gz")  # komprimovaná kazeta s odpoveďami
+    REPLAY_LATENCY = os.environ.get("DATAFORSEO_REPLAY_LATENCY", "0") == "1"  # pri prehrávaní počká pôvodne nameranú latenciu
+
 # Informácie o aplikácii
 class AppInfo:
     """Informácie o aplikácii."""
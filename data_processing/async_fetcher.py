@@ -4,201 +4,458 @@ Implementation of asynchronous fetcher for multi-country search volume data.
 This module provides a significantly faster alternative to the standard fetcher by making 
 API calls in parallel using asyncio and aiohttp. The implementation:
 
-1. Groups API calls into batches to respect rate limits
-2. Makes concurrent API requests within each batch
-3. Pauses between batches to avoid API rate limiting
-4. Properly handles errors and combines results
+1. Packs the tasks of all countries into as few multi-task POST requests as the API allows
+   (or, with ASYNC_PACK_TASKS disabled, sends one single-task API call per country);
+   with SEARCH_VOLUME_FETCH_MODE = "standard" the tasks go through the cheaper queued
+   task_post / tasks_ready / task_get endpoints instead of the live one
+2. Dispatches the API requests concurrently, each as soon as the shared process-wide
+   token-bucket rate limiter has a free token
+3. Retries only the tasks that failed with a transient error (backoff with jitter)
+4. Awaits identical tasks that another session is already fetching instead of sending
+   them again (single-flight, see api_client/single_flight.py)
+5. Requests only the keyword/location/month cells missing from the process-wide cell
+   cache and assembles the result from the cache (see data_processing/fetch_planner.py)
+6. Properly handles errors and combines results
+
+Callers that render results progressively use stream_country_results_async (or its
+script-thread bridge MultiCountryFetchStream), which yields every country as soon as
+all of its tasks are done, in completion order.
+
+A run can fetch every country in several languages (a language per country, a set of
+languages for all countries, or both, see fetch_targets); every (country, language) pair
+is a separate result and the combined DataFrame carries a Language column.
 
 The async implementation can be 2-5x faster than the sequential version,
 depending on the number of countries being analyzed.
 """
 import asyncio
-import aiohttp
+import queue
+import threading
 import pandas as pd
-import streamlit as st
-import time
-from typing import List, Dict, Tuple, Any, Optional
+from typing import AsyncIterator, Callable, List, Dict, Tuple, Any, Optional
 from datetime import datetime
 import logging
 
-from api_client.dataforseo_client import get_search_volume_async
-from config import CacheSettings, DataProcessingSettings
+from api_client.dataforseo_client import get_search_volume_multi_async, verify_credentials
+from api_client.http_session import shared_client_session, submit_http_coroutine
+from api_client.queued_client import get_search_volume_queued_async
+from api_client.single_flight import fetch_tasks_single_flight_async
+from config import DataProcessingSettings
+from data_processing.fetch_planner import (
+    FetchPlan, LanguageSelection, collect_location_outcomes, get_search_volume_cell_cache, plan_search_volume_fetch, task_target
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# This async function itself is not cached - the wrapper function will handle caching
-async def _fetch_multi_country_search_volume_data_async_internal(
+class FetchProgress:
+    """
+    Thread-safe progress of a running fetch.
+    
+    The fetch coroutine runs on the shared background event loop thread, where Streamlit
+    elements cannot be updated. It records its progress here and the Streamlit script
+    thread renders it while waiting for the result.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fraction = 0.0
+        self._message: Optional[str] = None
+        self._level = "info"
+    
+    def update(self, fraction: Optional[float] = None, message: Optional[str] = None, level: str = "info") -> None:
+        """Records the completed fraction and/or a status message ('info' or 'error')."""
+        with self._lock:
+            if fraction is not None:
+                self._fraction = min(1.0, max(0.0, fraction))
+            if message is not None:
+                self._message = message
+                self._level = level
+    
+    def snapshot(self) -> Tuple[float, Optional[str], str]:
+        """Returns (fraction, message, level)."""
+        with self._lock:
+            return self._fraction, self._message, self._level
+
+async def _fetch_task_outcomes_async(
     login: str,
     password: str,
-    kw_list_tuple: Tuple[str, ...],
-    selected_location_codes_tuple: Tuple[int, ...],
-    lang_code: str,
-    date_from: datetime,
-    date_to: datetime,
-    all_location_options_tuple: Tuple[Tuple[str, int], ...]
-) -> Tuple[pd.DataFrame, Optional[str]]:
+    tasks: List[Dict[str, Any]],
+    progress: FetchProgress,
+    on_outcome: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None
+) -> List[Dict[str, Any]]:
     """
-    Asynchronously fetches search volume data for multiple countries in parallel.
-    Uses aiohttp to make concurrent API calls for each location.
+    Sends all tasks of a run and returns one outcome per task, in the order of `tasks`.
     
-    This is an internal implementation that should not be called directly.
-    Use fetch_multi_country_search_volume_data_async instead.
+    Tasks are packed into as few multi-task POSTs as the API allows (one task per POST
+    when ASYNC_PACK_TASKS is disabled). All POSTs are dispatched at once; each one waits
+    for a token from the shared process-wide rate limiter and for a slot in the adaptive
+    (AIMD) concurrency window, which grows while the API answers quickly and shrinks on
+    throttling. All requests share one pooled keep-alive aiohttp session.
     
     Args:
         login: API username
         password: API password
-        kw_list_tuple: Tuple of keywords
-        selected_location_codes_tuple: Tuple of location codes
-        lang_code: Language code
-        date_from: Start date
-        date_to: End date
-        all_location_options_tuple: Tuple of all available locations
+        tasks: Tasks built with build_search_volume_task
+        progress: Progress holder to update
+        on_outcome: Optional callback called with (task, outcome) as soon as a task is done
         
     Returns:
-        Tuple[pd.DataFrame, Optional[str]]: Tuple of (resulting DataFrame, error message or None)
+        List[Dict[str, Any]]: One outcome dict per task (see get_search_volume_multi_async)
     """
-    all_results_list = [] 
-    errors_list = []
+    if DataProcessingSettings.get('SEARCH_VOLUME_FETCH_MODE', 'live') == 'standard':
+        return await _fetch_task_outcomes_queued_async(login, password, tasks, progress, on_outcome)
     
-    kw_list = list(kw_list_tuple)
-    selected_location_codes = list(selected_location_codes_tuple)
+    if DataProcessingSettings.get('ASYNC_PACK_TASKS', True):
+        max_tasks_per_post = max(1, DataProcessingSettings.get('MAX_TASKS_PER_POST', 100))
+    else:
+        max_tasks_per_post = 1
+    chunk_starts = range(0, len(tasks), max_tasks_per_post)
+    
+    outcomes: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+    progress.update(message=f"⏳ Fetching data for {len(tasks)} tasks in {len(chunk_starts)} API requests...")
+    
+    async with shared_client_session() as session:
+        async def run_chunk(start: int) -> int:
+            chunk = tasks[start:start + max_tasks_per_post]
+            chunk_outcomes = await get_search_volume_multi_async(session, login, password, chunk)
+            outcomes[start:start + len(chunk)] = chunk_outcomes
+            if on_outcome:
+                for task, outcome in zip(chunk, chunk_outcomes):
+                    on_outcome(task, outcome)
+            return len(chunk)
+        
+        # Requests are dispatched as soon as the rate limiter allows, progress follows completion order
+        chunk_runs = [asyncio.ensure_future(run_chunk(start)) for start in chunk_starts]
+        try:
+            completed = 0
+            for finished in asyncio.as_completed(chunk_runs):
+                completed += await finished
+                progress.update(fraction=completed / len(tasks))
+        finally:
+            # A cancelled run (rerun or closed session) stops requests in flight and later chunks
+            for chunk_run in chunk_runs:
+                chunk_run.cancel()
     
-    # Create a map from location_code to name
-    location_code_to_name_map = {code: name for name, code in list(all_location_options_tuple)}
+    return outcomes
 
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    status_text.info(f"⏳ Initializing data fetching for {len(selected_location_codes)} countries...")
-    
-    # Determine batch size based on API limitations
-    # Each batch will be processed concurrently, with pauses between batches
-    # Default batch size of 5 is conservative, can be adjusted based on API limits
-    batch_size = DataProcessingSettings.get('ASYNC_BATCH_SIZE', 5)
-    
-    # Dynamically adjust batch size based on the number of countries
-    # For a small number of countries, we can process them all at once
-    if len(selected_location_codes) <= 3:
-        batch_size = len(selected_location_codes)
-    # For many countries, be more conservative to avoid rate limiting
-    elif len(selected_location_codes) > 10:
-        batch_size = min(batch_size, 4)  # Reduce batch size for large requests
-    
-    # Process location codes in batches
-    for batch_index in range(0, len(selected_location_codes), batch_size):
-        batch_locs = selected_location_codes[batch_index:batch_index + batch_size]
-        status_text.info(f"⏳ Fetching data for batch {batch_index//batch_size + 1} of {(len(selected_location_codes) + batch_size - 1)//batch_size}...")
+async def _fetch_task_outcomes_queued_async(
+    login: str,
+    password: str,
+    tasks: List[Dict[str, Any]],
+    progress: FetchProgress,
+    on_outcome: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Sends all tasks of a run through the queued standard endpoints and returns one
+    outcome per task, in the order of `tasks`.
+    
+    Args:
+        login: API username
+        password: API password
+        tasks: Tasks built with build_search_volume_task
+        progress: Progress holder to update
+        on_outcome: Optional callback called with (task, outcome) as soon as a task is done
         
-        async with aiohttp.ClientSession() as session:
-            # Create a list of tasks to run concurrently
-            tasks = []
-            for loc_code in batch_locs:
-                tasks.append(
-                    get_search_volume_async(
-                        session=session,
-                        login=login,
-                        password=password,
-                        keywords=kw_list,
-                        location_code=loc_code,
-                        language_code=lang_code,
-                        date_from=date_from,
-                        date_to=date_to
-                    )
-                )
-            
-            # Execute all tasks concurrently and gather results
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Process the results
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    # Handle exceptions from the tasks
-                    loc_code = batch_locs[i]
-                    location_name = location_code_to_name_map.get(loc_code, str(loc_code))
-                    error_msg = f"Error for country {location_name}: {str(result)}"
-                    errors_list.append(error_msg)
-                    logger.error(error_msg)
-                else:
-                    # Process successful results
-                    single_country_data_list, error_msg_single, loc_code = result
-                    location_name = location_code_to_name_map.get(loc_code, str(loc_code))
-                    
-                    if error_msg_single:
-                        errors_list.append(f"Error for country {location_name} ({loc_code}): {error_msg_single}")
-                        # If the error includes "Too many requests", we might need a longer pause
-                        if "50301" in error_msg_single or "Too many requests" in error_msg_single:
-                            status_text.error(f"API Limit exceeded for country {location_name}. Try again in a while or with fewer countries.")
-                            # Dynamically increase pause between batches if we hit rate limits
-                            if batch_index + batch_size < len(selected_location_codes):
-                                current_pause = DataProcessingSettings.get('ASYNC_BATCH_PAUSE', 3)
-                                DataProcessingSettings.ASYNC_BATCH_PAUSE = min(10, current_pause * 1.5)  # Increase pause but cap at 10 seconds
-                                logger.warning(f"Increased batch pause to {DataProcessingSettings.ASYNC_BATCH_PAUSE}s due to rate limiting")
-                    elif single_country_data_list:
-                        # Add the country information to the data
-                        country_data = [
-                            {**record, 'Country': location_name} 
-                            for record in single_country_data_list
-                        ]
-                        all_results_list.extend(country_data)
-            
-            # Update progress
-            progress_bar.progress((batch_index + len(batch_locs)) / len(selected_location_codes))
+    Returns:
+        List[Dict[str, Any]]: One outcome dict per task (see get_search_volume_queued_async)
+    """
+    progress.update(message=f"⏳ Queueing {len(tasks)} tasks, results are collected as soon as they are ready...")
+    
+    def on_task_done(done: int, total: int) -> None:
+        progress.update(fraction=done / total, message=f"⏳ Collected {done}/{total} queued tasks...")
+    
+    async with shared_client_session() as session:
+        return await get_search_volume_queued_async(session, login, password, tasks, on_task_done, on_outcome)
+
+async def stream_country_results_async(
+    login: str,
+    password: str,
+    plan: FetchPlan,
+    location_names: Dict[int, str],
+    progress: Optional[FetchProgress] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yields the result of every country of a fetch plan as soon as all of its tasks are done.
+    
+    With several languages every (country, language) pair of the plan is yielded separately.
+    Countries served entirely from the cell cache are yielded first, the others in the
+    order their tasks complete (per packed POST in live mode, per task in standard mode).
+    Tasks are sent exactly as by _fetch_multi_country_search_volume_data_async_internal,
+    so streaming costs no extra API calls. Every successful task is stored in the cell
+    cache as soon as it completes, so closing the generator early (or cancelling the
+    coroutine consuming it) cancels only the requests still in flight and keeps the
+    data that already arrived.
+    
+    Args:
+        login: API username
+        password: API password
+        plan: Fetch plan built with plan_search_volume_fetch
+        location_names: Map from location code to the country name used in the Country column
+        progress: Optional progress holder to update
         
-        # Add a pause between batches to respect API rate limits
-        if batch_index + batch_size < len(selected_location_codes):  # No pause after the last batch
-            sleep_duration = DataProcessingSettings.get('ASYNC_BATCH_PAUSE', 3)  # seconds
-            status_text.info(f"Pausing {sleep_duration}s before the next batch of API calls...")
-            await asyncio.sleep(sleep_duration)
+    Yields:
+        Dict[str, Any]: Country result with keys 'location_code', 'language_code', 'country',
+            'results' (DataFrame with Country and Language columns), 'error' and 'attempts'
+    """
+    if progress is None:
+        progress = FetchProgress()
+    cell_cache = get_search_volume_cell_cache()
+    task_indices: Dict[Tuple[int, str], List[int]] = {}
+    for index, task in enumerate(plan.tasks):
+        task_indices.setdefault(task_target(task), []).append(index)
     
-    status_text.empty()
-    progress_bar.empty()
+    def country_result(target: Tuple[int, str], outcomes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        outcome = collect_location_outcomes(cell_cache, plan.for_target(target), outcomes, store=False)[0]
+        location_code, language_code = target
+        location_name = location_names.get(location_code, str(location_code))
+        if outcome["error"]:
+            logger.error(f"Error for country {location_name} ({location_code}, {language_code}): {outcome['error']}")
+            if "50301" in outcome["error"] or "Too many requests" in outcome["error"]:
+                progress.update(message=f"API Limit exceeded for country {location_name}. Try again in a while or with fewer countries.", level="error")
+        results = outcome["results"]
+        # Add the country and language information to the columnar batch of the country
+        if not results.empty:
+            results = results.assign(Country=location_name, Language=language_code)
+        return {**outcome, "country": location_name, "results": results}
     
-    if not errors_list and not all_results_list:
-        return pd.DataFrame(), "No data found for the specified criteria and selected countries."
+    if not plan.tasks:
+        # The cell cache is shared by all accounts; a result made only of cached cells
+        # is returned only to credentials the API accepts
+        credentials_error = await asyncio.to_thread(verify_credentials, login, password)
+        if credentials_error:
+            progress.update(fraction=1.0, message=credentials_error, level="error")
+            for target in plan.targets:
+                result = country_result(target, [])
+                yield {**result, "results": result["results"].iloc[0:0], "error": credentials_error}
+            return
+    for target in plan.targets:
+        if target not in task_indices:
+            yield country_result(target, [])
+    if not plan.tasks:
+        progress.update(fraction=1.0, message="✅ All requested data is already cached.")
+        return
     
-    final_error_message = "\n".join(errors_list) if errors_list else None
+    task_outcomes: List[Optional[Dict[str, Any]]] = [None] * len(plan.tasks)
+    index_of = {id(task): index for index, task in enumerate(plan.tasks)}
+    completed: asyncio.Queue = asyncio.Queue()
+    
+    def on_outcome(task: Dict[str, Any], outcome: Dict[str, Any]) -> None:
+        index = index_of.get(id(task))
+        if index is not None and task_outcomes[index] is None:
+            task_outcomes[index] = outcome
+            if not outcome["error"]:
+                cell_cache.store(task, outcome["results"])
+            completed.put_nowait(index)
+    
+    async def fetch_all() -> None:
+        try:
+            # Tasks already being fetched by another session are awaited instead of sent again
+            outcomes = await fetch_tasks_single_flight_async(
+                login, password, plan.tasks,
+                lambda own_tasks: _fetch_task_outcomes_async(login, password, own_tasks, progress, on_outcome),
+                on_outcome
+            )
+            # Outcomes not reported on completion are delivered once everything is done
+            for task, outcome in zip(plan.tasks, outcomes):
+                on_outcome(task, outcome)
+        finally:
+            completed.put_nowait(None)
+    
+    fetching = asyncio.ensure_future(fetch_all())
+    remaining = {target: len(indices) for target, indices in task_indices.items()}
+    try:
+        while True:
+            index = await completed.get()
+            if index is None:
+                break
+            target = task_target(plan.tasks[index])
+            remaining[target] -= 1
+            if remaining[target] == 0:
+                yield country_result(target, [task_outcomes[i] for i in task_indices[target]])
+        await fetching
+    finally:
+        if not fetching.done():
+            fetching.cancel()
+
+def combine_country_results(plan: FetchPlan, country_results: List[Dict[str, Any]]) -> Tuple[pd.DataFrame, Optional[str]]:
+    """
+    Combines streamed country results into the DataFrame returned by the multi-country fetchers.
+    
+    Countries (and their languages) are put back into the order of the plan, so the result
+    does not depend on the completion order. The attempts and final status per country are stored in
+    `df.attrs["task_report"]` and the cache usage in `df.attrs["fetch_plan"]`.
+    
+    Args:
+        plan: Fetch plan the results were streamed for
+        country_results: Results yielded by stream_country_results_async
+        
+    Returns:
+        Tuple[pd.DataFrame, Optional[str]]: Tuple of (resulting DataFrame, error message or None)
+    """
+    results_by_target = {task_target(result): result for result in country_results}
+    ordered_results = [results_by_target[target] for target in plan.targets if target in results_by_target]
+    multiple_languages = len(plan.language_codes) > 1
+    
+    task_report = []
+    errors_list = []
+    result_frames = []
+    for result in ordered_results:
+        task_report.append({
+            "Country": result["country"],
+            "Location Code": result["location_code"],
+            "Language": result["language_code"],
+            "Attempts": result.get("attempts", 1),
+            "Status": "error" if result["error"] else "ok",
+        })
+        if result["error"]:
+            language_label = f", {result['language_code']}" if multiple_languages else ""
+            errors_list.append(f"Error for country {result['country']} ({result['location_code']}{language_label}): {result['error']}")
+        # Keep the data of successful keyword shards even if another shard failed
+        if not result["results"].empty:
+            result_frames.append(result["results"])
+    
+    # Concatenate the per-country columnar batches in one step
+    all_results_df = pd.concat(result_frames, ignore_index=True) if result_frames else pd.DataFrame()
+    # Per-country attempts and final outcome, reported back to the page
+    all_results_df.attrs["task_report"] = task_report
+    all_results_df.attrs["fetch_plan"] = plan.summary()
     
-    # Efficiently create DataFrame directly from the result list
-    all_results_df = pd.DataFrame(all_results_list) if all_results_list else pd.DataFrame()
+    if not errors_list and not result_frames:
+        return all_results_df, "No data found for the specified criteria and selected countries."
+    
+    final_error_message = "\n".join(errors_list) if errors_list else None
     
     return all_results_df, final_error_message
 
-# This is the cached wrapper function that calls the async implementation
-@st.cache_data(ttl=CacheSettings.SEARCH_DATA_TTL)
-def fetch_multi_country_search_volume_data_async(
+# This async function itself is not cached - the wrapper function will handle caching
+async def _fetch_multi_country_search_volume_data_async_internal(
     login: str,
     password: str,
     kw_list_tuple: Tuple[str, ...],
     selected_location_codes_tuple: Tuple[int, ...],
-    lang_code: str,
+    lang_code: LanguageSelection,
     date_from: datetime,
     date_to: datetime,
-    all_location_options_tuple: Tuple[Tuple[str, int], ...]
+    all_location_options_tuple: Tuple[Tuple[str, int], ...],
+    progress: Optional[FetchProgress] = None
 ) -> Tuple[pd.DataFrame, Optional[str]]:
     """
-    Cached wrapper for async fetching of search volume data for multiple countries.
-    This function runs the async implementation and returns the result.
+    Asynchronously fetches search volume data for multiple countries in parallel.
+    Uses aiohttp to make concurrent API calls for each location.
     
-    IMPORTANT: This structure solves the UnserializableReturnValueError that occurs
-    when trying to cache an async function. Instead of caching the coroutine directly,
-    we cache this wrapper function that calls the async implementation and
-    returns serializable results.
+    When DataProcessingSettings.ASYNC_PACK_TASKS is enabled, all countries are packed
+    into as few multi-task POST requests as the API allows instead of one request
+    per country. Requests are paced by the shared process-wide rate limiter and
+    tasks failing with a transient error are retried individually. The attempts and
+    final status per country are stored in `df.attrs["task_report"]`.
+    
+    This is an internal implementation that should not be called directly.
+    Pages fetch through the background jobs (data_processing/fetch_jobs.py) built on MultiCountryFetchStream.
     
     Args:
         login: API username
         password: API password
         kw_list_tuple: Tuple of keywords
         selected_location_codes_tuple: Tuple of location codes
-        lang_code: Language code
+        lang_code: Language code for all countries, language codes, or (location code, language code) pairs
         date_from: Start date
         date_to: End date
         all_location_options_tuple: Tuple of all available locations
+        progress: Optional progress holder the caller renders while waiting
         
     Returns:
         Tuple[pd.DataFrame, Optional[str]]: Tuple of (resulting DataFrame, error message or None)
     """
-    # Run the async function using asyncio.run
-    return asyncio.run(_fetch_multi_country_search_volume_data_async_internal(
-        login, password, kw_list_tuple, selected_location_codes_tuple,
-        lang_code, date_from, date_to, all_location_options_tuple
-    ))
+    if progress is None:
+        progress = FetchProgress()
+    progress.update(message=f"⏳ Initializing data fetching for {len(selected_location_codes_tuple)} countries...")
+    
+    # Only the keyword/location/month cells missing from the cell cache are requested
+    plan = plan_search_volume_fetch(
+        get_search_volume_cell_cache(), list(kw_list_tuple), list(selected_location_codes_tuple), lang_code, date_from, date_to
+    )
+    location_names = {code: name for name, code in all_location_options_tuple}
+    country_results = [
+        result async for result in stream_country_results_async(login, password, plan, location_names, progress)
+    ]
+    return combine_country_results(plan, country_results)
+
+class MultiCountryFetchStream:
+    """
+    Multi-country fetch whose country results the Streamlit script thread polls while they arrive.
+    
+    The fetch runs stream_country_results_async on the shared background event loop and hands every
+    country over through a thread-safe queue, so the page can render partial totals and
+    charts before the slowest country is done. The combined result equals the result of
+    _fetch_multi_country_search_volume_data_async_internal for the same arguments. A stream left
+    behind by a rerun or a closed session is stopped with cancel().
+    """
+    
+    def __init__(
+        self,
+        login: str,
+        password: str,
+        kw_list_tuple: Tuple[str, ...],
+        selected_location_codes_tuple: Tuple[int, ...],
+        lang_code: LanguageSelection,
+        date_from: datetime,
+        date_to: datetime,
+        all_location_options_tuple: Tuple[Tuple[str, int], ...],
+        progress: Optional[FetchProgress] = None
+    ):
+        self.progress = progress or FetchProgress()
+        self.progress.update(message=f"⏳ Initializing data fetching for {len(selected_location_codes_tuple)} countries...")
+        # Only the keyword/location/month cells missing from the cell cache are requested
+        self.plan = plan_search_volume_fetch(
+            get_search_volume_cell_cache(), list(kw_list_tuple), list(selected_location_codes_tuple), lang_code, date_from, date_to
+        )
+        self._location_names = {code: name for name, code in all_location_options_tuple}
+        self._arrived: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._country_results: List[Dict[str, Any]] = []
+        self._future = submit_http_coroutine(self._pump(login, password))
+    
+    async def _pump(self, login: str, password: str) -> None:
+        async for result in stream_country_results_async(login, password, self.plan, self._location_names, self.progress):
+            self._arrived.put(result)
+    
+    def cancel(self) -> None:
+        """Cancels the requests still in flight; countries that already arrived stay in the cell cache."""
+        if self._future.cancel():
+            logger.info(f"Multi-country fetch cancelled, {len(self._country_results)}/{len(self.plan.targets)} country results done")
+    
+    @property
+    def done(self) -> bool:
+        """True when the fetch has finished and every country result has been polled."""
+        return self._future.done() and self._arrived.empty()
+    
+    def poll(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the country results that arrived since the last call, in completion order.
+        
+        Args:
+            timeout: Seconds to wait for at least one result (None returns immediately)
+            
+        Returns:
+            List[Dict[str, Any]]: Country results (see stream_country_results_async)
+        """
+        arrived = []
+        try:
+            arrived.append(self._arrived.get(timeout=timeout) if timeout else self._arrived.get_nowait())
+            while True:
+                arrived.append(self._arrived.get_nowait())
+        except queue.Empty:
+            pass
+        self._country_results.extend(arrived)
+        return arrived
+    
+    def result(self) -> Tuple[pd.DataFrame, Optional[str]]:
+        """
+        Waits for the fetch to finish and combines all country results.
+        
+        Returns:
+            Tuple[pd.DataFrame, Optional[str]]: Tuple of (resulting DataFrame, error message or None)
+        """
+        self._future.result()
+        self.poll()
+        return combine_country_results(self.plan, self._country_results)
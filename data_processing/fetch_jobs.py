@@ -0,0 +1,256 @@
+"""
+Joby načítania dát pre analýzu viacerých krajín, ktoré bežia na pozadí mimo behu Streamlit skriptu.
+
+Stránka job len odošle a dostane jeho ID. Job beží vo vlákne spoločného poolu a priebeh,
+čiastočné výsledky (krajiny v poradí dokončenia) aj výsledok drží v pamäti procesu, takže
+prežije rerun stránky. Session, ktoré odošlú rovnakú požiadavku s rovnakými prihlasovacími
+údajmi, dostanú ID toho istého jobu a API sa volá len raz.
+
+Job sa zruší, keď ho uvoľní posledná session, ktorá naň čaká (napr. pri zmene výberu krajín),
+alebo keď sa na jeho stav nikto nepýta dlhšie ako FetchJobSettings.ABANDON_AFTER (zatvorená
+session). Už načítané tasky ostávajú v cache buniek. Job dokončený bez chýb je k dispozícii ešte
+FetchJobSettings.KEEP_FINISHED sekúnd; po jobe s chybou (napr. 50301 aj po opakovaniach)
+nové odoslanie spustí nový job, ktorý chybné krajiny skúsi načítať znova.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import logging
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+from config import FetchJobSettings
+from api_client.dataforseo_client import credentials_fingerprint
+from data_processing.async_fetcher import FetchProgress, MultiCountryFetchStream
+from data_processing.fetch_planner import LanguageSelection, fetch_targets
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+FINISHED_STATUSES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+class FetchJob:
+    """Stav jedného jobu; metódy sú bezpečné pre súbežný prístup z viacerých session."""
+
+    def __init__(self, key: Tuple, total_countries: int):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.total_countries = total_countries
+        self.progress = FetchProgress()
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._status = JOB_QUEUED
+        self._country_results: List[Dict[str, Any]] = []
+        self._result: Optional[Tuple[pd.DataFrame, Optional[str]]] = None
+        self._subscribers: set = set()
+        self._last_polled = time.monotonic()
+        self._cancel_requested = False
+
+    @property
+    def status(self) -> str:
+        with self._lock:
+            return self._status
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def subscribe(self, subscriber: str) -> None:
+        with self._lock:
+            self._subscribers.add(subscriber)
+            self._last_polled = time.monotonic()
+            self._cancel_requested = False
+
+    def release(self, subscriber: str) -> bool:
+        """Odhlási session; vráti True, ak na job už nikto nečaká."""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            return not self._subscribers
+
+    def touch(self) -> None:
+        with self._lock:
+            self._last_polled = time.monotonic()
+
+    def request_cancel(self) -> None:
+        with self._lock:
+            self._cancel_requested = True
+
+    def should_stop(self) -> bool:
+        """Job má skončiť: zrušil ho posledný odberateľ, alebo sa naň dlho nikto nepýtal."""
+        with self._lock:
+            return self._cancel_requested or time.monotonic() - self._last_polled > FetchJobSettings.ABANDON_AFTER
+
+    def _start(self) -> None:
+        with self._lock:
+            self._status = JOB_RUNNING
+
+    def _add_countries(self, country_results: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._country_results.extend(country_results)
+
+    def _finish(self, status: str, result: Optional[Tuple[pd.DataFrame, Optional[str]]] = None) -> None:
+        with self._lock:
+            self._status = status
+            self._result = result
+            self.finished_at = time.time()
+
+    @property
+    def reusable(self) -> bool:
+        """Job môže prevziať ďalšia session: ešte beží, alebo skončil bez chyby."""
+        with self._lock:
+            if self._status in (JOB_QUEUED, JOB_RUNNING):
+                return True
+            return self._status == JOB_DONE and self._result is not None and self._result[1] is None
+
+    def country_results(self) -> List[Dict[str, Any]]:
+        """Výsledky krajín, ktoré už prišli, v poradí dokončenia."""
+        with self._lock:
+            return list(self._country_results)
+
+    def result(self) -> Optional[Tuple[pd.DataFrame, Optional[str]]]:
+        """Výsledok (DataFrame, chybová správa alebo None) dokončeného jobu, inak None.
+
+        Každé volanie vráti kópiu DataFrame, aby si session navzájom nemenili výsledok.
+        """
+        with self._lock:
+            if self._result is None:
+                return None
+            results_df, error_msg = self._result
+        return results_df.copy(), error_msg
+
+def fetch_job_key(
+    login: str,
+    password: str,
+    kw_list_tuple: Tuple[str, ...],
+    selected_location_codes_tuple: Tuple[int, ...],
+    lang_code: LanguageSelection,
+    date_from: datetime,
+    date_to: datetime
+) -> Tuple:
+    """Kľúč požiadavky: session s rovnakým kľúčom (rovnaké dvojice krajiny a jazyka) zdieľajú jeden job.
+
+    Kľúč obsahuje odtlačok prihlasovacích údajov, takže session s iným alebo nesprávnym
+    heslom sa nepripojí k jobu inej session.
+    """
+    targets = fetch_targets(selected_location_codes_tuple, lang_code)
+    return (
+        credentials_fingerprint(login, password), tuple(sorted(kw_list_tuple)), tuple(sorted(targets)),
+        str(date_from), str(date_to)
+    )
+
+class FetchJobRunner:
+    """Pool vlákien, ktorý spúšťa joby načítania dát a drží ich stav podľa ID."""
+
+    def __init__(self, max_workers: int = FetchJobSettings.MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="fetch-job")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, FetchJob] = {}
+        self._jobs_by_key: Dict[Tuple, FetchJob] = {}
+
+    def submit(
+        self,
+        subscriber: str,
+        login: str,
+        password: str,
+        kw_list_tuple: Tuple[str, ...],
+        selected_location_codes_tuple: Tuple[int, ...],
+        lang_code: LanguageSelection,
+        date_from: datetime,
+        date_to: datetime,
+        all_location_options_tuple: Tuple[Tuple[str, int], ...]
+    ) -> str:
+        """Odošle job, alebo sa pripojí k bežiacemu či nedávno bez chýb dokončenému jobu s rovnakou požiadavkou.
+
+        Args:
+            subscriber: Identifikátor session, ktorá bude stav jobu sledovať
+            login: API prihlasovacie meno
+            password: API heslo
+            kw_list_tuple: Tuple kľúčových slov
+            selected_location_codes_tuple: Tuple kódov lokácií
+            lang_code: Kód jazyka pre všetky krajiny, kódy jazykov alebo dvojice (kód lokácie, kód jazyka)
+            date_from: Počiatočný dátum
+            date_to: Koncový dátum
+            all_location_options_tuple: Dvojice (názov, kód) vybraných lokácií
+
+        Returns:
+            str: ID jobu
+        """
+        key = fetch_job_key(login, password, kw_list_tuple, selected_location_codes_tuple, lang_code, date_from, date_to)
+        with self._lock:
+            self._purge_finished()
+            job = self._jobs_by_key.get(key)
+            if job is not None and job.reusable:
+                job.subscribe(subscriber)
+                logger.info(f"Session sa pripojila k jobu {job.id} ({job.status})")
+                return job.id
+            # Každá dvojica krajiny a jazyka je samostatný výsledok jobu
+            job = FetchJob(key, len(fetch_targets(selected_location_codes_tuple, lang_code)))
+            job.subscribe(subscriber)
+            self._jobs[job.id] = job
+            self._jobs_by_key[key] = job
+        request = (login, password, kw_list_tuple, selected_location_codes_tuple, lang_code, date_from, date_to, all_location_options_tuple)
+        self._executor.submit(self._run, job, request)
+        logger.info(f"Job {job.id} odoslaný pre {job.total_countries} dvojíc krajiny a jazyka")
+        return job.id
+
+    def get(self, job_id: str) -> Optional[FetchJob]:
+        """Vráti job podľa ID (None, ak neexistuje alebo už expiroval) a zaznamená, že naň niekto čaká."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            job.touch()
+        return job
+
+    def release(self, job_id: str, subscriber: str) -> None:
+        """Session už na job nečaká; ak bola posledná, nedokončený job sa zruší."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None and job.release(subscriber) and not job.finished:
+            job.request_cancel()
+
+    def _purge_finished(self) -> None:
+        """Odstráni dokončené joby staršie ako FetchJobSettings.KEEP_FINISHED (volá sa pod zámkom)."""
+        now = time.time()
+        expired = [job for job in self._jobs.values() if job.finished and now - job.finished_at > FetchJobSettings.KEEP_FINISHED]
+        for job in expired:
+            del self._jobs[job.id]
+            if self._jobs_by_key.get(job.key) is job:
+                del self._jobs_by_key[job.key]
+
+    def _run(self, job: FetchJob, request: Tuple) -> None:
+        job._start()
+        try:
+            stream = MultiCountryFetchStream(*request, progress=job.progress)
+            while not stream.done:
+                if job.should_stop():
+                    stream.cancel()
+                    job._finish(JOB_CANCELLED)
+                    logger.info(f"Job {job.id} zrušený, načítané krajiny ostávajú v cache buniek")
+                    return
+                job._add_countries(stream.poll(timeout=0.2))
+            job._finish(JOB_DONE, stream.result())
+        except Exception as e:
+            logger.exception(f"Job {job.id} zlyhal")
+            job.progress.update(message=f"Načítanie dát zlyhalo: {e}", level="error")
+            job._finish(JOB_FAILED, (pd.DataFrame(), f"Načítanie dát zlyhalo: {e}"))
+
+_fetch_job_runner: Optional[FetchJobRunner] = None
+_fetch_job_runner_lock = threading.Lock()
+
+def get_fetch_job_runner() -> FetchJobRunner:
+    """Vráti pool jobov spoločný pre všetky session v procese."""
+    global _fetch_job_runner
+    with _fetch_job_runner_lock:
+        if _fetch_job_runner is None:
+            _fetch_job_runner = FetchJobRunner()
+        return _fetch_job_runner
@@ -0,0 +1,449 @@
+"""
+Plánovač načítania search volume dát nad cache jednotlivých buniek.
+
+Bunka je objem vyhľadávania jedného kľúčového slova v jednej lokácii, jazyku a mesiaci.
+Plánovač porovná novú požiadavku s cache a do API pošle tasky len pre chýbajúce kľúčové
+slová, lokácie alebo mesiace; v rámci lokácie a jazyka sa chýbajúce bunky zlúčia do jedného tasku. Výsledný DataFrame sa potom zostaví celý z cache.
+Jeden beh môže načítať každú lokáciu vo viacerých jazykoch (dvojice lokácia a jazyk, fetch_targets).
+Pridanie kľúčového slova, krajiny alebo posunutie dátumu 'do' o mesiac tak načíta z API
+len nové bunky namiesto celej požiadavky.
+
+Cache je spoločná pre celý proces (všetky Streamlit session). Údaje nezávisia od účtu,
+preto login nie je súčasťou kľúča; výsledok zostavený len z cache preto fetchery vrátia
+až po overení prihlasovacích údajov (dataforseo_client.verify_credentials). Bunky starnú po CacheSettings.SEARCH_CELLS_TTL a pri
+prekročení CacheSettings.SEARCH_CELLS_MAX sa z pamäte uvoľnia najdlhšie nepoužité kľúčové
+slová. Pod pamäťovou cache je perzistentné úložisko (data_processing/persistent_cache.py),
+takže bunky prežijú aj reštart alebo nové nasadenie aplikácie.
+"""
+from typing import List, Dict, Tuple, Any, Optional, Iterable, Union
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+import logging
+import re
+import threading
+import time
+import unicodedata
+
+import pandas as pd
+
+from api_client.dataforseo_client import build_search_volume_task
+from api_client.search_volume_columns import SearchVolumeColumns
+from config import CacheSettings
+from data_processing.keyword_sharding import merge_shard_outcomes, shard_keywords
+from data_processing.persistent_cache import CellRow, PersistentCellStore, get_persistent_cell_store
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+# Objem bunky, pre ktorú API nevrátilo žiadny údaj (mesiac je načítaný, ale bez dát)
+NO_DATA = -1
+
+# Výber jazykov behu: jeden kód jazyka pre všetky lokácie, tuple kódov jazykov (každá lokácia
+# v každom jazyku) alebo tuple dvojíc (kód lokácie, kód jazyka) s jazykmi podľa krajiny
+LanguageSelection = Union[str, Tuple[str, ...], Tuple[Tuple[int, str], ...]]
+
+def fetch_targets(location_codes: Iterable[int], languages: LanguageSelection) -> List[Tuple[int, str]]:
+    """Rozvinie výber jazykov na dvojice (kód lokácie, kód jazyka) v poradí lokácií.
+
+    Pri dvojiciach sa lokácie, ktoré nemajú žiadny jazyk, vynechajú.
+
+    Args:
+        location_codes: Kódy lokácií
+        languages: Výber jazykov (LanguageSelection)
+
+    Returns:
+        List[Tuple[int, str]]: Jedinečné dvojice (kód lokácie, kód jazyka)
+    """
+    if isinstance(languages, str):
+        return list(dict.fromkeys((location_code, languages) for location_code in location_codes))
+    if all(isinstance(language, str) for language in languages):
+        return list(dict.fromkeys(
+            (location_code, language) for location_code in location_codes for language in languages
+        ))
+    languages_by_location: Dict[int, List[str]] = {}
+    for location_code, language in languages:
+        languages_by_location.setdefault(location_code, []).append(language)
+    return list(dict.fromkeys(
+        (location_code, language)
+        for location_code in location_codes
+        for language in languages_by_location.get(location_code, [])
+    ))
+
+def task_target(task: Dict[str, Any]) -> Tuple[int, str]:
+    """Dvojica (kód lokácie, kód jazyka) tasku alebo výsledku."""
+    return task["location_code"], task["language_code"]
+
+def month_index(value: Any) -> int:
+    """Poradové číslo mesiaca (rok * 12 + mesiac - 1) pre dátum alebo reťazec 'YYYY-MM-DD'."""
+    if isinstance(value, str):
+        value = datetime.strptime(value[:10], "%Y-%m-%d")
+    return value.year * 12 + value.month - 1
+
+def _month_start(index: int) -> datetime:
+    return datetime(index // 12, index % 12 + 1, 1)
+
+def _month_end(index: int) -> datetime:
+    return _month_start(index + 1) - timedelta(days=1)
+
+def _normalize_keyword(keyword: str) -> str:
+    # API vracia kľúčové slová normalizované (napr. malými písmenami)
+    return keyword.strip().lower()
+
+def _loose_keyword(keyword: str) -> str:
+    """Tvar kľúčového slova bez diakritiky, interpunkcie a nadbytočných medzier."""
+    without_accents = "".join(
+        char for char in unicodedata.normalize("NFKD", keyword.casefold()) if not unicodedata.combining(char)
+    )
+    return " ".join(re.sub(r"[^\w\s]|_", " ", without_accents).split())
+
+def match_requested_keywords(requested: Iterable[str], returned: Iterable[str]) -> Dict[str, str]:
+    """Priradí kľúčové slová z odpovede API k požadovaným kľúčovým slovám tasku.
+
+    API vracia kľúčové slová v normalizovanom tvare (iné veľké písmená, bez diakritiky,
+    interpunkcie alebo nadbytočných medzier). Priradenie ide postupne podľa presnej zhody,
+    podľa voľného tvaru a nakoniec podľa poradia zvyšných kľúčových slov, ak ich zostal
+    rovnaký počet. Kľúčové slovo, ktoré sa nepodarí priradiť, sa mapuje samo na seba.
+
+    Args:
+        requested: Kľúčové slová tasku
+        returned: Kľúčové slová z výsledkov API (v poradí odpovede)
+
+    Returns:
+        Dict[str, str]: Kľúčové slovo z odpovede -> požadované kľúčové slovo
+    """
+    requested = list(dict.fromkeys(requested))
+    returned = list(dict.fromkeys(returned))
+    by_exact = {_normalize_keyword(keyword): keyword for keyword in requested}
+    by_loose: Dict[str, str] = {}
+    for keyword in requested:
+        by_loose.setdefault(_loose_keyword(keyword), keyword)
+
+    mapping: Dict[str, str] = {}
+    matched = set()
+    unmatched: List[str] = []
+    for keyword in returned:
+        match = by_exact.get(_normalize_keyword(keyword)) or by_loose.get(_loose_keyword(keyword))
+        if match is not None and match not in matched:
+            mapping[keyword] = match
+            matched.add(match)
+        else:
+            unmatched.append(keyword)
+    remaining = [keyword for keyword in requested if keyword not in matched]
+    if unmatched and len(unmatched) == len(remaining):
+        mapping.update(zip(unmatched, remaining))
+    for keyword in unmatched:
+        if keyword not in mapping:
+            logger.warning(f"Kľúčové slovo '{keyword}' z odpovede API nezodpovedá žiadnemu požadovanému")
+            mapping[keyword] = keyword
+    return mapping
+
+class _KeywordSeries:
+    """Bunky jedného kľúčového slova v jednej lokácii a jazyku: mesiac -> (objem, čas uloženia)."""
+
+    __slots__ = ("keyword", "cells")
+
+    def __init__(self, keyword: str):
+        self.keyword = keyword
+        self.cells: Dict[int, Tuple[int, float]] = {}
+
+class SearchVolumeCellCache:
+    """Cache objemov vyhľadávania po bunkách (kľúčové slovo, lokácia, jazyk, mesiac).
+
+    Pri persistent=True sa bunky zapisujú aj do perzistentného úložiska podľa CacheSettings
+    a chýbajúce bunky sa pred plánovaním načítajú z neho (warm).
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_cells: Optional[int] = None, persistent: bool = False):
+        self._ttl = ttl
+        self._max_cells = max_cells
+        self._persistent = persistent
+        self._lock = threading.Lock()
+        self._series: "OrderedDict[Tuple[str, int, str], _KeywordSeries]" = OrderedDict()
+        self._cell_count = 0
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl if self._ttl is not None else CacheSettings.SEARCH_CELLS_TTL
+
+    @property
+    def max_cells(self) -> int:
+        return self._max_cells if self._max_cells is not None else CacheSettings.SEARCH_CELLS_MAX
+
+    @property
+    def persistent_store(self) -> Optional[PersistentCellStore]:
+        return get_persistent_cell_store() if self._persistent else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._cell_count
+
+    def clear(self) -> None:
+        """Odstráni všetky bunky z pamäte aj z perzistentného úložiska."""
+        with self._lock:
+            self._series.clear()
+            self._cell_count = 0
+        store = self.persistent_store
+        if store is not None:
+            store.clear()
+
+    def warm(self, keywords: Iterable[str], location_code: int, language_code: str, months: range) -> None:
+        """Doplní do pamäte platné bunky z perzistentného úložiska pre kľúčové slová, ktorým chýbajú."""
+        store = self.persistent_store
+        if store is None or not len(months):
+            return
+        keyword_keys = [
+            _normalize_keyword(keyword) for keyword in dict.fromkeys(keywords)
+            if self.missing_months(keyword, location_code, language_code, months)
+        ]
+        if not keyword_keys:
+            return
+        rows = store.load(keyword_keys, location_code, language_code, months[0], months[-1])
+        with self._lock:
+            for _, keyword, _, _, month, volume, stored_at in rows:
+                series = self._get_series(keyword, location_code, language_code)
+                cell = series.cells.get(month)
+                if cell is None or cell[1] < stored_at:
+                    self._set_cell(series, month, (volume, stored_at))
+            self._evict()
+
+    def missing_months(self, keyword: str, location_code: int, language_code: str, months: range) -> List[int]:
+        """Vráti mesiace z rozsahu, pre ktoré kľúčové slovo nemá v cache platnú bunku."""
+        oldest = time.time() - self.ttl
+        with self._lock:
+            series = self._series.get((_normalize_keyword(keyword), location_code, language_code))
+            if series is None:
+                return list(months)
+            cells = series.cells
+            return [month for month in months if month not in cells or cells[month][1] < oldest]
+
+    def store(self, task: Dict[str, Any], results: pd.DataFrame) -> None:
+        """Uloží výsledky úspešného tasku.
+
+        Výsledky sa uložia pod požadované kľúčové slovo, ktorému zodpovedajú
+        (match_requested_keywords), aj keď ho API vrátilo v inom tvare; zobrazí sa tvar z API.
+        Mesiace tasku, pre ktoré API nevrátilo údaj, sa uložia ako NO_DATA, aby sa
+        nenačítavali znova, kým bunka nezostarne.
+
+        Args:
+            task: Task vytvorený pomocou build_search_volume_task
+            results: DataFrame výsledkov tasku (stĺpce SEARCH_VOLUME_COLUMNS)
+        """
+        now = time.time()
+        location_code, language_code = task["location_code"], task["language_code"]
+        months = range(month_index(task["date_from"]), month_index(task["date_to"]) + 1)
+        dates = results["Date"]
+        result_months = (dates.dt.year.to_numpy() * 12 + dates.dt.month.to_numpy() - 1).tolist()
+        result_keywords = results["Keyword"].astype(str).tolist()
+        requested = match_requested_keywords(task["keywords"], result_keywords)
+        rows: List[CellRow] = []
+
+        with self._lock:
+            for keyword, month, volume in zip(result_keywords, result_months, results["Search Volume"].tolist()):
+                requested_keyword = requested[keyword]
+                series = self._get_series(requested_keyword, location_code, language_code, display=keyword)
+                self._set_cell(series, month, (int(volume), now))
+                rows.append((_normalize_keyword(requested_keyword), series.keyword, location_code, language_code, month, int(volume), now))
+            for keyword in task["keywords"]:
+                series = self._get_series(keyword, location_code, language_code)
+                for month in months:
+                    cell = series.cells.get(month)
+                    if cell is None or cell[1] < now:
+                        self._set_cell(series, month, (NO_DATA, now))
+                        rows.append((_normalize_keyword(keyword), series.keyword, location_code, language_code, month, NO_DATA, now))
+            self._evict()
+
+        store = self.persistent_store
+        if store is not None:
+            store.save(rows)
+
+    def _get_series(
+        self, keyword: str, location_code: int, language_code: str, display: Optional[str] = None
+    ) -> _KeywordSeries:
+        """Vráti (prípadne vytvorí) bunky kľúčového slova. Volať pod zámkom.
+
+        display je tvar kľúčového slova z odpovede API, ktorý sa zobrazí vo výsledkoch.
+        """
+        key = (_normalize_keyword(keyword), location_code, language_code)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _KeywordSeries(display or keyword)
+        else:
+            if display is not None:
+                series.keyword = display
+            self._series.move_to_end(key)
+        return series
+
+    def _set_cell(self, series: _KeywordSeries, month: int, cell: Tuple[int, float]) -> None:
+        if month not in series.cells:
+            self._cell_count += 1
+        series.cells[month] = cell
+
+    def _evict(self) -> None:
+        """Uvoľní najdlhšie nepoužité kľúčové slová nad limit buniek. Volať pod zámkom."""
+        while self._cell_count > self.max_cells and len(self._series) > 1:
+            _, series = self._series.popitem(last=False)
+            self._cell_count -= len(series.cells)
+
+    def frame(self, keywords: Iterable[str], location_code: int, language_code: str, months: range) -> pd.DataFrame:
+        """Zostaví DataFrame výsledkov lokácie z platných buniek cache.
+
+        Args:
+            keywords: Kľúčové slová v požadovanom poradí
+            location_code: Kód lokácie
+            language_code: Kód jazyka
+            months: Rozsah mesiacov (month_index)
+
+        Returns:
+            pd.DataFrame: Stĺpce SEARCH_VOLUME_COLUMNS
+        """
+        oldest = time.time() - self.ttl
+        columns = SearchVolumeColumns()
+        with self._lock:
+            for keyword in dict.fromkeys(keywords):
+                series = self._series.get((_normalize_keyword(keyword), location_code, language_code))
+                if series is None:
+                    continue
+                keyword_code = None
+                for month in months:
+                    cell = series.cells.get(month)
+                    if cell is None or cell[1] < oldest or cell[0] == NO_DATA:
+                        continue
+                    if keyword_code is None:
+                        keyword_code = columns.add_keyword(series.keyword)
+                    columns.append(keyword_code, month // 12, month % 12 + 1, cell[0])
+        return columns.to_frame(location_code)
+
+_cell_cache = SearchVolumeCellCache(persistent=True)
+
+def get_search_volume_cell_cache() -> SearchVolumeCellCache:
+    """Vráti cache buniek zdieľanú v procese."""
+    return _cell_cache
+
+@dataclass
+class FetchPlan:
+    """Tasky potrebné na doplnenie požiadavky a rozsah, ktorý už pokrýva cache."""
+    keywords: List[str]
+    targets: List[Tuple[int, str]]
+    months: range
+    tasks: List[Dict[str, Any]] = field(default_factory=list)
+    missing_cells: int = 0
+
+    @property
+    def location_codes(self) -> List[int]:
+        return list(dict.fromkeys(location_code for location_code, _ in self.targets))
+
+    @property
+    def language_codes(self) -> List[str]:
+        return list(dict.fromkeys(language_code for _, language_code in self.targets))
+
+    @property
+    def total_cells(self) -> int:
+        return len(self.keywords) * len(self.targets) * len(self.months)
+
+    def summary(self) -> Dict[str, int]:
+        """Súhrn plánu pre zobrazenie na stránke."""
+        return {"tasks": len(self.tasks), "missing_cells": self.missing_cells, "total_cells": self.total_cells}
+
+    def for_target(self, target: Tuple[int, str]) -> "FetchPlan":
+        """Časť plánu pre jednu lokáciu a jazyk, na zostavenie výsledku hneď, ako sú hotové ich tasky."""
+        tasks = [task for task in self.tasks if task_target(task) == target]
+        return replace(self, targets=[target], tasks=tasks)
+
+def plan_search_volume_fetch(
+    cache: SearchVolumeCellCache,
+    keywords: List[str],
+    location_codes: List[int],
+    languages: LanguageSelection,
+    date_from: datetime,
+    date_to: datetime
+) -> FetchPlan:
+    """Naplánuje tasky len pre bunky, ktoré v cache chýbajú.
+
+    Pre každú lokáciu a jazyk vznikne jeden task (pri veľkom počte kľúčových slov rozdelený podľa
+    limitu API) s kľúčovými slovami, ktorým chýba aspoň jedna bunka, za obdobie od prvého
+    po posledný chýbajúci mesiac. API účtuje po taskoch, preto sa bunky, ktoré už sú v cache
+    a padnú do tohto obdobia, radšej načítajú znova, než aby vznikol ďalší task.
+    Ak v cache nie je nič, vzniknú rovnaké tasky ako bez cache.
+
+    Args:
+        cache: Cache buniek
+        keywords: Zoznam kľúčových slov
+        location_codes: Kódy lokácií
+        languages: Kód jazyka pre všetky lokácie, kódy jazykov alebo dvojice (kód lokácie, kód jazyka)
+        date_from: Počiatočný dátum
+        date_to: Koncový dátum
+
+    Returns:
+        FetchPlan: Tasky na odoslanie a rozsah požiadavky
+    """
+    first_month, last_month = month_index(date_from), month_index(date_to)
+    plan = FetchPlan(
+        keywords=list(dict.fromkeys(keywords)),
+        targets=fetch_targets(location_codes, languages),
+        months=range(first_month, last_month + 1),
+    )
+    for location_code, language_code in plan.targets:
+        cache.warm(plan.keywords, location_code, language_code, plan.months)
+        missing_keywords = []
+        span_first, span_last = last_month, first_month
+        for keyword in plan.keywords:
+            missing = cache.missing_months(keyword, location_code, language_code, plan.months)
+            if missing:
+                plan.missing_cells += len(missing)
+                missing_keywords.append(keyword)
+                span_first, span_last = min(span_first, missing[0]), max(span_last, missing[-1])
+        if not missing_keywords:
+            continue
+        # Krajné mesiace požiadavky sa pýtajú s pôvodným dátumom, nie s celým mesiacom
+        task_from = date_from if span_first == first_month else _month_start(span_first)
+        task_to = date_to if span_last == last_month else _month_end(span_last)
+        for shard in shard_keywords(missing_keywords):
+            plan.tasks.append(build_search_volume_task(shard, location_code, language_code, task_from, task_to))
+
+    if plan.missing_cells < plan.total_cells:
+        logger.info(
+            f"Cache pokrýva {plan.total_cells - plan.missing_cells} z {plan.total_cells} buniek, "
+            f"z API sa načíta {plan.missing_cells} buniek v {len(plan.tasks)} taskoch"
+        )
+    return plan
+
+def collect_location_outcomes(
+    cache: SearchVolumeCellCache,
+    plan: FetchPlan,
+    task_outcomes: List[Dict[str, Any]],
+    store: bool = True
+) -> List[Dict[str, Any]]:
+    """Uloží úspešné výsledky taskov do cache a zostaví výsledok pre každú lokáciu a jazyk z cache.
+
+    Args:
+        cache: Cache buniek
+        plan: Plán, podľa ktorého sa tasky odoslali
+        task_outcomes: Výsledok pre každý task plánu v poradí plan.tasks
+        store: False, ak volajúci uložil výsledky do cache už pri dokončení taskov
+
+    Returns:
+        List[Dict[str, Any]]: Výsledok pre každú dvojicu lokácie a jazyka plánu (kľúče
+            'location_code', 'language_code', 'results', 'error' a 'attempts'; 0 pokusov,
+            ak sa celý načítal z cache)
+    """
+    outcomes_by_target: Dict[Tuple[int, str], List[Dict[str, Any]]] = {}
+    sizes_by_target: Dict[Tuple[int, str], List[int]] = {}
+    for task, outcome in zip(plan.tasks, task_outcomes):
+        if store and not outcome["error"]:
+            cache.store(task, outcome["results"])
+        outcomes_by_target.setdefault(task_target(task), []).append(outcome)
+        sizes_by_target.setdefault(task_target(task), []).append(len(task["keywords"]))
+
+    location_outcomes = []
+    for location_code, language_code in plan.targets:
+        fetched = outcomes_by_target.get((location_code, language_code))
+        merged = merge_shard_outcomes(fetched, sizes_by_target[(location_code, language_code)]) if fetched else None
+        location_outcomes.append({
+            "location_code": location_code,
+            "language_code": language_code,
+            "results": cache.frame(plan.keywords, location_code, language_code, plan.months),
+            "error": merged["error"] if merged else None,
+            "attempts": merged["attempts"] if merged else 0,
+        })
+    return location_outcomes
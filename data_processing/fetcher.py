@@ -2,23 +2,44 @@
 Modul pre načítanie dát z API a ich spracovanie pre aplikáciu.
 Podporuje načítavanie dát pre jednu krajinu a pre viacero krajín.
 """
-from typing import List, Dict, Tuple, Any, Optional
+from typing import Tuple, Any, Optional
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import pandas as pd
-import time
 import logging
 import asyncio
 import aiohttp
 from datetime import datetime
 
-# Importujeme upravenú funkciu z api_client
-from api_client.dataforseo_client import get_search_volume_for_task
-from config import CacheSettings, DataProcessingSettings
+from api_client.dataforseo_client import verify_credentials
+from data_processing.fetch_planner import (
+    LanguageSelection, collect_location_outcomes, fetch_targets, get_search_volume_cell_cache, plan_search_volume_fetch
+)
+from data_processing.keyword_sharding import fetch_search_volume_tasks_concurrently
+from config import CacheSettings
+from utils.swr_cache import stale_while_revalidate
 
 # Nastavenie loggera
 logger = logging.getLogger(__name__)
 
-@st.cache_data(ttl=CacheSettings.SEARCH_DATA_TTL)
+def search_data_cache_label(login: str, password: str, kw_list_tuple: Tuple[str, ...], location_codes: Any, lang_code: LanguageSelection, date_from: datetime, date_to: datetime, *args: Any) -> str:
+    """Popis záznamu cache search volume dát (bez prihlasovacích údajov)."""
+    locations = ", ".join(map(str, location_codes)) if isinstance(location_codes, tuple) else str(location_codes)
+    if isinstance(lang_code, str):
+        languages = lang_code
+    else:
+        languages = ", ".join(dict.fromkeys(item if isinstance(item, str) else item[1] for item in lang_code))
+    return f"{len(kw_list_tuple)} kľúčových slov | {locations} | {languages} | {date_from:%Y-%m} až {date_to:%Y-%m}"
+
+def search_data_cache(name: str) -> Any:
+    """Stale-while-revalidate cache pre search volume fetchery (namiesto st.cache_data)."""
+    return stale_while_revalidate(
+        name, ttl=lambda: CacheSettings.SEARCH_DATA_TTL, max_stale=lambda: CacheSettings.SEARCH_DATA_MAX_STALE,
+        max_entries=CacheSettings.SEARCH_DATA_MAX_ENTRIES, is_failure=lambda result: result[1] is not None,
+        label=search_data_cache_label
+    )
+
+@search_data_cache("Search volume (jedna krajina)")
 def fetch_search_volume_data_single(
     login: str,
     password: str,
@@ -27,9 +48,11 @@ def fetch_search_volume_data_single(
     lang_code: str,
     date_from: datetime,
     date_to: datetime
-) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
     """
     Získa a cachuje dáta pre analýzu jednej krajiny.
+    Z API sa načítajú len bunky chýbajúce v cache buniek (data_processing/fetch_planner.py),
+    dlhé zoznamy kľúčových slov po častiach súbežne.
     Filtruje dáta na presný časový rozsah mesiacov.
     
     Args:
@@ -42,7 +65,8 @@ def fetch_search_volume_data_single(
         date_to: Koncový dátum
         
     Returns:
-        Tuple[List[Dict[str, Any]], Optional[str]]: Dvojica (výsledky, chybová správa alebo None)
+        Tuple[Optional[pd.DataFrame], Optional[str]]: Dvojica (výsledky v stĺpcoch Keyword, Date,
+            Search Volume a Location Code, chybová správa alebo None)
     """
     keywords = list(kw_list_tuple)
     
@@ -51,68 +75,78 @@ def fetch_search_volume_data_single(
             return None, "Chyba: Chýbajú API prihlasovacie údaje."
         return None, "Chyba: Chýbajú vstupné parametre pre fetch_search_volume_data_single."
 
-    all_monthly_data_from_api, error_msg = get_search_volume_for_task(
-        login, password, keywords, loc_code, lang_code, date_from, date_to
-    )
+    # Z API sa načítajú len kľúčové slová a mesiace, ktoré chýbajú v cache buniek
+    cell_cache = get_search_volume_cell_cache()
+    plan = plan_search_volume_fetch(cell_cache, keywords, [loc_code], lang_code, date_from, date_to)
+    if not plan.tasks:
+        # Cache buniek je spoločná pre všetky účty; výsledok len z cache dostanú iba platné údaje
+        credentials_error = verify_credentials(login, password)
+        if credentials_error:
+            return None, credentials_error
+    task_outcomes = fetch_search_volume_tasks_concurrently(login, password, plan.tasks)
+    location_outcome = collect_location_outcomes(cell_cache, plan, task_outcomes)[0]
+    results_df, error_msg = location_outcome["results"], location_outcome["error"]
 
-    if error_msg:
+    # Ak zlyhali len niektoré časti kľúčových slov, vrátime výsledky ostatných spolu s chybou
+    if error_msg and results_df.empty:
         return None, error_msg
         
-    if not all_monthly_data_from_api: 
-        return [], None 
-
-    # Efektívnejšie filtrovanie pomocou pandas
-    try:
-        # Konvertujeme na DataFrame pre efektívnejšie filtrovanie
-        df = pd.DataFrame(all_monthly_data_from_api)
-        df['Date'] = pd.to_datetime(df['Date'])
-        
-        # Vytvoríme filtre pre dátumy
-        request_start_date_ts = pd.Timestamp(date_from).replace(day=1)
-        request_end_date_ts = pd.Timestamp(date_to).replace(day=1)
-        
-        # Filtrujeme dáta
-        mask = (df['Date'] >= request_start_date_ts) & (df['Date'] <= request_end_date_ts)
-        filtered_df = df[mask]
-        
-        # Konvertujeme naspäť na zoznam slovníkov
-        filtered_results = filtered_df.to_dict('records')
-    except Exception as e:
-        # Fallback na pôvodný spôsob filtrovania, ak nastane chyba
-        logger.error(f"Chyba pri filtrovaní dát: {e}")
-        filtered_results = []
-        request_start_date_ts = pd.Timestamp(date_from).replace(day=1)
-        request_end_date_ts = pd.Timestamp(date_to).replace(day=1)  
-
-        for record in all_monthly_data_from_api:
-            record_date_ts = pd.Timestamp(record['Date']).replace(day=1)
-            if request_start_date_ts <= record_date_ts <= request_end_date_ts:
-                filtered_results.append(record)
+    if results_df.empty: 
+        return results_df, None 
+
+    # Stĺpec Date je už typu datetime64, filtrujeme jednou vektorovou maskou
+    request_start_date_ts = pd.Timestamp(date_from).replace(day=1)
+    request_end_date_ts = pd.Timestamp(date_to).replace(day=1)
+    mask = results_df['Date'].between(request_start_date_ts, request_end_date_ts)
              
-    return filtered_results, None
+    return results_df[mask].reset_index(drop=True), error_msg
 
 
-@st.cache_data(ttl=CacheSettings.SEARCH_DATA_TTL)
+class _ScriptProgress:
+    """Progress bar a stavový text multi-country fetchu na stránke, ktorá fetch spustila."""
+
+    def __init__(self):
+        self._progress_bar = st.progress(0)
+        self._status_text = st.empty()
+
+    def update(self, fraction: Optional[float] = None, message: Optional[str] = None, level: str = "info") -> None:
+        if fraction is not None:
+            self._progress_bar.progress(fraction)
+        if message:
+            (self._status_text.error if level == "error" else self._status_text.info)(message)
+
+    def close(self) -> None:
+        self._status_text.empty()
+        self._progress_bar.empty()
+
+def _script_progress() -> Optional[_ScriptProgress]:
+    """Priebeh na stránke, alebo None mimo Streamlit skriptu (obnova SWR cache na pozadí nemá stránku)."""
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    return _ScriptProgress()
+
+@search_data_cache("Search volume (viac krajín)")
 def fetch_multi_country_search_volume_data(
     login: str,
     password: str,
     kw_list_tuple: Tuple[str, ...],
     selected_location_codes_tuple: Tuple[int, ...],
-    lang_code: str,
+    lang_code: LanguageSelection,
     date_from: datetime,
     date_to: datetime,
     all_location_options_tuple: Tuple[Tuple[str, int], ...]
 ) -> Tuple[pd.DataFrame, Optional[str]]:
     """
     Získa a cachuje dáta pre analýzu viacerých krajín.
-    Iteruje cez krajiny a volá fetch_search_volume_data_single.
+    Iteruje cez dvojice krajiny a jazyka a volá fetch_search_volume_data_single;
+    výsledok má stĺpce Country a Language.
     
     Args:
         login: API prihlasovacie meno
         password: API heslo
         kw_list_tuple: Tuple kľúčových slov
         selected_location_codes_tuple: Tuple kódov lokácií
-        lang_code: Kód jazyka
+        lang_code: Kód jazyka pre všetky krajiny, kódy jazykov alebo dvojice (kód lokácie, kód jazyka)
         date_from: Počiatočný dátum
         date_to: Koncový dátum
         all_location_options_tuple: Tuple všetkých dostupných lokácií
@@ -120,62 +154,59 @@ def fetch_multi_country_search_volume_data(
     Returns:
         Tuple[pd.DataFrame, Optional[str]]: Dvojica (výsledný DataFrame, chybová správa alebo None)
     """
-    all_results_list = [] 
+    result_frames = []
     errors_list = []
     
     kw_list = list(kw_list_tuple)
-    selected_location_codes = list(selected_location_codes_tuple)
+    targets = fetch_targets(selected_location_codes_tuple, lang_code)
+    multiple_languages = len({language for _, language in targets}) > 1
     
     # Vytvoríme mapu z location_code na názov
     location_code_to_name_map = {code: name for name, code in list(all_location_options_tuple)}
 
-    progress_bar = st.progress(0)
-    status_text = st.empty()
+    # Pri obnove na pozadí (utils/swr_cache.py) sa nič nevykresľuje
+    progress = _script_progress()
 
-    for i, loc_code in enumerate(selected_location_codes):
+    for i, (loc_code, target_lang_code) in enumerate(targets):
         location_name = location_code_to_name_map.get(loc_code, str(loc_code))
-        status_text.info(f"⏳ Získavam dáta pre krajinu: {location_name} ({i+1}/{len(selected_location_codes)})...")
+        target_label = f"{location_name} ({target_lang_code})" if multiple_languages else location_name
+        if progress:
+            progress.update(message=f"⏳ Získavam dáta pre krajinu: {target_label} ({i+1}/{len(targets)})...")
         
-        single_country_data_list, error_msg_single = fetch_search_volume_data_single(
+        single_country_df, error_msg_single = fetch_search_volume_data_single(
             login, password, 
             tuple(kw_list), 
             loc_code,
-            lang_code,
+            target_lang_code,
             date_from,
             date_to
         )
 
         if error_msg_single:
-            errors_list.append(f"Chyba pre krajinu {location_name} ({loc_code}): {error_msg_single}")
+            language_label = f", {target_lang_code}" if multiple_languages else ""
+            errors_list.append(f"Chyba pre krajinu {location_name} ({loc_code}{language_label}): {error_msg_single}")
             # Ak chyba obsahuje "Too many requests", môžeme pridať dlhšiu pauzu alebo zastaviť
-            if "50301" in error_msg_single or "Too many requests" in error_msg_single:
-                status_text.error(f"API Limit prekročený pri krajine {location_name}. Skúste znova o chvíľu alebo s menším počtom krajín.")
+            if progress and ("50301" in error_msg_single or "Too many requests" in error_msg_single):
+                progress.update(level="error", message=f"API Limit prekročený pri krajine {location_name}. Skúste znova o chvíľu alebo s menším počtom krajín.")
                 # Môžeme tu vrátiť čiastočné výsledky a pokračovať
-        elif single_country_data_list:
-            # Možnosť optimalizácie - pridanie údajov naraz do DataFrame
-            country_data = [
-                {**record, 'Country': location_name} 
-                for record in single_country_data_list
-            ]
-            all_results_list.extend(country_data)
-        
-        progress_bar.progress((i + 1) / len(selected_location_codes))
+        # Pri čiastočnej chybe (zlyhala len časť kľúčových slov) ponecháme úspešne načítané dáta
+        if single_country_df is not None and not single_country_df.empty:
+            # Názov krajiny a jazyk sa pridajú celému stĺpcovému bloku naraz
+            result_frames.append(single_country_df.assign(Country=location_name, Language=target_lang_code))
         
-        # Pridanie pauzy medzi API volaniami, aby sa predišlo "Too many requests"
-        if i < len(selected_location_codes) - 1:  # Nerobíme pauzu po poslednom volaní
-            sleep_duration = DataProcessingSettings.API_RATE_LIMIT_SLEEP  # sekundy
-            status_text.info(f"Pauza {sleep_duration}s pred ďalším API volaním...")
-            time.sleep(sleep_duration)
+        # Pauzy medzi API volaniami rieši zdieľaný rate limiter v api_client
+        if progress:
+            progress.update(fraction=(i + 1) / len(targets))
 
-    status_text.empty()
-    progress_bar.empty()
+    if progress:
+        progress.close()
 
-    if not errors_list and not all_results_list:
+    if not errors_list and not result_frames:
         return pd.DataFrame(), "Pre zadané kritériá a vybrané krajiny neboli nájdené žiadne dáta."
     
     final_error_message = "\n".join(errors_list) if errors_list else None
     
-    # Efektívnejšie vytváranie DataFrame - rovno z listu výsledkov
-    all_results_df = pd.DataFrame(all_results_list) if all_results_list else pd.DataFrame()
+    # Bloky jednotlivých krajín sa spoja jedným krokom
+    all_results_df = pd.concat(result_frames, ignore_index=True) if result_frames else pd.DataFrame()
     
     return all_results_df, final_error_message
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+Modul pre rozdelenie dlhých zoznamov kľúčových slov na časti (shardy) podľa limitu API.
+Shardy sa načítavajú súbežne a ich výsledky sa spájajú do jednej sady výsledkov.
+"""
+from typing import List, Dict, Tuple, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import logging
+import pandas as pd
+
+from api_client.dataforseo_client import build_search_volume_task, get_search_volume_tasks
+from api_client.search_volume_columns import empty_search_volume_frame
+from api_client.single_flight import fetch_tasks_single_flight
+from config import DataProcessingSettings
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+def shard_keywords(keywords: List[str], max_keywords_per_shard: Optional[int] = None) -> List[List[str]]:
+    """Rozdelí zoznam kľúčových slov na časti s veľkosťou povolenou API.
+    
+    Duplicitné kľúčové slová sa odstránia (zachová sa poradie prvého výskytu),
+    aby sa zbytočne neplatilo za ten istý dopyt viackrát.
+    
+    Args:
+        keywords: Zoznam kľúčových slov
+        max_keywords_per_shard: Maximálny počet kľúčových slov v jednej časti
+            (predvolene DataProcessingSettings.MAX_KEYWORDS_PER_TASK)
+        
+    Returns:
+        List[List[str]]: Zoznam častí kľúčových slov
+    """
+    if max_keywords_per_shard is None:
+        max_keywords_per_shard = DataProcessingSettings.get('MAX_KEYWORDS_PER_TASK', 1000)
+    max_keywords_per_shard = max(1, max_keywords_per_shard)
+    
+    unique_keywords = list(dict.fromkeys(keywords))
+    return [
+        unique_keywords[i:i + max_keywords_per_shard]
+        for i in range(0, len(unique_keywords), max_keywords_per_shard)
+    ]
+
+def merge_shard_outcomes(shard_outcomes: List[Dict[str, Any]], shard_sizes: List[int]) -> Dict[str, Any]:
+    """Spojí výsledky jednotlivých častí jedného tasku do jedného výsledku.
+    
+    Chyby sa hlásia pre každú časť zvlášť, výsledky úspešných častí sa zachovajú.
+    
+    Args:
+        shard_outcomes: Výsledky častí v poradí častí (slovníky s kľúčmi
+            'location_code', 'language_code', 'results' (DataFrame), 'error' a voliteľne 'attempts')
+        shard_sizes: Počet kľúčových slov v jednotlivých častiach
+        
+    Returns:
+        Dict[str, Any]: Spojený výsledok s rovnakými kľúčmi a najvyšším počtom pokusov v 'attempts'
+    """
+    result_frames = []
+    shard_errors = []
+    shard_count = len(shard_outcomes)
+    
+    for shard_index, outcome in enumerate(shard_outcomes):
+        if not outcome["results"].empty:
+            result_frames.append(outcome["results"])
+        if outcome["error"]:
+            if shard_count == 1:
+                shard_errors.append(outcome["error"])
+            else:
+                shard_errors.append(
+                    f"Časť {shard_index + 1}/{shard_count} ({shard_sizes[shard_index]} kľúčových slov): {outcome['error']}"
+                )
+    
+    if len(result_frames) > 1:
+        merged_results = pd.concat(result_frames, ignore_index=True)
+    elif result_frames:
+        merged_results = result_frames[0]
+    else:
+        merged_results = empty_search_volume_frame()
+    
+    return {
+        "location_code": shard_outcomes[0]["location_code"],
+        "language_code": shard_outcomes[0]["language_code"],
+        "results": merged_results,
+        "error": "\n".join(shard_errors) if shard_errors else None,
+        # Najvyšší počet pokusov spomedzi častí
+        "attempts": max(outcome.get("attempts", 1) for outcome in shard_outcomes),
+    }
+
+def fetch_search_volume_tasks_concurrently(
+    login: str,
+    password: str,
+    tasks: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Synchrónne načíta tasky, každý samostatným volaním, súbežne vo vláknach.
+    
+    Najviac DataProcessingSettings.SHARD_MAX_WORKERS taskov naraz. Rovnaký task, ktorý
+    práve načítava iná session, sa neodošle druhýkrát.
+    
+    Args:
+        login: API prihlasovacie meno
+        password: API heslo
+        tasks: Tasky vytvorené pomocou build_search_volume_task
+        
+    Returns:
+        List[Dict[str, Any]]: Výsledok pre každý task v poradí vstupu (pozri get_search_volume_tasks)
+    """
+    def fetch_task(task: Dict[str, Any]) -> Dict[str, Any]:
+        return fetch_tasks_single_flight(
+            login, password, [task], lambda own_tasks: get_search_volume_tasks(login, password, own_tasks)
+        )[0]
+    
+    if len(tasks) <= 1:
+        return [fetch_task(task) for task in tasks]
+    max_workers = min(len(tasks), DataProcessingSettings.get('SHARD_MAX_WORKERS', 4))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="keyword_shard") as executor:
+        return list(executor.map(fetch_task, tasks))
+
+def fetch_search_volume_sharded(
+    login: str,
+    password: str,
+    keywords: List[str],
+    location_code: int,
+    language_code: str,
+    date_from: datetime,
+    date_to: datetime
+) -> Tuple[pd.DataFrame, Optional[str]]:
+    """Získa objem vyhľadávania pre ľubovoľne dlhý zoznam kľúčových slov.
+    
+    Zoznam sa rozdelí na časti podľa limitu API a časti sa načítajú súbežne
+    vo vláknach (najviac DataProcessingSettings.SHARD_MAX_WORKERS naraz).
+    
+    Args:
+        login: API prihlasovacie meno
+        password: API heslo
+        keywords: Zoznam kľúčových slov
+        location_code: Kód lokácie
+        language_code: Kód jazyka
+        date_from: Počiatočný dátum
+        date_to: Koncový dátum
+        
+    Returns:
+        Tuple[pd.DataFrame, Optional[str]]: Dvojica (spojené výsledky, chybová správa alebo None)
+    """
+    shards = shard_keywords(keywords)
+    if not shards:
+        return empty_search_volume_frame(), None
+    
+    if len(shards) > 1:
+        logger.info(f"Načítavam {len(keywords)} kľúčových slov v {len(shards)} častiach")
+    shard_outcomes = fetch_search_volume_tasks_concurrently(login, password, [
+        build_search_volume_task(shard, location_code, language_code, date_from, date_to)
+        for shard in shards
+    ])
+    
+    merged = merge_shard_outcomes(shard_outcomes, [len(shard) for shard in shards])
+    return merged["results"], merged["error"]
@@ -0,0 +1,285 @@
+"""
+Indexovaný katalóg lokácií DataForSEO pre vyhľadávanie počas písania.
+
+Zoznam lokácií Google Ads má desaťtisíce položiek. Katalóg sa z neho postaví raz:
+kódy, názvy a typy sú v kompaktných poliach zoradených podľa zobrazovaného názvu, nad nimi
+je prefixový index slov a trigramový index. Hľadanie tak prechádza len kandidátov z indexu
+a do prehliadača sa posiela iba niekoľko desiatok nájdených lokácií namiesto celého zoznamu.
+
+Katalóg je spoločný pre celý proces a ukladá sa do CacheSettings.PERSISTENT_CACHE_DIR, takže
+po reštarte sa nemusí znova sťahovať. Súbor obsahuje len polia s kódmi, názvami a typmi
+(numpy .npz bez pickle), indexy sa po načítaní postavia znova. Platí CacheSettings.LOCATIONS_TTL.
+"""
+from typing import List, Dict, Tuple, Optional, Iterable
+from bisect import bisect_left
+import heapq
+import logging
+import os
+import re
+import tempfile
+import time
+import unicodedata
+
+import numpy as np
+
+from api_client.dataforseo_client import fetch_location_rows, location_display_name
+from config import CacheSettings
+from utils.swr_cache import stale_while_revalidate
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+CATALOG_FILENAME = "locations_catalog.npz"
+
+# Verzia formátu uloženého katalógu; pri zmene štruktúry sa starý súbor ignoruje
+CATALOG_FORMAT_VERSION = 2
+
+# Počet lokácií, ktoré vráti jedno hľadanie
+DEFAULT_SEARCH_LIMIT = 30
+
+_WORD_SEPARATORS = re.compile(r"[\s,()\-/]+")
+
+def fold_text(text: str) -> str:
+    """Text na porovnávanie: malé písmená bez diakritiky (napr. 'Česko' -> 'cesko')."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+def _search_text(text: str) -> str:
+    """Text bez diakritiky so slovami oddelenými jednou medzerou."""
+    return " ".join(word for word in _WORD_SEPARATORS.split(fold_text(text)) if word)
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class LocationCatalog:
+    """Lokácie v poliach zoradených podľa zobrazovaného názvu s prefixovým a trigramovým indexom."""
+
+    def __init__(self, rows: Iterable[Tuple[int, str, Optional[str]]], built_at: Optional[float] = None):
+        """
+        Args:
+            rows: Lokácie ako (kód, názov, typ lokácie), napr. z fetch_location_rows
+            built_at: Čas stiahnutia lokácií (pri načítaní z disku), inak aktuálny čas
+        """
+        locations = {int(code): (name, location_type or "") for code, name, location_type in rows}
+        entries = sorted(
+            ((location_display_name(name, location_type), code, name, location_type)
+             for code, (name, location_type) in locations.items()),
+            key=lambda entry: entry[0]
+        )
+
+        self.displays: List[str] = [entry[0] for entry in entries]
+        self.names: List[str] = [entry[2] for entry in entries]
+        self.codes = np.array([entry[1] for entry in entries], dtype=np.int64)
+        self.location_types: List[str] = sorted({entry[3] for entry in entries if entry[3]})
+        type_ids = {location_type: index for index, location_type in enumerate(self.location_types)}
+        self.type_ids = np.array([type_ids.get(entry[3], -1) for entry in entries], dtype=np.int16)
+        self.built_at = time.time() if built_at is None else built_at
+
+        self._rows_by_code: Dict[int, int] = {code: row for row, code in enumerate(self.codes.tolist())}
+        self._folded: List[str] = [_search_text(display) for display in self.displays]
+
+        # Prefixový index: zoradené (slovo, riadok) pre hľadanie podľa začiatku slova
+        terms = sorted(
+            (word, row) for row, folded in enumerate(self._folded)
+            for word in set(folded.split(" ")) if word
+        )
+        self._prefix_terms: List[str] = [term for term, _ in terms]
+        self._prefix_rows = np.array([row for _, row in terms], dtype=np.int32)
+
+        # Trigramový index: zoradené riadky všetkých trigramov v jednom poli, trigram -> (začiatok, koniec)
+        postings: Dict[str, List[int]] = {}
+        for row, folded in enumerate(self._folded):
+            for trigram in _trigrams(folded):
+                postings.setdefault(trigram, []).append(row)
+        self._trigram_spans: Dict[str, Tuple[int, int]] = {}
+        offset = 0
+        for trigram, rows in postings.items():
+            self._trigram_spans[trigram] = (offset, offset + len(rows))
+            offset += len(rows)
+        self._trigram_rows = np.fromiter(
+            (row for rows in postings.values() for row in rows), dtype=np.int32, count=offset
+        )
+
+    def __len__(self) -> int:
+        return len(self.displays)
+
+    def __contains__(self, code) -> bool:
+        return code in self._rows_by_code
+
+    def display(self, code: int) -> str:
+        """Zobrazovaný názov lokácie (kód, ak lokácia v katalógu nie je)."""
+        row = self._rows_by_code.get(code)
+        return self.displays[row] if row is not None else str(code)
+
+    def name(self, code: int) -> Optional[str]:
+        row = self._rows_by_code.get(code)
+        return self.names[row] if row is not None else None
+
+    def location_type(self, code: int) -> Optional[str]:
+        row = self._rows_by_code.get(code)
+        if row is None or self.type_ids[row] < 0:
+            return None
+        return self.location_types[self.type_ids[row]]
+
+    def options(self, codes: Iterable[int]) -> Tuple[Tuple[str, int], ...]:
+        """Dvojice (zobrazovaný názov, kód) len pre zadané lokácie, vo formáte load_locations."""
+        return tuple((self.display(code), code) for code in codes)
+
+    def _prefix_candidates(self, prefix: str) -> np.ndarray:
+        start = bisect_left(self._prefix_terms, prefix)
+        end = bisect_left(self._prefix_terms, prefix + "\uffff", lo=start)
+        return np.unique(self._prefix_rows[start:end])
+
+    def _trigram_candidates(self, query: str) -> np.ndarray:
+        spans = [self._trigram_spans.get(trigram) for trigram in _trigrams(query)]
+        if None in spans:
+            return np.empty(0, dtype=np.int32)
+        spans.sort(key=lambda span: span[1] - span[0])
+        candidates = self._trigram_rows[spans[0][0]:spans[0][1]]
+        for start, end in spans[1:]:
+            candidates = np.intersect1d(candidates, self._trigram_rows[start:end], assume_unique=True)
+            if not len(candidates):
+                break
+        return candidates
+
+    def search(self, query: str, location_type: Optional[str] = None, limit: int = DEFAULT_SEARCH_LIMIT) -> List[int]:
+        """Nájde lokácie podľa časti názvu.
+
+        Krátky dopyt (1-2 znaky) hľadá začiatky slov cez prefixový index, dlhší dopyt
+        ľubovoľnú časť názvu cez trigramový index. Poradie: presná zhoda, začiatok názvu,
+        začiatok slova, ostatné; v rámci skupiny abecedne.
+
+        Args:
+            query: Hľadaný text (na veľkosti písmen a diakritike nezáleží)
+            location_type: Len lokácie tohto typu (napr. "Country"), None pre všetky
+            limit: Maximálny počet výsledkov
+
+        Returns:
+            List[int]: Kódy nájdených lokácií
+        """
+        folded_query = _search_text(query)
+        type_id = None
+        if location_type is not None:
+            if location_type not in self.location_types:
+                return []
+            type_id = self.location_types.index(location_type)
+
+        if not folded_query:
+            rows = np.arange(len(self), dtype=np.int32)
+            if type_id is not None:
+                rows = rows[self.type_ids == type_id]
+            return self.codes[rows[:limit]].tolist()
+
+        if len(folded_query) < 3:
+            candidates = self._prefix_candidates(folded_query)
+        else:
+            candidates = self._trigram_candidates(folded_query)
+        if type_id is not None and len(candidates):
+            candidates = candidates[self.type_ids[candidates] == type_id]
+
+        def rank(row: int) -> Tuple[int, int]:
+            folded = self._folded[row]
+            if folded == folded_query:
+                return (0, row)
+            if folded.startswith(folded_query):
+                return (1, row)
+            return (2 if f" {folded_query}" in f" {folded}" else 3, row)
+
+        matches = (row for row in candidates.tolist() if folded_query in self._folded[row])
+        return [int(self.codes[row]) for _, row in heapq.nsmallest(limit, map(rank, matches))]
+
+    def save(self, path: str) -> None:
+        """Uloží lokácie katalógu atomicky (zápis do dočasného súboru a premenovanie).
+
+        Ukladajú sa len numpy polia (.npz), nie objekty, takže načítanie nespúšťa kód zo súboru.
+        """
+        directory = os.path.dirname(path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temporary_path = tempfile.mkstemp(prefix=".catalog-", dir=directory)
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    np.savez(
+                        file,
+                        version=np.array(CATALOG_FORMAT_VERSION, dtype=np.int64),
+                        built_at=np.array(self.built_at, dtype=np.float64),
+                        codes=self.codes,
+                        names=np.array(self.names, dtype=np.str_),
+                        location_types=np.array(self.location_types, dtype=np.str_),
+                        type_ids=self.type_ids
+                    )
+                os.replace(temporary_path, path)
+            except BaseException:
+                os.unlink(temporary_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Nepodarilo sa uložiť katalóg lokácií {path}: {e}")
+
+    @staticmethod
+    def load(path: str) -> Optional["LocationCatalog"]:
+        """Načíta uložený katalóg a postaví jeho indexy, alebo None, ak neexistuje alebo má starý formát."""
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                if int(stored["version"]) != CATALOG_FORMAT_VERSION:
+                    return None
+                built_at = float(stored["built_at"])
+                codes = stored["codes"].tolist()
+                names = stored["names"].tolist()
+                location_types = stored["location_types"].tolist()
+                type_ids = stored["type_ids"].tolist()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Nepodarilo sa načítať katalóg lokácií {path}: {e}")
+            return None
+        rows = (
+            (code, name, location_types[type_id] if type_id >= 0 else None)
+            for code, name, type_id in zip(codes, names, type_ids)
+        )
+        return LocationCatalog(rows, built_at=built_at)
+
+def _catalog_path() -> str:
+    return os.path.join(CacheSettings.PERSISTENT_CACHE_DIR, CATALOG_FILENAME)
+
+@stale_while_revalidate(
+    "Katalóg lokácií", ttl=lambda: CacheSettings.LOCATIONS_TTL, max_stale=lambda: CacheSettings.LOCATIONS_MAX_STALE,
+    is_failure=lambda result: result[1] is not None, copy_result=False
+)
+def _load_location_catalog(login: str, password: str) -> Tuple[Optional[LocationCatalog], Optional[str]]:
+    """Načíta čerstvý katalóg z disku, alebo ho postaví zo zoznamu z API a uloží."""
+    if CacheSettings.PERSISTENT_CACHE_ENABLED:
+        stored = LocationCatalog.load(_catalog_path())
+        if stored is not None and time.time() - stored.built_at < CacheSettings.LOCATIONS_TTL:
+            return stored, None
+
+    location_rows, error_msg = fetch_location_rows(login, password)
+    if error_msg:
+        return None, error_msg
+
+    started = time.perf_counter()
+    catalog = LocationCatalog(location_rows)
+    logger.info(f"Katalóg lokácií ({len(catalog)}) postavený za {time.perf_counter() - started:.2f} s")
+    if CacheSettings.PERSISTENT_CACHE_ENABLED:
+        catalog.save(_catalog_path())
+    return catalog, None
+
+def get_location_catalog(login: str, password: str) -> Tuple[Optional[LocationCatalog], Optional[str]]:
+    """Vráti katalóg lokácií z pamäte, z disku, alebo ho postaví zo zoznamu z API.
+
+    Zastaraný katalóg sa vráti okamžite a obnoví na pozadí (CacheSettings.LOCATIONS_MAX_STALE);
+    súbežné session pri prvom načítaní počkajú na jedno stiahnutie.
+
+    Args:
+        login: API prihlasovacie meno
+        password: API heslo
+
+    Returns:
+        Tuple[Optional[LocationCatalog], Optional[str]]: Dvojica (katalóg alebo None, chybová správa alebo None)
+    """
+    if not login or not password:
+        return None, "Chýbajú API prihlasovacie údaje."
+    return _load_location_catalog(login, password)
+
+def reset_location_catalog() -> None:
+    """Zabudne katalóg v pamäti (uložený súbor ostáva)."""
+    _load_location_catalog.clear()
@@ -0,0 +1,194 @@
+"""
+Perzistentné úložisko buniek search volume cache v SQLite.
+
+Bunky (kľúčové slovo, lokácia, jazyk, mesiac) -> objem prežijú reštart, pád aj nové
+nasadenie aplikácie; cache plánovača (data_processing/fetch_planner.py) ich pri ďalšej
+požiadavke načíta z disku namiesto volania API. Databáza je v adresári
+CacheSettings.PERSISTENT_CACHE_DIR a môže ju naraz používať viac worker procesov:
+zápisy prebiehajú v transakciách (WAL režim, čakanie na zámok), takže sú atomické.
+Bunky staršie ako CacheSettings.SEARCH_CELLS_TTL sa ignorujú a pri prekročení
+CacheSettings.PERSISTENT_CACHE_MAX_MB sa odstránia najstaršie bunky.
+
+Chyba disku alebo databázy nikdy nezastaví načítanie dát, iba sa zaloguje.
+"""
+from typing import List, Tuple, Optional, Iterable, Dict
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from config import CacheSettings
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+DATABASE_FILENAME = "search_volume_cells.sqlite3"
+
+# Riadok bunky: (normalizované kľúčové slovo, kľúčové slovo, lokácia, jazyk, mesiac, objem, čas uloženia)
+CellRow = Tuple[str, str, int, str, int, int, float]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cells (
+    keyword_key TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    location_code INTEGER NOT NULL,
+    language_code TEXT NOT NULL,
+    month INTEGER NOT NULL,
+    volume INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (location_code, language_code, keyword_key, month)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cells_stored_at ON cells (stored_at);
+"""
+
+# Počet parametrov v jednom IN (...) dotaze, pod limitom starších verzií SQLite
+_QUERY_CHUNK = 500
+
+# Veľkosť databázy sa kontroluje po každom N-tom zápise
+_EVICTION_CHECK_INTERVAL = 20
+
+# Chyby úložiska, ktoré sa len zalogujú: databáza aj disk, napr. adresár, ktorý sa nedá vytvoriť
+# (PermissionError na read-only zväzku alebo neplatná cesta SOS_CACHE_DIR)
+_STORE_ERRORS = (sqlite3.Error, OSError)
+
+class PersistentCellStore:
+    """SQLite úložisko buniek zdieľané vláknami aj procesmi."""
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        self.path = path
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes if self._max_bytes is not None else int(CacheSettings.PERSISTENT_CACHE_MAX_MB * 1024 * 1024)
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl if self._ttl is not None else CacheSettings.SEARCH_CELLS_TTL
+
+    def _connection(self) -> sqlite3.Connection:
+        """Vráti spojenie pre aktuálne vlákno (sqlite3 spojenia sa medzi vláknami nezdieľajú)."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            # Auto-vacuum sa dá zapnúť len pred vytvorením tabuliek
+            connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.executescript(_SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def load(
+        self,
+        keyword_keys: Iterable[str],
+        location_code: int,
+        language_code: str,
+        first_month: int,
+        last_month: int
+    ) -> List[CellRow]:
+        """Načíta platné bunky kľúčových slov jednej lokácie a jazyka v rozsahu mesiacov.
+
+        Returns:
+            List[CellRow]: Nájdené bunky (prázdny zoznam aj pri chybe databázy)
+        """
+        keyword_keys = list(keyword_keys)
+        oldest = time.time() - self.ttl
+        rows: List[CellRow] = []
+        try:
+            connection = self._connection()
+            for start in range(0, len(keyword_keys), _QUERY_CHUNK):
+                chunk = keyword_keys[start:start + _QUERY_CHUNK]
+                rows.extend(connection.execute(
+                    "SELECT keyword_key, keyword, location_code, language_code, month, volume, stored_at FROM cells "
+                    "WHERE location_code = ? AND language_code = ? AND month BETWEEN ? AND ? AND stored_at >= ? "
+                    f"AND keyword_key IN ({','.join('?' * len(chunk))})",
+                    (location_code, language_code, first_month, last_month, oldest, *chunk)
+                ))
+        except _STORE_ERRORS as e:
+            logger.warning(f"Nepodarilo sa načítať bunky z perzistentnej cache {self.path}: {e}")
+        return rows
+
+    def save(self, rows: List[CellRow]) -> None:
+        """Uloží bunky jednou transakciou (atomicky aj voči iným procesom)."""
+        if not rows:
+            return
+        try:
+            connection = self._connection()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO cells "
+                    "(keyword_key, keyword, location_code, language_code, month, volume, stored_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+        except _STORE_ERRORS as e:
+            logger.warning(f"Nepodarilo sa uložiť bunky do perzistentnej cache {self.path}: {e}")
+            return
+        with self._writes_lock:
+            self._writes += 1
+            check_size = self._writes % _EVICTION_CHECK_INTERVAL == 1
+        if check_size:
+            self.evict()
+
+    def size_bytes(self) -> int:
+        """Veľkosť databázy bez voľných stránok."""
+        connection = self._connection()
+        page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+        page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+        freelist_count = connection.execute("PRAGMA freelist_count").fetchone()[0]
+        return page_size * (page_count - freelist_count)
+
+    def evict(self) -> None:
+        """Odstráni zastarané bunky a pri prekročení veľkosti aj najstaršie bunky."""
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute("DELETE FROM cells WHERE stored_at < ?", (time.time() - self.ttl,))
+            size = self.size_bytes()
+            if size > self.max_bytes:
+                count = connection.execute("SELECT COUNT(*) FROM cells").fetchone()[0]
+                # Odstráni toľko najstarších buniek, aby databáza klesla pod 90 % limitu
+                remove = max(1, int(count * (1 - 0.9 * self.max_bytes / size)))
+                with connection:
+                    connection.execute(
+                        "DELETE FROM cells WHERE stored_at <= "
+                        "(SELECT stored_at FROM cells ORDER BY stored_at LIMIT 1 OFFSET ?)",
+                        (min(remove, count) - 1,)
+                    )
+                logger.info(f"Perzistentná cache prekročila {self.max_bytes} B, odstránených ~{remove} najstarších buniek")
+            connection.execute("PRAGMA incremental_vacuum")
+        except _STORE_ERRORS as e:
+            logger.warning(f"Nepodarilo sa uvoľniť miesto v perzistentnej cache {self.path}: {e}")
+
+    def clear(self) -> None:
+        """Odstráni všetky bunky."""
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute("DELETE FROM cells")
+            connection.execute("PRAGMA incremental_vacuum")
+        except _STORE_ERRORS as e:
+            logger.warning(f"Nepodarilo sa vyprázdniť perzistentnú cache {self.path}: {e}")
+
+_stores: Dict[str, PersistentCellStore] = {}
+_stores_lock = threading.Lock()
+
+def get_persistent_cell_store() -> Optional[PersistentCellStore]:
+    """Vráti perzistentné úložisko podľa CacheSettings, alebo None, ak je vypnuté."""
+    if not CacheSettings.PERSISTENT_CACHE_ENABLED:
+        return None
+    path = os.path.abspath(os.path.join(CacheSettings.PERSISTENT_CACHE_DIR, DATABASE_FILENAME))
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = PersistentCellStore(path)
+        return store
@@ -145,6 +145,12 @@ def calculate_growth_data(period_volume_sum_df, period_col, sort_key_func, keywo
     heatmap_pivot = growth_df.pivot(index=keyword_col, columns=period_col, values='Period Growth (%)')
     return heatmap_pivot
 
+def filter_languages(mc_df_raw_data, selected_languages, language_col='Language'):
+    """Ponechá len riadky vybraných jazykov; bez výberu alebo bez stĺpca jazyka vráti dáta nezmenené."""
+    if selected_languages is None or language_col not in mc_df_raw_data.columns:
+        return mc_df_raw_data
+    return mc_df_raw_data[mc_df_raw_data[language_col].isin(selected_languages)].copy()
+
 def transform_total_sos_across_countries(mc_df_aggregated_by_period_keyword, period_col='Period', keyword_col='Keyword', volume_col='Search Volume'):
     return calculate_sos_data(mc_df_aggregated_by_period_keyword, period_col, keyword_col, volume_col)
 
@@ -301,4 +307,28 @@ def transform_flexible_avg_volume_by_country_display(mc_df_raw_data, selected_ke
     # Funkcia calculate_average_monthly_keyword_volume premenuje keyword_col na 'Average Search Volume'
     # a ponechá pôvodný keyword_col (v našom prípade country_col).
     # Výstupný DataFrame by mal mať stĺpce: period_col, country_col, 'Average Search Volume'
-    return avg_volume_df_by_country
\ No newline at end of file
+    return avg_volume_df_by_country
+
+def transform_flexible_avg_volume_by_language_display(mc_df_raw_data, selected_keywords_to_aggregate, selected_countries, selected_languages_to_display, granularity_str, period_col='Period', keyword_col='Keyword', country_col='Country', language_col='Language', date_col='Date', volume_col='Search Volume'):
+    """
+    Pripraví dáta pre priemerný objem, kde sú JAZYKY zobrazené ako samostatné série.
+    Objemy vybraných značiek z vybraných krajín sa sčítajú v rámci každého jazyka, potom sa
+    vypočíta priemerný objem pre každý jazyk podľa granularity (rovnako ako pri Grafoch 5 a 6).
+    Výstup má stĺpce period_col, language_col a 'Average Search Volume'.
+    """
+    if mc_df_raw_data.empty or language_col not in mc_df_raw_data.columns or not selected_countries:
+        return pd.DataFrame(columns=[period_col, language_col, 'Average Search Volume'])
+
+    # Filter podľa krajín, ktorých dáta sa sčítajú; jazyk potom funguje ako zobrazovaná entita
+    df_filtered_by_countries = mc_df_raw_data[mc_df_raw_data[country_col].isin(selected_countries)]
+    return transform_flexible_avg_volume_by_country_display(
+        df_filtered_by_countries,
+        selected_keywords_to_aggregate,
+        selected_languages_to_display,
+        granularity_str,
+        period_col=period_col,
+        keyword_col=keyword_col,
+        country_col=language_col,
+        date_col=date_col,
+        volume_col=volume_col
+    )
@@ -93,7 +93,7 @@ def main():
     api_login, api_password = config.get_dataforseo_credentials()
     
     # Renderovanie postranného panela a získanie dostupných možností
-    location_options, locations_error, language_options, languages_error = ui_sidebar.render_sidebar(api_login, api_password)
+    location_catalog, locations_error, language_options, languages_error = ui_sidebar.render_sidebar(api_login, api_password)
     
     # Kontrola API prihlasovacích údajov
     if not validate_api_credentials(api_login, api_password):
@@ -107,19 +107,19 @@ def main():
     if analysis_mode == "Analýza jednej krajiny":
         ui_single_country.render_single_country_page(
             api_login, api_password, 
-            location_options, language_options, 
+            location_catalog, language_options, 
             locations_error, languages_error
         )
     elif analysis_mode == "Analýza viacerých krajín":
         # Kontrola, či sú potrebné options načítané
-        if not location_options and not locations_error: 
+        if not location_catalog and not locations_error: 
             st.warning("Zoznam krajín nie je k dispozícii. Funkcionalita 'Analýza viacerých krajín' môže byť obmedzená alebo nefunkčná.")
         if not language_options and not languages_error:
             st.warning("Zoznam jazykov nie je k dispozícii. Funkcionalita 'Analýza viacerých krajín' môže byť obmedzená alebo nefunkčná.")
         
         ui_multi_country.render_multi_country_page(
             api_login, api_password, 
-            location_options, language_options, 
+            location_catalog, language_options, 
             locations_error, languages_error
         )
     else:
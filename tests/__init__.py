@@ -1,3 +1,8 @@
 """
 Test package for Share of Search Tool.
 """
+import os
+import tempfile
+
+# Tests never read or write the persistent cache of a local app run
+os.environ.setdefault("SOS_CACHE_DIR", tempfile.mkdtemp(prefix="sos_test_cache_"))
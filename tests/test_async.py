@@ -11,7 +11,6 @@ import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from api_client.dataforseo_client import get_search_volume_async
-from data_processing.async_fetcher import fetch_multi_country_search_volume_data_async
 
 async def test_async_client():
     """Test the async API client functionality."""
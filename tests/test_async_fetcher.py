@@ -5,8 +5,11 @@ To run these tests, execute:
     python -m unittest tests/test_async_fetcher.py
 """
 import unittest
+from unittest import mock
 import asyncio
 import aiohttp
+import io
+import json as jsonlib
 from datetime import datetime, timedelta
 import sys
 import os
@@ -16,12 +19,28 @@ from typing import Dict, Any, List, Tuple, Optional
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from api_client.dataforseo_client import get_search_volume_async
+from api_client.dataforseo_client import (
+    build_search_volume_task,
+    get_search_volume_async,
+    get_search_volume_multi_async
+)
+from config import DataProcessingSettings, RetrySettings
+from data_processing.fetch_planner import get_search_volume_cell_cache
 from data_processing.async_fetcher import (
-    _fetch_multi_country_search_volume_data_async_internal,
-    fetch_multi_country_search_volume_data_async
+    MultiCountryFetchStream,
+    _fetch_multi_country_search_volume_data_async_internal
 )
 
+class MockStream:
+    """Mock aiohttp.StreamReader serving a JSON body in small chunks"""
+    
+    def __init__(self, data):
+        self._body = io.BytesIO(jsonlib.dumps(data).encode())
+    
+    async def read(self, n=-1):
+        return self._body.read(min(n, 256) if n > 0 else n)
+
+
 class MockSession:
     """Mock aiohttp.ClientSession for testing"""
     
@@ -29,9 +48,11 @@ class MockSession:
         self.response_data = response_data or {"tasks": [{"status_code": 20000, "result": []}]}
         self.should_raise = should_raise
         self.post_calls = []
+        self.status = 200
+        self.headers = {}
     
-    async def post(self, url, headers=None, json=None, timeout=None):
-        """Mock post method"""
+    def post(self, url, headers=None, json=None, timeout=None):
+        """Mock post method (used as `async with session.post(...)`)"""
         self.post_calls.append({
             "url": url,
             "headers": headers,
@@ -54,6 +75,11 @@ class MockSession:
         """Return mock response data"""
         return self.response_data
     
+    @property
+    def content(self):
+        """Mock streamed response body"""
+        return MockStream(self.response_data)
+    
     def raise_for_status(self):
         """Mock raise_for_status method"""
         if self.should_raise:
@@ -69,19 +95,29 @@ class MockSession:
 class TestAsyncFetcher(unittest.TestCase):
     """Test cases for async fetcher implementation"""
     
-    def test_fetch_multi_country_search_volume_data_async_signature(self):
-        """Test that the async function has the same signature as the original function"""
+    def setUp(self):
+        # Mocked calls should not wait on the shared process-wide rate limiter
+        patcher = mock.patch.object(DataProcessingSettings, "API_RATE_LIMIT_PER_MINUTE", 60000)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Every test fetches through the API, not from cells cached by an earlier test
+        get_search_volume_cell_cache().clear()
+    
+    def test_multi_country_fetch_stream_signature(self):
+        """Test that the async fetch stream takes the same request as the original function"""
         from data_processing.fetcher import fetch_multi_country_search_volume_data
         import inspect
         
-        async_sig = inspect.signature(fetch_multi_country_search_volume_data_async)
+        stream_sig = inspect.signature(MultiCountryFetchStream)
         orig_sig = inspect.signature(fetch_multi_country_search_volume_data)
         
-        # Both functions should have the same parameter names
-        self.assertEqual(async_sig.parameters.keys(), orig_sig.parameters.keys())
+        # The stream takes the same parameters plus an optional progress holder
+        self.assertEqual(list(stream_sig.parameters)[:-1], list(orig_sig.parameters))
+        self.assertEqual(list(stream_sig.parameters)[-1], "progress")
         
-        # Both functions should return the same type
-        self.assertEqual(async_sig.return_annotation, orig_sig.return_annotation)
+        # The combined result has the same type as the result of the original function
+        result_sig = inspect.signature(MultiCountryFetchStream.result)
+        self.assertEqual(result_sig.return_annotation, orig_sig.return_annotation)
 
     async def async_test_get_search_volume_async(self):
         """Test the async API client function"""
@@ -102,8 +138,8 @@ class TestAsyncFetcher(unittest.TestCase):
         self.assertEqual(mock_session.post_calls[0]["json"][0]["keywords"], ["test"])
         self.assertEqual(mock_session.post_calls[0]["json"][0]["location_code"], 123)
         
-        # Without real data, we expect an empty result list
-        self.assertEqual(result, [])
+        # Without real data, we expect an empty result batch
+        self.assertTrue(result.empty)
         self.assertIsNone(error)
         self.assertEqual(loc_code, 123)
 
@@ -126,7 +162,7 @@ class TestAsyncFetcher(unittest.TestCase):
         )
         
         # Assert that error is handled properly
-        self.assertEqual(result, [])
+        self.assertTrue(result.empty)
         self.assertIsNotNone(error)
         self.assertEqual(loc_code, 123)
 
@@ -134,5 +170,60 @@ class TestAsyncFetcher(unittest.TestCase):
         """Run the async error handling test using asyncio.run"""
         asyncio.run(self.async_test_get_search_volume_async_error_handling())
 
+    async def async_test_get_search_volume_multi_async_splits_tasks(self):
+        """Test that one multi-task POST is split back out per location"""
+        def monthly(volume):
+            return [{"year": 2024, "month": 1, "search_volume": volume}]
+
+        response_data = {"tasks": [
+            # Tasks are matched by tag, so the order of the response does not matter
+            {"status_code": 20000, "data": {"tag": "streamlit_app_request#1"},
+             "result": [{"keyword": "test", "monthly_searches": monthly(20)}]},
+            {"status_code": 50301, "status_message": "Too many requests.", "data": {"tag": "streamlit_app_request#2"}},
+            {"status_code": 20000, "data": {"tag": "streamlit_app_request#0"},
+             "result": [{"keyword": "test", "monthly_searches": monthly(10)}]},
+        ]}
+        mock_session = MockSession(response_data=response_data)
+        tasks = [
+            build_search_volume_task(["test"], loc_code, "en", datetime(2024, 1, 1), datetime(2024, 1, 31))
+            for loc_code in (111, 222, 333)
+        ]
+        # Retries are covered in test_retry.py, here we only check the split of one response
+        with mock.patch.object(RetrySettings, "MAX_ATTEMPTS", 1):
+            outcomes = await get_search_volume_multi_async(mock_session, "test", "test", tasks)
+
+        # All tasks are sent in one POST
+        self.assertEqual(len(mock_session.post_calls), 1)
+        self.assertEqual([task["location_code"] for task in mock_session.post_calls[0]["json"]], [111, 222, 333])
+
+        self.assertEqual([outcome["location_code"] for outcome in outcomes], [111, 222, 333])
+        self.assertEqual(outcomes[0]["results"]["Search Volume"].tolist(), [10])
+        self.assertEqual(outcomes[1]["results"]["Search Volume"].tolist(), [20])
+        self.assertIsNone(outcomes[0]["error"])
+        self.assertTrue(outcomes[2]["results"].empty)
+        self.assertIn("50301", outcomes[2]["error"])
+
+    def test_get_search_volume_multi_async_splits_tasks(self):
+        """Run the multi-task split test using asyncio.run"""
+        asyncio.run(self.async_test_get_search_volume_multi_async_splits_tasks())
+
+    async def async_test_get_search_volume_multi_async_error_handling(self):
+        """Test that an HTTP error of the whole POST is reported for every task"""
+        mock_session = MockSession(should_raise=True)
+        tasks = [
+            build_search_volume_task(["test"], loc_code, "en", datetime.now(), datetime.now())
+            for loc_code in (111, 222)
+        ]
+        outcomes = await get_search_volume_multi_async(mock_session, "test", "test", tasks)
+
+        self.assertEqual(len(outcomes), 2)
+        for outcome in outcomes:
+            self.assertTrue(outcome["results"].empty)
+            self.assertIsNotNone(outcome["error"])
+
+    def test_get_search_volume_multi_async_error_handling(self):
+        """Run the multi-task error handling test using asyncio.run"""
+        asyncio.run(self.async_test_get_search_volume_multi_async_error_handling())
+
 if __name__ == '__main__':
     unittest.main()
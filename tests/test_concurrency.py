@@ -0,0 +1,140 @@
+"""
+Unit tests for the adaptive (AIMD) concurrency window.
+
+To run these tests, execute:
+    python -m unittest tests/test_concurrency.py
+"""
+import unittest
+from unittest import mock
+import asyncio
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client import concurrency
+from api_client.concurrency import AimdConcurrencyLimiter, get_concurrency_limiter
+from config import ConcurrencySettings
+
+
+def complete(limiter, congested=False, latency=None):
+    """Runs one call through the limiter and records its outcome"""
+    async def run():
+        async with limiter.slot() as slot:
+            slot.start()
+            if latency is not None:
+                slot.started_at -= latency
+            slot.record(congested)
+    asyncio.run(run())
+
+
+class TestAimdConcurrencyLimiter(unittest.TestCase):
+    """Test cases for AimdConcurrencyLimiter"""
+
+    def test_window_grows_by_one_per_window_of_healthy_calls(self):
+        limiter = AimdConcurrencyLimiter(initial_window=2, min_window=1, max_window=10)
+        for _ in range(2):
+            complete(limiter, latency=0.1)
+        self.assertAlmostEqual(limiter.window, 2.9, places=1)
+        self.assertEqual(limiter.limit, 2)
+        complete(limiter, latency=0.1)
+        self.assertEqual(limiter.limit, 3)
+
+    def test_throttling_halves_the_window_once_per_episode(self):
+        limiter = AimdConcurrencyLimiter(initial_window=8, min_window=1, max_window=10)
+
+        async def run():
+            slots = [await limiter.acquire() for _ in range(4)]
+            for slot in slots:
+                slot.start()
+                slot.record(congested=True)
+                limiter.release(slot)
+        asyncio.run(run())
+
+        # Four calls sent with the same window hit the same overload: one decrease
+        self.assertEqual(limiter.window, 4.0)
+        self.assertEqual(limiter.snapshot()["decreases"], 1)
+        complete(limiter, congested=True)
+        self.assertEqual(limiter.window, 2.0)
+
+    def test_window_stays_within_bounds(self):
+        limiter = AimdConcurrencyLimiter(initial_window=2, min_window=2, max_window=3)
+        for _ in range(3):
+            complete(limiter, congested=True)
+        self.assertEqual(limiter.window, 2.0)
+        for _ in range(20):
+            complete(limiter, latency=0.1)
+        self.assertEqual(limiter.window, 3.0)
+
+    def test_latency_spike_shrinks_the_window(self):
+        limiter = AimdConcurrencyLimiter(initial_window=8, min_window=1, max_window=8, latency_spike_factor=2.0)
+        for _ in range(5):
+            complete(limiter, latency=0.1)
+        self.assertEqual(limiter.window, 8.0)
+
+        complete(limiter, latency=0.5)
+        self.assertEqual(limiter.window, 4.0)
+
+    def test_cancelled_call_does_not_change_the_window(self):
+        limiter = AimdConcurrencyLimiter(initial_window=4, min_window=1, max_window=8)
+        complete(limiter, congested=None)
+        self.assertEqual(limiter.window, 4.0)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_limit_caps_calls_in_flight(self):
+        limiter = AimdConcurrencyLimiter(initial_window=2, min_window=1, max_window=2)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with limiter.slot() as slot:
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+                slot.record(False)
+
+        async def run():
+            await asyncio.gather(*(call() for _ in range(6)))
+        asyncio.run(run())
+
+        self.assertEqual(peak, 2)
+        self.assertEqual(limiter.snapshot()["in_flight"], 0)
+        self.assertEqual(limiter.snapshot()["waiting"], 0)
+
+    def test_try_acquire_does_not_wait(self):
+        limiter = AimdConcurrencyLimiter(initial_window=1, min_window=1, max_window=1)
+        slot = limiter.try_acquire()
+        self.assertIsNotNone(slot)
+        self.assertIsNone(limiter.try_acquire())
+        limiter.release(slot)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_cancelled_waiter_gives_up_its_place(self):
+        limiter = AimdConcurrencyLimiter(initial_window=1, min_window=1, max_window=1)
+
+        async def run():
+            first = await limiter.acquire()
+            waiting = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0)
+            waiting.cancel()
+            limiter.release(first)
+            await asyncio.gather(waiting, return_exceptions=True)
+            await asyncio.sleep(0)
+        asyncio.run(run())
+
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertEqual(limiter.snapshot()["waiting"], 0)
+
+    def test_get_concurrency_limiter_is_shared_and_follows_settings(self):
+        with mock.patch.object(concurrency, "_concurrency_limiter", None):
+            limiter = get_concurrency_limiter()
+            self.assertIs(get_concurrency_limiter(), limiter)
+            self.assertEqual(limiter.window, ConcurrencySettings.INITIAL_WINDOW)
+
+            with mock.patch.object(ConcurrencySettings, "MAX_WINDOW", 2):
+                self.assertIs(get_concurrency_limiter(), limiter)
+                self.assertEqual(limiter.window, 2.0)
+                self.assertEqual(limiter.snapshot()["max_window"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Unit tests for the process-wide background event loop.
+
+To run these tests, execute:
+    python -m unittest tests/test_event_loop.py
+"""
+import unittest
+import asyncio
+import threading
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.event_loop import BackgroundEventLoop
+
+
+async def _current_thread_name():
+    return threading.current_thread().name
+
+
+class TestBackgroundEventLoop(unittest.TestCase):
+    """Test cases for BackgroundEventLoop"""
+
+    def setUp(self):
+        self.background = BackgroundEventLoop(name="test_event_loop")
+
+    def tearDown(self):
+        self.background.stop()
+
+    def test_coroutines_share_one_loop_thread(self):
+        first = self.background.submit(_current_thread_name()).result(timeout=5)
+        second = self.background.run(_current_thread_name(), timeout=5)
+
+        self.assertEqual(first, "test_event_loop")
+        self.assertEqual(second, "test_event_loop")
+        self.assertIs(self.background.loop(), self.background.loop())
+
+    def test_other_loops_can_await_the_result(self):
+        async def caller():
+            return await asyncio.wrap_future(self.background.submit(_current_thread_name()))
+
+        self.assertEqual(asyncio.run(caller()), "test_event_loop")
+
+    def test_run_on_the_loop_itself_is_refused(self):
+        async def nested():
+            return self.background.run(_current_thread_name())
+
+        with self.assertRaises(RuntimeError):
+            self.background.run(nested(), timeout=5)
+
+    def test_stop_closes_resources_and_cancels_pending_tasks(self):
+        closed = []
+        started = threading.Event()
+
+        async def close_resource():
+            closed.append(True)
+
+        async def forever():
+            started.set()
+            await asyncio.sleep(3600)
+
+        self.background.add_shutdown_callback(close_resource)
+        pending = self.background.submit(forever())
+        started.wait(5)
+        old_loop = self.background.loop()
+        self.background.stop()
+
+        self.assertEqual(closed, [True])
+        self.assertTrue(pending.cancelled())
+        self.assertTrue(old_loop.is_closed())
+        # The loop is started again on the next use
+        self.assertEqual(self.background.run(_current_thread_name(), timeout=5), "test_event_loop")
+
+
+if __name__ == "__main__":
+    unittest.main()
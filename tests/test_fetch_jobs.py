@@ -0,0 +1,134 @@
+"""
+Unit tests for background fetch jobs (data_processing/fetch_jobs.py).
+
+To run these tests, execute:
+    python -m unittest tests/test_fetch_jobs.py
+"""
+import unittest
+from unittest import mock
+import time
+from datetime import datetime
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import ConcurrencySettings, DataProcessingSettings, FetchJobSettings, RetrySettings
+from data_processing.fetch_jobs import JOB_CANCELLED, JOB_DONE, FetchJobRunner, fetch_job_key
+from tools.dataforseo_simulator import SimulatorConfig
+from tests.test_simulator import SimulatorTestCase
+
+LOCATIONS = (2703, 2203, 2276)
+
+
+def _wait_finished(runner, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    job = runner.get(job_id)
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.02)
+        job = runner.get(job_id)
+    return job
+
+
+class TestFetchJobRunner(SimulatorTestCase):
+    """Test cases for submitting, sharing and cancelling fetch jobs"""
+
+    simulator_config = SimulatorConfig(latency=0.2, latency_distribution="constant", rate_limit_per_minute=0, seed=1)
+
+    def setUp(self):
+        super().setUp()
+        self.runner = FetchJobRunner(max_workers=2)
+        # One country per request, sent one after another, so a job can be stopped midway
+        self.stack.enter_context(mock.patch.object(DataProcessingSettings, "ASYNC_PACK_TASKS", False))
+        self.stack.enter_context(mock.patch.object(ConcurrencySettings, "MAX_WINDOW", 1))
+
+    def submit(self, subscriber="session-1", locations=LOCATIONS, languages="sk"):
+        options = tuple((str(code), code) for code in locations)
+        return self.runner.submit(
+            subscriber, "test", "test", ("castelli", "rapha"), locations, languages,
+            datetime(2024, 1, 1), datetime(2024, 12, 31), options
+        )
+
+    def test_job_result_and_partial_results(self):
+        job_id = self.submit()
+        job = _wait_finished(self.runner, job_id)
+
+        self.assertEqual(job.status, JOB_DONE)
+        results_df, error = job.result()
+        self.assertIsNone(error)
+        self.assertEqual(sorted(results_df["Country"].unique()), ["2203", "2276", "2703"])
+        self.assertEqual(sorted(result["location_code"] for result in job.country_results()), sorted(LOCATIONS))
+        self.assertEqual(job.progress.snapshot()[0], 1.0)
+
+    def test_sessions_submitting_the_same_request_share_one_job(self):
+        first_id = self.submit("session-1")
+        second_id = self.submit("session-2", locations=tuple(reversed(LOCATIONS)))
+        self.assertEqual(first_id, second_id)
+        # The same (country, language) pairs given per country are the same request
+        self.assertEqual(self.submit("session-4", languages=tuple((code, "sk") for code in LOCATIONS)), first_id)
+        self.assertNotEqual(
+            fetch_job_key("test", "test", ("castelli",), LOCATIONS, ("sk", "en"), datetime(2024, 1, 1), datetime(2024, 12, 31)),
+            fetch_job_key("test", "test", ("castelli",), LOCATIONS, "sk", datetime(2024, 1, 1), datetime(2024, 12, 31))
+        )
+        # Another password never joins the job
+        self.assertNotEqual(
+            fetch_job_key("test", "wrong", ("castelli",), LOCATIONS, "sk", datetime(2024, 1, 1), datetime(2024, 12, 31)),
+            fetch_job_key("test", "test", ("castelli",), LOCATIONS, "sk", datetime(2024, 1, 1), datetime(2024, 12, 31))
+        )
+
+        _wait_finished(self.runner, first_id)
+        # A finished job is still shared and is not fetched again
+        self.assertEqual(self.submit("session-3"), first_id)
+        self.assertEqual(self.simulator.stats.by_endpoint["search_volume/live"], len(LOCATIONS))
+
+    def test_job_is_cancelled_when_the_last_session_releases_it(self):
+        job_id = self.submit("session-1")
+        self.submit("session-2")
+        time.sleep(0.1)
+        self.runner.release(job_id, "session-1")
+        time.sleep(0.1)
+        self.assertFalse(self.runner.get(job_id).finished)
+
+        self.runner.release(job_id, "session-2")
+        job = _wait_finished(self.runner, job_id)
+        self.assertEqual(job.status, JOB_CANCELLED)
+        self.assertIsNone(job.result())
+        self.assertLess(self.simulator.stats.by_endpoint["search_volume/live"], len(LOCATIONS))
+        # A cancelled job is replaced by a new one
+        self.assertNotEqual(self.submit("session-1"), job_id)
+
+    def test_job_nobody_polls_is_abandoned(self):
+        with mock.patch.object(FetchJobSettings, "ABANDON_AFTER", 0.1):
+            job_id = self.submit()
+            time.sleep(0.6)
+            job = self.runner._jobs[job_id]
+        self.assertEqual(job.status, JOB_CANCELLED)
+
+    def test_job_finished_with_errors_is_not_reused(self):
+        with mock.patch.object(RetrySettings, "MAX_ATTEMPTS", 1), \
+             mock.patch.object(self.simulator.simulator.config, "error_rate", 1.0):
+            failed_id = self.submit(locations=(2703,))
+            job = _wait_finished(self.runner, failed_id)
+        self.assertEqual(job.status, JOB_DONE)
+        self.assertIsNotNone(job.result()[1])
+
+        # Fetching again starts a new job instead of showing the old error
+        retry_id = self.submit("session-2", locations=(2703,))
+        self.assertNotEqual(retry_id, failed_id)
+        results_df, error_msg = _wait_finished(self.runner, retry_id).result()
+        self.assertIsNone(error_msg)
+        self.assertFalse(results_df.empty)
+
+    def test_finished_jobs_expire(self):
+        job_id = self.submit()
+        _wait_finished(self.runner, job_id)
+        with mock.patch.object(FetchJobSettings, "KEEP_FINISHED", 0):
+            time.sleep(0.01)
+            new_id = self.submit(locations=(2703,))
+        self.assertIsNone(self.runner.get(job_id))
+        self.assertIsNotNone(self.runner.get(new_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,263 @@
+"""
+Unit tests for the cell cache and the gap-aware fetch planner.
+
+To run these tests, execute:
+    python -m unittest tests/test_fetch_planner.py
+"""
+import unittest
+from unittest import mock
+import asyncio
+from datetime import datetime
+import sys
+import os
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client.search_volume_columns import SearchVolumeColumns
+from config import DataProcessingSettings
+from data_processing.async_fetcher import FetchProgress, _fetch_multi_country_search_volume_data_async_internal
+from data_processing.fetcher import fetch_search_volume_data_single
+from data_processing.fetch_planner import (
+    SearchVolumeCellCache,
+    collect_location_outcomes,
+    fetch_targets,
+    get_search_volume_cell_cache,
+    match_requested_keywords,
+    month_index,
+    plan_search_volume_fetch
+)
+from tests.test_simulator import SimulatorTestCase
+from tools.dataforseo_simulator import SimulatorConfig
+
+
+def _results(task, volume=lambda keyword, year, month: 100 * month, skip_months=()):
+    """Results of a task as the API client returns them, one row per keyword and month"""
+    columns = SearchVolumeColumns()
+    for keyword in task["keywords"]:
+        code = columns.add_keyword(keyword.lower())
+        for month in range(month_index(task["date_from"]), month_index(task["date_to"]) + 1):
+            year, month_of_year = month // 12, month % 12 + 1
+            if (year, month_of_year) not in skip_months:
+                columns.append(code, year, month_of_year, volume(keyword, year, month_of_year))
+    return columns.to_frame(task["location_code"])
+
+
+def _outcome(task, **kwargs):
+    return {"location_code": task["location_code"], "language_code": task["language_code"],
+            "results": _results(task, **kwargs), "error": None, "attempts": 1}
+
+
+class TestFetchPlanner(unittest.TestCase):
+    """Test cases for planning only the missing keyword/location/month cells"""
+
+    def setUp(self):
+        self.cache = SearchVolumeCellCache(ttl=3600, max_cells=10_000)
+
+    def plan(self, keywords, locations, date_from=datetime(2024, 1, 1), date_to=datetime(2024, 6, 30)):
+        return plan_search_volume_fetch(self.cache, keywords, locations, "sk", date_from, date_to)
+
+    def fill(self, plan, **kwargs):
+        return collect_location_outcomes(self.cache, plan, [_outcome(task, **kwargs) for task in plan.tasks])
+
+    def test_empty_cache_plans_the_whole_request(self):
+        plan = self.plan(["a", "b"], [2703, 2203])
+        self.assertEqual([(t["location_code"], t["keywords"]) for t in plan.tasks], [(2703, ["a", "b"]), (2203, ["a", "b"])])
+        self.assertEqual((plan.tasks[0]["date_from"], plan.tasks[0]["date_to"]), ("2024-01-01", "2024-06-30"))
+        self.assertEqual(plan.summary(), {"tasks": 2, "missing_cells": 24, "total_cells": 24})
+
+    def test_only_new_keyword_is_requested(self):
+        self.fill(self.plan(["a", "b"], [2703, 2203]))
+        plan = self.plan(["a", "b", "c"], [2703, 2203])
+        self.assertEqual([(t["location_code"], t["keywords"]) for t in plan.tasks], [(2703, ["c"]), (2203, ["c"])])
+        self.assertEqual(plan.missing_cells, 12)
+
+    def test_only_new_location_is_requested(self):
+        self.fill(self.plan(["a", "b"], [2703]))
+        plan = self.plan(["a", "b"], [2703, 2276])
+        self.assertEqual([(t["location_code"], t["keywords"]) for t in plan.tasks], [(2276, ["a", "b"])])
+
+    def test_extended_date_range_requests_only_new_months(self):
+        self.fill(self.plan(["a", "b"], [2703]))
+        plan = self.plan(["a", "b"], [2703], date_to=datetime(2024, 7, 20))
+        self.assertEqual(len(plan.tasks), 1)
+        self.assertEqual(plan.tasks[0]["keywords"], ["a", "b"])
+        self.assertEqual((plan.tasks[0]["date_from"], plan.tasks[0]["date_to"]), ("2024-07-01", "2024-07-20"))
+
+    def test_earlier_start_requests_only_new_months(self):
+        self.fill(self.plan(["a"], [2703]))
+        plan = self.plan(["a"], [2703], date_from=datetime(2023, 11, 15))
+        self.assertEqual((plan.tasks[0]["date_from"], plan.tasks[0]["date_to"]), ("2023-11-15", "2023-12-31"))
+
+    def test_fully_cached_request_is_assembled_from_cache(self):
+        self.fill(self.plan(["a", "b", "c"], [2703], date_from=datetime(2023, 1, 1)))
+        plan = self.plan(["b", "a"], [2703], date_from=datetime(2024, 3, 1), date_to=datetime(2024, 4, 30))
+        self.assertEqual(plan.tasks, [])
+        outcome = collect_location_outcomes(self.cache, plan, [])[0]
+        self.assertEqual(outcome["attempts"], 0)
+        self.assertIsNone(outcome["error"])
+        self.assertEqual(outcome["results"]["Keyword"].tolist(), ["b", "b", "a", "a"])
+        self.assertEqual(outcome["results"]["Date"].tolist(), [pd.Timestamp("2024-03-01"), pd.Timestamp("2024-04-01")] * 2)
+        self.assertEqual(outcome["results"]["Search Volume"].tolist(), [300, 400, 300, 400])
+
+    def test_months_without_data_are_not_refetched(self):
+        outcomes = self.fill(self.plan(["a"], [2703]), skip_months=[(2024, 6)])
+        self.assertEqual(len(outcomes[0]["results"]), 5)
+        self.assertEqual(self.plan(["a"], [2703]).tasks, [])
+
+    def test_keyword_case_follows_api_normalization(self):
+        outcomes = self.fill(self.plan(["Castelli"], [2703]))
+        self.assertEqual(set(outcomes[0]["results"]["Keyword"]), {"castelli"})
+        self.assertEqual(self.plan(["Castelli"], [2703]).tasks, [])
+
+    def test_keywords_returned_in_another_form_map_to_the_request(self):
+        mapping = match_requested_keywords(
+            ["Rapha  Core", "café racer", "maap!", "castelli"], ["castelli", "rapha core", "cafe racer", "maap", "x"]
+        )
+        self.assertEqual(mapping, {
+            "castelli": "castelli", "rapha core": "Rapha  Core", "cafe racer": "café racer", "maap": "maap!", "x": "x"
+        })
+        # Unrecognizable forms are matched by position when the counts agree
+        self.assertEqual(match_requested_keywords(["a", "b", "c"], ["a", "bb", "cc"]), {"a": "a", "bb": "b", "cc": "c"})
+
+    def test_failed_task_is_not_cached(self):
+        plan = self.plan(["a"], [2703, 2203])
+        failed = {"location_code": 2203, "language_code": "sk", "results": _results({**plan.tasks[1], "keywords": []}),
+                  "error": "Chyba HTTP 500", "attempts": 4}
+        outcomes = collect_location_outcomes(self.cache, plan, [_outcome(plan.tasks[0]), failed])
+        self.assertIsNone(outcomes[0]["error"])
+        self.assertEqual(outcomes[1]["error"], "Chyba HTTP 500")
+        self.assertEqual(outcomes[1]["attempts"], 4)
+        self.assertEqual([t["location_code"] for t in self.plan(["a"], [2703, 2203]).tasks], [2203])
+
+    def test_expired_cells_are_refetched(self):
+        self.fill(self.plan(["a"], [2703]))
+        with mock.patch("data_processing.fetch_planner.time.time", return_value=datetime.now().timestamp() + 7200):
+            self.assertEqual(len(self.plan(["a"], [2703]).tasks), 1)
+
+    def test_language_selection_expands_to_location_language_pairs(self):
+        self.assertEqual(fetch_targets([2703, 2203], "sk"), [(2703, "sk"), (2203, "sk")])
+        self.assertEqual(fetch_targets([2703, 2203], ("sk", "en")), [(2703, "sk"), (2703, "en"), (2203, "sk"), (2203, "en")])
+        self.assertEqual(
+            fetch_targets([2703, 2203], ((2203, "cs"), (2703, "sk"), (2203, "en"))),
+            [(2703, "sk"), (2203, "cs"), (2203, "en")]
+        )
+
+    def test_every_language_is_planned_and_cached_separately(self):
+        plan = plan_search_volume_fetch(
+            self.cache, ["a"], [2703, 2203], ((2703, "sk"), (2203, "cs"), (2203, "en")), datetime(2024, 1, 1), datetime(2024, 6, 30)
+        )
+        self.assertEqual([(t["location_code"], t["language_code"]) for t in plan.tasks], [(2703, "sk"), (2203, "cs"), (2203, "en")])
+        self.assertEqual(plan.total_cells, 18)
+        outcomes = self.fill(plan)
+        self.assertEqual([(o["location_code"], o["language_code"]) for o in outcomes], [(2703, "sk"), (2203, "cs"), (2203, "en")])
+
+        plan = plan_search_volume_fetch(self.cache, ["a"], [2703, 2203], ("en",), datetime(2024, 1, 1), datetime(2024, 6, 30))
+        self.assertEqual([(t["location_code"], t["language_code"]) for t in plan.tasks], [(2703, "en")])
+
+    def test_least_recently_used_keywords_are_evicted(self):
+        cache = SearchVolumeCellCache(ttl=3600, max_cells=12)
+        for keyword in ["a", "b", "c"]:
+            plan = plan_search_volume_fetch(cache, [keyword], [2703], "sk", datetime(2024, 1, 1), datetime(2024, 6, 30))
+            collect_location_outcomes(cache, plan, [_outcome(task) for task in plan.tasks])
+        self.assertEqual(len(cache), 12)
+        plan = plan_search_volume_fetch(cache, ["a", "b", "c"], [2703], "sk", datetime(2024, 1, 1), datetime(2024, 6, 30))
+        self.assertEqual([task["keywords"] for task in plan.tasks], [["a"]])
+
+
+class TestGapAwareFetchers(SimulatorTestCase):
+    """Iterative edits of a multi-country request only fetch the new cells"""
+
+    def fetch(self, keywords, location_codes, date_to):
+        options = tuple((str(code), code) for code in location_codes)
+        return asyncio.run(_fetch_multi_country_search_volume_data_async_internal(
+            "test", "test", tuple(keywords), tuple(location_codes), "sk",
+            datetime(2024, 1, 1), date_to, options, FetchProgress()
+        ))
+
+    def test_incremental_requests_match_a_fresh_fetch(self):
+        with mock.patch.object(DataProcessingSettings, "ASYNC_PACK_TASKS", False):
+            self.fetch(["castelli", "rapha"], [2703, 2203], datetime(2024, 6, 30))
+            self.assertEqual(self.simulator.stats.by_endpoint["search_volume/live"], 2)
+
+            # One new keyword and one more month: one task per country
+            df, error = self.fetch(["castelli", "rapha", "maap"], [2703, 2203], datetime(2024, 7, 31))
+            self.assertIsNone(error)
+            self.assertEqual(self.simulator.stats.by_endpoint["search_volume/live"], 4)
+            self.assertEqual(df.attrs["fetch_plan"], {"tasks": 2, "missing_cells": 2 * (7 + 2), "total_cells": 3 * 2 * 7})
+
+            # Fully cached: no API call at all
+            cached_df, _ = self.fetch(["castelli", "maap"], [2203], datetime(2024, 7, 31))
+            self.assertEqual(self.simulator.stats.by_endpoint["search_volume/live"], 4)
+            self.assertEqual([row["Attempts"] for row in cached_df.attrs["task_report"]], [0])
+
+            get_search_volume_cell_cache().clear()
+            fresh_df, _ = self.fetch(["castelli", "rapha", "maap"], [2703, 2203], datetime(2024, 7, 31))
+
+        sort_columns = ["Country", "Keyword", "Date"]
+        pd.testing.assert_frame_equal(
+            df.sort_values(sort_columns).reset_index(drop=True),
+            fresh_df.sort_values(sort_columns).reset_index(drop=True)
+        )
+
+
+
+class TestNormalizedKeywords(SimulatorTestCase):
+    """The API returns keywords in its normalized form"""
+
+    simulator_config = SimulatorConfig(latency=0.0, rate_limit_per_minute=0, normalize_keywords=True, seed=1)
+
+    def test_normalized_keywords_keep_their_data(self):
+        keywords = ("Rapha  Core", "maap!")
+        options = (("2703", 2703),)
+        fetch = lambda: asyncio.run(_fetch_multi_country_search_volume_data_async_internal(
+            "test", "test", keywords, (2703,), "sk", datetime(2024, 1, 1), datetime(2024, 6, 30), options, FetchProgress()
+        ))
+        df, error = fetch()
+        self.assertIsNone(error)
+        self.assertEqual(sorted(df["Keyword"].unique()), ["maap", "rapha core"])
+        self.assertEqual(len(df), 2 * 6)
+        self.assertTrue((df["Search Volume"] >= 0).all())
+
+        # The cells are cached under the requested keywords: no second API call
+        cached_df, _ = fetch()
+        self.assertEqual(self.simulator.stats.by_endpoint["search_volume/live"], 1)
+        self.assertEqual(len(cached_df), 2 * 6)
+
+
+class TestSharedCellCacheCredentials(SimulatorTestCase):
+    """Cells cached for one account are not served to credentials the API rejects"""
+
+    simulator_config = SimulatorConfig(latency=0.0, rate_limit_per_minute=0, login="test", password="test", seed=1)
+
+    def fetch(self, password):
+        return asyncio.run(_fetch_multi_country_search_volume_data_async_internal(
+            "test", password, ("castelli",), (2703,), "sk",
+            datetime(2024, 1, 1), datetime(2024, 6, 30), (("2703", 2703),), FetchProgress()
+        ))
+
+    def test_cache_only_result_needs_valid_credentials(self):
+        df, error = self.fetch("test")
+        self.assertIsNone(error)
+        self.assertEqual(len(df), 6)
+
+        rejected_df, rejected_error = self.fetch("wrong")
+        self.assertIn("40101", rejected_error)
+        self.assertTrue(rejected_df.empty)
+
+        single_df, single_error = fetch_search_volume_data_single(
+            "test", "wrong", ("castelli",), 2703, "sk", datetime(2024, 1, 1), datetime(2024, 6, 30)
+        )
+        self.assertIsNone(single_df)
+        self.assertIn("40101", single_error)
+
+        cached_df, cached_error = self.fetch("test")
+        self.assertIsNone(cached_error)
+        self.assertEqual(len(cached_df), 6)
+        self.assertEqual(self.simulator.stats.by_endpoint["search_volume/live"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
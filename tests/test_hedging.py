@@ -0,0 +1,103 @@
+"""
+Unit tests for the hedged request policy (latency percentile and hedge budget).
+
+To run these tests, execute:
+    python -m unittest tests/test_hedging.py
+"""
+import unittest
+from unittest import mock
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client import hedging
+from api_client.hedging import HedgePolicy, get_hedge_policy, size_bucket
+from api_client.rate_limiter import TokenBucketRateLimiter
+from config import HedgeSettings
+
+
+def _policy(**kwargs):
+    options = dict(percentile=90, latency_window=10, min_samples=5, min_delay=0.0, budget_ratio=0.5, max_budget=1)
+    options.update(kwargs)
+    return HedgePolicy(**options)
+
+
+class TestHedgePolicy(unittest.TestCase):
+    """Test cases for HedgePolicy"""
+
+    def test_delay_is_learned_percentile_of_recent_calls(self):
+        policy = _policy()
+        for latency in (0.1, 0.2, 0.3, 0.4):
+            policy.observe(latency)
+        self.assertIsNone(policy.hedge_delay())
+
+        for latency in (0.5, 0.6, 0.7, 0.8, 0.9, 1.0):
+            policy.observe(latency)
+        self.assertEqual(policy.hedge_delay(), 0.9)
+
+        # Only the last latency_window samples count
+        for _ in range(10):
+            policy.observe(0.2)
+        self.assertEqual(policy.hedge_delay(), 0.2)
+
+    def test_latency_is_tracked_per_post_size(self):
+        self.assertEqual([size_bucket(tasks) for tasks in (1, 2, 4, 5, 64, 100)], ["1", "2-4", "2-4", "5-16", "17-64", "65+"])
+        policy = _policy()
+        for _ in range(5):
+            policy.observe(0.1, tasks=1)
+            policy.observe(3.0, tasks=80)
+        self.assertEqual(policy.hedge_delay(1), 0.1)
+        self.assertEqual(policy.hedge_delay(100), 3.0)
+        self.assertIsNone(policy.hedge_delay(3))
+        self.assertEqual(policy.snapshot()["latency_seconds"], {"1": 0.1, "65+": 3.0})
+
+    def test_delay_respects_minimum(self):
+        policy = _policy(min_delay=0.5)
+        for _ in range(5):
+            policy.observe(0.1)
+        self.assertEqual(policy.hedge_delay(), 0.5)
+
+    def test_budget_limits_hedged_tasks_to_share_of_sent_tasks(self):
+        policy = _policy(budget_ratio=0.25, max_budget=4)
+        hedged = 0
+        for _ in range(20):
+            policy.record_call(tasks=2)
+            if policy.try_hedge(2, lambda: True):
+                hedged += 2
+        self.assertEqual(hedged, 10)
+        self.assertEqual(policy.snapshot()["hedged_tasks"], 10)
+
+    def test_budget_is_counted_in_tasks(self):
+        policy = _policy(budget_ratio=0.05, max_budget=10)
+        policy.record_call(tasks=100)
+        # A 100-task POST earns five tasks of budget, not enough to duplicate itself
+        self.assertFalse(policy.try_hedge(100, lambda: True))
+        self.assertTrue(policy.try_hedge(5, lambda: True))
+
+    def test_hedge_needs_free_rate_limit_token(self):
+        policy = _policy()
+        policy.record_call()
+        policy.record_call()
+        limiter = TokenBucketRateLimiter(requests_per_minute=1, burst=1)
+        limiter.reserve()
+
+        self.assertFalse(policy.try_hedge(1, limiter.try_reserve))
+        # A refused hedge keeps its budget and borrows no token
+        self.assertEqual(policy.snapshot()["budget"], 1.0)
+        self.assertGreater(limiter.reserve(), 0)
+
+    def test_get_hedge_policy_is_shared_and_follows_settings(self):
+        with mock.patch.object(hedging, "_hedge_policy", None):
+            policy = get_hedge_policy()
+            policy.observe(0.1)
+            self.assertIs(get_hedge_policy(), policy)
+
+            with mock.patch.object(HedgeSettings, "PERCENTILE", 50):
+                self.assertIs(get_hedge_policy(), policy)
+                self.assertEqual(policy.snapshot()["percentile"], 50)
+                self.assertEqual(policy.snapshot()["samples"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Unit tests for the shared pooled aiohttp session.
+
+To run these tests, execute:
+    python -m unittest tests/test_http_session.py
+"""
+import unittest
+import asyncio
+import threading
+import sys
+import os
+
+import requests
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client.http_session import (
+    close_http_sessions,
+    get_http_session,
+    shared_client_session,
+    submit_http_coroutine
+)
+from config import HttpPoolSettings
+
+
+async def _get_session():
+    async with shared_client_session() as session:
+        return session
+
+
+class TestSharedClientSession(unittest.TestCase):
+    """Test cases for the long-lived HTTP client session"""
+
+    def tearDown(self):
+        close_http_sessions()
+
+    def test_session_is_reused_across_runs(self):
+        first = submit_http_coroutine(_get_session()).result(timeout=5)
+        second = submit_http_coroutine(_get_session()).result(timeout=5)
+
+        self.assertIs(first, second)
+        self.assertFalse(first.closed)
+        self.assertEqual(first.connector.limit, HttpPoolSettings.POOL_SIZE)
+        self.assertEqual(first.connector.limit_per_host, HttpPoolSettings.POOL_SIZE_PER_HOST)
+
+    def test_close_releases_session(self):
+        session = submit_http_coroutine(_get_session()).result(timeout=5)
+        close_http_sessions()
+
+        self.assertTrue(session.closed)
+        # A new session is created on the next use
+        self.assertIsNot(submit_http_coroutine(_get_session()).result(timeout=5), session)
+
+    def test_other_event_loops_get_temporary_session(self):
+        shared = submit_http_coroutine(_get_session()).result(timeout=5)
+        temporary = asyncio.run(_get_session())
+
+        self.assertIsNot(temporary, shared)
+        self.assertTrue(temporary.closed)
+
+
+class TestSyncHttpSession(unittest.TestCase):
+    """Test cases for the pooled synchronous transport"""
+
+    def tearDown(self):
+        close_http_sessions()
+
+    def test_threads_get_own_session_over_shared_pool(self):
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(get_http_session()))
+        thread.start()
+        thread.join()
+        main_session = get_http_session()
+
+        self.assertIs(get_http_session(), main_session)
+        self.assertIsNot(sessions[0], main_session)
+        self.assertIs(sessions[0].get_adapter("https://api.dataforseo.com"), main_session.get_adapter("https://api.dataforseo.com"))
+        self.assertEqual(main_session.get_adapter("https://api.dataforseo.com")._pool_maxsize, HttpPoolSettings.POOL_SIZE_PER_HOST)
+
+    def test_session_is_recreated_after_close(self):
+        session = get_http_session()
+        close_http_sessions()
+
+        self.assertIsNot(get_http_session(), session)
+
+    def test_sync_session_keeps_the_default_compressed_encodings(self):
+        self.assertEqual(get_http_session().headers["Accept-Encoding"], requests.utils.default_headers()["Accept-Encoding"])
+        self.assertIn("gzip", get_http_session().headers["Accept-Encoding"])
+
+if __name__ == '__main__':
+    unittest.main()
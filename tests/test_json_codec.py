@@ -0,0 +1,69 @@
+"""
+Unit tests for the optional fast JSON decoder of API responses.
+
+To run these tests, execute:
+    python -m unittest tests/test_json_codec.py
+"""
+import unittest
+from unittest import mock
+import asyncio
+import sys
+import os
+import requests
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client import json_codec
+from api_client.json_codec import is_fast_json_enabled, loads, response_json, response_json_async
+from api_client.streaming_parser import JSON_PARSE_ERRORS
+from api_client.transport import CassetteResponse
+from config import DataProcessingSettings
+
+BODY = '{"status_code": 20000, "tasks": [{"result": [{"location_name": "Slovensko", "location_code": 2703}]}]}'.encode("utf-8")
+
+
+def _requests_response(content):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+    response.encoding = "utf-8"
+    return response
+
+
+def _cassette_response(content):
+    return CassetteResponse("GET", "https://api.test/v3/locations", {"status": 200, "headers": {}, "content": content})
+
+
+@unittest.skipIf(json_codec.orjson is None, "orjson is not installed")
+class TestJsonCodec(unittest.TestCase):
+    """Test cases for decoding with orjson and the stdlib fallback"""
+
+    def test_fast_json_follows_setting(self):
+        self.assertTrue(is_fast_json_enabled())
+        with mock.patch.object(DataProcessingSettings, "FAST_JSON", False):
+            self.assertFalse(is_fast_json_enabled())
+            self.assertEqual(json_codec.json_backend_name(), "json")
+
+    def test_backends_decode_the_same_document(self):
+        fast = loads(BODY)
+        with mock.patch.object(DataProcessingSettings, "FAST_JSON", False):
+            self.assertEqual(loads(BODY), fast)
+        self.assertEqual(fast["tasks"][0]["result"][0]["location_name"], "Slovensko")
+
+    def test_sync_and_async_responses(self):
+        for fast_json in (True, False):
+            with mock.patch.object(DataProcessingSettings, "FAST_JSON", fast_json):
+                self.assertEqual(response_json(_requests_response(BODY))["status_code"], 20000)
+                self.assertEqual(asyncio.run(response_json_async(_cassette_response(BODY)))["status_code"], 20000)
+
+    def test_invalid_document_raises_json_parse_error(self):
+        for fast_json in (True, False):
+            with mock.patch.object(DataProcessingSettings, "FAST_JSON", fast_json):
+                with self.assertRaises(JSON_PARSE_ERRORS):
+                    response_json(_requests_response(b'{"tasks": ['))
+                with self.assertRaises(JSON_PARSE_ERRORS):
+                    asyncio.run(response_json_async(_cassette_response(b'{"tasks": [')))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Unit tests for keyword sharding.
+
+To run these tests, execute:
+    python -m unittest tests/test_keyword_sharding.py
+"""
+import unittest
+from unittest import mock
+from datetime import datetime
+import sys
+import os
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client.search_volume_columns import empty_search_volume_frame
+from data_processing import keyword_sharding
+from data_processing.keyword_sharding import (
+    fetch_search_volume_sharded,
+    merge_shard_outcomes,
+    shard_keywords
+)
+
+
+class TestKeywordSharding(unittest.TestCase):
+    """Test cases for splitting keyword lists and merging shard results"""
+
+    def test_shard_keywords_respects_limit_and_removes_duplicates(self):
+        keywords = [f"kw{i}" for i in range(5)] + ["kw0"]
+        self.assertEqual(
+            shard_keywords(keywords, max_keywords_per_shard=2),
+            [["kw0", "kw1"], ["kw2", "kw3"], ["kw4"]]
+        )
+
+    def test_merge_shard_outcomes_reports_errors_per_shard(self):
+        outcomes = [
+            {"location_code": 1, "language_code": "en", "results": pd.DataFrame({"Keyword": ["a"]}), "error": None},
+            {"location_code": 1, "language_code": "en", "results": empty_search_volume_frame(), "error": "API: Kód 50301"},
+        ]
+        merged = merge_shard_outcomes(outcomes, [1000, 10])
+
+        self.assertEqual(merged["results"]["Keyword"].tolist(), ["a"])
+        self.assertEqual(merged["error"], "Časť 2/2 (10 kľúčových slov): API: Kód 50301")
+
+    def test_fetch_search_volume_sharded_fetches_every_shard(self):
+        calls = []
+
+        def fake_get_search_volume_tasks(login, password, tasks):
+            keywords = tasks[0]["keywords"]
+            calls.append(list(keywords))
+            return [{"location_code": 2703, "language_code": "sk", "results": pd.DataFrame({"Keyword": keywords}), "error": None, "attempts": 1}]
+
+        keywords = [f"kw{i}" for i in range(5)]
+        with mock.patch.object(keyword_sharding.DataProcessingSettings, "MAX_KEYWORDS_PER_TASK", 2), \
+             mock.patch.object(keyword_sharding, "get_search_volume_tasks", fake_get_search_volume_tasks):
+            results, error = fetch_search_volume_sharded(
+                "test", "test", keywords, 2703, "sk", datetime(2024, 1, 1), datetime(2024, 12, 31)
+            )
+
+        self.assertIsNone(error)
+        self.assertEqual(sorted(calls), [["kw0", "kw1"], ["kw2", "kw3"], ["kw4"]])
+        # Results keep the order of the shards
+        self.assertEqual(results["Keyword"].tolist(), keywords)
+
+if __name__ == '__main__':
+    unittest.main()
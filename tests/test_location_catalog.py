@@ -0,0 +1,195 @@
+"""
+Unit tests for the indexed location catalog used by the location search box.
+
+To run these tests, execute:
+    python -m unittest tests/test_location_catalog.py
+"""
+import unittest
+from unittest import mock
+import pickle
+import tempfile
+import time
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client.dataforseo_client import load_languages
+from config import CacheSettings
+from data_processing.location_catalog import (
+    CATALOG_FILENAME,
+    LocationCatalog,
+    fold_text,
+    get_location_catalog,
+    reset_location_catalog
+)
+from tools.dataforseo_simulator import SimulatorConfig
+from ui.sidebar import load_sidebar_catalogs
+from utils.swr_cache import wait_for_refreshes
+from tests.test_simulator import SimulatorTestCase
+
+LOCATIONS = [
+    (2703, "Slovakia", "Country"),
+    (2203, "Czechia", "Country"),
+    (2840, "United States", "Country"),
+    (1001, "Bratislava,Bratislava Region,Slovakia", "City"),
+    (1002, "Bratislava Region,Slovakia", "Region"),
+    (1003, "Česká Lípa,Liberec Region,Czechia", "City"),
+    (1004, "New York,New York,United States", "City"),
+    (1005, "Slovenská Ľupča,Banska Bystrica Region,Slovakia", "City"),
+]
+
+
+class TestLocationCatalog(unittest.TestCase):
+    """Test cases for searching the location catalog"""
+
+    def setUp(self):
+        self.catalog = LocationCatalog(LOCATIONS)
+
+    def test_arrays_and_display_names(self):
+        self.assertEqual(len(self.catalog), 8)
+        self.assertEqual(self.catalog.display(2703), "Slovakia")
+        self.assertEqual(self.catalog.display(1002), "Bratislava Region,Slovakia (Region)")
+        self.assertEqual(self.catalog.name(1001), "Bratislava,Bratislava Region,Slovakia")
+        self.assertEqual(self.catalog.location_type(1004), "City")
+        self.assertEqual(self.catalog.location_types, ["City", "Country", "Region"])
+        self.assertIn(2203, self.catalog)
+        self.assertNotIn(9999, self.catalog)
+        self.assertEqual(self.catalog.options([2203, 2703]), (("Czechia", 2203), ("Slovakia", 2703)))
+
+    def test_fold_text_removes_case_and_diacritics(self):
+        self.assertEqual(fold_text("Česká Lípa"), "ceska lipa")
+
+    def test_short_query_matches_word_prefixes(self):
+        self.assertEqual(self.catalog.search("sl", location_type="Country"), [2703])
+        self.assertEqual(set(self.catalog.search("ny")), set())
+        self.assertEqual(self.catalog.search("ne"), [1004])
+
+    def test_substring_query_ranks_name_prefix_first(self):
+        # Name prefix, then word prefix, then any substring; alphabetical within each group
+        self.assertEqual(self.catalog.search("slova"), [2703, 1002, 1001, 1005])
+        self.assertEqual(self.catalog.search("slovakia"), [2703, 1002, 1001, 1005])
+        self.assertEqual(self.catalog.search("lovak"), [1002, 1001, 2703, 1005])
+
+    def test_query_ignores_diacritics_and_punctuation(self):
+        self.assertEqual(self.catalog.search("ceska"), [1003])
+        self.assertEqual(self.catalog.search("Ľupča"), [1005])
+        self.assertEqual(self.catalog.search("york, new york"), [1004])
+
+    def test_type_filter_and_limit(self):
+        self.assertEqual(self.catalog.search("bratislava", location_type="Region"), [1002])
+        self.assertEqual(self.catalog.search("", location_type="Country"), [2203, 2703, 2840])
+        self.assertEqual(len(self.catalog.search("", limit=3)), 3)
+        self.assertEqual(self.catalog.search("slovakia", location_type="Airport"), [])
+        self.assertEqual(self.catalog.search("xyz"), [])
+
+    def test_saved_catalog_is_loaded(self):
+        path = os.path.join(tempfile.mkdtemp(prefix="sos_catalog_"), CATALOG_FILENAME)
+        self.catalog.save(path)
+        loaded = LocationCatalog.load(path)
+        self.assertEqual(loaded.search("slova"), self.catalog.search("slova"))
+        self.assertIsNone(LocationCatalog.load(path + ".missing"))
+
+    def test_saved_catalog_keeps_its_age_and_types(self):
+        path = os.path.join(tempfile.mkdtemp(prefix="sos_catalog_"), CATALOG_FILENAME)
+        self.catalog.save(path)
+        loaded = LocationCatalog.load(path)
+        self.assertEqual(loaded.built_at, self.catalog.built_at)
+        self.assertEqual(loaded.location_types, self.catalog.location_types)
+        self.assertEqual(loaded.codes.tolist(), self.catalog.codes.tolist())
+        self.assertEqual(loaded.search("", location_type="Country"), [2203, 2703, 2840])
+
+    def test_pickled_file_is_not_unpickled(self):
+        path = os.path.join(tempfile.mkdtemp(prefix="sos_catalog_"), CATALOG_FILENAME)
+        with open(path, "wb") as file:
+            pickle.dump((1, self.catalog), file)
+        with mock.patch("pickle.loads") as loads, mock.patch("pickle.load") as load:
+            self.assertIsNone(LocationCatalog.load(path))
+        loads.assert_not_called()
+        load.assert_not_called()
+
+
+class TestLocationCatalogLoading(SimulatorTestCase):
+    """The catalog is downloaded once, persisted and reused after a restart"""
+
+    simulator_config = SimulatorConfig(latency=0.0, rate_limit_per_minute=0, seed=1, cities_per_country=20)
+
+    def setUp(self):
+        super().setUp()
+        self.stack.enter_context(mock.patch.object(CacheSettings, "PERSISTENT_CACHE_DIR", tempfile.mkdtemp(prefix="sos_catalog_")))
+        reset_location_catalog()
+        self.addCleanup(reset_location_catalog)
+
+    def test_catalog_is_built_once_and_persisted(self):
+        catalog, error = get_location_catalog("test", "test")
+        self.assertIsNone(error)
+        self.assertEqual(catalog.search("slovakia", location_type="Country"), [2703])
+        self.assertIs(get_location_catalog("test", "test")[0], catalog)
+
+        reset_location_catalog()
+        restarted, _ = get_location_catalog("test", "test")
+        self.assertIsNot(restarted, catalog)
+        self.assertEqual(len(restarted), len(catalog))
+        self.assertEqual(self.simulator.stats.by_endpoint["locations"], 1)
+
+    def test_expired_catalog_is_served_stale_and_refreshed(self):
+        catalog, _ = get_location_catalog("test", "test")
+        with mock.patch.object(CacheSettings, "LOCATIONS_TTL", 0):
+            stale, error = get_location_catalog("test", "test")
+            self.assertIs(stale, catalog)
+            self.assertIsNone(error)
+            self.assertTrue(wait_for_refreshes(5))
+        self.assertEqual(self.simulator.stats.by_endpoint["locations"], 2)
+        self.assertIsNot(get_location_catalog("test", "test")[0], catalog)
+
+    def test_catalog_past_max_staleness_is_downloaded_again(self):
+        get_location_catalog("test", "test")
+        with mock.patch.object(CacheSettings, "LOCATIONS_TTL", 0), mock.patch.object(CacheSettings, "LOCATIONS_MAX_STALE", 0):
+            get_location_catalog("test", "test")
+        self.assertEqual(self.simulator.stats.by_endpoint["locations"], 2)
+
+    def test_missing_credentials(self):
+        self.assertEqual(get_location_catalog("", ""), (None, "Chýbajú API prihlasovacie údaje."))
+
+
+class TestSidebarCatalogLoading(SimulatorTestCase):
+    """Locations and languages are loaded concurrently on a cold start"""
+
+    simulator_config = SimulatorConfig(latency=0.3, latency_distribution="constant", rate_limit_per_minute=0, seed=1)
+
+    def setUp(self):
+        super().setUp()
+        self.stack.enter_context(mock.patch.object(CacheSettings, "PERSISTENT_CACHE_DIR", tempfile.mkdtemp(prefix="sos_catalog_")))
+        reset_location_catalog()
+        load_languages.clear()
+        self.addCleanup(reset_location_catalog)
+        self.addCleanup(load_languages.clear)
+
+    def test_cold_start_loads_both_catalogs_concurrently(self):
+        spans = {}
+
+        def timed(name, loader):
+            def load(*args):
+                started = time.perf_counter()
+                try:
+                    return loader(*args)
+                finally:
+                    spans[name] = (started, time.perf_counter())
+            return load
+
+        with mock.patch("ui.sidebar.get_location_catalog", timed("locations", get_location_catalog)), \
+             mock.patch("ui.sidebar.load_languages", timed("languages", load_languages)):
+            catalog, locations_error, languages, languages_error = load_sidebar_catalogs("test", "test")
+        self.assertIsNone(locations_error)
+        self.assertIsNone(languages_error)
+        self.assertIn(2703, catalog)
+        self.assertIn(("Slovak", "sk"), languages)
+        # Sequential loading would start the second call only after the first one ended
+        latest_start = max(started for started, _ in spans.values())
+        earliest_end = min(ended for _, ended in spans.values())
+        self.assertLess(latest_start, earliest_end)
+
+
+if __name__ == "__main__":
+    unittest.main()
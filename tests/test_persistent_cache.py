@@ -0,0 +1,161 @@
+"""
+Unit tests for the persistent SQLite store beneath the cell cache planner.
+
+To run these tests, execute:
+    python -m unittest tests/test_persistent_cache.py
+"""
+import unittest
+from unittest import mock
+import multiprocessing
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import CacheSettings
+from data_processing.fetch_planner import SearchVolumeCellCache, collect_location_outcomes, plan_search_volume_fetch
+from data_processing.persistent_cache import DATABASE_FILENAME, PersistentCellStore
+from tests.test_fetch_planner import _outcome
+from tests.test_simulator import SimulatorTestCase
+
+
+def _rows(keywords, location_code=2703, months=range(24288, 24294), stored_at=None):
+    stored_at = time.time() if stored_at is None else stored_at
+    return [(keyword, keyword, location_code, "sk", month, 100, stored_at) for keyword in keywords for month in months]
+
+
+def _write_rows(path, worker):
+    """Writes rows from a separate process"""
+    PersistentCellStore(path).save(_rows([f"kw{worker}-{i}" for i in range(50)]))
+
+
+class TestPersistentCellStore(unittest.TestCase):
+    """Test cases for the on-disk cell store"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="sos_store_")
+        self.path = os.path.join(self.directory, DATABASE_FILENAME)
+        self.store = PersistentCellStore(self.path, ttl=3600)
+
+    def test_saved_cells_are_loaded_by_another_instance(self):
+        self.store.save(_rows(["a", "b"]))
+        rows = PersistentCellStore(self.path, ttl=3600).load(["a", "c"], 2703, "sk", 24288, 24290)
+        self.assertEqual(sorted((row[0], row[4]) for row in rows), [("a", 24288), ("a", 24289), ("a", 24290)])
+
+    def test_newer_cell_replaces_older(self):
+        self.store.save(_rows(["a"], stored_at=time.time() - 10))
+        self.store.save([("a", "a", 2703, "sk", 24288, 555, time.time())])
+        rows = self.store.load(["a"], 2703, "sk", 24288, 24288)
+        self.assertEqual([row[5] for row in rows], [555])
+
+    def test_expired_cells_are_ignored_and_evicted(self):
+        self.store.save(_rows(["old"], stored_at=time.time() - 7200) + _rows(["new"]))
+        self.assertEqual({row[0] for row in self.store.load(["old", "new"], 2703, "sk", 0, 10 ** 6)}, {"new"})
+        self.store.evict()
+        count = self.store._connection().execute("SELECT COUNT(*) FROM cells").fetchone()[0]
+        self.assertEqual(count, 6)
+
+    def test_oldest_cells_are_evicted_over_size_limit(self):
+        now = time.time()
+        for batch in range(10):
+            self.store.save(_rows([f"kw{batch}-{i}" for i in range(100)], stored_at=now - 100 + batch))
+        store = PersistentCellStore(self.path, max_bytes=self.store.size_bytes() // 2, ttl=3600)
+        store.evict()
+        self.assertLessEqual(store.size_bytes(), store.max_bytes)
+        self.assertEqual(store.load(["kw0-0"], 2703, "sk", 0, 10 ** 6), [])
+        self.assertEqual(len(store.load(["kw9-0"], 2703, "sk", 0, 10 ** 6)), 6)
+
+    def test_concurrent_writes_from_several_processes(self):
+        self.store.save([])  # creates the database before the workers start
+        processes = [multiprocessing.Process(target=_write_rows, args=(self.path, worker)) for worker in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+            self.assertEqual(process.exitcode, 0)
+        count = self.store._connection().execute("SELECT COUNT(*) FROM cells").fetchone()[0]
+        self.assertEqual(count, 4 * 50 * 6)
+
+    def test_database_errors_do_not_propagate(self):
+        with mock.patch.object(self.store, "_connection", side_effect=sqlite3.OperationalError("disk I/O error")):
+            self.store.save(_rows(["a"]))
+            self.assertEqual(self.store.load(["a"], 2703, "sk", 0, 10 ** 6), [])
+
+    def test_directory_that_cannot_be_created_does_not_propagate(self):
+        blocker = tempfile.NamedTemporaryFile(prefix="sos_cache_", delete=False)
+        blocker.close()
+        self.addCleanup(os.unlink, blocker.name)
+        store = PersistentCellStore(os.path.join(blocker.name, "cache", DATABASE_FILENAME))
+        store.save(_rows(["a"]))
+        self.assertEqual(store.load(["a"], 2703, "sk", 0, 10 ** 6), [])
+        store.evict()
+        store.clear()
+
+
+class TestPersistentCellCache(unittest.TestCase):
+    """The cell cache reuses cells stored on disk by an earlier process"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp(prefix="sos_cache_")
+        patcher = mock.patch.object(CacheSettings, "PERSISTENT_CACHE_DIR", directory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def plan(self, cache, keywords):
+        return plan_search_volume_fetch(cache, keywords, [2703], "sk", datetime(2024, 1, 1), datetime(2024, 6, 30))
+
+    def test_restarted_cache_plans_only_new_cells(self):
+        cache = SearchVolumeCellCache(ttl=3600, persistent=True)
+        plan = self.plan(cache, ["Castelli", "rapha"])
+        expected = collect_location_outcomes(cache, plan, [_outcome(task) for task in plan.tasks])
+
+        restarted = SearchVolumeCellCache(ttl=3600, persistent=True)
+        plan = self.plan(restarted, ["castelli", "rapha", "maap"])
+        self.assertEqual([task["keywords"] for task in plan.tasks], [["maap"]])
+
+        plan = self.plan(restarted, ["castelli", "rapha"])
+        self.assertEqual(plan.tasks, [])
+        outcome = collect_location_outcomes(restarted, plan, [])[0]
+        self.assertEqual(outcome["results"]["Search Volume"].tolist(), expected[0]["results"]["Search Volume"].tolist())
+
+    def test_clear_removes_cells_from_disk(self):
+        cache = SearchVolumeCellCache(ttl=3600, persistent=True)
+        plan = self.plan(cache, ["a"])
+        collect_location_outcomes(cache, plan, [_outcome(task) for task in plan.tasks])
+        cache.clear()
+        self.assertEqual(len(self.plan(SearchVolumeCellCache(ttl=3600, persistent=True), ["a"]).tasks), 1)
+
+    def test_disabled_setting_keeps_cells_in_memory_only(self):
+        with mock.patch.object(CacheSettings, "PERSISTENT_CACHE_ENABLED", False):
+            cache = SearchVolumeCellCache(ttl=3600, persistent=True)
+            plan = self.plan(cache, ["a"])
+            collect_location_outcomes(cache, plan, [_outcome(task) for task in plan.tasks])
+        self.assertEqual(len(self.plan(SearchVolumeCellCache(ttl=3600, persistent=True), ["a"]).tasks), 1)
+
+
+class TestUnwritableCacheDirectory(SimulatorTestCase):
+    """A cache directory that cannot be created does not stop the fetch"""
+
+    def setUp(self):
+        super().setUp()
+        # A path below a regular file fails in os.makedirs even when running as root
+        blocker = tempfile.NamedTemporaryFile(prefix="sos_cache_", delete=False)
+        blocker.close()
+        self.addCleanup(os.unlink, blocker.name)
+        self.stack.enter_context(mock.patch.object(CacheSettings, "PERSISTENT_CACHE_ENABLED", True))
+        self.stack.enter_context(mock.patch.object(CacheSettings, "PERSISTENT_CACHE_DIR", os.path.join(blocker.name, "cache")))
+
+    def test_fetch_returns_api_data(self):
+        df, error = self.fetch_multi_country([2703, 2203])
+        self.assertIsNone(error)
+        self.assertEqual(len(df), 2 * 2 * 12)
+        self.assertEqual(self.simulator.stats.by_endpoint["search_volume/live"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
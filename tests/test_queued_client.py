@@ -0,0 +1,198 @@
+"""
+Unit tests for the queued (standard) task mode, run against a local stand-in server.
+
+To run these tests, execute:
+    python -m unittest tests/test_queued_client.py
+"""
+import unittest
+from unittest import mock
+import asyncio
+import itertools
+from datetime import datetime
+import sys
+import os
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client.dataforseo_client import build_search_volume_task
+from api_client.queued_client import get_search_volume_queued_async
+from config import ApiEndpoints, DataProcessingSettings, QueuedTaskSettings
+from data_processing.fetch_planner import get_search_volume_cell_cache
+from data_processing.async_fetcher import FetchProgress, _fetch_multi_country_search_volume_data_async_internal
+
+
+class QueuedStandInServer:
+    """Minimal in-process stand-in for the task_post / tasks_ready / task_get endpoints"""
+
+    def __init__(self, polls_until_ready=2, rejected_locations=(), never_ready=False):
+        self.polls_until_ready = polls_until_ready
+        self.rejected_locations = set(rejected_locations)
+        self.never_ready = never_ready
+        self.tasks = {}
+        self.post_calls = 0
+        self.ready_polls = 0
+        self.get_calls = []
+        self._ids = itertools.count(1)
+
+    def app(self):
+        app = web.Application()
+        app.router.add_post("/task_post", self.task_post)
+        app.router.add_get("/tasks_ready", self.tasks_ready)
+        app.router.add_get("/task_get/{task_id}", self.task_get)
+        return app
+
+    async def task_post(self, request):
+        self.post_calls += 1
+        response_tasks = []
+        for task in await request.json():
+            if task["location_code"] in self.rejected_locations:
+                response_tasks.append({"id": None, "status_code": 40501, "status_message": "Invalid Field: 'location_code'.", "data": task})
+                continue
+            task_id = f"task-{next(self._ids)}"
+            # The first task becomes ready one poll earlier than the rest
+            self.tasks[task_id] = {"data": task, "ready_after": self.polls_until_ready - (len(self.tasks) == 0), "collected": False}
+            response_tasks.append({"id": task_id, "status_code": 20100, "status_message": "Task Created.", "data": task})
+        return web.json_response({"status_code": 20000, "tasks": response_tasks})
+
+    async def tasks_ready(self, request):
+        self.ready_polls += 1
+        ready = [
+            {"id": task_id, "tag": task["data"]["tag"]}
+            for task_id, task in self.tasks.items()
+            if not self.never_ready and not task["collected"] and self.ready_polls >= task["ready_after"]
+        ]
+        return web.json_response({"status_code": 20000, "tasks": [{"status_code": 20000, "status_message": "Ok.", "result": ready}]})
+
+    async def task_get(self, request):
+        task_id = request.match_info["task_id"]
+        self.get_calls.append(task_id)
+        task = self.tasks[task_id]
+        if self.never_ready:
+            return web.json_response({"status_code": 20000, "tasks": [
+                {"id": task_id, "status_code": 40602, "status_message": "Task In Queue.", "data": task["data"], "result": None}
+            ]})
+        task["collected"] = True
+        data = task["data"]
+        return web.json_response({"status_code": 20000, "tasks": [{
+            "id": task_id,
+            "status_code": 20000,
+            "status_message": "Ok.",
+            "data": data,
+            "result": [
+                {"keyword": keyword, "monthly_searches": [{"year": 2024, "month": 1, "search_volume": data["location_code"]}]}
+                for keyword in data["keywords"]
+            ],
+        }]})
+
+
+class TestQueuedClient(unittest.TestCase):
+    """Test cases for posting tasks in bulk and collecting them when ready"""
+
+    def setUp(self):
+        self.settings_patches = [
+            mock.patch.object(DataProcessingSettings, "API_RATE_LIMIT_PER_MINUTE", 60000),
+            mock.patch.object(QueuedTaskSettings, "POLL_INITIAL_INTERVAL", 0.01),
+            mock.patch.object(QueuedTaskSettings, "POLL_MAX_INTERVAL", 0.05),
+        ]
+        for patch in self.settings_patches:
+            patch.start()
+        get_search_volume_cell_cache().clear()
+
+    def tearDown(self):
+        for patch in reversed(self.settings_patches):
+            patch.stop()
+
+    async def _run(self, stand_in, coroutine_factory):
+        server = TestServer(stand_in.app())
+        await server.start_server()
+        try:
+            with mock.patch.object(ApiEndpoints, "SEARCH_VOLUME_TASK_POST", str(server.make_url("/task_post"))), \
+                 mock.patch.object(ApiEndpoints, "SEARCH_VOLUME_TASKS_READY", str(server.make_url("/tasks_ready"))), \
+                 mock.patch.object(ApiEndpoints, "SEARCH_VOLUME_TASK_GET", str(server.make_url("/task_get")) + "/{task_id}"):
+                return await coroutine_factory()
+        finally:
+            await server.close()
+
+    def _fetch(self, stand_in, location_codes):
+        tasks = [
+            build_search_volume_task(["a", "b"], loc_code, "sk", datetime(2024, 1, 1), datetime(2024, 1, 31))
+            for loc_code in location_codes
+        ]
+        progress = []
+
+        async def fetch():
+            async with aiohttp.ClientSession() as session:
+                return await get_search_volume_queued_async(
+                    session, "test", "test", tasks, lambda done, total: progress.append((done, total))
+                )
+
+        return asyncio.run(self._run(stand_in, fetch)), progress
+
+    def test_posts_in_bulk_and_collects_ready_tasks(self):
+        stand_in = QueuedStandInServer(polls_until_ready=3)
+        outcomes, progress = self._fetch(stand_in, [2703, 2203, 2276])
+
+        self.assertEqual(stand_in.post_calls, 1)
+        self.assertGreaterEqual(stand_in.ready_polls, 3)
+        self.assertEqual(len(stand_in.get_calls), 3)
+        self.assertEqual([outcome["location_code"] for outcome in outcomes], [2703, 2203, 2276])
+        for outcome in outcomes:
+            self.assertIsNone(outcome["error"])
+            self.assertEqual(outcome["results"]["Keyword"].tolist(), ["a", "b"])
+            self.assertEqual(outcome["results"]["Search Volume"].tolist(), [outcome["location_code"]] * 2)
+        self.assertEqual(progress[-1], (3, 3))
+
+    def test_every_request_takes_a_rate_limiter_token(self):
+        stand_in = QueuedStandInServer(polls_until_ready=2)
+        limiter = mock.Mock(acquire_async=mock.AsyncMock())
+        with mock.patch("api_client.queued_client.get_rate_limiter", return_value=limiter):
+            self._fetch(stand_in, [2703, 2203])
+
+        requests = stand_in.post_calls + stand_in.ready_polls + len(stand_in.get_calls)
+        self.assertEqual(limiter.acquire_async.await_count, requests)
+
+    def test_rejected_task_is_reported_without_polling_it(self):
+        stand_in = QueuedStandInServer(rejected_locations=[2203])
+        outcomes, _ = self._fetch(stand_in, [2703, 2203])
+
+        self.assertIsNone(outcomes[0]["error"])
+        self.assertIn("40501", outcomes[1]["error"])
+        self.assertTrue(outcomes[1]["results"].empty)
+        self.assertEqual(len(stand_in.get_calls), 1)
+
+    def test_tasks_not_ready_before_timeout(self):
+        stand_in = QueuedStandInServer(never_ready=True)
+        with mock.patch.object(QueuedTaskSettings, "QUEUE_TIMEOUT", 0.1):
+            outcomes, _ = self._fetch(stand_in, [2703])
+
+        # After the timeout the task is requested directly once
+        self.assertEqual(len(stand_in.get_calls), 1)
+        self.assertIn("sa nespracoval", outcomes[0]["error"])
+        self.assertIn("40602", outcomes[0]["error"])
+
+    def test_multi_country_fetch_in_standard_mode(self):
+        stand_in = QueuedStandInServer()
+
+        async def fetch():
+            return await _fetch_multi_country_search_volume_data_async_internal(
+                "test", "test", ("a", "b"), (2703, 2203), "sk",
+                datetime(2024, 1, 1), datetime(2024, 1, 31),
+                (("Slovakia", 2703), ("Czechia", 2203)), FetchProgress()
+            )
+
+        with mock.patch.object(DataProcessingSettings, "SEARCH_VOLUME_FETCH_MODE", "standard"):
+            df, error = asyncio.run(self._run(stand_in, fetch))
+
+        self.assertIsNone(error)
+        self.assertEqual(sorted(df["Country"].unique()), ["Czechia", "Slovakia"])
+        self.assertEqual(len(df), 4)
+        self.assertEqual([row["Status"] for row in df.attrs["task_report"]], ["ok", "ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()
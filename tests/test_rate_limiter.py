@@ -0,0 +1,62 @@
+"""
+Unit tests for the shared token-bucket rate limiter.
+
+To run these tests, execute:
+    python -m unittest tests/test_rate_limiter.py
+"""
+import unittest
+from unittest import mock
+import asyncio
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client import rate_limiter
+from api_client.rate_limiter import TokenBucketRateLimiter, get_rate_limiter
+
+
+class TestTokenBucketRateLimiter(unittest.TestCase):
+    """Test cases for the token-bucket rate limiter"""
+
+    def test_burst_is_free_then_requests_are_spaced(self):
+        limiter = TokenBucketRateLimiter(requests_per_minute=60, burst=2)
+
+        self.assertEqual(limiter.reserve(), 0.0)
+        self.assertEqual(limiter.reserve(), 0.0)
+        # Third and fourth requests queue up behind each other, one second apart
+        self.assertAlmostEqual(limiter.reserve(), 1.0, places=1)
+        self.assertAlmostEqual(limiter.reserve(), 2.0, places=1)
+
+    def test_acquire_async_waits_for_token(self):
+        limiter = TokenBucketRateLimiter(requests_per_minute=600, burst=1)
+
+        async def acquire_twice():
+            await limiter.acquire_async()
+            return await limiter.acquire_async()
+
+        self.assertAlmostEqual(asyncio.run(acquire_twice()), 0.1, places=1)
+
+    def test_try_reserve_never_borrows_tokens(self):
+        limiter = TokenBucketRateLimiter(requests_per_minute=60, burst=1)
+
+        self.assertTrue(limiter.try_reserve())
+        self.assertFalse(limiter.try_reserve())
+        # The refused reservation did not push later callers back
+        self.assertAlmostEqual(limiter.reserve(), 1.0, places=1)
+
+    def test_invalid_rate_is_rejected(self):
+        with self.assertRaises(ValueError):
+            TokenBucketRateLimiter(requests_per_minute=0)
+
+    def test_get_rate_limiter_is_shared_and_follows_settings(self):
+        limiter = get_rate_limiter()
+        self.assertIs(get_rate_limiter(), limiter)
+
+        with mock.patch.object(rate_limiter.DataProcessingSettings, "API_RATE_LIMIT_PER_MINUTE", 120):
+            self.assertIs(get_rate_limiter(), limiter)
+            self.assertEqual(limiter.requests_per_minute, 120)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Unit tests for the per-task retry policy.
+
+To run these tests, execute:
+    python -m unittest tests/test_retry.py
+"""
+import unittest
+from unittest import mock
+import asyncio
+import io
+import json
+from datetime import datetime
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client.dataforseo_client import build_search_volume_task, get_search_volume_multi_async
+from api_client.retry import compute_backoff_delay, parse_retry_after
+from config import DataProcessingSettings, RetrySettings
+
+
+class MockStream:
+    """Mock aiohttp.StreamReader serving a JSON body"""
+
+    def __init__(self, data):
+        self._body = io.BytesIO(json.dumps(data).encode())
+
+    async def read(self, n=-1):
+        return self._body.read(n)
+
+
+class ScriptedResponse:
+    """Response returned by ScriptedSession, usable as `async with session.post(...)`"""
+
+    def __init__(self, status, data, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def json(self):
+        return self._data
+
+    @property
+    def content(self):
+        return MockStream(self._data)
+
+    def raise_for_status(self):
+        pass
+
+
+class ScriptedSession:
+    """Mock aiohttp.ClientSession that answers each POST with the next scripted response"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.post_calls = []
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        self.post_calls.append(json)
+        status, data, response_headers = self.responses.pop(0)
+        return ScriptedResponse(status, data(json) if callable(data) else data, response_headers)
+
+
+def _task_response(status_by_location):
+    """Builds a response for the posted tasks with the given status code per location"""
+    def build(post_data):
+        return {"tasks": [
+            {
+                "status_code": status_by_location[task["location_code"]],
+                "status_message": "Too many requests." if status_by_location[task["location_code"]] == 50301 else "Ok.",
+                "data": {"tag": task["tag"]},
+                "result": [{"keyword": "test", "monthly_searches": [{"year": 2024, "month": 1, "search_volume": 10}]}],
+            }
+            for task in post_data
+        ]}
+    return build
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test cases for backoff computation and per-task retries"""
+
+    def setUp(self):
+        for patcher in (
+            mock.patch.object(DataProcessingSettings, "API_RATE_LIMIT_PER_MINUTE", 60000),
+            mock.patch.object(RetrySettings, "BASE_DELAY", 0.01),
+            mock.patch.object(RetrySettings, "MAX_DELAY", 0.05),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_backoff_grows_exponentially_with_jitter(self):
+        with mock.patch.object(RetrySettings, "BASE_DELAY", 1.0), mock.patch.object(RetrySettings, "MAX_DELAY", 30.0):
+            for attempt, upper in ((1, 1.0), (2, 2.0), (3, 4.0), (10, 30.0)):
+                delay = compute_backoff_delay(attempt)
+                self.assertGreaterEqual(delay, upper / 2)
+                self.assertLessEqual(delay, upper)
+            # Retry-After is honored, but bounded by MAX_DELAY
+            self.assertEqual(compute_backoff_delay(1, retry_after=12), 12)
+            self.assertEqual(compute_backoff_delay(1, retry_after=120), 30.0)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("7"), 7.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("not a date"))
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+    def test_only_failed_tasks_are_retried(self):
+        session = ScriptedSession([
+            (200, _task_response({111: 20000, 222: 50301}), None),
+            (200, _task_response({222: 20000}), None),
+        ])
+        tasks = [build_search_volume_task(["test"], loc, "en", datetime(2024, 1, 1), datetime(2024, 1, 31)) for loc in (111, 222)]
+
+        outcomes = asyncio.run(get_search_volume_multi_async(session, "test", "test", tasks))
+
+        self.assertEqual([len(call) for call in session.post_calls], [2, 1])
+        self.assertEqual(session.post_calls[1][0]["location_code"], 222)
+        self.assertEqual([outcome["attempts"] for outcome in outcomes], [1, 2])
+        self.assertTrue(all(outcome["error"] is None and not outcome["results"].empty for outcome in outcomes))
+
+    def test_http_errors_are_retried_until_attempts_run_out(self):
+        session = ScriptedSession([(503, {}, {"Retry-After": "0"})] * 2)
+        tasks = [build_search_volume_task(["test"], 111, "en", datetime(2024, 1, 1), datetime(2024, 1, 31))]
+
+        with mock.patch.object(RetrySettings, "MAX_ATTEMPTS", 2):
+            outcome = asyncio.run(get_search_volume_multi_async(session, "test", "test", tasks))[0]
+
+        self.assertEqual(len(session.post_calls), 2)
+        self.assertEqual(outcome["attempts"], 2)
+        self.assertIn("503", outcome["error"])
+        self.assertIn("po 2 pokusoch", outcome["error"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Unit tests for the columnar search volume batches.
+
+To run these tests, execute:
+    python -m unittest tests/test_search_volume_columns.py
+"""
+import unittest
+import sys
+import os
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client.search_volume_columns import SEARCH_VOLUME_COLUMNS, SearchVolumeColumns, empty_search_volume_frame
+
+
+class TestSearchVolumeColumns(unittest.TestCase):
+    """Test cases for building result frames from typed arrays"""
+
+    def test_to_frame_builds_typed_columns(self):
+        columns = SearchVolumeColumns()
+        a = columns.add_keyword("a")
+        b = columns.add_keyword("b")
+        columns.append(a, 2023, 12, 10)
+        columns.append(b, 2024, 1, 0)
+        frame = columns.to_frame(2703)
+
+        self.assertEqual(list(frame.columns), SEARCH_VOLUME_COLUMNS)
+        self.assertEqual(frame["Keyword"].tolist(), ["a", "b"])
+        self.assertEqual(frame["Date"].tolist(), [pd.Timestamp("2023-12-01"), pd.Timestamp("2024-01-01")])
+        self.assertEqual(frame["Search Volume"].tolist(), [10, 0])
+        self.assertEqual(frame["Location Code"].tolist(), [2703, 2703])
+        self.assertEqual(frame["Date"].dtype, "datetime64[ns]")
+
+    def test_invalid_months_are_skipped(self):
+        columns = SearchVolumeColumns()
+        keyword = columns.add_keyword("a")
+        columns.append(keyword, 2024, 13, 10)
+        columns.append(keyword, None, 1, 10)
+        columns.append(keyword, 2024, 2, None)
+        columns.append(keyword, 2024, 3, 30)
+        frame = columns.to_frame(2703)
+
+        self.assertEqual(frame["Date"].tolist(), [pd.Timestamp("2024-03-01")])
+
+    def test_empty_frame_matches_result_columns(self):
+        empty = empty_search_volume_frame()
+        self.assertTrue(empty.empty)
+        pd.testing.assert_frame_equal(SearchVolumeColumns().to_frame(2703), empty)
+        self.assertEqual(list(empty.columns), SEARCH_VOLUME_COLUMNS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,236 @@
+"""
+Regression tests of the API client and fetchers against the local DataForSEO simulator.
+
+To run these tests, execute:
+    python -m unittest tests/test_simulator.py
+"""
+import unittest
+from unittest import mock
+import asyncio
+from contextlib import ExitStack
+from datetime import datetime
+import sys
+import os
+import time
+
+import aiohttp
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client import concurrency, hedging
+from api_client.dataforseo_client import get_search_volume_async, get_search_volume_for_task, load_languages, load_locations
+from config import ApiEndpoints, ConcurrencySettings, DataProcessingSettings, HedgeSettings, QueuedTaskSettings, RetrySettings
+from data_processing.fetch_planner import get_search_volume_cell_cache
+from data_processing.async_fetcher import FetchProgress, _fetch_multi_country_search_volume_data_async_internal
+from tools.dataforseo_simulator import SimulatorConfig, SimulatorThread, synthetic_search_volume
+
+ENDPOINT_PATHS = {
+    "SEARCH_VOLUME_LIVE": "/v3/keywords_data/google_ads/search_volume/live",
+    "LOCATIONS": "/v3/keywords_data/google_ads/locations",
+    "LANGUAGES": "/v3/keywords_data/google_ads/languages",
+    "SEARCH_VOLUME_TASK_POST": "/v3/keywords_data/google_ads/search_volume/task_post",
+    "SEARCH_VOLUME_TASKS_READY": "/v3/keywords_data/google_ads/search_volume/tasks_ready",
+    "SEARCH_VOLUME_TASK_GET": "/v3/keywords_data/google_ads/search_volume/task_get/{task_id}",
+}
+
+
+class SimulatorTestCase(unittest.TestCase):
+    """Starts a simulator per test and points ApiEndpoints at it"""
+
+    simulator_config = SimulatorConfig(latency=0.0, rate_limit_per_minute=0, seed=1)
+
+    def setUp(self):
+        self.stack = ExitStack()
+        self.simulator = self.stack.enter_context(SimulatorThread(self.simulator_config))
+        for name, path in ENDPOINT_PATHS.items():
+            self.stack.enter_context(mock.patch.object(ApiEndpoints, name, self.simulator.base_url + path))
+        self.stack.enter_context(mock.patch.object(DataProcessingSettings, "API_RATE_LIMIT_PER_MINUTE", 60000))
+        self.stack.enter_context(mock.patch.object(RetrySettings, "BASE_DELAY", 0.01))
+        # Every test starts with a fresh concurrency window
+        self.stack.enter_context(mock.patch.object(concurrency, "_concurrency_limiter", None))
+        self.stack.enter_context(mock.patch.object(hedging, "_hedge_policy", None))
+        get_search_volume_cell_cache().clear()
+        # Credentials are verified against this simulator, not a cached earlier answer
+        load_languages.clear()
+        self.stack.callback(load_languages.clear)
+
+    def tearDown(self):
+        self.stack.close()
+
+    def fetch_multi_country(self, location_codes):
+        options = tuple((str(code), code) for code in location_codes)
+        return asyncio.run(_fetch_multi_country_search_volume_data_async_internal(
+            "test", "test", ("castelli", "rapha"), tuple(location_codes), "sk",
+            datetime(2024, 1, 1), datetime(2024, 12, 31), options, FetchProgress()
+        ))
+
+
+class TestSimulatorEndpoints(SimulatorTestCase):
+    """Test cases for the synthetic endpoints"""
+
+    def test_live_search_volume_is_deterministic(self):
+        results, error = get_search_volume_for_task(
+            "test", "test", ["castelli"], 2703, "sk", datetime(2024, 1, 1), datetime(2024, 6, 30)
+        )
+        self.assertIsNone(error)
+        self.assertEqual(len(results), 6)
+        first = results.sort_values("Date").iloc[0]
+        self.assertEqual(first["Search Volume"], synthetic_search_volume("castelli", 2703, 2024, 1))
+
+    def test_locations_and_languages(self):
+        load_locations.clear()
+        load_languages.clear()
+        locations, error = load_locations("test", "test")
+        self.assertIsNone(error)
+        self.assertIn(("Slovakia", 2703), locations)
+        self.assertEqual(len(locations), 12 * (1 + self.simulator_config.cities_per_country))
+        languages, error = load_languages("test", "test")
+        self.assertIsNone(error)
+        self.assertIn(("Slovak", "sk"), languages)
+
+    def test_responses_are_transferred_compressed(self):
+        load_locations.clear()
+        locations, error = load_locations("test", "test")
+        self.assertIsNone(error)
+        self.fetch_multi_country([2703])
+        self.assertEqual(self.simulator.stats.compressed_responses, self.simulator.stats.requests)
+
+        load_locations.clear()
+        with mock.patch.object(self.simulator.simulator.config, "compression", False), \
+             mock.patch.object(DataProcessingSettings, "FAST_JSON", False):
+            uncompressed, error = load_locations("test", "test")
+        self.assertIsNone(error)
+        self.assertEqual(uncompressed, locations)
+        self.assertEqual(self.simulator.stats.compressed_responses, self.simulator.stats.requests - 1)
+
+    def test_multi_country_fetch_live_and_standard_mode(self):
+        live_df, error = self.fetch_multi_country([2703, 2203])
+        self.assertIsNone(error)
+        get_search_volume_cell_cache().clear()
+        with mock.patch.object(DataProcessingSettings, "SEARCH_VOLUME_FETCH_MODE", "standard"), \
+             mock.patch.object(QueuedTaskSettings, "POLL_INITIAL_INTERVAL", 0.01), \
+             mock.patch.object(self.simulator.simulator.config, "queue_delay", 0.05):
+            standard_df, error = self.fetch_multi_country([2703, 2203])
+        self.assertIsNone(error)
+        self.assertEqual(len(live_df), 2 * 2 * 12)
+        self.assertEqual(
+            live_df.sort_values(["Country", "Keyword", "Date"])["Search Volume"].tolist(),
+            standard_df.sort_values(["Country", "Keyword", "Date"])["Search Volume"].tolist()
+        )
+        self.assertGreaterEqual(self.simulator.stats.by_endpoint["search_volume/tasks_ready"], 1)
+
+
+class TestSimulatorRateLimit(SimulatorTestCase):
+    """Requests beyond the per-minute limit are answered with 50301"""
+
+    simulator_config = SimulatorConfig(latency=0.0, rate_limit_per_minute=1, seed=1)
+
+    def test_throttled_tasks_fail_with_50301(self):
+        with mock.patch.object(DataProcessingSettings, "ASYNC_PACK_TASKS", False), \
+             mock.patch.object(RetrySettings, "MAX_ATTEMPTS", 1):
+            df, error = self.fetch_multi_country([2703, 2203])
+        self.assertEqual(sorted(row["Status"] for row in df.attrs["task_report"]), ["error", "ok"])
+        self.assertEqual(error.count("50301"), 1)
+        self.assertEqual(self.simulator.stats.throttled, 1)
+
+    def test_throttling_shrinks_the_concurrency_window(self):
+        with mock.patch.object(DataProcessingSettings, "ASYNC_PACK_TASKS", False), \
+             mock.patch.object(RetrySettings, "MAX_ATTEMPTS", 1):
+            self.fetch_multi_country([2703, 2203])
+        snapshot = concurrency.get_concurrency_limiter().snapshot()
+        self.assertEqual(snapshot["decreases"], 1)
+        self.assertLess(snapshot["window"], ConcurrencySettings.INITIAL_WINDOW)
+        self.assertEqual(snapshot["in_flight"], 0)
+
+
+class TestSimulatorHedging(SimulatorTestCase):
+    """A slow response is hedged with a duplicate request"""
+
+    def fetch_one(self):
+        async def run():
+            async with aiohttp.ClientSession() as session:
+                return await get_search_volume_async(
+                    session, "test", "test", ["castelli"], 2703, "sk", datetime(2024, 1, 1), datetime(2024, 6, 30)
+                )
+        return asyncio.run(run())
+
+    def learn_fast_latency(self, policy):
+        for _ in range(HedgeSettings.MIN_SAMPLES):
+            policy.observe(0.01)
+            policy.record_call(tasks=HedgeSettings.MAX_TASKS)
+
+    def test_slow_call_is_hedged_and_first_response_wins(self):
+        policy = hedging.get_hedge_policy()
+        self.learn_fast_latency(policy)
+        with mock.patch.object(HedgeSettings, "ENABLED", True), \
+             mock.patch.object(HedgeSettings, "MIN_DELAY", 0.05), \
+             mock.patch.object(self.simulator.simulator, "_latency", side_effect=[2.0, 0.0]):
+            started = time.monotonic()
+            results, error, _ = self.fetch_one()
+            elapsed = time.monotonic() - started
+
+        self.assertIsNone(error)
+        self.assertEqual(len(results), 6)
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(self.simulator.stats.requests, 2)
+        snapshot = policy.snapshot()
+        self.assertEqual((snapshot["hedges"], snapshot["hedges_won"], snapshot["hedged_tasks"]), (1, 1, 1))
+        # The duplicate held its own place in the concurrency window and gave it back
+        self.assertEqual(concurrency.get_concurrency_limiter().in_flight, 0)
+
+    def test_duplicate_needs_a_free_concurrency_slot(self):
+        policy = hedging.get_hedge_policy()
+        self.learn_fast_latency(policy)
+        with mock.patch.object(HedgeSettings, "ENABLED", True), \
+             mock.patch.object(HedgeSettings, "MIN_DELAY", 0.05), \
+             mock.patch.object(ConcurrencySettings, "MAX_WINDOW", 1), \
+             mock.patch.object(self.simulator.simulator, "_latency", side_effect=[0.3]):
+            results, error, _ = self.fetch_one()
+
+        self.assertIsNone(error)
+        self.assertEqual(self.simulator.stats.requests, 1)
+        self.assertEqual(policy.snapshot()["hedges"], 0)
+        self.assertEqual(policy.snapshot()["skipped"], 1)
+
+    def test_large_posts_are_not_hedged(self):
+        policy = hedging.get_hedge_policy()
+        self.learn_fast_latency(policy)
+        with mock.patch.object(HedgeSettings, "ENABLED", True), \
+             mock.patch.object(HedgeSettings, "MIN_DELAY", 0.05), \
+             mock.patch.object(HedgeSettings, "MAX_TASKS", 0), \
+             mock.patch.object(self.simulator.simulator, "_latency", side_effect=[0.3]):
+            results, error, _ = self.fetch_one()
+
+        self.assertIsNone(error)
+        self.assertEqual(self.simulator.stats.requests, 1)
+        self.assertEqual(policy.snapshot()["skipped"], 0)
+
+    def test_hedging_is_off_by_default(self):
+        policy = hedging.get_hedge_policy()
+        self.learn_fast_latency(policy)
+        with mock.patch.object(self.simulator.simulator, "_latency", side_effect=[0.3]):
+            results, error, _ = self.fetch_one()
+
+        self.assertIsNone(error)
+        self.assertEqual(self.simulator.stats.requests, 1)
+        self.assertEqual(policy.snapshot()["hedges"], 0)
+
+
+class TestSimulatorErrorInjection(SimulatorTestCase):
+    """Injected 5xx errors are retried and reported"""
+
+    simulator_config = SimulatorConfig(latency=0.0, rate_limit_per_minute=0, error_rate=1.0, seed=1)
+
+    def test_injected_errors_are_retried(self):
+        with mock.patch.object(RetrySettings, "MAX_ATTEMPTS", 2):
+            results, error = get_search_volume_for_task(
+                "test", "test", ["castelli"], 2703, "sk", datetime(2024, 1, 1), datetime(2024, 6, 30)
+            )
+        self.assertTrue(results.empty)
+        self.assertIn("po 2 pokusoch", error)
+        self.assertEqual(self.simulator.stats.injected_errors, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,225 @@
+"""
+Unit tests for single-flight deduplication of identical in-flight search volume tasks.
+
+To run these tests, execute:
+    python -m unittest tests/test_single_flight.py
+"""
+import unittest
+from unittest import mock
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import sys
+import os
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client.dataforseo_client import build_search_volume_task
+from api_client.single_flight import (
+    fetch_tasks_single_flight,
+    fetch_tasks_single_flight_async,
+    get_search_volume_flights,
+    search_volume_task_key
+)
+from config import DataProcessingSettings
+from data_processing.async_fetcher import FetchProgress, _fetch_multi_country_search_volume_data_async_internal
+from data_processing.keyword_sharding import fetch_search_volume_sharded
+from tools.dataforseo_simulator import SimulatorConfig
+from tests.test_simulator import SimulatorTestCase
+
+
+def _task(keywords=("a", "b"), location_code=2703):
+    return build_search_volume_task(list(keywords), location_code, "sk", datetime(2024, 1, 1), datetime(2024, 6, 30))
+
+
+def _outcome(task):
+    return {
+        "location_code": task["location_code"],
+        "language_code": task["language_code"],
+        "results": pd.DataFrame({"Keyword": task["keywords"]}),
+        "error": None,
+        "attempts": 1,
+    }
+
+
+class BlockingFetch:
+    """Fetch function that blocks until released and records the tasks it was given"""
+
+    def __init__(self):
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, tasks):
+        self.calls.append(tasks)
+        self.started.set()
+        self.release.wait(5)
+        return [_outcome(task) for task in tasks]
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for the in-process single-flight registry"""
+
+    def test_key_ignores_keyword_order_and_tag(self):
+        first = _task(("a", "b"))
+        second = {**_task(("b", "a")), "tag": "other"}
+        key = search_volume_task_key("login", "password", first)
+        self.assertEqual(key, search_volume_task_key("login", "password", second))
+        self.assertNotEqual(key, search_volume_task_key("other", "password", first))
+        self.assertNotEqual(key, search_volume_task_key("login", "wrong", first))
+        self.assertNotEqual(key, search_volume_task_key("login", "password", _task(location_code=2203)))
+        self.assertNotIn("password", repr(key))
+
+    def test_concurrent_sync_callers_share_one_fetch(self):
+        fetch = BlockingFetch()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(fetch_tasks_single_flight, "login", "password", [_task(), _task(location_code=2203)], fetch)
+            fetch.started.wait(5)
+            second = executor.submit(fetch_tasks_single_flight, "login", "password", [_task(("b", "a"))], lambda tasks: self.fail("fetched twice"))
+            fetch.release.set()
+            first_outcomes, second_outcomes = first.result(5), second.result(5)
+
+        self.assertEqual(len(fetch.calls), 1)
+        pd.testing.assert_frame_equal(second_outcomes[0]["results"], first_outcomes[0]["results"])
+        self.assertIsNot(second_outcomes[0]["results"], first_outcomes[0]["results"])
+        self.assertEqual(len(get_search_volume_flights()), 0)
+
+    def test_callers_with_other_credentials_fetch_themselves(self):
+        fetch = BlockingFetch()
+        other_fetch = mock.Mock(side_effect=lambda tasks: [_outcome(task) for task in tasks])
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(fetch_tasks_single_flight, "login", "password", [_task()], fetch)
+            fetch.started.wait(5)
+            other_fetch_outcomes = fetch_tasks_single_flight("login", "wrong", [_task()], other_fetch)
+            fetch.release.set()
+            first.result(5)
+
+        other_fetch.assert_called_once()
+        self.assertEqual(other_fetch_outcomes[0]["results"]["Keyword"].tolist(), ["a", "b"])
+        self.assertEqual(len(fetch.calls), 1)
+        self.assertEqual(len(get_search_volume_flights()), 0)
+
+    def test_only_tasks_not_in_flight_are_fetched(self):
+        fetch = BlockingFetch()
+        own_tasks = []
+
+        def second_fetch(tasks):
+            own_tasks.extend(tasks)
+            return [_outcome(task) for task in tasks]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(fetch_tasks_single_flight, "login", "password", [_task()], fetch)
+            fetch.started.wait(5)
+            second = executor.submit(fetch_tasks_single_flight, "login", "password", [_task(location_code=2203), _task()], second_fetch)
+            fetch.release.set()
+            first.result(5)
+            second_outcomes = second.result(5)
+
+        self.assertEqual([task["location_code"] for task in own_tasks], [2203])
+        self.assertEqual([outcome["location_code"] for outcome in second_outcomes], [2203, 2703])
+
+    def test_async_caller_awaits_sync_fetch_in_flight(self):
+        fetch = BlockingFetch()
+
+        async def follower():
+            async def fetch_async(tasks):
+                self.fail("fetched twice")
+            return await fetch_tasks_single_flight_async("login", "password", [_task()], fetch_async)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(fetch_tasks_single_flight, "login", "password", [_task()], fetch)
+            fetch.started.wait(5)
+            threading.Timer(0.05, fetch.release.set).start()
+            outcomes = asyncio.run(follower())
+            leader.result(5)
+        self.assertEqual(outcomes[0]["results"]["Keyword"].tolist(), ["a", "b"])
+
+    def test_failure_is_propagated_to_waiting_callers(self):
+        release = threading.Event()
+        started = threading.Event()
+
+        def failing_fetch(tasks):
+            started.set()
+            release.wait(5)
+            raise RuntimeError("boom")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(fetch_tasks_single_flight, "login", "password", [_task()], failing_fetch)
+            started.wait(5)
+            second = executor.submit(fetch_tasks_single_flight, "login", "password", [_task()], failing_fetch)
+            release.set()
+            for future in (first, second):
+                with self.assertRaises(RuntimeError):
+                    future.result(5)
+        self.assertEqual(len(get_search_volume_flights()), 0)
+
+    def test_waiting_caller_fetches_itself_when_owner_is_cancelled(self):
+        release = threading.Event()
+        started = threading.Event()
+
+        def cancelled_fetch(tasks):
+            started.set()
+            release.wait(5)
+            raise asyncio.CancelledError()
+
+        fallback_fetch = mock.Mock(side_effect=lambda tasks: [_outcome(task) for task in tasks])
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(fetch_tasks_single_flight, "login", "password", [_task()], cancelled_fetch)
+            started.wait(5)
+            second = executor.submit(fetch_tasks_single_flight, "login", "password", [_task()], fallback_fetch)
+            release.set()
+            with self.assertRaises(asyncio.CancelledError):
+                first.result(5)
+            second_outcomes = second.result(5)
+
+        fallback_fetch.assert_called_once()
+        self.assertEqual(second_outcomes[0]["results"]["Keyword"].tolist(), ["a", "b"])
+        self.assertEqual(len(get_search_volume_flights()), 0)
+
+    def test_setting_disables_deduplication(self):
+        fetch = mock.Mock(side_effect=lambda tasks: [_outcome(task) for task in tasks])
+        with mock.patch.object(DataProcessingSettings, "SINGLE_FLIGHT", False):
+            fetch_tasks_single_flight("login", "password", [_task()], fetch)
+        self.assertEqual(len(get_search_volume_flights()), 0)
+        fetch.assert_called_once()
+
+
+class TestSingleFlightFetchers(SimulatorTestCase):
+    """Identical concurrent runs of the fetchers reach the API only once"""
+
+    simulator_config = SimulatorConfig(latency=0.2, latency_distribution="constant", rate_limit_per_minute=0, seed=1)
+
+    def test_concurrent_async_runs(self):
+        async def run_twice():
+            return await asyncio.gather(*[
+                _fetch_multi_country_search_volume_data_async_internal(
+                    "test", "test", ("castelli", "rapha"), (2703, 2203), "sk",
+                    datetime(2024, 1, 1), datetime(2024, 12, 31), (("Slovakia", 2703), ("Czechia", 2203)), FetchProgress()
+                )
+                for _ in range(2)
+            ])
+
+        (first_df, first_error), (second_df, second_error) = asyncio.run(run_twice())
+        self.assertIsNone(first_error)
+        self.assertIsNone(second_error)
+        pd.testing.assert_frame_equal(first_df, second_df)
+        self.assertEqual(self.simulator.stats.by_endpoint["search_volume/live"], 1)
+
+    def test_concurrent_sync_runs(self):
+        def fetch():
+            return fetch_search_volume_sharded(
+                "test", "test", ["castelli", "rapha"], 2703, "sk", datetime(2024, 1, 1), datetime(2024, 12, 31)
+            )
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(lambda _: fetch(), range(2)))
+        pd.testing.assert_frame_equal(results[0][0], results[1][0])
+        self.assertEqual(self.simulator.stats.by_endpoint["search_volume/live"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Unit tests for streaming multi-country fetches (results per country in completion order).
+
+To run these tests, execute:
+    python -m unittest tests/test_streaming_fetch.py
+"""
+import unittest
+from unittest import mock
+import asyncio
+import time
+from datetime import datetime
+import sys
+import os
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client.single_flight import get_search_volume_flights
+from config import ConcurrencySettings, DataProcessingSettings, QueuedTaskSettings
+from data_processing.async_fetcher import MultiCountryFetchStream, stream_country_results_async
+from data_processing.fetch_planner import get_search_volume_cell_cache, plan_search_volume_fetch
+from tools.dataforseo_simulator import SimulatorConfig
+from tests.test_simulator import SimulatorTestCase
+
+KEYWORDS = ("castelli", "rapha")
+DATE_FROM = datetime(2024, 1, 1)
+DATE_TO = datetime(2024, 12, 31)
+
+
+class TestStreamingFetch(SimulatorTestCase):
+    """Test cases for stream_country_results_async and MultiCountryFetchStream"""
+
+    simulator_config = SimulatorConfig(latency=0.2, latency_distribution="constant", rate_limit_per_minute=0, seed=1)
+
+    def stream(self, location_codes):
+        """Collects (seconds since start, country result) for every streamed country"""
+        plan = plan_search_volume_fetch(
+            get_search_volume_cell_cache(), list(KEYWORDS), list(location_codes), "sk", DATE_FROM, DATE_TO
+        )
+        names = {code: f"Country {code}" for code in location_codes}
+
+        async def collect():
+            started = time.perf_counter()
+            return [
+                (time.perf_counter() - started, result)
+                async for result in stream_country_results_async("test", "test", plan, names)
+            ]
+        return asyncio.run(collect())
+
+    def open_stream(self, location_codes):
+        options = tuple((f"Country {code}", code) for code in location_codes)
+        return MultiCountryFetchStream("test", "test", KEYWORDS, tuple(location_codes), "sk", DATE_FROM, DATE_TO, options)
+
+    def test_countries_are_yielded_as_they_complete(self):
+        with mock.patch.object(DataProcessingSettings, "ASYNC_PACK_TASKS", False), \
+             mock.patch.object(ConcurrencySettings, "MAX_WINDOW", 1):
+            streamed = self.stream([2703, 2203, 2276])
+
+        self.assertEqual(sorted(result["location_code"] for _, result in streamed), [2203, 2276, 2703])
+        # The first country is available after one request, not after all three
+        self.assertLess(streamed[0][0], 0.45)
+        self.assertGreaterEqual(streamed[-1][0], 0.55)
+        for _, result in streamed:
+            self.assertIsNone(result["error"])
+            self.assertEqual(set(result["results"]["Country"]), {f"Country {result['location_code']}"})
+
+    def test_cached_countries_are_yielded_first(self):
+        self.stream([2203])
+        streamed = self.stream([2703, 2203])
+
+        self.assertEqual([result["location_code"] for _, result in streamed], [2203, 2703])
+        self.assertEqual(streamed[0][1]["attempts"], 0)
+        self.assertEqual(streamed[1][1]["attempts"], 1)
+
+    def test_stream_result_equals_batch_fetch(self):
+        stream = self.open_stream([2703, 2203, 2276])
+        arrived = []
+        while not stream.done:
+            arrived.extend(stream.poll(timeout=0.05))
+        streamed_df, streamed_error = stream.result()
+
+        get_search_volume_cell_cache().clear()
+        batch_df, batch_error = self.fetch_multi_country([2703, 2203, 2276])
+
+        self.assertEqual(len(arrived), 3)
+        self.assertIsNone(streamed_error)
+        self.assertEqual(streamed_error, batch_error)
+        pd.testing.assert_frame_equal(streamed_df, batch_df.assign(Country=batch_df["Country"].map(lambda code: f"Country {code}")))
+        self.assertEqual(streamed_df.attrs["task_report"][0]["Location Code"], 2703)
+
+    def test_cancel_stops_remaining_requests_and_keeps_arrived_countries(self):
+        with mock.patch.object(DataProcessingSettings, "ASYNC_PACK_TASKS", False), \
+             mock.patch.object(ConcurrencySettings, "MAX_WINDOW", 1):
+            stream = self.open_stream([2703, 2203, 2276, 2040])
+            arrived = stream.poll(timeout=2)
+            stream.cancel()
+            time.sleep(0.5)
+
+        self.assertEqual(len(arrived), 1)
+        # The request in flight when cancelling may have reached the server, later ones not
+        self.assertLessEqual(self.simulator.stats.by_endpoint["search_volume/live"], 2)
+        self.assertEqual(len(get_search_volume_flights()), 0)
+        plan = plan_search_volume_fetch(
+            get_search_volume_cell_cache(), list(KEYWORDS), [arrived[0]["location_code"]], "sk", DATE_FROM, DATE_TO
+        )
+        self.assertEqual(plan.tasks, [])
+
+    def test_languages_are_fetched_in_one_run_with_language_column(self):
+        options = (("Country 2703", 2703), ("Country 2203", 2203))
+        stream = MultiCountryFetchStream(
+            "test", "test", KEYWORDS, (2703, 2203), ((2703, "sk"), (2703, "en"), (2203, "cs")), DATE_FROM, DATE_TO, options
+        )
+        arrived = []
+        while not stream.done:
+            arrived.extend(stream.poll(timeout=0.05))
+        streamed_df, error = stream.result()
+
+        self.assertIsNone(error)
+        self.assertEqual(sorted((result["location_code"], result["language_code"]) for result in arrived), [(2203, "cs"), (2703, "en"), (2703, "sk")])
+        # All (country, language) tasks are packed into one request
+        self.assertEqual(self.simulator.stats.by_endpoint["search_volume/live"], 1)
+        self.assertEqual(
+            streamed_df.groupby(["Country", "Language"]).size().to_dict(),
+            {("Country 2203", "cs"): 24, ("Country 2703", "en"): 24, ("Country 2703", "sk"): 24}
+        )
+        self.assertEqual([row["Language"] for row in streamed_df.attrs["task_report"]], ["sk", "en", "cs"])
+
+    def test_standard_mode_streams_per_task(self):
+        with mock.patch.object(DataProcessingSettings, "SEARCH_VOLUME_FETCH_MODE", "standard"), \
+             mock.patch.object(QueuedTaskSettings, "POLL_INITIAL_INTERVAL", 0.01), \
+             mock.patch.object(self.simulator.simulator.config, "queue_delay", 0.05):
+            stream = self.open_stream([2703, 2203])
+            streamed_df, error = stream.result()
+
+        self.assertIsNone(error)
+        self.assertEqual(sorted(streamed_df["Country"].unique()), ["Country 2203", "Country 2703"])
+        self.assertEqual(len(streamed_df), 2 * 2 * 12)
+        self.assertTrue(stream.done)
+        self.assertEqual(self.simulator.stats.by_endpoint["search_volume/task_post"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Unit tests for the streaming search volume response parser.
+
+To run these tests, execute:
+    python -m unittest tests/test_streaming_parser.py
+"""
+import unittest
+from unittest import mock
+import asyncio
+import io
+import json
+import sys
+import os
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client import streaming_parser
+from api_client.dataforseo_client import _split_search_volume_response
+from api_client.streaming_parser import parse_search_volume_stream, parse_search_volume_stream_async
+from config import DataProcessingSettings
+
+
+def _response(tasks):
+    return {"status_code": 20000, "status_message": "Ok.", "tasks": tasks}
+
+
+def _task(tag, keywords, status_code=20000, months=3):
+    return {
+        "id": "task-" + tag,
+        "status_code": status_code,
+        "status_message": "Ok." if status_code == 20000 else "Too many requests.",
+        "cost": 0.05,
+        "data": {"api": "keywords_data", "tag": tag},
+        "result": [
+            {
+                "keyword": keyword,
+                "competition": "LOW",
+                "monthly_searches": [
+                    {"year": 2024, "month": month, "search_volume": index * 100 + month}
+                    for month in range(1, months + 1)
+                ],
+            }
+            for index, keyword in enumerate(keywords)
+        ] if status_code == 20000 else None,
+    }
+
+
+def _chunks(data, size=7):
+    body = json.dumps(data).encode()
+    return (body[i:i + size] for i in range(0, len(body), size))
+
+
+def assert_outcomes_equal(testcase, first, second):
+    testcase.assertEqual(len(first), len(second))
+    for outcome, expected in zip(first, second):
+        pd.testing.assert_frame_equal(outcome.pop("results"), expected.pop("results"))
+        testcase.assertEqual(outcome, expected)
+
+
+class AsyncStream:
+    """Minimal async stream with aiohttp.StreamReader's read(n)"""
+
+    def __init__(self, data):
+        self._body = io.BytesIO(json.dumps(data).encode())
+
+    async def read(self, n=-1):
+        return self._body.read(min(n, 5) if n > 0 else n)
+
+
+@unittest.skipIf(streaming_parser.ijson is None, "ijson is not installed")
+class TestStreamingParser(unittest.TestCase):
+    """Streaming parse must give the same outcomes as the full JSON parse"""
+
+    def setUp(self):
+        self.post_data = [
+            {"location_code": 2703, "language_code": "sk", "tag": "t#0"},
+            {"location_code": 2203, "language_code": "sk", "tag": "t#1"},
+            {"location_code": 2276, "language_code": "sk", "tag": "t#2"},
+        ]
+        self.data = _response([
+            _task("t#1", ["a", "b"]),
+            _task("t#0", ["c"], months=12),
+            _task("t#2", ["d"], status_code=50301),
+        ])
+
+    def test_sync_stream_matches_full_parse(self):
+        streamed = _split_search_volume_response(parse_search_volume_stream(_chunks(self.data)), self.post_data)
+        self.assertEqual(len(streamed[0]["results"]), 12)
+        self.assertEqual(len(streamed[1]["results"]), 6)
+        self.assertTrue(streamed[2]["retryable"])
+        assert_outcomes_equal(self, streamed, _split_search_volume_response(self.data, self.post_data))
+
+    def test_async_stream_matches_full_parse(self):
+        streamed = asyncio.run(parse_search_volume_stream_async(AsyncStream(self.data)))
+        assert_outcomes_equal(
+            self,
+            _split_search_volume_response(streamed, self.post_data),
+            _split_search_volume_response(self.data, self.post_data)
+        )
+
+    def test_only_monthly_columns_are_kept(self):
+        streamed = parse_search_volume_stream(_chunks(self.data))
+        self.assertEqual(set(streamed["tasks"][0]), {"status_code", "status_message", "data", "monthly_columns"})
+        frame = streamed["tasks"][0]["monthly_columns"].to_frame(2203)
+        self.assertEqual(frame.iloc[0].tolist(), ["a", pd.Timestamp("2024-01-01"), 1, 2203])
+
+    def test_keyword_after_monthly_searches(self):
+        data = _response([{
+            "status_code": 20000,
+            "data": {"tag": "t#0"},
+            "result": [
+                {"monthly_searches": [{"year": 2024, "month": 2, "search_volume": 5}], "keyword": "late"},
+                {"monthly_searches": [{"year": 2024, "month": 2, "search_volume": 7}]},
+            ],
+        }])
+        streamed = parse_search_volume_stream(_chunks(data))
+        frame = streamed["tasks"][0]["monthly_columns"].to_frame(2703)
+        self.assertEqual(frame[["Keyword", "Search Volume"]].values.tolist(), [["late", 5]])
+
+    def test_unexpected_structure(self):
+        data = {"status_code": 40000, "status_message": "Bad request."}
+        outcome = _split_search_volume_response(parse_search_volume_stream(_chunks(data)), self.post_data[:1])[0]
+        self.assertEqual(outcome["error"], "API vrátilo neočakávanú štruktúru odpovede.")
+
+    def test_setting_disables_streaming(self):
+        with mock.patch.object(DataProcessingSettings, 'STREAMING_JSON_PARSE', False):
+            self.assertFalse(streaming_parser.is_streaming_parse_enabled())
+        self.assertTrue(streaming_parser.is_streaming_parse_enabled())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Unit tests for the stale-while-revalidate cache used by the API loaders and fetchers.
+
+To run these tests, execute:
+    python -m unittest tests/test_swr_cache.py
+"""
+import unittest
+from unittest import mock
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import os
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_processing.fetcher import fetch_multi_country_search_volume_data
+from utils.swr_cache import StaleWhileRevalidateCache, cache_status, wait_for_refreshes
+from tests.test_simulator import SimulatorTestCase
+
+
+class Loader:
+    """Counts calls and returns a new (value, error) result per call"""
+
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, key):
+        self.release.wait(5)
+        self.calls += 1
+        return [f"{key}-{self.calls}"], self.error
+
+
+class TestStaleWhileRevalidateCache(unittest.TestCase):
+    """Test cases for serving stale entries while refreshing them in the background"""
+
+    def setUp(self):
+        self.ttl = 3600
+        self.max_stale = 3600
+        self.loader = Loader()
+        self.cache = StaleWhileRevalidateCache(
+            self.loader, self.id(), ttl=lambda: self.ttl, max_stale=lambda: self.max_stale, max_entries=2,
+            is_failure=lambda result: result[1] is not None, label=lambda key: f"key {key}"
+        )
+
+    def test_fresh_entry_is_cached(self):
+        self.assertEqual(self.cache("a"), (["a-1"], None))
+        self.assertEqual(self.cache("a"), (["a-1"], None))
+        self.assertEqual(self.loader.calls, 1)
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        self.cache("a")
+        self.ttl = 0
+        self.loader.release.clear()
+        self.assertEqual(self.cache("a"), (["a-1"], None))
+        self.assertEqual(self.cache("a"), (["a-1"], None))
+        self.assertEqual([entry["refreshing"] for entry in cache_status(stale_only=True) if entry["cache"] == self.id()], [True])
+        self.loader.release.set()
+        self.assertTrue(wait_for_refreshes(5))
+        self.assertEqual(self.loader.calls, 2)
+        self.assertEqual(self.cache("a")[0], ["a-2"])
+
+    def test_failed_refresh_keeps_the_stale_value(self):
+        self.cache("a")
+        self.ttl = 0
+        self.loader.error = "Chyba HTTP 500"
+        self.cache("a")
+        self.assertTrue(wait_for_refreshes(5))
+        self.assertEqual(self.cache("a"), (["a-1"], None))
+        status = [entry for entry in cache_status() if entry["cache"] == self.id()]
+        self.assertEqual([(entry["entry"], entry["stale"], entry["refresh_failed"]) for entry in status], [("key a", True, True)])
+        # A failed refresh is not retried on every call
+        self.assertEqual(self.loader.calls, 2)
+
+    def test_entry_past_max_staleness_is_loaded_synchronously(self):
+        self.cache("a")
+        self.ttl = 0
+        self.max_stale = 0
+        self.assertEqual(self.cache("a"), (["a-2"], None))
+        self.assertEqual(self.loader.calls, 2)
+
+    def test_concurrent_cold_callers_share_one_load(self):
+        self.loader.release.clear()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(self.cache, "a") for _ in range(3)]
+            threading.Timer(0.05, self.loader.release.set).start()
+            results = [future.result(5) for future in futures]
+        self.assertEqual(results, [(["a-1"], None)] * 3)
+        self.assertEqual(self.loader.calls, 1)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        self.cache("a")
+        self.cache("b")
+        self.cache("a")
+        self.cache("c")
+        self.assertEqual([entry["entry"] for entry in self.cache.status()], ["key a", "key c"])
+
+    def test_callers_get_copies(self):
+        def frame(key):
+            df = pd.DataFrame({"Keyword": [key]})
+            df.attrs["task_report"] = [{"Attempts": 1}]
+            return df, None
+
+        cache = StaleWhileRevalidateCache(frame, "frames", ttl=60, max_stale=60)
+        df, _ = cache("a")
+        df["Keyword"] = "changed"
+        again, _ = cache("a")
+        self.assertEqual(again["Keyword"].tolist(), ["a"])
+        self.assertEqual(again.attrs["task_report"], [{"Attempts": 1}])
+
+    def test_clear(self):
+        self.cache("a")
+        self.cache.clear()
+        self.cache("a")
+        self.assertEqual(self.loader.calls, 2)
+
+
+class TestFetcherRefreshInBackground(SimulatorTestCase):
+    """A background refresh of the sequential multi-country fetcher renders nothing"""
+
+    ARGS = (
+        "test", "test", ("castelli",), (2703, 2203), "sk",
+        datetime(2024, 1, 1), datetime(2024, 6, 30), (("Slovakia", 2703), ("Czechia", 2203))
+    )
+
+    def setUp(self):
+        super().setUp()
+        fetch_multi_country_search_volume_data.clear()
+        self.addCleanup(fetch_multi_country_search_volume_data.clear)
+
+    def test_refresh_creates_no_streamlit_elements(self):
+        fetched_df, error = fetch_multi_country_search_volume_data(*self.ARGS)
+        self.assertIsNone(error)
+        key = (self.ARGS, ())
+        entry = fetch_multi_country_search_volume_data._entries[key]
+
+        with mock.patch("data_processing.fetcher.st") as st:
+            fetch_multi_country_search_volume_data._refresh(key, entry, self.ARGS, {})
+        self.assertEqual(st.method_calls, [])
+        refreshed_df, _ = fetch_multi_country_search_volume_data._entries[key].value
+        pd.testing.assert_frame_equal(refreshed_df, fetched_df)
+
+    def test_script_run_renders_progress(self):
+        with mock.patch("data_processing.fetcher.st") as st, \
+             mock.patch("data_processing.fetcher.get_script_run_ctx", return_value=object()):
+            fetch_multi_country_search_volume_data(*self.ARGS)
+        st.progress.assert_called_once_with(0)
+        st.progress.return_value.empty.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Unit tests for the record/replay transport, recorded against the local DataForSEO simulator.
+
+To run these tests, execute:
+    python -m unittest tests/test_transport.py
+"""
+import unittest
+from unittest import mock
+import asyncio
+import gzip
+import json
+import tempfile
+import time
+from contextlib import ExitStack
+from datetime import datetime
+import sys
+import os
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client import transport
+from api_client.dataforseo_client import get_search_volume_for_task, load_languages, load_locations
+from config import ApiEndpoints, DataProcessingSettings, QueuedTaskSettings, TransportSettings
+from data_processing.fetch_planner import get_search_volume_cell_cache
+from data_processing.async_fetcher import FetchProgress, _fetch_multi_country_search_volume_data_async_internal
+from tools.dataforseo_simulator import SimulatorConfig, SimulatorThread
+from tests.test_simulator import ENDPOINT_PATHS
+
+
+class TestRecordReplay(unittest.TestCase):
+    """Responses recorded from the simulator are replayed without any network access"""
+
+    def setUp(self):
+        self.stack = ExitStack()
+        self.cassette_path = os.path.join(self.stack.enter_context(tempfile.TemporaryDirectory()), "api.jsonl.gz")
+        self.stack.enter_context(mock.patch.object(TransportSettings, "CASSETTE_PATH", self.cassette_path))
+        self.stack.enter_context(mock.patch.object(DataProcessingSettings, "API_RATE_LIMIT_PER_MINUTE", 60000))
+        self.stack.callback(transport.reset_cassettes)
+        transport.reset_cassettes()
+
+    def tearDown(self):
+        self.stack.close()
+
+    def run_all(self):
+        load_locations.clear()
+        load_languages.clear()
+        get_search_volume_cell_cache().clear()
+        locations = load_locations("test", "test")
+        languages = load_languages("test", "test")
+        single = get_search_volume_for_task(
+            "test", "test", ["castelli", "rapha"], 2703, "sk", datetime(2024, 1, 1), datetime(2024, 6, 30)
+        )
+        multi = asyncio.run(_fetch_multi_country_search_volume_data_async_internal(
+            "test", "test", ("castelli", "rapha"), (2703, 2203), "sk",
+            datetime(2024, 1, 1), datetime(2024, 12, 31), (("Slovakia", 2703), ("Czechia", 2203)), FetchProgress()
+        ))
+        return locations, languages, single, multi
+
+    def record(self, config=SimulatorConfig(latency=0.0, rate_limit_per_minute=0, seed=1), func=None):
+        with ExitStack() as stack:
+            simulator = stack.enter_context(SimulatorThread(config))
+            for name, path in ENDPOINT_PATHS.items():
+                stack.enter_context(mock.patch.object(ApiEndpoints, name, simulator.base_url + path))
+            stack.enter_context(mock.patch.object(TransportSettings, "MODE", "record"))
+            return (func or self.run_all)(), simulator.stats.requests
+
+    def replay(self, func=None):
+        transport.reset_cassettes()
+        get_search_volume_cell_cache().clear()
+        with ExitStack() as stack:
+            # Nothing listens on the discard port, so replay must not touch the network at all
+            for name, path in ENDPOINT_PATHS.items():
+                stack.enter_context(mock.patch.object(ApiEndpoints, name, "http://127.0.0.1:9" + path))
+            stack.enter_context(mock.patch.object(TransportSettings, "MODE", "replay"))
+            return (func or self.run_all)()
+
+    def test_replay_matches_recording(self):
+        recorded, _ = self.record()
+        replayed = self.replay()
+
+        self.assertEqual(replayed[0], recorded[0])
+        self.assertEqual(replayed[1], recorded[1])
+        pd.testing.assert_frame_equal(replayed[2][0], recorded[2][0])
+        pd.testing.assert_frame_equal(replayed[3][0], recorded[3][0])
+        self.assertIsNone(replayed[3][1])
+        self.assertEqual(len(replayed[3][0]), 2 * 2 * 12)
+
+    def test_cassette_is_compressed_and_has_no_credentials(self):
+        _, requests_made = self.record()
+        with gzip.open(self.cassette_path, "rt", encoding="utf-8") as cassette_file:
+            interactions = [json.loads(line) for line in cassette_file]
+        self.assertEqual(len(interactions), requests_made)
+        self.assertIn("GET /v3/keywords_data/google_ads/locations", [i["request"] for i in interactions])
+        self.assertNotIn("Authorization", json.dumps(interactions))
+
+    def test_standard_mode_polls_are_replayed_in_order(self):
+        def fetch():
+            return asyncio.run(_fetch_multi_country_search_volume_data_async_internal(
+                "test", "test", ("castelli",), (2703,), "sk",
+                datetime(2024, 1, 1), datetime(2024, 3, 31), (("Slovakia", 2703),), FetchProgress()
+            ))
+
+        config = SimulatorConfig(latency=0.0, rate_limit_per_minute=0, queue_delay=0.05, seed=1)
+        with mock.patch.object(DataProcessingSettings, "SEARCH_VOLUME_FETCH_MODE", "standard"), \
+             mock.patch.object(QueuedTaskSettings, "POLL_INITIAL_INTERVAL", 0.01):
+            (recorded_df, _), _ = self.record(config, fetch)
+            replayed_df, error = self.replay(fetch)
+        self.assertIsNone(error)
+        pd.testing.assert_frame_equal(replayed_df, recorded_df)
+
+    def test_missing_interaction_is_reported(self):
+        self.record()
+        with mock.patch.object(DataProcessingSettings, "API_REQUEST_TIMEOUT", 1):
+            results, error = self.replay(lambda: get_search_volume_for_task(
+                "test", "test", ["unknown"], 2703, "sk", datetime(2024, 1, 1), datetime(2024, 6, 30)
+            ))
+        self.assertTrue(results.empty)
+        self.assertIn("neobsahuje odpoveď", error)
+
+    def test_replay_with_recorded_latency(self):
+        config = SimulatorConfig(latency=0.2, latency_distribution="constant", rate_limit_per_minute=0, seed=1)
+        fetch = lambda: get_search_volume_for_task(
+            "test", "test", ["castelli"], 2703, "sk", datetime(2024, 1, 1), datetime(2024, 6, 30)
+        )
+        self.record(config, fetch)
+
+        started = time.perf_counter()
+        self.replay(fetch)
+        self.assertLess(time.perf_counter() - started, 0.15)
+        with mock.patch.object(TransportSettings, "REPLAY_LATENCY", True):
+            started = time.perf_counter()
+            self.replay(fetch)
+        self.assertGreaterEqual(time.perf_counter() - started, 0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
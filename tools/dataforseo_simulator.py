@@ -0,0 +1,415 @@
+"""
+Lokálny simulátor DataForSEO API pre offline ladenie priepustnosti a regresné testy.
+
+Implementuje endpointy search_volume/live, locations a languages (a frontové
+task_post / tasks_ready / task_get) so syntetickými, deterministickými dátami.
+Oneskorenie odpovedí, limit volaní za minútu (tasky dostanú status 50301) aj
+náhodné chyby 5xx sú nastaviteľné. Ako produkčné API, odpovede komprimuje podľa
+hlavičky Accept-Encoding klienta (requests aj aiohttp predvolene posielajú gzip, deflate).
+
+Spustenie:
+    python -m tools.dataforseo_simulator --port 8765 --latency 0.3 --rate-limit 12 --error-rate 0.05
+
+Aplikáciu potom nasmerujete na simulátor premennou prostredia:
+    DATAFORSEO_API_BASE_URL=http://127.0.0.1:8765 streamlit run streamlit_app.py
+
+Štatistiky simulátora (počty volaní, obmedzených a chybných odpovedí) vracia GET /simulator/stats.
+"""
+from typing import List, Dict, Tuple, Any, Optional
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from datetime import date
+import argparse
+import asyncio
+import base64
+import itertools
+import logging
+import random
+import re
+import threading
+import time
+import zlib
+
+from aiohttp import web
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/v3/keywords_data/google_ads"
+
+# Krajiny, ktoré aplikácia používa predvolene, plus niekoľko ďalších
+SIMULATED_COUNTRIES = [
+    (2703, "Slovakia", "SK"), (2203, "Czechia", "CZ"), (2276, "Germany", "DE"),
+    (2040, "Austria", "AT"), (2348, "Hungary", "HU"), (2616, "Poland", "PL"),
+    (2840, "United States", "US"), (2826, "United Kingdom", "GB"), (2250, "France", "FR"),
+    (2380, "Italy", "IT"), (2724, "Spain", "ES"), (2528, "Netherlands", "NL"),
+]
+
+SIMULATED_LANGUAGES = [
+    ("Czech", "cs"), ("Dutch", "nl"), ("English", "en"), ("French", "fr"), ("German", "de"),
+    ("Hungarian", "hu"), ("Italian", "it"), ("Polish", "pl"), ("Slovak", "sk"), ("Spanish", "es"),
+]
+
+@dataclass
+class SimulatorConfig:
+    """Nastavenia simulátora.
+
+    Oneskorenie: 'constant' (vždy latency), 'uniform' (latency ± latency_jitter)
+    alebo 'lognormal' (medián latency, rozptyl latency_sigma).
+    """
+    latency: float = 0.3  # sekundy
+    latency_distribution: str = "lognormal"
+    latency_jitter: float = 0.1  # sekundy, pre 'uniform'
+    latency_sigma: float = 0.5  # pre 'lognormal'
+    rate_limit_per_minute: int = 12  # search_volume/live a task_post volaní za minútu; 0 = bez limitu
+    error_rate: float = 0.0  # pravdepodobnosť náhodnej chyby 5xx
+    error_statuses: Tuple[int, ...] = (500, 502, 503)
+    queue_delay: float = 2.0  # sekundy, kým je task z fronty hotový
+    cities_per_country: int = 50  # počet syntetických miest na krajinu v zozname lokácií
+    login: Optional[str] = None  # ak je nastavené, iné prihlasovacie údaje dostanú 40101
+    password: Optional[str] = None
+    compression: bool = True  # komprimuje odpovede, ak ich klient v Accept-Encoding prijíma
+    normalize_keywords: bool = False  # vráti kľúčové slová ako API: malými písmenami, bez interpunkcie a nadbytočných medzier
+    seed: Optional[int] = None
+
+@dataclass
+class SimulatorStats:
+    """Počítadlá volaní simulátora."""
+    requests: int = 0
+    throttled: int = 0
+    injected_errors: int = 0
+    tasks: int = 0
+    compressed_responses: int = 0
+    response_bytes: int = 0  # veľkosť nekomprimovaných tiel odpovedí
+    by_endpoint: Dict[str, int] = field(default_factory=dict)
+
+def synthetic_search_volume(keyword: str, location_code: int, year: int, month: int) -> int:
+    """Deterministický objem vyhľadávania pre kľúčové slovo, lokáciu a mesiac."""
+    base = zlib.crc32(f"{keyword}|{location_code}".encode()) % 50000 + 10
+    seasonal = 1.0 + 0.3 * ((zlib.crc32(f"{keyword}|{month}".encode()) % 200) / 100.0 - 1.0)
+    trend = 1.0 + 0.02 * (year - 2020)
+    return int(base * seasonal * trend)
+
+def _month_range(date_from: Optional[str], date_to: Optional[str]) -> List[Tuple[int, int]]:
+    """Mesiace (rok, mesiac) medzi date_from a date_to; predvolene posledné 4 roky."""
+    today = date.today()
+    end = date.fromisoformat(date_to) if date_to else today
+    start = date.fromisoformat(date_from) if date_from else date(end.year - 4, end.month, 1)
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+class DataForSeoSimulator:
+    """Stav simulátora: nastavenia, limit volaní, fronta taskov a štatistiky."""
+
+    def __init__(self, config: Optional[SimulatorConfig] = None):
+        self.config = config or SimulatorConfig()
+        self.stats = SimulatorStats()
+        self._random = random.Random(self.config.seed)
+        self._calls: deque = deque()
+        self._queued: Dict[str, Dict[str, Any]] = {}
+        self._task_ids = itertools.count(1)
+
+    # --- Správanie siete ---
+
+    def _latency(self) -> float:
+        config = self.config
+        if config.latency_distribution == "constant":
+            return max(0.0, config.latency)
+        if config.latency_distribution == "uniform":
+            return max(0.0, self._random.uniform(config.latency - config.latency_jitter, config.latency + config.latency_jitter))
+        if config.latency <= 0:
+            return 0.0
+        return self._random.lognormvariate(0.0, config.latency_sigma) * config.latency
+
+    def _is_throttled(self) -> bool:
+        """Posuvné okno 60 s pre search_volume/live a task_post."""
+        if self.config.rate_limit_per_minute <= 0:
+            return False
+        now = time.monotonic()
+        while self._calls and now - self._calls[0] >= 60.0:
+            self._calls.popleft()
+        if len(self._calls) >= self.config.rate_limit_per_minute:
+            return True
+        self._calls.append(now)
+        return False
+
+    def _is_authorized(self, request: web.Request) -> bool:
+        if self.config.login is None:
+            return True
+        expected = base64.b64encode(f"{self.config.login}:{self.config.password}".encode()).decode()
+        return request.headers.get("Authorization") == f"Basic {expected}"
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Spoločné oneskorenie, počítanie volaní a náhodné chyby 5xx."""
+        if request.path.startswith("/simulator/"):
+            return await handler(request)
+        self.stats.requests += 1
+        endpoint = request.path[len(API_PREFIX) + 1:] if request.path.startswith(API_PREFIX) else request.path
+        endpoint = endpoint.split("/task_get/")[0] + ("/task_get" if "/task_get/" in endpoint else "")
+        self.stats.by_endpoint[endpoint] = self.stats.by_endpoint.get(endpoint, 0) + 1
+
+        await asyncio.sleep(self._latency())
+        if self.config.error_rate > 0 and self._random.random() < self.config.error_rate:
+            self.stats.injected_errors += 1
+            status = self._random.choice(self.config.error_statuses)
+            return web.json_response({"status_code": 50000, "status_message": "Internal Error."}, status=status)
+        if not self._is_authorized(request):
+            return web.json_response({
+                "status_code": 40101,
+                "status_message": "You are not authorized to access this resource.",
+                "tasks": [{"status_code": 40101, "status_message": "You are not authorized to access this resource.", "result": None}],
+            })
+        response = await handler(request)
+        if isinstance(response, web.Response) and response.body is not None:
+            self.stats.response_bytes += len(response.body)
+            accepted = request.headers.get("Accept-Encoding", "")
+            if self.config.compression and ("gzip" in accepted or "deflate" in accepted):
+                response.enable_compression()
+                self.stats.compressed_responses += 1
+        return response
+
+    # --- Tvorba odpovedí ---
+
+    def _task_envelope(self, task_id: str, status_code: int, status_message: str, data: Dict[str, Any], result: Any) -> Dict[str, Any]:
+        return {
+            "id": task_id,
+            "status_code": status_code,
+            "status_message": status_message,
+            "time": "0 sec.",
+            "cost": 0.05 if status_code in (20000, 20100) else 0,
+            "result_count": len(result) if result else 0,
+            "path": [],
+            "data": data,
+            "result": result,
+        }
+
+    def _search_volume_result(self, task: Dict[str, Any]) -> List[Dict[str, Any]]:
+        months = _month_range(task.get("date_from"), task.get("date_to"))
+        location_code = task.get("location_code")
+        result = []
+        for keyword in task.get("keywords") or []:
+            if self.config.normalize_keywords:
+                keyword = " ".join(re.sub(r"[^\w\s]", " ", keyword.lower()).split())
+            monthly_searches = [
+                {"year": year, "month": month, "search_volume": synthetic_search_volume(keyword, location_code, year, month)}
+                for year, month in reversed(months)
+            ]
+            result.append({
+                "keyword": keyword,
+                "spell": None,
+                "location_code": location_code,
+                "language_code": task.get("language_code"),
+                "search_partners": False,
+                "competition": "LOW",
+                "competition_index": 10,
+                "search_volume": monthly_searches[0]["search_volume"] if monthly_searches else None,
+                "low_top_of_page_bid": 0.1,
+                "high_top_of_page_bid": 0.5,
+                "cpc": 0.3,
+                "monthly_searches": monthly_searches,
+            })
+        return result
+
+    def _response(self, tasks: List[Dict[str, Any]]) -> web.Response:
+        return web.json_response({
+            "version": "0.1.simulator",
+            "status_code": 20000,
+            "status_message": "Ok.",
+            "time": "0 sec.",
+            "cost": sum(task["cost"] for task in tasks),
+            "tasks_count": len(tasks),
+            "tasks_error": sum(1 for task in tasks if task["status_code"] >= 40000),
+            "tasks": tasks,
+        })
+
+    # --- Endpointy ---
+
+    async def search_volume_live(self, request: web.Request) -> web.Response:
+        posted = await request.json()
+        throttled = self._is_throttled()
+        tasks = []
+        for task in posted:
+            self.stats.tasks += 1
+            task_id = f"sim-live-{next(self._task_ids)}"
+            if throttled:
+                self.stats.throttled += 1
+                tasks.append(self._task_envelope(task_id, 50301, "Too many requests.", task, None))
+            else:
+                tasks.append(self._task_envelope(task_id, 20000, "Ok.", task, self._search_volume_result(task)))
+        return self._response(tasks)
+
+    async def task_post(self, request: web.Request) -> web.Response:
+        posted = await request.json()
+        throttled = self._is_throttled()
+        tasks = []
+        for task in posted:
+            self.stats.tasks += 1
+            task_id = f"sim-queued-{next(self._task_ids)}"
+            if throttled:
+                self.stats.throttled += 1
+                tasks.append(self._task_envelope(task_id, 50301, "Too many requests.", task, None))
+                continue
+            self._queued[task_id] = {"data": task, "ready_at": time.monotonic() + self.config.queue_delay, "collected": False}
+            tasks.append(self._task_envelope(task_id, 20100, "Task Created.", task, None))
+        return self._response(tasks)
+
+    async def tasks_ready(self, request: web.Request) -> web.Response:
+        now = time.monotonic()
+        ready = [
+            {"id": task_id, "se": "google_ads", "function": "search_volume", "tag": task["data"].get("tag"),
+             "endpoint": f"{API_PREFIX}/search_volume/task_get/{task_id}"}
+            for task_id, task in self._queued.items()
+            if not task["collected"] and task["ready_at"] <= now
+        ]
+        return self._response([self._task_envelope("sim-ready", 20000, "Ok.", {}, ready)])
+
+    async def task_get(self, request: web.Request) -> web.Response:
+        task_id = request.match_info["task_id"]
+        task = self._queued.get(task_id)
+        if task is None:
+            return self._response([self._task_envelope(task_id, 40400, "Not Found.", {}, None)])
+        if task["ready_at"] > time.monotonic():
+            return self._response([self._task_envelope(task_id, 40602, "Task In Queue.", task["data"], None)])
+        task["collected"] = True
+        return self._response([self._task_envelope(task_id, 20000, "Ok.", task["data"], self._search_volume_result(task["data"]))])
+
+    async def locations(self, request: web.Request) -> web.Response:
+        result = []
+        for code, name, iso in SIMULATED_COUNTRIES:
+            result.append({"location_code": code, "location_name": name, "location_code_parent": None,
+                           "country_iso_code": iso, "location_type": "Country"})
+            for index in range(1, self.config.cities_per_country + 1):
+                result.append({"location_code": code * 10000 + index, "location_name": f"City {index},{name}",
+                               "location_code_parent": code, "country_iso_code": iso, "location_type": "City"})
+        return self._response([self._task_envelope("sim-locations", 20000, "Ok.", {}, result)])
+
+    async def languages(self, request: web.Request) -> web.Response:
+        result = [{"language_name": name, "language_code": code} for name, code in SIMULATED_LANGUAGES]
+        return self._response([self._task_envelope("sim-languages", 20000, "Ok.", {}, result)])
+
+    async def stats_endpoint(self, request: web.Request) -> web.Response:
+        return web.json_response(asdict(self.stats))
+
+# Kľúč, pod ktorým je stav simulátora uložený v aplikácii (web.AppKey od aiohttp 3.9)
+SIMULATOR_APP_KEY = web.AppKey("simulator", DataForSeoSimulator) if hasattr(web, "AppKey") else "simulator"
+
+def create_simulator_app(config: Optional[SimulatorConfig] = None) -> web.Application:
+    """Vytvorí aiohttp aplikáciu simulátora; stav je dostupný v app[SIMULATOR_APP_KEY].
+
+    Args:
+        config: Nastavenia simulátora
+
+    Returns:
+        web.Application: Aplikácia pripravená na spustenie
+    """
+    simulator = DataForSeoSimulator(config)
+    app = web.Application(middlewares=[simulator.middleware])
+    app[SIMULATOR_APP_KEY] = simulator
+    app.router.add_post(f"{API_PREFIX}/search_volume/live", simulator.search_volume_live)
+    app.router.add_post(f"{API_PREFIX}/search_volume/task_post", simulator.task_post)
+    app.router.add_get(f"{API_PREFIX}/search_volume/tasks_ready", simulator.tasks_ready)
+    app.router.add_get(f"{API_PREFIX}/search_volume/task_get/{{task_id}}", simulator.task_get)
+    app.router.add_get(f"{API_PREFIX}/locations", simulator.locations)
+    app.router.add_get(f"{API_PREFIX}/languages", simulator.languages)
+    app.router.add_get("/simulator/stats", simulator.stats_endpoint)
+    return app
+
+class SimulatorThread:
+    """Spustí simulátor na pozadí vo vlastnom vlákne (pre testy a benchmarky).
+
+    Použitie:
+        with SimulatorThread(SimulatorConfig(latency=0.05)) as server:
+            ... # server.base_url, server.stats, server.simulator.config
+    """
+
+    def __init__(self, config: Optional[SimulatorConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.app = create_simulator_app(config)
+        self.host = host
+        self.port = port
+        self.base_url: Optional[str] = None
+        self._loop = asyncio.new_event_loop()
+        self._runner: Optional[web.AppRunner] = None
+        self._thread = threading.Thread(target=self._loop.run_forever, name="dataforseo_simulator", daemon=True)
+
+    @property
+    def simulator(self) -> DataForSeoSimulator:
+        return self.app[SIMULATOR_APP_KEY]
+
+    @property
+    def stats(self) -> SimulatorStats:
+        return self.simulator.stats
+
+    async def _start(self) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        return f"http://{self.host}:{port}"
+
+    def start(self) -> str:
+        """Spustí server a vráti jeho základnú URL."""
+        self._thread.start()
+        self.base_url = asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self.base_url
+
+    def stop(self) -> None:
+        """Zastaví server a jeho event loop."""
+        if self._runner is not None:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> "SimulatorThread":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+def main() -> None:
+    """Spustí simulátor z príkazového riadku."""
+    defaults = SimulatorConfig()
+    parser = argparse.ArgumentParser(description="Lokálny simulátor DataForSEO API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="sekundy (medián pri lognormal)")
+    parser.add_argument("--latency-distribution", choices=["constant", "uniform", "lognormal"], default=defaults.latency_distribution)
+    parser.add_argument("--latency-jitter", type=float, default=defaults.latency_jitter)
+    parser.add_argument("--latency-sigma", type=float, default=defaults.latency_sigma)
+    parser.add_argument("--rate-limit", type=int, default=defaults.rate_limit_per_minute, help="volaní za minútu, 0 = bez limitu")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="pravdepodobnosť chyby 5xx (0-1)")
+    parser.add_argument("--queue-delay", type=float, default=defaults.queue_delay)
+    parser.add_argument("--cities-per-country", type=int, default=defaults.cities_per_country)
+    parser.add_argument("--login")
+    parser.add_argument("--password")
+    parser.add_argument("--no-compression", action="store_true", help="odpovede nekomprimuje")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    config = SimulatorConfig(
+        latency=args.latency,
+        latency_distribution=args.latency_distribution,
+        latency_jitter=args.latency_jitter,
+        latency_sigma=args.latency_sigma,
+        rate_limit_per_minute=args.rate_limit,
+        error_rate=args.error_rate,
+        queue_delay=args.queue_delay,
+        cities_per_country=args.cities_per_country,
+        login=args.login,
+        password=args.password,
+        compression=not args.no_compression,
+        seed=args.seed,
+    )
+    logging.basicConfig(level=logging.INFO)
+    logger.info(f"Simulátor DataForSEO beží na http://{args.host}:{args.port} ({config})")
+    web.run_app(create_simulator_app(config), host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Benchmark spracovania search volume dát nad nahratými odpoveďami API.
+
+Najprv sa odpovede nahrajú do kazety (vyžaduje prihlasovacie údaje v premenných
+prostredia DATAFORSEO_LOGIN a DATAFORSEO_PASSWORD):
+    python -m tools.replay_benchmark --mode record --cassette cassettes/bench.jsonl.gz \\
+        --keywords "castelli,rapha,maap" --locations 2703,2203,2276,2040
+
+Potom sa rovnaký beh opakovane prehráva bez siete a meria sa čas jednotlivých krokov
+(načítanie a parsovanie, add_period_column, transformácie a grafy 1 a 2 multi-country stránky):
+    python -m tools.replay_benchmark --mode replay --cassette cassettes/bench.jsonl.gz \\
+        --keywords "castelli,rapha,maap" --locations 2703,2203,2276,2040 --repeat 20 --profile
+
+S --locations-list sa nahrá a meria aj načítanie celého zoznamu lokácií. Prepínač --decode
+navyše zmeria samotné dekódovanie nahratých odpovedí (zoznam lokácií, search volume) cez json,
+orjson a prúdový ijson parser a porovná veľkosť tela s veľkosťou pri prenose v gzip.
+Prepínačom --json json sa celý beh vykoná so štandardným dekodérom namiesto orjson:
+    python -m tools.replay_benchmark --mode record --cassette cassettes/bench.jsonl.gz \\
+        --keywords "castelli,rapha,maap" --locations 2703,2203 --date-from 2019-01-01 --locations-list
+    python -m tools.replay_benchmark --cassette cassettes/bench.jsonl.gz \\
+        --keywords "castelli,rapha,maap" --locations 2703,2203 --date-from 2019-01-01 --locations-list --decode
+"""
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from datetime import datetime
+import argparse
+import cProfile
+import gzip
+import json
+import logging
+import os
+import pstats
+import statistics
+import time
+
+from config import DataProcessingSettings, TransportSettings
+from api_client import json_codec, streaming_parser
+from api_client.dataforseo_client import fetch_location_rows
+from api_client.transport import Cassette, get_cassette
+from data_processing.async_fetcher import FetchProgress, _fetch_multi_country_search_volume_data_async_internal
+from data_processing.transformer import (
+    add_period_column,
+    transform_total_sos_across_countries,
+    transform_total_average_volume_across_countries
+)
+from ui.charts import create_mc_total_sos_chart, create_mc_total_avg_volume_chart
+from utils.event_loop import run_coroutine
+
+# Nastavenie loggera
+logger = logging.getLogger(__name__)
+
+PERIOD_COL = "Period"
+
+def run_pipeline(args: argparse.Namespace, timings: Dict[str, List[float]]) -> int:
+    """Vykoná jeden beh: načítanie dát, Period stĺpec, transformácie a grafy.
+
+    Returns:
+        int: Počet riadkov načítaných dát
+    """
+    def timed(stage: str, func: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        result = func()
+        timings.setdefault(stage, []).append(time.perf_counter() - started)
+        return result
+
+    location_codes = tuple(int(code) for code in args.locations.split(","))
+    keywords = tuple(keyword.strip() for keyword in args.keywords.split(",") if keyword.strip())
+    login = os.environ.get("DATAFORSEO_LOGIN", "replay")
+    password = os.environ.get("DATAFORSEO_PASSWORD", "replay")
+    if args.locations_list:
+        _, error = timed("zoznam lokácií", lambda: fetch_location_rows(login, password))
+        if error:
+            logger.warning(error)
+    df, error = timed("fetch + parse", lambda: run_coroutine(_fetch_multi_country_search_volume_data_async_internal(
+        login, password,
+        keywords, location_codes, args.language,
+        datetime.fromisoformat(args.date_from), datetime.fromisoformat(args.date_to),
+        tuple((str(code), code) for code in location_codes), FetchProgress()
+    )))
+    if error:
+        logger.warning(error)
+    if df.empty:
+        return 0
+
+    df_agg = timed("add_period_column", lambda: add_period_column(df.copy(), args.granularity, "Date", PERIOD_COL))
+    df_total_sos = timed("transform graf 1", lambda: transform_total_sos_across_countries(
+        df_agg.groupby([PERIOD_COL, "Keyword"], observed=False)["Search Volume"].sum().reset_index(), PERIOD_COL
+    ))
+    df_total_avg = timed("transform graf 2", lambda: transform_total_average_volume_across_countries(df.copy(), args.granularity, PERIOD_COL))
+    label = args.granularity.replace("e", "á")
+    timed("charts", lambda: (
+        create_mc_total_sos_chart(df_total_sos, PERIOD_COL, args.granularity, label, None),
+        create_mc_total_avg_volume_chart(df_total_avg, PERIOD_COL, args.granularity, label, None)
+    ))
+    return len(df)
+
+def _payload_kind(target: str) -> Optional[str]:
+    """Druh nahratej odpovede podľa cieľa requestu, alebo None pre ostatné endpointy."""
+    path = target.split(" ", 1)[-1].split("?", 1)[0]
+    if path.endswith("/locations"):
+        return "lokácie"
+    if path.endswith("/search_volume/live") or "/search_volume/task_get/" in path:
+        return "search volume"
+    return None
+
+def _decoders(kind: str) -> List[Tuple[str, Callable[[bytes], Any]]]:
+    """Dostupné dekodéry pre daný druh odpovede."""
+    decoders: List[Tuple[str, Callable[[bytes], Any]]] = [("json", json.loads)]
+    if json_codec.orjson is not None:
+        decoders.append(("orjson", json_codec.orjson.loads))
+    if kind == "search volume" and streaming_parser.ijson is not None:
+        chunk = streaming_parser.STREAM_CHUNK_SIZE
+        decoders.append(("ijson (prúdovo)", lambda body: streaming_parser.parse_search_volume_stream(
+            body[start:start + chunk] for start in range(0, len(body), chunk)
+        )))
+    return decoders
+
+def measure_decoding(cassette: Cassette, repeat: int) -> None:
+    """Zmeria dekódovanie nahratých odpovedí a ich veľkosť pri prenose v gzip."""
+    bodies: Dict[str, List[bytes]] = {}
+    for interaction in cassette.interactions():
+        kind = _payload_kind(interaction["request"])
+        if kind and interaction["status"] == 200:
+            bodies.setdefault(kind, []).append(interaction["content"])
+    if not bodies:
+        print("Kazeta neobsahuje odpovede lokácií ani search volume.")
+        return
+
+    print("Dekódovanie nahratých odpovedí:")
+    for kind, payloads in bodies.items():
+        raw_size = sum(len(body) for body in payloads)
+        gzip_size = sum(len(gzip.compress(body, compresslevel=6)) for body in payloads)
+        print(f"  {kind}: {len(payloads)} odpovedí, {raw_size / 1024:.0f} kB, v gzip {gzip_size / 1024:.0f} kB "
+              f"({gzip_size / raw_size:.0%})")
+        for name, decode in _decoders(kind):
+            values = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                for body in payloads:
+                    decode(body)
+                values.append(time.perf_counter() - started)
+            print(f"    {name:<18} medián {statistics.median(values) * 1000:9.1f} ms   min {min(values) * 1000:9.1f} ms")
+
+def main() -> None:
+    """Spustí benchmark z príkazového riadku."""
+    parser = argparse.ArgumentParser(description="Benchmark spracovania nad nahratými odpoveďami DataForSEO API")
+    parser.add_argument("--mode", choices=["record", "replay"], default="replay")
+    parser.add_argument("--cassette", default=TransportSettings.CASSETTE_PATH)
+    parser.add_argument("--keywords", required=True, help="čiarkou oddelené kľúčové slová")
+    parser.add_argument("--locations", required=True, help="čiarkou oddelené kódy lokácií")
+    parser.add_argument("--language", default="sk")
+    parser.add_argument("--date-from", default="2021-01-01")
+    parser.add_argument("--date-to", default=datetime.now().strftime("%Y-%m-%d"))
+    parser.add_argument("--granularity", choices=["Ročne", "Štvrťročne", "Mesačne"], default="Mesačne")
+    parser.add_argument("--repeat", type=int, default=5, help="počet opakovaní v režime replay")
+    parser.add_argument("--replay-latency", action="store_true", help="prehrá aj pôvodne nameranú latenciu")
+    parser.add_argument("--profile", action="store_true", help="vypíše najnáročnejšie funkcie (cProfile)")
+    parser.add_argument("--locations-list", action="store_true", help="nahrá a meria aj načítanie zoznamu lokácií")
+    parser.add_argument("--decode", action="store_true", help="zmeria dekódovanie nahratých odpovedí (json, orjson, ijson)")
+    parser.add_argument("--json", choices=["orjson", "json"], default="orjson", help="dekodér odpovedí počas behu")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    TransportSettings.MODE = args.mode
+    TransportSettings.CASSETTE_PATH = args.cassette
+    TransportSettings.REPLAY_LATENCY = args.replay_latency
+    DataProcessingSettings.FAST_JSON = args.json == "orjson"
+    repeat = args.repeat if args.mode == "replay" else 1
+    if args.mode == "replay":
+        # Prehrávanie nejde na sieť, limit volaní API by meranie len skresľoval
+        DataProcessingSettings.API_RATE_LIMIT_PER_MINUTE = 60000
+        DataProcessingSettings.API_RATE_LIMIT_BURST = 1000
+
+    timings: Dict[str, List[float]] = {}
+    profiler = cProfile.Profile() if args.profile else None
+    rows = 0
+    for _ in range(repeat):
+        get_cassette().rewind()
+        if profiler:
+            profiler.enable()
+        rows = run_pipeline(args, timings)
+        if profiler:
+            profiler.disable()
+
+    print(f"Režim: {args.mode}, kazeta: {args.cassette}, riadkov: {rows}, opakovaní: {repeat}, "
+          f"JSON: {json_codec.json_backend_name()}")
+    for stage, values in timings.items():
+        print(f"  {stage:<20} medián {statistics.median(values) * 1000:9.1f} ms   min {min(values) * 1000:9.1f} ms")
+    if args.decode:
+        measure_decoding(get_cassette(), max(repeat, 1))
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+if __name__ == "__main__":
+    main()
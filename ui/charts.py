@@ -154,6 +154,19 @@ def create_mc_flexible_avg_volume_by_country_stacked_bar_chart(df_flex_avg_vol_b
     return fig
 
 
+def create_mc_avg_volume_by_language_line_chart(df_avg_vol_by_language, period_col, granularity_str_for_sort, granularity_label_for_display, language_order, selected_brands_str, title_prefix="7b."):
+    """Graf 7b (Multi-Country): PRIEMERNÝ objem podľa JAZYKOV (Čiarový), pri behu s viacerými jazykmi."""
+    if df_avg_vol_by_language.empty or 'Language' not in df_avg_vol_by_language.columns or df_avg_vol_by_language['Average Search Volume'].sum(skipna=True) <= 0:
+        return None
+    title = f"{title_prefix} Priemerný objem podľa JAZYKOV (značky sčítané: {selected_brands_str}) - Čiarový"
+    unique_periods = sorted(df_avg_vol_by_language[period_col].unique(), key=get_period_sort_key_func(granularity_str_for_sort))
+    fig = px.line(df_avg_vol_by_language, x=period_col, y='Average Search Volume', color='Language',
+                  labels={'Average Search Volume': 'Priemerný objem', 'Language': 'Jazyk', period_col: granularity_label_for_display},
+                  title=title, markers=True,
+                  category_orders={"Language": language_order, period_col: unique_periods})
+    fig.update_layout(yaxis_title='Priemerný objem vyhľadávania', legend_title_text='Jazyky', height=600)
+    return fig
+
 # --- Graf pre pôvodný graf č. 5 (teraz č. 7) ---
 def create_mc_segment_avg_volume_custom_countries_chart(df_segment_avg_vol, period_col, granularity_str_for_sort, granularity_label_for_display, selected_countries_str):
     """Graf 7 (Multi-Country, pôvodne 5): Priemerný mesačný objem segmentu pre VLASTNÝ VÝBER KRAJÍN."""
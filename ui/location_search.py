@@ -0,0 +1,34 @@
+"""
+Modul pre výber lokácií cez vyhľadávacie pole nad indexovaným katalógom lokácií.
+Do prehliadača sa posielajú len nájdené lokácie a aktuálny výber, nie celý zoznam.
+"""
+from typing import List, Optional
+import streamlit as st
+
+from data_processing.location_catalog import DEFAULT_SEARCH_LIMIT, LocationCatalog
+
+ALL_LOCATION_TYPES = "Všetky typy"
+
+def render_location_search(catalog: LocationCatalog, key: str, default_type: Optional[str] = "Country") -> List[int]:
+    """Vykreslí vyhľadávacie pole a filter typu lokácie.
+
+    Args:
+        catalog: Katalóg lokácií
+        key: Prefix kľúčov widgetov v session_state
+        default_type: Predvolený typ lokácie vo filtri
+
+    Returns:
+        List[int]: Kódy nájdených lokácií (najviac DEFAULT_SEARCH_LIMIT)
+    """
+    type_options = [ALL_LOCATION_TYPES] + catalog.location_types
+    type_key = f"{key}_type"
+    if type_key not in st.session_state or st.session_state[type_key] not in type_options:
+        st.session_state[type_key] = default_type if default_type in type_options else ALL_LOCATION_TYPES
+
+    query = st.text_input("Hľadať lokáciu:", key=f"{key}_query", placeholder="napr. Slovakia, Bratislava", help="Hľadá v názvoch lokácií bez ohľadu na diakritiku.")
+    location_type = st.selectbox("Typ lokácie:", options=type_options, key=type_key)
+    return catalog.search(query, None if location_type == ALL_LOCATION_TYPES else location_type, limit=DEFAULT_SEARCH_LIMIT)
+
+def location_select_options(catalog: LocationCatalog, selected_codes: List[int], matches: List[int]) -> List[int]:
+    """Možnosti výberového widgetu: aktuálne vybrané lokácie a za nimi nájdené lokácie."""
+    return list(dict.fromkeys([code for code in selected_codes if code in catalog] + matches))
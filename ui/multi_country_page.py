@@ -4,6 +4,7 @@ from datetime import date, timedelta
 
 # Importy z vlastných modulov
 from config import DEFAULT_KEYWORDS, DEFAULT_MULTI_COUNTRY_CODES
+from ui.location_search import location_select_options, render_location_search
 from data_processing.fetcher import fetch_multi_country_search_volume_data
 from data_processing.transformer import (
     add_period_column,
@@ -26,7 +27,7 @@ from ui.charts import (
     create_mc_flexible_avg_volume_by_country_stacked_bar_chart
 )
 
-def render_multi_country_page(api_login, api_password, location_options_all, language_options_all, locations_error_msg, languages_error_msg):
+def render_multi_country_page(api_login, api_password, location_catalog, language_options_all, locations_error_msg, languages_error_msg):
     st.header("🌍 Analýza viacerých krajín")
     
     col1_mc, col2_mc, col3_mc = st.columns(3)
@@ -37,21 +38,19 @@ def render_multi_country_page(api_login, api_password, location_options_all, lan
         st.text_area("Zadajte kľúčové slová:", key="mc_keywords_input", height=150, help="Každé kľúčové slovo na nový riadok.")
     with col2_mc:
         st.subheader("Krajiny (Hlavný filter)")
-        loc_display_list_mc = [opt[0] for opt in location_options_all] if location_options_all else []
-        code_to_display_name_map_mc = {code: name for name, code in location_options_all} if location_options_all else {}
-        if not location_options_all or not api_login or not api_password:
+        if not location_catalog or not api_login or not api_password:
             st.info("Zoznam krajín nie je dostupný.")
             if locations_error_msg and (api_login and api_password): st.warning(f"Chyba pri načítaní lokácií: {locations_error_msg}")
         else:
+            # Výber sa drží ako kódy lokácií; možnosti sú len vybrané a nájdené lokácie
             if 'mc_selected_locations' not in st.session_state: 
-                default_display_names_to_set = [code_to_display_name_map_mc[code] for code in DEFAULT_MULTI_COUNTRY_CODES if code in code_to_display_name_map_mc]
-                default_display_names_to_set = [name for name in default_display_names_to_set if name in loc_display_list_mc] 
-                if not default_display_names_to_set: 
-                    if len(loc_display_list_mc) >= 2: default_display_names_to_set = loc_display_list_mc[:min(4,len(loc_display_list_mc))]
-                    elif loc_display_list_mc: default_display_names_to_set = loc_display_list_mc[:1]
-                    else: default_display_names_to_set = []
-                st.session_state.mc_selected_locations = default_display_names_to_set
-            st.multiselect("Vyberte krajiny pre analýzu:", options=loc_display_list_mc, key="mc_selected_locations", help="Vyberte jednu alebo viac krajín, pre ktoré sa načítajú dáta.")
+                default_codes_to_set = [code for code in DEFAULT_MULTI_COUNTRY_CODES if code in location_catalog]
+                if not default_codes_to_set: 
+                    default_codes_to_set = location_catalog.search("", "Country", limit=4)
+                st.session_state.mc_selected_locations = default_codes_to_set
+            st.session_state.mc_selected_locations = [code for code in st.session_state.mc_selected_locations if code in location_catalog]
+            location_matches_mc = render_location_search(location_catalog, "mc_location_search")
+            st.multiselect("Vyberte krajiny pre analýzu:", options=location_select_options(location_catalog, st.session_state.mc_selected_locations, location_matches_mc), format_func=location_catalog.display, key="mc_selected_locations", help="Vyhľadajte a vyberte jednu alebo viac krajín, pre ktoré sa načítajú dáta.")
             st.info("Poznámka: Výber veľkého počtu krajín môže predĺžiť čas načítania dát. API má limit 12 požiadaviek za minútu na účet.")
         st.subheader("Jazyk")
         if not language_options_all or not api_login or not api_password:
@@ -98,11 +97,9 @@ def render_multi_country_page(api_login, api_password, location_options_all, lan
         st.radio("Agregovať dáta:", options=mc_granularity_options, key="mc_granularity_choice", horizontal=True)
 
     keywords_list_mc = [kw.strip() for kw in st.session_state.mc_keywords_input.splitlines() if kw.strip()]
-    selected_main_countries_display = st.session_state.get('mc_selected_locations', [])
     selected_location_codes_mc = []
-    loc_code_map_mc_local = {opt[0]: opt[1] for opt in location_options_all} if location_options_all else {}
-    if location_options_all and selected_main_countries_display and loc_code_map_mc_local:
-        selected_location_codes_mc = [loc_code_map_mc_local[name] for name in selected_main_countries_display if name in loc_code_map_mc_local]
+    if location_catalog:
+        selected_location_codes_mc = [code for code in st.session_state.get('mc_selected_locations', []) if code in location_catalog]
     
     selected_language_code_mc = None 
     if 'mc_language_select' in st.session_state and language_options_all:
@@ -128,7 +125,8 @@ def render_multi_country_page(api_login, api_password, location_options_all, lan
         elif date_from_input_mc > date_to_input_mc: st.error("🚨 Dátum 'od' nemôže byť neskorší ako 'do'.")
         else:
             keywords_tuple_mc = tuple(sorted(keywords_list_mc)); locations_tuple_mc = tuple(sorted(selected_location_codes_mc))
-            all_loc_options_tuple_for_cache = tuple(location_options_all) if location_options_all else tuple()
+            # Fetcher dostane len názvy vybraných lokácií, nie celý katalóg
+            all_loc_options_tuple_for_cache = location_catalog.options(locations_tuple_mc)
             
             mc_cache_info_placeholder.empty()
             if mc_session_key in st.session_state and st.session_state[mc_session_key].get("data") is not None:
@@ -413,11 +411,10 @@ def render_multi_country_page(api_login, api_password, location_options_all, lan
 
                 st.markdown("---"); st.subheader("9. História vyhľadávaní (Analýza viacerých krajín)") # ZMENENÉ ČÍSLO
                 if 'search_history_multi' not in st.session_state: st.session_state.search_history_multi = []
-                current_display_country_names_mc_hist = st.session_state.get('mc_selected_locations', [])
+                current_location_codes_mc_hist = list(selected_location_codes_mc)
+                current_display_country_names_mc_hist = [location_catalog.display(code) for code in current_location_codes_mc_hist]
                 current_language_name_mc_hist = st.session_state.get('mc_language_select', "")
-                
-                # loc_code_map_mc_hist už je definované vyššie ako loc_code_map_mc_local
-                current_location_codes_mc_hist = [loc_code_map_mc_local[name] for name in current_display_country_names_mc_hist if name in loc_code_map_mc_local]
+
 
                 current_request_info_multi = {
                     'keywords': keywords_list_mc, 'countries_display': current_display_country_names_mc_hist, 
@@ -448,7 +445,7 @@ def render_multi_country_page(api_login, api_password, location_options_all, lan
                             with col_h3:
                                 if st.button("Načítať", key=f"load_hist_multi_{hist_item['session_key']}"):
                                     st.session_state.mc_keywords_input = "\n".join(hist_item['keywords'])
-                                    st.session_state.mc_selected_locations = hist_item['countries_display']
+                                    st.session_state.mc_selected_locations = hist_item['location_codes']
                                     st.session_state.mc_language_select = hist_item['language']
                                     st.session_state.mc_date_from = hist_item['date_from']
                                     st.session_state.mc_date_to = hist_item['date_to']
@@ -1,19 +1,24 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import pandas as pd
+import time
 from datetime import date, timedelta
 
 # Imports from our modules
-from config import DEFAULT_KEYWORDS, DEFAULT_MULTI_COUNTRY_CODES
+from config import DEFAULT_KEYWORDS, DEFAULT_MULTI_COUNTRY_CODES, FetchJobSettings
+from ui.location_search import location_select_options, render_location_search
 from data_processing.fetcher import fetch_multi_country_search_volume_data
-from data_processing.async_fetcher import fetch_multi_country_search_volume_data_async
+from data_processing.fetch_jobs import JOB_CANCELLED, get_fetch_job_runner
 from data_processing.transformer import (
     add_period_column,
+    filter_languages,
     get_period_sort_key_func,
     transform_total_sos_across_countries,
     transform_total_average_volume_across_countries,
     transform_flexible_avg_volume,
     transform_segment_average_volume_custom_countries,
-    transform_flexible_avg_volume_by_country_display
+    transform_flexible_avg_volume_by_country_display,
+    transform_flexible_avg_volume_by_language_display
 )
 from ui.charts import (
     create_mc_total_sos_chart,
@@ -22,10 +27,144 @@ from ui.charts import (
     create_mc_flexible_avg_volume_stacked_bar_chart,
     create_mc_segment_avg_volume_custom_countries_chart,
     create_mc_flexible_avg_volume_by_country_line_chart,
-    create_mc_flexible_avg_volume_by_country_stacked_bar_chart
+    create_mc_flexible_avg_volume_by_country_stacked_bar_chart,
+    create_mc_avg_volume_by_language_line_chart
 )
 
-def render_multi_country_page(api_login, api_password, location_options_all, language_options_all, locations_error_msg, languages_error_msg):
+def _session_id():
+    """Identifikátor aktuálnej Streamlit session pre sledovanie jobov."""
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else "local"
+
+def _selected_language_targets(location_codes, language_options_all):
+    """Dvojice (kód lokácie, kód jazyka) podľa výberu jazykov na stránke.
+
+    Každá krajina sa načíta v hlavnom jazyku (spoločnom alebo zvolenom pre krajinu)
+    a v každom z ďalších jazykov. Bez hlavného jazyka vráti prázdny tuple.
+    """
+    code_by_name = {name: code for name, code in language_options_all}
+    main_language = code_by_name.get(st.session_state.get('mc_language_select'))
+    additional_languages = [code_by_name[name] for name in st.session_state.get('mc_additional_languages', []) if name in code_by_name]
+    per_country = st.session_state.get('mc_language_per_country', False)
+    targets = []
+    for location_code in location_codes:
+        primary_language = code_by_name.get(st.session_state.get(f"mc_country_language_{location_code}")) if per_country else main_language
+        if not primary_language:
+            return ()
+        targets.extend((location_code, language) for language in dict.fromkeys([primary_language, *additional_languages]))
+    return tuple(targets)
+
+def _store_fetch_result(mc_session_key, results_df_mc, error_msg_mc, granularity_mc_str):
+    st.session_state[mc_session_key] = {
+        "data": results_df_mc, "error": error_msg_mc, "granularity": granularity_mc_str,
+        "task_report": results_df_mc.attrs.get("task_report", []) if results_df_mc is not None else [],
+        "fetch_plan": results_df_mc.attrs.get("fetch_plan") if results_df_mc is not None else None
+    }
+
+def _render_fetch_summary(mc_session_key):
+    """Vykreslí výsledok načítania: úspech alebo chybu, opakované volania a využitie cache buniek."""
+    current_df_mc_on_run = st.session_state[mc_session_key].get("data")
+    current_error_mc_on_run = st.session_state[mc_session_key].get("error") 
+    
+    if not current_error_mc_on_run and current_df_mc_on_run is not None and not current_df_mc_on_run.empty: 
+        st.success("✅ Dáta (analýza viacerých krajín) úspešne získané/načítané!")
+    elif not current_error_mc_on_run and current_df_mc_on_run is not None and current_df_mc_on_run.empty: 
+        st.info("ℹ️ API nevrátilo žiadne dáta pre zadané kritériá, alebo dáta v cache sú prázdne.")
+    elif current_error_mc_on_run: 
+        st.error(f"🚨 Nastala chyba pri získavaní dát: {current_error_mc_on_run}")
+    
+    retried_tasks_mc = [item for item in st.session_state[mc_session_key].get("task_report", []) if item["Attempts"] > 1]
+    if retried_tasks_mc:
+        retried_summary = ", ".join(
+            f"{item['Country']}{' / ' + item['Language'] if item.get('Language') else ''} ({item['Attempts']} pokusy, {'úspech' if item['Status'] == 'ok' else 'neúspech'})"
+            for item in retried_tasks_mc
+        )
+        st.caption(f"🔁 Opakované API volania po dočasnej chybe: {retried_summary}")
+    
+    fetch_plan_mc = st.session_state[mc_session_key].get("fetch_plan")
+    if fetch_plan_mc and fetch_plan_mc["total_cells"] and fetch_plan_mc["missing_cells"] < fetch_plan_mc["total_cells"]:
+        cached_cells_mc = fetch_plan_mc["total_cells"] - fetch_plan_mc["missing_cells"]
+        st.caption(
+            f"🧩 Z cache použitých {cached_cells_mc} z {fetch_plan_mc['total_cells']} buniek (kľúčové slovo × krajina × mesiac), "
+            f"z API načítaných {fetch_plan_mc['missing_cells']} v {fetch_plan_mc['tasks']} taskoch."
+        )
+
+def _render_job_preview(job, granularity_str, totals_placeholder, chart_placeholder):
+    """Vykreslí súčty krajín a náhľad grafu 1 z krajín, ktoré job už načítal."""
+    country_results = job.country_results()
+    if not country_results:
+        return
+    totals = [
+        {
+            "Krajina": country_result["country"],
+            "Jazyk": country_result["language_code"],
+            "Celkový objem": int(country_result["results"]["Search Volume"].sum()) if not country_result["results"].empty else 0,
+            "Stav": "chyba" if country_result["error"] else "ok",
+        }
+        for country_result in country_results
+    ]
+    totals_placeholder.dataframe(pd.DataFrame(totals), hide_index=True, use_container_width=True)
+    frames = [country_result["results"] for country_result in country_results if not country_result["results"].empty]
+    if frames:
+        preview_df = add_period_column(pd.concat(frames, ignore_index=True), granularity_str, 'Date', 'Period')
+        preview_graph1 = preview_df.groupby(['Period', 'Keyword'], observed=False)['Search Volume'].sum().reset_index()
+        fig_preview = create_mc_total_sos_chart(
+            transform_total_sos_across_countries(preview_graph1, 'Period'), 'Period', granularity_str, granularity_str.replace('e', 'á'), None
+        )
+        if fig_preview:
+            fig_preview.update_layout(title=f"Priebežný Share of Search ({len(totals)}/{job.total_countries} krajín a jazykov)")
+            chart_placeholder.plotly_chart(fig_preview, use_container_width=True)
+
+def _follow_fetch_job(mc_session_key, granularity_mc_str):
+    """Sleduje job načítania dát tejto session, kým nie je hotový, a uloží jeho výsledok.
+
+    Job beží na pozadí (data_processing/fetch_jobs.py), takže rerun čakanie len preruší
+    a ďalší beh skriptu pokračuje v sledovaní toho istého jobu. Pri zmene parametrov
+    sa session od jobu odhlási; ak naň nečaká iná session, job sa zruší.
+    """
+    job_ref = st.session_state.get("mc_fetch_job")
+    if not job_ref:
+        return
+    runner = get_fetch_job_runner()
+    if job_ref["session_key"] != mc_session_key:
+        runner.release(job_ref["job_id"], _session_id())
+        del st.session_state["mc_fetch_job"]
+        return
+    job = runner.get(job_ref["job_id"])
+    if job is None or job.status == JOB_CANCELLED:
+        del st.session_state["mc_fetch_job"]
+        st.info("ℹ️ Načítanie dát bolo prerušené. Spustite ho znova tlačidlom vyššie.")
+        return
+
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    totals_placeholder = st.empty()
+    chart_placeholder = st.empty()
+    shown_countries = -1
+    while not job.finished:
+        fraction, message, level = job.progress.snapshot()
+        progress_bar.progress(fraction)
+        if message:
+            (status_text.error if level == "error" else status_text.info)(message)
+        arrived_countries = len(job.country_results())
+        if arrived_countries != shown_countries:
+            _render_job_preview(job, granularity_mc_str, totals_placeholder, chart_placeholder)
+            shown_countries = arrived_countries
+        time.sleep(FetchJobSettings.POLL_INTERVAL)
+        job = runner.get(job.id) or job
+    for placeholder in (chart_placeholder, totals_placeholder, status_text, progress_bar):
+        placeholder.empty()
+
+    runner.release(job.id, _session_id())
+    del st.session_state["mc_fetch_job"]
+    if job.status == JOB_CANCELLED:
+        st.info("ℹ️ Načítanie dát bolo prerušené. Spustite ho znova tlačidlom vyššie.")
+        return
+    results_df_mc, error_msg_mc = job.result()
+    _store_fetch_result(mc_session_key, results_df_mc, error_msg_mc, granularity_mc_str)
+    _render_fetch_summary(mc_session_key)
+
+def render_multi_country_page(api_login, api_password, location_catalog, language_options_all, locations_error_msg, languages_error_msg):
     st.header("🌍 Analýza viacerých krajín")
     
     col1_mc, col2_mc, col3_mc = st.columns(3)
@@ -36,21 +175,19 @@ def render_multi_country_page(api_login, api_password, location_options_all, lan
         st.text_area("Zadajte kľúčové slová:", key="mc_keywords_input", height=150, help="Každé kľúčové slovo na nový riadok.")
     with col2_mc:
         st.subheader("Krajiny (Hlavný filter)")
-        loc_display_list_mc = [opt[0] for opt in location_options_all] if location_options_all else []
-        code_to_display_name_map_mc = {code: name for name, code in location_options_all} if location_options_all else {}
-        if not location_options_all or not api_login or not api_password:
+        if not location_catalog or not api_login or not api_password:
             st.info("Zoznam krajín nie je dostupný.")
             if locations_error_msg and (api_login and api_password): st.warning(f"Chyba pri načítaní lokácií: {locations_error_msg}")
         else:
+            # Výber sa drží ako kódy lokácií; možnosti sú len vybrané a nájdené lokácie
             if 'mc_selected_locations' not in st.session_state: 
-                default_display_names_to_set = [code_to_display_name_map_mc[code] for code in DEFAULT_MULTI_COUNTRY_CODES if code in code_to_display_name_map_mc]
-                default_display_names_to_set = [name for name in default_display_names_to_set if name in loc_display_list_mc] 
-                if not default_display_names_to_set: 
-                    if len(loc_display_list_mc) >= 2: default_display_names_to_set = loc_display_list_mc[:min(4,len(loc_display_list_mc))]
-                    elif loc_display_list_mc: default_display_names_to_set = loc_display_list_mc[:1]
-                    else: default_display_names_to_set = []
-                st.session_state.mc_selected_locations = default_display_names_to_set
-            st.multiselect("Vyberte krajiny pre analýzu:", options=loc_display_list_mc, key="mc_selected_locations", help="Vyberte jednu alebo viac krajín, pre ktoré sa načítajú dáta.")
+                default_codes_to_set = [code for code in DEFAULT_MULTI_COUNTRY_CODES if code in location_catalog]
+                if not default_codes_to_set: 
+                    default_codes_to_set = location_catalog.search("", "Country", limit=4)
+                st.session_state.mc_selected_locations = default_codes_to_set
+            st.session_state.mc_selected_locations = [code for code in st.session_state.mc_selected_locations if code in location_catalog]
+            location_matches_mc = render_location_search(location_catalog, "mc_location_search")
+            st.multiselect("Vyberte krajiny pre analýzu:", options=location_select_options(location_catalog, st.session_state.mc_selected_locations, location_matches_mc), format_func=location_catalog.display, key="mc_selected_locations", help="Vyhľadajte a vyberte jednu alebo viac krajín, pre ktoré sa načítajú dáta.")
             st.info("Poznámka: Pomocou asynchrónneho spracovania sme optimalizovali rýchlosť načítania dát pre viacero krajín. Pri výbere viacerých krajín sa dáta načítajú až 5x rýchlejšie ako v sekvenčnom režime.")
         st.subheader("Jazyk")
         if not language_options_all or not api_login or not api_password:
@@ -62,6 +199,17 @@ def render_multi_country_page(api_login, api_password, location_options_all, lan
                 default_lang_name_mc = next((name for name, code in language_options_all if code.lower() == 'en'), lang_display_list_mc[0] if lang_display_list_mc else "")
                 st.session_state.mc_language_select = default_lang_name_mc
             st.selectbox("Vyberte jazyk (pre všetky krajiny):", options=lang_display_list_mc, key="mc_language_select")
+            # Jeden beh môže načítať každú krajinu vo viacerých jazykoch, tasky idú spolu jedným fetchom
+            if 'mc_additional_languages' not in st.session_state or not set(st.session_state.mc_additional_languages).issubset(set(lang_display_list_mc)):
+                st.session_state.mc_additional_languages = []
+            st.multiselect("Ďalšie jazyky (pre všetky krajiny):", options=lang_display_list_mc, key="mc_additional_languages", help="Napr. angličtina popri miestnom jazyku. Každá krajina sa načíta aj v týchto jazykoch, výsledky majú stĺpec Language.")
+            st.checkbox("Nastaviť hlavný jazyk pre každú krajinu zvlášť", key="mc_language_per_country")
+            if st.session_state.get('mc_language_per_country') and location_catalog:
+                for location_code_mc in st.session_state.get('mc_selected_locations', []):
+                    country_language_key_mc = f"mc_country_language_{location_code_mc}"
+                    if country_language_key_mc not in st.session_state or st.session_state[country_language_key_mc] not in lang_display_list_mc:
+                        st.session_state[country_language_key_mc] = st.session_state.mc_language_select
+                    st.selectbox(f"Jazyk pre {location_catalog.display(location_code_mc)}:", options=lang_display_list_mc, key=country_language_key_mc)
     with col3_mc:
         st.subheader("Rozsah dátumov")
         today_mc = date.today(); default_end_date_mc = today_mc.replace(day=1) - timedelta(days=1)
@@ -101,28 +249,28 @@ def render_multi_country_page(api_login, api_password, location_options_all, lan
         st.session_state.use_async_fetching = True  # Default to use async fetching
     
     use_async = st.checkbox("Použiť asynchrónne volanie API (rýchlejšie)", value=st.session_state.use_async_fetching, 
-                            help="Zapnite pre paralelné volanie API (5 krajín súčasne), čo je 2-5x rýchlejšie. Vypnite pre sekvenčné volanie API (pomalšie, ale menej náchylné na prekročenie limitov API).")
+                            help="Zapnite pre paralelné volanie API (krajiny sa zbalia do čo najmenšieho počtu požiadaviek), čo je 2-5x rýchlejšie. Vypnite pre sekvenčné volanie API (pomalšie). Oba režimy rešpektujú spoločný limit API volaní.")
     st.session_state.use_async_fetching = use_async
 
     keywords_list_mc = [kw.strip() for kw in st.session_state.mc_keywords_input.splitlines() if kw.strip()]
-    selected_main_countries_display = st.session_state.get('mc_selected_locations', [])
     selected_location_codes_mc = []
-    loc_code_map_mc_local = {opt[0]: opt[1] for opt in location_options_all} if location_options_all else {}
-    if location_options_all and selected_main_countries_display and loc_code_map_mc_local:
-        selected_location_codes_mc = [loc_code_map_mc_local[name] for name in selected_main_countries_display if name in loc_code_map_mc_local]
+    if location_catalog:
+        selected_location_codes_mc = [code for code in st.session_state.get('mc_selected_locations', []) if code in location_catalog]
     
     selected_language_code_mc = None 
+    language_targets_mc = ()
     if 'mc_language_select' in st.session_state and language_options_all:
         temp_lang_code_map_mc_local = {name: code for name, code in language_options_all}
         selected_language_code_mc = temp_lang_code_map_mc_local.get(st.session_state.mc_language_select)
+        language_targets_mc = _selected_language_targets(selected_location_codes_mc, language_options_all)
     
     date_from_input_mc = st.session_state.mc_date_from
     date_to_input_mc = st.session_state.mc_date_to
     granularity_mc_str = st.session_state.mc_granularity_choice 
     
-    run_button_disabled_mc = not selected_location_codes_mc or not selected_language_code_mc or not api_login or not api_password or not keywords_list_mc
+    run_button_disabled_mc = not selected_location_codes_mc or not language_targets_mc or not api_login or not api_password or not keywords_list_mc
     
-    mc_session_key = f"multi_data_{tuple(sorted(keywords_list_mc))}_{tuple(sorted(selected_location_codes_mc))}_{selected_language_code_mc}_{date_from_input_mc}_{date_to_input_mc}_{granularity_mc_str}_{use_async}"
+    mc_session_key = f"multi_data_{tuple(sorted(keywords_list_mc))}_{tuple(sorted(language_targets_mc))}_{date_from_input_mc}_{date_to_input_mc}_{granularity_mc_str}_{use_async}"
     
     mc_cache_info_placeholder = st.empty()
     if mc_session_key in st.session_state and st.session_state[mc_session_key].get("data") is not None:
@@ -131,50 +279,48 @@ def render_multi_country_page(api_login, api_password, location_options_all, lan
     if st.button("📊 Získať dáta a zobraziť grafy (Analýza viacerých krajín)", type="primary", disabled=run_button_disabled_mc, key="mc_run_button"):
         if not keywords_list_mc: st.warning("⚠️ Zadajte kľúčové slová.")
         elif not selected_location_codes_mc: st.warning("⚠️ Vyberte aspoň jednu krajinu v hlavnom filtri.")
-        elif not selected_language_code_mc: st.warning("⚠️ Vyberte jazyk.")
+        elif not language_targets_mc: st.warning("⚠️ Vyberte jazyk.")
         elif date_from_input_mc > date_to_input_mc: st.error("🚨 Dátum 'od' nemôže byť neskorší ako 'do'.")
         else:
             keywords_tuple_mc = tuple(sorted(keywords_list_mc)); locations_tuple_mc = tuple(sorted(selected_location_codes_mc))
-            all_loc_options_tuple_for_cache = tuple(location_options_all) if location_options_all else tuple()
+            # Fetcher dostane len názvy vybraných lokácií, nie celý katalóg
+            all_loc_options_tuple_for_cache = location_catalog.options(locations_tuple_mc)
             
             mc_cache_info_placeholder.empty()
             if mc_session_key in st.session_state and st.session_state[mc_session_key].get("data") is not None:
                  mc_cache_info_placeholder.success("✅ Používam dáta z cache session (analýza viacerých krajín).")
             else:
                 mc_cache_info_placeholder.info("ℹ️ Cache session (analýza viacerých krajín) nenájdená, volám API...")
-                with st.spinner(f"⏳ Získavam dáta pre analýzu viacerých krajín{' asynchrónne' if use_async else ''}..."):
-                    if use_async:
-                        # Use the async version
-                        results_df_mc, error_msg_mc = fetch_multi_country_search_volume_data_async(
-                            api_login, api_password, 
-                            keywords_tuple_mc, 
-                            locations_tuple_mc, 
-                            selected_language_code_mc, 
-                            date_from_input_mc, date_to_input_mc, 
-                            all_loc_options_tuple_for_cache
-                        )
-                    else:
+                if use_async:
+                    # Job beží na pozadí a prežije rerun; stav sleduje _follow_fetch_job nižšie
+                    job_id_mc = get_fetch_job_runner().submit(
+                        _session_id(),
+                        api_login, api_password, 
+                        keywords_tuple_mc, 
+                        locations_tuple_mc, 
+                        language_targets_mc, 
+                        date_from_input_mc, date_to_input_mc, 
+                        all_loc_options_tuple_for_cache
+                    )
+                    st.session_state["mc_fetch_job"] = {"session_key": mc_session_key, "job_id": job_id_mc}
+                else:
+                    with st.spinner("⏳ Získavam dáta pre analýzu viacerých krajín..."):
                         # Use the original sequential version
                         results_df_mc, error_msg_mc = fetch_multi_country_search_volume_data(
                             api_login, api_password, 
                             keywords_tuple_mc, 
                             locations_tuple_mc, 
-                            selected_language_code_mc, 
+                            language_targets_mc, 
                             date_from_input_mc, date_to_input_mc, 
                             all_loc_options_tuple_for_cache 
                         )
-                st.session_state[mc_session_key] = {"data": results_df_mc, "error": error_msg_mc, "granularity": granularity_mc_str}
+                    _store_fetch_result(mc_session_key, results_df_mc, error_msg_mc, granularity_mc_str)
                 mc_cache_info_placeholder.empty() 
 
-            current_df_mc_on_run = st.session_state[mc_session_key].get("data")
-            current_error_mc_on_run = st.session_state[mc_session_key].get("error") 
-            
-            if not current_error_mc_on_run and current_df_mc_on_run is not None and not current_df_mc_on_run.empty: 
-                st.success("✅ Dáta (analýza viacerých krajín) úspešne získané/načítané!")
-            elif not current_error_mc_on_run and current_df_mc_on_run is not None and current_df_mc_on_run.empty: 
-                st.info("ℹ️ API nevrátilo žiadne dáta pre zadané kritériá, alebo dáta v cache sú prázdne.")
-            elif current_error_mc_on_run: 
-                st.error(f"🚨 Nastala chyba pri získavaní dát: {current_error_mc_on_run}")
+            if mc_session_key in st.session_state:
+                _render_fetch_summary(mc_session_key)
+
+    _follow_fetch_job(mc_session_key, granularity_mc_str)
 
     if mc_session_key in st.session_state:
         current_df_mc = st.session_state[mc_session_key].get("data") 
@@ -192,6 +338,15 @@ def render_multi_country_page(api_login, api_password, location_options_all, lan
                 mc_history_df_raw = current_df_mc.copy()
                 mc_history_df_raw['Date'] = pd.to_datetime(mc_history_df_raw['Date'])
                 
+                # Pri behu s viacerými jazykmi sa grafy počítajú len z vybraných jazykov (objemy jazykov sa inak sčítajú)
+                available_languages_mc = sorted(mc_history_df_raw['Language'].unique()) if 'Language' in mc_history_df_raw.columns else []
+                mc_language_df_raw = mc_history_df_raw.copy()
+                if len(available_languages_mc) > 1:
+                    if 'mc_chart_languages' not in st.session_state or not set(st.session_state.mc_chart_languages).issubset(set(available_languages_mc)):
+                        st.session_state.mc_chart_languages = available_languages_mc
+                    selected_chart_languages_mc = st.multiselect("Jazyky zahrnuté v grafoch 1-7:", options=available_languages_mc, key="mc_chart_languages", help="Objemy vybraných jazykov sa v grafoch sčítajú. Porovnanie jazykov zobrazuje graf 7b.")
+                    mc_history_df_raw = filter_languages(mc_history_df_raw, selected_chart_languages_mc)
+                
                 period_col_name_mc = 'Period'
                 mc_history_df_agg = add_period_column(mc_history_df_raw.copy(), granularity_mc_str_for_charts, 'Date', period_col_name_mc)
                 
@@ -404,31 +559,72 @@ def render_multi_country_page(api_login, api_password, location_options_all, lan
                 else: st.info("Vyberte aspoň jednu krajinu pre graf '7. Priemerný objem segmentu pre vlastný výber krajín'.")
 
 
+                # Graf 7b: Priemerný objem podľa jazykov (len pri behu s viacerými jazykmi)
+                if len(available_languages_mc) > 1:
+                    st.markdown("---"); st.subheader(f"7b. Priemerný objem podľa jazykov (Čiarový) ({granularity_mc_label_for_charts})")
+                    st.markdown("Graf zobrazuje priemerný objem vyhľadávania pre každý jazyk. Dáta pre každý jazyk sú súčtom objemov vybraných značiek z vybraných krajín.")
+                    available_countries_languages = sorted(mc_language_df_raw['Country'].unique())
+                    col_by_language_kw_g7b, col_by_language_co_g7b = st.columns(2)
+                    with col_by_language_kw_g7b:
+                        if 'by_language_brands_g7b' not in st.session_state or not set(st.session_state.by_language_brands_g7b).issubset(set(available_keywords_flex)):
+                            st.session_state.by_language_brands_g7b = available_keywords_flex[:min(3, len(available_keywords_flex))]
+                        selected_brands_for_g7b = st.multiselect("Vyberte značky (ich objemy sa sčítajú pre každý jazyk v grafe 7b):", options=available_keywords_flex, key="by_language_brands_g7b")
+                    with col_by_language_co_g7b:
+                        if 'by_language_countries_g7b' not in st.session_state or not set(st.session_state.by_language_countries_g7b).issubset(set(available_countries_languages)):
+                            st.session_state.by_language_countries_g7b = available_countries_languages
+                        selected_countries_for_g7b = st.multiselect("Vyberte krajiny pre graf 7b (ich dáta sa sčítajú pre každý jazyk):", options=available_countries_languages, key="by_language_countries_g7b")
+
+                    if selected_brands_for_g7b and selected_countries_for_g7b:
+                        df_avg_vol_by_language_g7b = transform_flexible_avg_volume_by_language_display(
+                            mc_language_df_raw.copy(),
+                            selected_brands_for_g7b,
+                            selected_countries_for_g7b,
+                            available_languages_mc,
+                            granularity_mc_str_for_charts,
+                            period_col_name_mc
+                        )
+                        fig7b = create_mc_avg_volume_by_language_line_chart(
+                            df_avg_vol_by_language_g7b,
+                            period_col_name_mc,
+                            granularity_mc_str_for_charts,
+                            granularity_mc_label_for_charts,
+                            available_languages_mc,
+                            ", ".join(selected_brands_for_g7b)
+                        )
+                        if fig7b: st.plotly_chart(fig7b, use_container_width=True)
+                        else: st.info("Nedostatok dát pre graf '7b. Priemerný objem podľa jazykov' s vybranými parametrami.")
+                    else: st.info("Vyberte aspoň jednu značku a jednu krajinu pre graf '7b. Priemerný objem podľa jazykov'.")
+
                 # Stiahnutie dát a história
                 st.markdown("---"); st.subheader("8. Stiahnuť dáta ako CSV (Analýza viacerých krajín)")
                 try:
                      if not mc_history_df_raw.empty:
                           @st.cache_data 
                           def convert_df_to_csv_mc_final_v4(df): # Zmenený názov funkcie pre cache
-                              df_sorted = df[['Keyword', 'Country', 'Location Code', 'Date', 'Search Volume']].sort_values(by=['Keyword', 'Country', 'Date'])
+                              csv_columns = ['Keyword', 'Country', 'Language', 'Location Code', 'Date', 'Search Volume'] if 'Language' in df.columns else ['Keyword', 'Country', 'Location Code', 'Date', 'Search Volume']
+                              df_sorted = df[csv_columns].sort_values(by=[col for col in ['Keyword', 'Country', 'Language', 'Date'] if col in csv_columns])
                               df_sorted['Date'] = pd.to_datetime(df_sorted['Date']).dt.strftime('%Y-%m-%d')
                               return df_sorted.to_csv(index=False).encode('utf-8')
-                          csv_data = convert_df_to_csv_mc_final_v4(mc_history_df_raw.copy())
+                          csv_data = convert_df_to_csv_mc_final_v4(mc_language_df_raw.copy())
                           st.download_button(label="Stiahnuť dáta (analýza viacerých krajín) ako CSV", data=csv_data, file_name=f'data_multi_country.csv', mime='text/csv', key="download_csv_mc_final_v4") # Zmenený kľúč pre tlačidlo
                 except Exception as e: st.error(f"Chyba pri príprave CSV na stiahnutie: {e}")
 
                 st.markdown("---"); st.subheader("9. História vyhľadávaní (Analýza viacerých krajín)")
                 if 'search_history_multi' not in st.session_state: st.session_state.search_history_multi = []
-                current_display_country_names_mc_hist = st.session_state.get('mc_selected_locations', [])
+                current_location_codes_mc_hist = list(selected_location_codes_mc)
+                current_display_country_names_mc_hist = [location_catalog.display(code) for code in current_location_codes_mc_hist]
                 current_language_name_mc_hist = st.session_state.get('mc_language_select', "")
-                
-                # loc_code_map_mc_hist už je definované vyššie ako loc_code_map_mc_local
-                current_location_codes_mc_hist = [loc_code_map_mc_local[name] for name in current_display_country_names_mc_hist if name in loc_code_map_mc_local]
+                current_additional_languages_mc_hist = list(st.session_state.get('mc_additional_languages', []))
+                current_country_languages_mc_hist = {
+                    code: st.session_state.get(f"mc_country_language_{code}") for code in current_location_codes_mc_hist
+                } if st.session_state.get('mc_language_per_country') else {}
+
 
                 current_request_info_multi = {
                     'keywords': keywords_list_mc, 'countries_display': current_display_country_names_mc_hist, 
                     'location_codes': current_location_codes_mc_hist, 
                     'language': current_language_name_mc_hist, 'language_code': selected_language_code_mc, 
+                    'additional_languages': current_additional_languages_mc_hist, 'country_languages': current_country_languages_mc_hist, 
                     'date_from': date_from_input_mc, 'date_to': date_to_input_mc, 
                     'granularity': granularity_mc_str, 
                     'session_key': mc_session_key, 
@@ -448,14 +644,18 @@ def render_multi_country_page(api_login, api_password, location_options_all, lan
                                 countries_summary = ", ".join(hist_item['countries_display'][:2]) + (f" a ďalšie {len(hist_item['countries_display'])-2}" if len(hist_item['countries_display']) > 2 else "")
                                 st.markdown(f"**Krajiny:** {countries_summary}")
                             with col_h2:
-                                st.markdown(f"**Jazyk:** {hist_item['language']}")
+                                st.markdown(f"**Jazyk:** {hist_item['language']}" + (f" + {', '.join(hist_item['additional_languages'])}" if hist_item.get('additional_languages') else "") + (" (podľa krajín)" if hist_item.get('country_languages') else ""))
                                 st.markdown(f"**Obdobie:** {hist_item['date_from'].strftime('%Y-%m-%d')} až {hist_item['date_to'].strftime('%Y-%m-%d')}")
                                 st.markdown(f"**Granularita:** {hist_item['granularity']}")
                             with col_h3:
                                 if st.button("Načítať", key=f"load_hist_multi_{hist_item['session_key']}"):
                                     st.session_state.mc_keywords_input = "\n".join(hist_item['keywords'])
-                                    st.session_state.mc_selected_locations = hist_item['countries_display']
+                                    st.session_state.mc_selected_locations = hist_item['location_codes']
                                     st.session_state.mc_language_select = hist_item['language']
+                                    st.session_state.mc_additional_languages = hist_item.get('additional_languages', [])
+                                    st.session_state.mc_language_per_country = bool(hist_item.get('country_languages'))
+                                    for code, language_name in hist_item.get('country_languages', {}).items():
+                                        st.session_state[f"mc_country_language_{code}"] = language_name
                                     st.session_state.mc_date_from = hist_item['date_from']
                                     st.session_state.mc_date_to = hist_item['date_to']
                                     st.session_state.mc_granularity_choice = hist_item['granularity']
@@ -3,16 +3,43 @@ Modul pre vykreslenie postranného panela aplikácie.
 Obsahuje funkcie pre zobrazenie menu, nastavení a informácií o aplikácii.
 """
 from typing import List, Tuple, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
 
 from config import (
     AppInfo, 
+    HedgeSettings,
     DEFAULT_MULTI_COUNTRY_CODES
 )
-# Importujeme load_locations a load_languages z api_client
-from api_client.dataforseo_client import load_locations, load_languages
+# Jazyky načítavame z api_client, lokácie z indexovaného katalógu
+from api_client.concurrency import get_concurrency_limiter
+from api_client.hedging import get_hedge_policy
+from api_client.dataforseo_client import load_languages
+from data_processing.location_catalog import LocationCatalog, get_location_catalog
+from utils.swr_cache import cache_status
 
-def render_sidebar(api_login: Optional[str], api_password: Optional[str]) -> Tuple[List, Optional[str], List, Optional[str]]:
+def load_sidebar_catalogs(api_login: str, api_password: str) -> Tuple[Optional[LocationCatalog], Optional[str], List, Optional[str]]:
+    """Načíta katalóg lokácií a zoznam jazykov súbežne.
+    
+    Sú to dve nezávislé blokujúce HTTP volania; pri studenom štarte tak prvé vykreslenie
+    čaká len na pomalšie z nich, nie na ich súčet. Z cache sa obe vrátia okamžite.
+    
+    Args:
+        api_login: DataForSEO API prihlasovacie meno
+        api_password: DataForSEO API heslo
+        
+    Returns:
+        Tuple[Optional[LocationCatalog], Optional[str], List, Optional[str]]: 
+            (location_catalog, locations_error, language_options, languages_error)
+    """
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="sidebar_catalog") as executor:
+        locations_future = executor.submit(get_location_catalog, api_login, api_password)
+        languages_future = executor.submit(load_languages, api_login, api_password)
+        location_catalog, locations_error = locations_future.result()
+        language_options, languages_error = languages_future.result()
+    return location_catalog, locations_error, language_options, languages_error
+
+def render_sidebar(api_login: Optional[str], api_password: Optional[str]) -> Tuple[Optional[LocationCatalog], Optional[str], List, Optional[str]]:
     """Vykreslí postranný panel aplikácie.
     
     Args:
@@ -20,18 +47,18 @@ def render_sidebar(api_login: Optional[str], api_password: Optional[str]) -> Tup
         api_password: DataForSEO API heslo
         
     Returns:
-        Tuple[List, Optional[str], List, Optional[str]]: 
-            (location_options, locations_error, language_options, languages_error)
+        Tuple[Optional[LocationCatalog], Optional[str], List, Optional[str]]: 
+            (location_catalog, locations_error, language_options, languages_error)
     """
     st.sidebar.header("⚙️ Nastavenia DataForSEO API")
     st.sidebar.info("API prihlasovacie údaje sa načítavajú zo Streamlit Secrets.")
     login_status_placeholder = st.sidebar.empty()
 
-    location_options, locations_error, language_options, languages_error = [], None, [], None
+    location_catalog, locations_error, language_options, languages_error = None, None, [], None
 
     if api_login and api_password:
-        location_options, locations_error = load_locations(api_login, api_password)
-        language_options, languages_error = load_languages(api_login, api_password)
+        login_status_placeholder.info("⏳ Načítavam krajiny a jazyky...")
+        location_catalog, locations_error, language_options, languages_error = load_sidebar_catalogs(api_login, api_password)
         
         if not locations_error and not languages_error:
             login_status_placeholder.success("✅ API Prihlásenie OK (Krajiny a Jazyky načítané)")
@@ -54,13 +81,19 @@ def render_sidebar(api_login: Optional[str], api_password: Optional[str]) -> Tup
     # Sekcia pre výber režimu analýzy
     _render_analysis_mode_section()
     
+    # Stav cache (zastarané záznamy obnovované na pozadí)
+    _render_cache_status_section()
+    
+    # Aktuálne okno súbežných API volaní
+    _render_api_concurrency_section()
+    
     # Sekcia dokumentácie
     _render_documentation_section()
     
     # Informácie o copyrighte a aplikácii
     _render_copyright_section()
 
-    return location_options, locations_error, language_options, languages_error
+    return location_catalog, locations_error, language_options, languages_error
 
 def _render_analysis_mode_section():
     """Vykreslí sekciu pre výber režimu analýzy."""
@@ -86,6 +119,43 @@ def _update_analysis_mode():
     """Aktualizuje globálny stav analýzy na základe výberu v postrannom paneli."""
     st.session_state.analysis_mode_radio = st.session_state.sidebar_analysis_mode_radio
 
+def _render_cache_status_section():
+    """Vykreslí sekciu so zastaranými záznamami cache, ktoré sa obnovujú na pozadí."""
+    stale_entries = cache_status(stale_only=True)
+    if not stale_entries:
+        return
+    st.sidebar.markdown("---")
+    with st.sidebar.expander(f"🗄️ Zastarané dáta v cache ({len(stale_entries)})", expanded=False):
+        st.caption("Tieto dáta sa zobrazujú z cache po uplynutí platnosti a na pozadí sa načítavajú nové.")
+        for entry in stale_entries:
+            state = "obnovuje sa" if entry["refreshing"] else ("obnova zlyhala" if entry["refresh_failed"] else "čaká na obnovu")
+            label = f" – {entry['entry']}" if entry["entry"] else ""
+            st.markdown(f"**{entry['cache']}**{label}  \n{entry['age_seconds'] / 60:.0f} min staré, {state}")
+
+def _render_api_concurrency_section():
+    """Vykreslí sekciu s aktuálnym adaptívnym oknom súbežných API volaní."""
+    window = get_concurrency_limiter().snapshot()
+    st.sidebar.markdown("---")
+    with st.sidebar.expander(f"📶 Súbežné API volania ({window['in_flight']}/{window['limit']})", expanded=False):
+        st.caption("Počet súbežných volaní sa prispôsobuje odozvám API: rastie pri rýchlych odpovediach, pri preťažení sa zníži.")
+        latency = f"{window['latency_seconds']:.2f} s" if window["latency_seconds"] is not None else "–"
+        st.markdown(
+            f"Okno: **{window['window']:.1f}** (rozsah {window['min_window']}–{window['max_window']})  \n"
+            f"Bežiace / čakajúce volania: {window['in_flight']} / {window['waiting']}  \n"
+            f"Priemerná latencia: {latency}  \n"
+            f"Zníženia pri preťažení: {window['decreases']}"
+        )
+        if HedgeSettings.ENABLED:
+            hedge = get_hedge_policy().snapshot()
+            thresholds = ", ".join(
+                f"{bucket} taskov: {latency:.2f} s" for bucket, latency in hedge["latency_seconds"].items()
+                if latency is not None
+            ) or "–"
+            st.markdown(
+                f"Duplicitné volania po {hedge['percentile']:g}. percentile ({thresholds}): "
+                f"{hedge['hedges']} ({hedge['hedged_tasks']} taskov), rýchlejšie {hedge['hedges_won']}"
+            )
+
 def _render_documentation_section():
     """Vykreslí sekciu s odkazmi na dokumentáciu."""
     st.sidebar.markdown("---")
@@ -20,8 +20,9 @@ from ui.charts import (
     create_stacked_bar_avg_keyword_volume_single, 
     create_heatmap_growth_single
 )
+from ui.location_search import location_select_options, render_location_search
 
-def render_single_country_page(api_login, api_password, location_options, language_options, locations_error, languages_error):
+def render_single_country_page(api_login, api_password, location_catalog, language_options, locations_error, languages_error):
     st.header("🔍 Analýza jednej krajiny") 
     
     col1, col2, col3 = st.columns(3)
@@ -34,21 +35,20 @@ def render_single_country_page(api_login, api_password, location_options, langua
     with col2:
         st.subheader("Krajina")
         selected_location_code, selected_location_display_name = None, ""
-        loc_selectbox_disabled = not location_options or not api_login or not api_password
+        loc_selectbox_disabled = not location_catalog or not api_login or not api_password
         
         if not loc_selectbox_disabled:
-            loc_display_list_s = [opt[0] for opt in location_options]
-            loc_code_map_s = {name: code for name, code in location_options}
-            
-            if 'location_select_single' not in st.session_state or st.session_state.location_select_single not in loc_display_list_s:
-                default_loc_name = next((name for name, code_val in location_options if code_val == 2703), loc_display_list_s[0] if loc_display_list_s else "")
-                st.session_state.location_select_single = default_loc_name
+            # Výber sa drží ako kód lokácie; možnosti sú len vybraná a nájdené lokácie
+            if 'location_select_single' not in st.session_state or st.session_state.location_select_single not in location_catalog:
+                default_loc_code = 2703 if 2703 in location_catalog else next(iter(location_catalog.search("", "Country", limit=1)), None)
+                st.session_state.location_select_single = default_loc_code
             
+            location_matches_s = render_location_search(location_catalog, "location_search_single")
             # Widget si hodnotu načíta zo session_state vďaka 'key'
-            st.selectbox("Vyber krajinu:", options=loc_display_list_s, key="location_select_single", help="Zoznam krajín načítaný z API.")
-            selected_location_display_name = st.session_state.location_select_single 
-            if selected_location_display_name:
-                selected_location_code = loc_code_map_s.get(selected_location_display_name)
+            st.selectbox("Vyber krajinu:", options=location_select_options(location_catalog, [st.session_state.location_select_single], location_matches_s), format_func=location_catalog.display, key="location_select_single", help="Lokácie nájdené v zozname z API.")
+            selected_location_code = st.session_state.location_select_single 
+            if selected_location_code is not None:
+                selected_location_display_name = location_catalog.display(selected_location_code)
         else:
             st.info("Zoznam krajín nie je dostupný.")
             if locations_error and (api_login and api_password): st.warning(f"Chyba pri načítaní krajín: {locations_error}")
@@ -130,19 +130,19 @@ def render_single_country_page(api_login, api_password, location_options, langua
             else: 
                 cache_info_placeholder_single.info("ℹ️ Cache session (analýza jednej krajiny) nenájdená, volám API...")
                 with st.spinner("⏳ Získavam dáta z DataForSEO API..."):
-                     results_data_list_s, error_msg_s = fetch_search_volume_data_single(
+                     results_df_s, error_msg_s = fetch_search_volume_data_single(
                          api_login, api_password, 
                          keywords_tuple_s, selected_location_code, selected_language_code, 
                          date_from_input_single, date_to_input_single
                      )
-                     st.session_state[session_key_single] = {"data": results_data_list_s, "error": error_msg_s, "granularity": granularity_single_str}
+                     st.session_state[session_key_single] = {"data": results_df_s, "error": error_msg_s, "granularity": granularity_single_str}
                 cache_info_placeholder_single.empty() 
             
             current_data_s_after_fetch = st.session_state[session_key_single].get("data")
             current_error_s_after_fetch = st.session_state[session_key_single].get("error")
-            if not current_error_s_after_fetch and current_data_s_after_fetch is not None and current_data_s_after_fetch:
+            if not current_error_s_after_fetch and current_data_s_after_fetch is not None and not current_data_s_after_fetch.empty:
                 st.success("✅ Dáta (analýza jednej krajiny) úspešne získané/načítané!")
-            elif not current_error_s_after_fetch and current_data_s_after_fetch == []:
+            elif not current_error_s_after_fetch and current_data_s_after_fetch is not None and current_data_s_after_fetch.empty:
                 st.info("ℹ️ API nevrátilo žiadne dáta pre zadané kritériá, alebo dáta v cache sú prázdne.")
             elif current_error_s_after_fetch: 
                 st.error(f"🚨 Chyba pri získavaní dát: {current_error_s_after_fetch}")
@@ -154,18 +154,14 @@ def render_single_country_page(api_login, api_password, location_options, langua
         granularity_s_for_charts_str = st.session_state[session_key_single].get("granularity", st.session_state.granularity_choice_single)
         granularity_s_for_charts_label = granularity_s_for_charts_str.replace('e','á')
 
-        if current_error_s and not (current_data_s is not None and current_data_s):
+        if current_error_s and not (current_data_s is not None and not current_data_s.empty):
             st.error(f"🚨 Nastala chyba pri získavaní dát (analýza jednej krajiny):\n{current_error_s}")
         elif current_data_s is not None: 
-            if not current_data_s: 
+            if current_data_s.empty: 
                 st.info("ℹ️ Neboli nájdené žiadne historické dáta pre zadané kľúčové slová, krajinu a jazyk v danom časovom období.")
             else:
-                history_df_raw_s = pd.DataFrame(current_data_s)
-                if history_df_raw_s.empty:
-                    st.info("ℹ️ Neboli nájdené žiadne historické dáta na spracovanie.")
-                    return
-
-                history_df_raw_s['Date'] = pd.to_datetime(history_df_raw_s['Date'])
+                # Fetcher vracia stĺpcový DataFrame so stĺpcom Date typu datetime64
+                history_df_raw_s = current_data_s.copy()
                 
                 period_col_name_s = 'Period'
                 history_df_agg_s = add_period_column(history_df_raw_s.copy(), granularity_s_for_charts_str, 'Date', period_col_name_s)
@@ -262,7 +258,7 @@ def render_single_country_page(api_login, api_password, location_options, langua
                     'timestamp': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
                 }
                 request_exists_single = any(hist_item['session_key'] == session_key_single for hist_item in st.session_state.search_history_single)
-                if not request_exists_single and current_data_s: 
+                if not request_exists_single and not current_data_s.empty: 
                     st.session_state.search_history_single.append(current_request_info_single)
 
                 if st.session_state.search_history_single:
@@ -280,7 +276,7 @@ def render_single_country_page(api_login, api_password, location_options, langua
                             with col_h3:
                                 if st.button(f"Načítať", key=f"load_hist_single_{hist_item['session_key']}"):
                                     st.session_state.keywords_input_single = "\n".join(hist_item['keywords'])
-                                    st.session_state.location_select_single = hist_item['location'] 
+                                    st.session_state.location_select_single = hist_item['location_code'] 
                                     st.session_state.language_select_single = hist_item['language'] 
                                     st.session_state.date_from_single = hist_item['date_from']
                                     st.session_state.date_to_single = hist_item['date_to']
@@ -0,0 +1,135 @@
+"""
+Utility modul pre Share of Search Tool.
+Jeden dlhodobo bežiaci asyncio event loop na vlastnom vlákne pre celý proces.
+
+Synchrónny kód (Streamlit skript, joby na pozadí, obnovy stale-while-revalidate cache) na ňom
+spúšťa korutíny cez submit_coroutine a dostane concurrent.futures.Future; korutína bežiaca na
+inom event loope na výsledok počká cez wrap_future. Na tomto loope žijú všetky asynchrónne
+zdroje - zdieľaná aiohttp session, rozpracované tasky fetcherov a ich asyncio primitíva - takže
+ich opakovane využívajú všetky behy, rerun-y aj Streamlit session v procese.
+
+Zdroje, ktoré treba pred zastavením loopu zatvoriť, sa registrujú cez add_shutdown_callback.
+Loop sa zastaví pri ukončení procesu a pri ďalšom použití sa znova spustí.
+"""
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Sekundy, ktoré má zastavenie loopu na zatvorenie zdrojov a zrušenie rozpracovaných taskov
+_STOP_TIMEOUT = 5
+
+ShutdownCallback = Callable[[], Awaitable[None]]
+
+class BackgroundEventLoop:
+    """Event loop bežiaci na samostatnom daemon vlákne."""
+
+    def __init__(self, name: str = "sos_event_loop"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._shutdown_callbacks: List[ShutdownCallback] = []
+
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Vráti bežiaci event loop; pri prvom použití (alebo po zastavení) ho spustí."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name=self.name, daemon=True)
+                self._thread.start()
+                logger.info(f"Spustený event loop '{self.name}' na pozadí")
+            return self._loop
+
+    def is_current(self) -> bool:
+        """Zistí, či volajúci kód beží na tomto event loope."""
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """Spustí korutínu na event loope; zrušenie vrátenej future zruší aj korutínu.
+
+        Args:
+            coro: Korutína na spustenie
+
+        Returns:
+            concurrent.futures.Future: Future s výsledkom korutíny
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop())
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """Spustí korutínu na event loope a počká na jej výsledok.
+
+        Raises:
+            RuntimeError: Ak sa volá z tohto event loopu (čakanie by ho zablokovalo)
+        """
+        if self.is_current():
+            coro.close()
+            raise RuntimeError(f"Na event loope '{self.name}' nemožno synchrónne čakať na korutínu, použite await.")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def add_shutdown_callback(self, callback: ShutdownCallback) -> None:
+        """Zaregistruje korutínovú funkciu, ktorá sa na loope zavolá pred jeho zastavením."""
+        with self._lock:
+            self._shutdown_callbacks.append(callback)
+
+    def stop(self) -> None:
+        """Zatvorí zaregistrované zdroje, zruší rozpracované tasky a zastaví event loop."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+            callbacks = list(self._shutdown_callbacks)
+        if loop is None or loop.is_closed():
+            return
+
+        async def shutdown() -> None:
+            for callback in callbacks:
+                try:
+                    await callback()
+                except Exception as e:
+                    logger.warning(f"Zatvorenie zdroja event loopu '{self.name}' zlyhalo: {e}")
+            pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout=_STOP_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Event loop '{self.name}' sa nepodarilo korektne ukončiť: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=_STOP_TIMEOUT)
+        if not loop.is_running():
+            loop.close()
+
+_background_loop = BackgroundEventLoop()
+
+def get_background_loop() -> BackgroundEventLoop:
+    """Vráti event loop na pozadí spoločný pre celý proces."""
+    return _background_loop
+
+def submit_coroutine(coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+    """Spustí korutínu na spoločnom event loope a vráti concurrent.futures.Future s výsledkom."""
+    return _background_loop.submit(coro)
+
+def run_coroutine(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """Spustí korutínu na spoločnom event loope a synchrónne počká na jej výsledok."""
+    return _background_loop.run(coro, timeout)
+
+def wrap_future(coro: Coroutine[Any, Any, Any]) -> "asyncio.Future[Any]":
+    """Spustí korutínu na spoločnom event loope a vráti future, na ktorú možno čakať (await) z iného loopu."""
+    return asyncio.wrap_future(submit_coroutine(coro))
+
+atexit.register(_background_loop.stop)
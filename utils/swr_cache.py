@@ -0,0 +1,231 @@
+"""
+Utility modul pre Share of Search Tool.
+Cache so stratégiou stale-while-revalidate pre pomalé načítania z API.
+
+Na rozdiel od st.cache_data sa záznam po uplynutí TTL nezahodí: kým nie je starší ako
+TTL + maximálna zastaranosť, vráti sa okamžite a nová hodnota sa načíta na pozadí.
+Na API tak čaká len volajúci bez záznamu alebo so záznamom starším ako tento limit.
+Zlyhaná obnova na pozadí ponechá pôvodnú hodnotu. Stav záznamov vracia cache_status().
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+import copy
+import functools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Počet vlákien, ktoré na pozadí obnovujú zastarané záznamy (spoločné pre všetky cache)
+_REFRESH_WORKERS = 2
+
+# Sekundy, po ktorých sa zlyhaná obnova záznamu skúsi znova
+_REFRESH_RETRY_INTERVAL = 60
+
+Seconds = Union[float, Callable[[], float]]
+
+def _seconds(value: Seconds) -> float:
+    return value() if callable(value) else value
+
+class _Entry:
+    __slots__ = ("value", "stored_at", "label", "refreshing", "refresh_failed_at")
+
+    def __init__(self, value: Any, stored_at: float, label: str):
+        self.value = value
+        self.stored_at = stored_at
+        self.label = label
+        self.refreshing = False
+        self.refresh_failed_at: Optional[float] = None
+
+class StaleWhileRevalidateCache:
+    """Cache výsledkov funkcie podľa argumentov s obnovou zastaraných záznamov na pozadí."""
+
+    def __init__(
+        self,
+        func: Callable,
+        name: str,
+        ttl: Seconds,
+        max_stale: Seconds,
+        max_entries: Optional[int] = None,
+        is_failure: Optional[Callable[[Any], bool]] = None,
+        copy_result: bool = True,
+        label: Optional[Callable[..., str]] = None
+    ):
+        """
+        Args:
+            func: Načítavaná funkcia; argumenty musia byť hashovateľné
+            name: Názov cache pre cache_status()
+            ttl: Sekundy, počas ktorých je záznam čerstvý (alebo funkcia, ktorá ich vráti)
+            max_stale: Sekundy po TTL, počas ktorých sa záznam ešte vráti a obnoví na pozadí
+            max_entries: Maximálny počet záznamov, nad ním sa uvoľnia najdlhšie nepoužité
+            is_failure: Rozpozná neúspešný výsledok, ktorý pri obnove neprepíše starý záznam
+            copy_result: Vráti kópiu hodnoty, aby volajúci nemohol zmeniť cachovaný záznam
+            label: Popis záznamu podľa argumentov pre cache_status() (bez prihlasovacích údajov)
+        """
+        self._func = func
+        self.name = name
+        self._ttl = ttl
+        self._max_stale = max_stale
+        self._max_entries = max_entries
+        self._is_failure = is_failure or (lambda value: False)
+        self._copy_result = copy_result
+        self._label = label or (lambda *args, **kwargs: "")
+        self._entries: "OrderedDict[Tuple, _Entry]" = OrderedDict()
+        self._load_locks: Dict[Tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+        functools.update_wrapper(self, func)
+        _register(self)
+
+    @property
+    def ttl(self) -> float:
+        return _seconds(self._ttl)
+
+    @property
+    def max_stale(self) -> float:
+        return _seconds(self._max_stale)
+
+    def _result(self, value: Any) -> Any:
+        return copy.deepcopy(value) if self._copy_result else value
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        key = (args, tuple(sorted(kwargs.items())))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                age = time.monotonic() - entry.stored_at
+                if age < self.ttl:
+                    return self._result(entry.value)
+                if age < self.ttl + self.max_stale:
+                    self._schedule_refresh(key, entry, args, kwargs)
+                    return self._result(entry.value)
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Súbežní volajúci s rovnakými argumentmi počkajú na jedno načítanie
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.monotonic() - entry.stored_at < self.ttl:
+                    return self._result(entry.value)
+            value = self._func(*args, **kwargs)
+            self._store(key, value, self._label(*args, **kwargs))
+        return self._result(value)
+
+    def _store(self, key: Tuple, value: Any, label: str) -> None:
+        with self._lock:
+            self._entries[key] = _Entry(value, time.monotonic(), label)
+            self._entries.move_to_end(key)
+            while self._max_entries is not None and len(self._entries) > self._max_entries:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._load_locks.pop(evicted_key, None)
+
+    def _schedule_refresh(self, key: Tuple, entry: _Entry, args: Tuple, kwargs: Dict) -> None:
+        """Naplánuje obnovu zastaraného záznamu, ak už neprebieha (volá sa pod zámkom)."""
+        if entry.refreshing:
+            return
+        if entry.refresh_failed_at is not None and time.monotonic() - entry.refresh_failed_at < _REFRESH_RETRY_INTERVAL:
+            return
+        entry.refreshing = True
+        _submit_refresh(functools.partial(self._refresh, key, entry, args, kwargs))
+
+    def _refresh(self, key: Tuple, entry: _Entry, args: Tuple, kwargs: Dict) -> None:
+        try:
+            value = self._func(*args, **kwargs)
+            failed = self._is_failure(value)
+        except Exception as e:
+            logger.warning(f"Obnova záznamu cache '{self.name}' zlyhala: {e}")
+            failed = True
+        with self._lock:
+            entry.refreshing = False
+            if failed:
+                entry.refresh_failed_at = time.monotonic()
+                return
+        self._store(key, value, entry.label)
+        logger.info(f"Záznam cache '{self.name}' obnovený na pozadí")
+
+    def clear(self) -> None:
+        """Odstráni všetky záznamy."""
+        with self._lock:
+            self._entries.clear()
+            self._load_locks.clear()
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Stav záznamov: vek, zastaranosť a prebiehajúca alebo zlyhaná obnova."""
+        now = time.monotonic()
+        ttl = self.ttl
+        with self._lock:
+            return [
+                {
+                    "cache": self.name,
+                    "entry": entry.label,
+                    "age_seconds": round(now - entry.stored_at, 1),
+                    "stale": now - entry.stored_at >= ttl,
+                    "refreshing": entry.refreshing,
+                    "refresh_failed": entry.refresh_failed_at is not None,
+                }
+                for entry in self._entries.values()
+            ]
+
+def stale_while_revalidate(name: str, ttl: Seconds, max_stale: Seconds, **options: Any) -> Callable[[Callable], StaleWhileRevalidateCache]:
+    """Dekorátor, ktorý nahrádza st.cache_data(ttl=...) cache so stratégiou stale-while-revalidate.
+
+    Args:
+        name: Názov cache pre cache_status()
+        ttl: Sekundy, počas ktorých je záznam čerstvý
+        max_stale: Sekundy po TTL, počas ktorých sa záznam vráti a obnoví na pozadí
+        **options: Ďalšie parametre StaleWhileRevalidateCache
+
+    Returns:
+        Callable: Dekorátor
+    """
+    def decorator(func: Callable) -> StaleWhileRevalidateCache:
+        return StaleWhileRevalidateCache(func, name, ttl, max_stale, **options)
+    return decorator
+
+_caches: List[StaleWhileRevalidateCache] = []
+_refresh_executor: Optional[ThreadPoolExecutor] = None
+_pending_refreshes: "set[Future]" = set()
+_registry_lock = threading.Lock()
+
+def _register(cache: StaleWhileRevalidateCache) -> None:
+    with _registry_lock:
+        _caches.append(cache)
+
+def _submit_refresh(refresh: Callable[[], None]) -> None:
+    global _refresh_executor
+    with _registry_lock:
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(max_workers=_REFRESH_WORKERS, thread_name_prefix="swr-refresh")
+        future = _refresh_executor.submit(refresh)
+        _pending_refreshes.add(future)
+    future.add_done_callback(_discard_refresh)
+
+def _discard_refresh(future: Future) -> None:
+    with _registry_lock:
+        _pending_refreshes.discard(future)
+
+def wait_for_refreshes(timeout: Optional[float] = None) -> bool:
+    """Počká na dokončenie prebiehajúcich obnov na pozadí (napr. v testoch a nástrojoch).
+
+    Returns:
+        bool: True, ak sa všetky obnovy dokončili do uplynutia timeoutu
+    """
+    with _registry_lock:
+        pending = set(_pending_refreshes)
+    return not wait(pending, timeout=timeout).not_done
+
+def cache_status(stale_only: bool = False) -> List[Dict[str, Any]]:
+    """Stav záznamov všetkých stale-while-revalidate cache.
+
+    Args:
+        stale_only: Vráti len zastarané záznamy
+
+    Returns:
+        List[Dict[str, Any]]: Záznamy s kľúčmi cache, entry, age_seconds, stale, refreshing, refresh_failed
+    """
+    with _registry_lock:
+        caches = list(_caches)
+    entries = [entry for cache in caches for entry in cache.status()]
+    return [entry for entry in entries if entry["stale"]] if stale_only else entries